@@ -0,0 +1,108 @@
+"""
+SOLVE-IT Async Loading Benchmark
+
+This script measures how responsive the asyncio event loop stays while the
+knowledge base is loaded and searched. A heartbeat task sleeps for a fixed
+interval in a loop and records how late it wakes up; the worst and mean lag
+are reported for:
+
+- constructing KnowledgeBase directly inside the event loop
+- awaiting AsyncKnowledgeBase.load (several loads running concurrently)
+- awaiting AsyncKnowledgeBase.search
+
+The script can be used directly from the command line
+
+"""
+
+import argparse
+import asyncio
+import sys
+import os
+import time
+import logging
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from solve_it_library import KnowledgeBase, AsyncKnowledgeBase
+
+# Configure logging to show errors to console
+logging.basicConfig(level=logging.ERROR, format='ERROR: %(message)s')
+
+HEARTBEAT_INTERVAL = 0.001
+
+
+async def heartbeat(lags, stop):
+    """Records how late each wake-up is compared to the requested interval"""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+        lags.append(loop.time() - start - HEARTBEAT_INTERVAL)
+
+
+async def measure(label, work):
+    """Runs a coroutine alongside the heartbeat and prints lag statistics"""
+    lags = []
+    stop = asyncio.Event()
+    beat = asyncio.ensure_future(heartbeat(lags, stop))
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await work()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await beat
+    if not lags:
+        lags = [elapsed]
+    print("{}\t{:.1f}\t{:.2f}\t{:.2f}".format(label, elapsed * 1000, max(lags) * 1000,
+                                              sum(lags) / len(lags) * 1000))
+
+
+async def run(solve_it_root, concurrency, max_concurrency):
+    """Runs each scenario and prints a TSV table"""
+    print('Scenario\tTotal ms\tMax loop lag ms\tMean loop lag ms')
+
+    async def blocking_load():
+        for _ in range(concurrency):
+            KnowledgeBase(solve_it_root, 'solve-it.json')
+
+    async def async_load():
+        await asyncio.gather(*(AsyncKnowledgeBase.load(solve_it_root, 'solve-it.json',
+                                                       max_concurrency=max_concurrency)
+                               for _ in range(concurrency)))
+
+    akb = await AsyncKnowledgeBase.load(solve_it_root, 'solve-it.json')
+
+    async def blocking_search():
+        for query in ['disk imaging', 'memory', 'hash', 'mobile device', 'timeline analysis']:
+            akb.kb.clear_search_cache()
+            akb.kb.search(query)
+
+    async def async_search():
+        for query in ['disk imaging', 'memory', 'hash', 'mobile device', 'timeline analysis']:
+            akb.kb.clear_search_cache()
+            await akb.search(query)
+
+    await measure('KnowledgeBase() x{} in loop'.format(concurrency), blocking_load)
+    await measure('AsyncKnowledgeBase.load() x{}'.format(concurrency), async_load)
+    await measure('search() x5 in loop', blocking_search)
+    await measure('await search() x5', async_search)
+
+
+def main():
+    """Command-line entry point for the script."""
+    parser = argparse.ArgumentParser(description="Measure event-loop latency while loading the knowledge base")
+    parser.add_argument('--concurrency', '-n', action='store', type=int, default=4,
+                        help="Number of knowledge bases loaded at the same time")
+    parser.add_argument('--max_concurrency', '-m', action='store', type=int, default=8,
+                        help="Files read and validated at once per load")
+    args = parser.parse_args()
+
+    # Calculate the path to the solve-it directory relative to this script
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    solve_it_root = os.path.dirname(script_dir)  # Go up from benchmarks to solve-it root
+
+    asyncio.run(run(solve_it_root, args.concurrency, args.max_concurrency))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
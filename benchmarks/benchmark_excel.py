@@ -0,0 +1,104 @@
+"""
+SOLVE-IT Excel Generation Benchmark
+
+This script runs the Excel reporting scripts (generate_excel_from_kb.py and
+generate_evaluation.py for all techniques) into a temporary directory and
+reports, for each workbook:
+
+- median generation time (including interpreter start-up and KB load)
+- workbook size in bytes
+- number of cell styles (cellXfs) and fonts/fills/borders in xl/styles.xml
+- number of Format objects created while generating it
+
+Results are reported as TSV.
+
+The script can be used directly from the command line
+
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+
+# Counts Format objects created in the child process, printed on exit
+COUNT_FORMATS = """
+import atexit, runpy, sys
+import xlsxwriter.format
+created = [0]
+original_init = xlsxwriter.format.Format.__init__
+def counting_init(self, *args, **kwargs):
+    created[0] += 1
+    original_init(self, *args, **kwargs)
+xlsxwriter.format.Format.__init__ = counting_init
+atexit.register(lambda: print('FORMATS_CREATED', created[0], file=sys.stderr))
+sys.argv = sys.argv[1:]
+runpy.run_path(sys.argv[0], run_name='__main__')
+"""
+
+SCRIPTS = [
+    ('generate_excel_from_kb.py', 'solve-it.xlsx', []),
+    ('generate_evaluation.py', 'solve-it_evaluation_workbook.xlsx', []),
+]
+
+
+def style_counts(workbook_path):
+    """Returns the number of cellXfs, fonts, fills and borders in a workbook's styles.xml"""
+    with zipfile.ZipFile(workbook_path) as archive:
+        styles = archive.read('xl/styles.xml').decode('utf-8')
+    counts = {}
+    for element in ('cellXfs', 'fonts', 'fills', 'borders'):
+        match = re.search(r'<{} count="(\d+)"'.format(element), styles)
+        counts[element] = int(match.group(1)) if match else 0
+    return counts
+
+
+def run_script(solve_it_root, script, out_path, extra_args):
+    """Runs a reporting script once, returning (seconds, formats created)"""
+    if os.path.exists(out_path):
+        os.remove(out_path)
+    command = [sys.executable, '-c', COUNT_FORMATS, os.path.join(solve_it_root, 'reporting_scripts', script),
+               '-o', out_path] + extra_args
+    start = time.perf_counter()
+    result = subprocess.run(command, cwd=os.path.dirname(out_path), capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0 or not os.path.exists(out_path):
+        raise RuntimeError('{} failed:\n{}{}'.format(script, result.stdout, result.stderr))
+    match = re.search(r'FORMATS_CREATED (\d+)', result.stderr)
+    return elapsed, int(match.group(1)) if match else 0
+
+
+def main():
+    """Command-line entry point for the script."""
+    parser = argparse.ArgumentParser(description="Measure time, size and style count of the generated Excel workbooks")
+    parser.add_argument('--repeat', '-r', action='store', type=int, default=3,
+                        help="Number of runs per script (the median time is reported)")
+    args = parser.parse_args()
+
+    # Calculate the path to the solve-it directory relative to this script
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    solve_it_root = os.path.dirname(script_dir)  # Go up from benchmarks to solve-it root
+
+    print('Script\tMedian s\tBytes\tcellXfs\tfonts\tfills\tborders\tFormats created')
+    with tempfile.TemporaryDirectory() as tmp:
+        for script, out_name, extra_args in SCRIPTS:
+            out_path = os.path.join(tmp, out_name)
+            timings = []
+            for _ in range(args.repeat):
+                elapsed, formats_created = run_script(solve_it_root, script, out_path, extra_args)
+                timings.append(elapsed)
+            counts = style_counts(out_path)
+            print('{}\t{:.2f}\t{}\t{}\t{}\t{}\t{}\t{}'.format(script, statistics.median(timings),
+                                                           os.path.getsize(out_path), counts['cellXfs'],
+                                                           counts['fonts'], counts['fills'], counts['borders'],
+                                                           formats_created))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
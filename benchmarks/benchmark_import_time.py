@@ -0,0 +1,112 @@
+"""
+SOLVE-IT Import Time Benchmark
+
+This script measures how long importing the library and starting the reporting
+scripts takes, by running each scenario in a fresh interpreter with
+`python -X importtime` and parsing the per-module timings it prints. For each
+scenario it reports:
+
+- the total import time (sum of the cumulative time of top-level imports)
+- the number of modules imported
+- the slowest top-level imports
+
+Heavy optional dependencies (pydantic, xlsxwriter, asyncio) must not be imported
+by scenarios that do not need them. The script exits with status 1 if a
+scenario imports one of its forbidden modules, or if --budget_ms is given and a
+scenario's median import time exceeds it, so it can guard against regressions.
+
+The script can be used directly from the command line
+
+"""
+
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+import os
+
+# Calculate the path to the solve-it directory relative to this script
+SOLVE_IT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (label, interpreter arguments, modules that must not be imported)
+SCENARIOS = [
+    ('import solve_it_library', ['-c', 'import solve_it_library'],
+     ['pydantic', 'xlsxwriter', 'asyncio']),
+    ('import KnowledgeBase', ['-c', 'from solve_it_library import KnowledgeBase'],
+     ['pydantic', 'xlsxwriter', 'asyncio']),
+    ('generate_excel_from_kb.py --help', [os.path.join('reporting_scripts', 'generate_excel_from_kb.py'), '--help'],
+     ['pydantic', 'xlsxwriter']),
+    ('generate_evaluation.py --help', [os.path.join('reporting_scripts', 'generate_evaluation.py'), '--help'],
+     ['pydantic', 'xlsxwriter']),
+    ('generate_stat_summary.py', [os.path.join('reporting_scripts', 'generate_stat_summary.py')],
+     ['pydantic', 'xlsxwriter']),
+]
+
+# e.g. "import time:       415 |      28020 |     pydantic"
+IMPORT_TIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)\s*$')
+
+
+def parse_import_times(stderr):
+    """
+    Parses `-X importtime` output.
+
+    Returns:
+        list: (module name, self microseconds, cumulative microseconds, nesting depth) tuples.
+    """
+    entries = []
+    for line in stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            depth = (len(match.group(3)) - 1) // 2
+            entries.append((match.group(4), int(match.group(1)), int(match.group(2)), depth))
+    return entries
+
+
+def run_scenario(arguments):
+    """Runs one scenario in a fresh interpreter and returns its parsed import times"""
+    result = subprocess.run([sys.executable, '-X', 'importtime'] + arguments, cwd=SOLVE_IT_ROOT,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    return parse_import_times(result.stderr)
+
+
+def main():
+    """Command-line entry point for the script."""
+    parser = argparse.ArgumentParser(description="Measure import time of the library and reporting scripts")
+    parser.add_argument('--repeat', '-r', action='store', type=int, default=5,
+                        help="Number of runs per scenario (the median is reported)")
+    parser.add_argument('--top', '-t', action='store', type=int, default=3,
+                        help="Number of slowest top-level imports to list per scenario")
+    parser.add_argument('--budget_ms', '-b', action='store', type=float, default=None,
+                        help="Fail if a scenario's median import time exceeds this many milliseconds")
+    args = parser.parse_args()
+
+    failures = []
+    print('Scenario\tImport ms (median)\tModules\tSlowest top-level imports')
+    for label, arguments, forbidden in SCENARIOS:
+        totals = []
+        entries = []
+        for _ in range(max(1, args.repeat)):
+            entries = run_scenario(arguments)
+            totals.append(sum(cumulative for _, _, cumulative, depth in entries if depth == 0) / 1000)
+        total = statistics.median(totals)
+
+        top_level = sorted((entry for entry in entries if entry[3] == 0), key=lambda entry: entry[2], reverse=True)
+        slowest = ', '.join('{} {:.1f}'.format(name, cumulative / 1000)
+                            for name, _, cumulative, _ in top_level[:args.top])
+        print('{}\t{:.1f}\t{}\t{}'.format(label, total, len(entries), slowest))
+
+        imported = {name.split('.')[0] for name, _, _, _ in entries}
+        for module in forbidden:
+            if module in imported:
+                failures.append('{}: imports {}'.format(label, module))
+        if args.budget_ms is not None and total > args.budget_ms:
+            failures.append('{}: {:.1f} ms exceeds budget of {:.1f} ms'.format(label, total, args.budget_ms))
+
+    for failure in failures:
+        print('FAIL: {}'.format(failure))
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""
+SOLVE-IT Load Benchmark
+
+This script compares the ways of validating and loading the knowledge base:
+
+- validation only (records already decoded in memory):
+    - model_validate() and model_dump() per record (the previous approach)
+    - batched validation with one TypeAdapter call per collection
+    - trusted normalisation (no validation)
+- full KnowledgeBase construction:
+    - default (batched validation)
+    - trusted=True
+    - lazy=True
+    - from a data pack (built in a temporary directory)
+
+Median times over several runs are reported as TSV.
+
+The script can be used directly from the command line
+
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import os
+import tempfile
+import time
+import logging
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from solve_it_library import KnowledgeBase
+from solve_it_library.data_pack import build_pack
+from solve_it_library.record_validation import get_model, validate_records, normalise_records
+
+# Configure logging to show errors to console
+logging.basicConfig(level=logging.ERROR, format='ERROR: %(message)s')
+
+COLLECTIONS = [('techniques', 'Technique'), ('weaknesses', 'Weakness'), ('mitigations', 'Mitigation')]
+
+
+def time_ms(function, repeat):
+    """Returns the median run time of a function in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def read_raw_records(solve_it_root):
+    """Decodes every record file, keyed by model name"""
+    raw = {}
+    for directory_name, model_name in COLLECTIONS:
+        directory_path = os.path.join(solve_it_root, 'data', directory_name)
+        raw[model_name] = []
+        for filename in sorted(os.listdir(directory_path)):
+            if filename.lower().endswith('.json'):
+                with open(os.path.join(directory_path, filename), encoding='utf-8') as f:
+                    raw[model_name].append(json.load(f))
+    return raw
+
+
+def main():
+    """Command-line entry point for the script."""
+    parser = argparse.ArgumentParser(description="Compare validation and loading modes of the knowledge base")
+    parser.add_argument('--repeat', '-r', action='store', type=int, default=10,
+                        help="Number of runs per measurement (the median is reported)")
+    args = parser.parse_args()
+
+    # Calculate the path to the solve-it directory relative to this script
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    solve_it_root = os.path.dirname(script_dir)  # Go up from benchmarks to solve-it root
+
+    raw = read_raw_records(solve_it_root)
+    sources = {model_name: ['record %d' % i for i in range(len(records))] for model_name, records in raw.items()}
+
+    def per_record():
+        for model_name, records in raw.items():
+            model_class = get_model(model_name)
+            for record in records:
+                model_class.model_validate(record).model_dump()
+
+    def batched():
+        for model_name, records in raw.items():
+            validate_records(model_name, records, sources[model_name])
+
+    def trusted():
+        for model_name, records in raw.items():
+            normalise_records(model_name, records, sources[model_name])
+
+    print('Measurement\tMedian ms')
+    print('validate: model_validate + model_dump per record\t{:.2f}'.format(time_ms(per_record, args.repeat)))
+    print('validate: batched TypeAdapter\t{:.2f}'.format(time_ms(batched, args.repeat)))
+    print('validate: trusted (normalise only)\t{:.2f}'.format(time_ms(trusted, args.repeat)))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pack_path = os.path.join(tmp, 'solve-it.pack')
+        build_pack(KnowledgeBase(solve_it_root, 'solve-it.json'), pack_path)
+        for label, options in [('default', {}), ('trusted=True', {'trusted': True}), ('lazy=True', {'lazy': True}),
+                               ('data_pack', {'data_pack': pack_path})]:
+            elapsed = time_ms(lambda: KnowledgeBase(solve_it_root, 'solve-it.json', **options), args.repeat)
+            print('load: KnowledgeBase {}\t{:.2f}'.format(label, elapsed))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
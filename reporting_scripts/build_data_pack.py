@@ -0,0 +1,47 @@
+"""
+SOLVE-IT Data Pack Builder
+
+This script packs the techniques, weaknesses, mitigations and objective mappings
+in the data directory into a single data pack file, which can be loaded with
+KnowledgeBase(base_path, data_pack='solve-it.pack') without reading the JSON files.
+
+The script can be used directly from the command line
+
+"""
+
+import argparse
+import sys
+import os
+import logging
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from solve_it_library import KnowledgeBase
+from solve_it_library.data_pack import build_pack
+
+# Configure logging to show errors to console
+logging.basicConfig(level=logging.ERROR, format='ERROR: %(message)s')
+
+
+def main():
+    """Command-line entry point for the script."""
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description="Build a single-file data pack from the SOLVE-IT data directory")
+    parser.add_argument('-o', action='store', type=str, dest='output_file', default='solve-it.pack',
+                        help="Output filename for the data pack")
+    args = parser.parse_args()
+
+    # Calculate the path to the solve-it directory relative to this script
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    solve_it_root = os.path.dirname(script_dir)  # Go up from reporting_scripts to solve-it root
+
+    kb = KnowledgeBase(solve_it_root, 'solve-it.json')
+    summary = build_pack(kb, args.output_file)
+
+    print("Data pack written to {}".format(args.output_file))
+    for key, value in summary.items():
+        print("{}\t{}".format(key, value))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""
+SOLVE-IT Objective Mapping Comparison
+
+This script compares the objective mappings in the data folder (solve-it.json,
+carrier.json, dfrws.json, ...) and prints, as TSV or JSON:
+
+    - the objectives each technique belongs to in every mapping
+    - the techniques each mapping leaves out
+    - the Jaccard overlap of the mappings and of each pair of their objectives
+
+Examples:
+    python reporting_scripts/compare_mappings.py
+    python reporting_scripts/compare_mappings.py -m carrier.json -m dfrws.json --json
+
+The script can be used directly from the command line
+
+"""
+
+import argparse
+import json
+import sys
+import os
+import logging
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from solve_it_library import KnowledgeBase
+
+# Configure logging to show errors to console
+logging.basicConfig(level=logging.ERROR, format='ERROR: %(message)s')
+
+
+def print_comparison(kb, comparison):
+    """Prints a mapping comparison to stdout in TSV format"""
+    mappings = comparison.get('mappings')
+    print('ID\tName\t' + '\t'.join(mappings))
+    for technique_id, objectives in comparison.get('matrix').items():
+        print("{}\t{}\t{}".format(technique_id,
+                                  kb.get_technique(technique_id).get('name'),
+                                  '\t'.join('; '.join(objectives.get(mapping_name)) for mapping_name in mappings)))
+
+    print()
+    print('Mapping\tUnmapped techniques\tIDs')
+    for mapping_name, technique_ids in comparison.get('unmapped').items():
+        print("{}\t{}\t{}".format(mapping_name, len(technique_ids), ', '.join(technique_ids)))
+
+    print()
+    print('Mapping A\tMapping B\tObjective A\tObjective B\tShared techniques\tJaccard')
+    for each_overlap in comparison.get('overlap'):
+        mapping_a = each_overlap.get('mapping_a')
+        mapping_b = each_overlap.get('mapping_b')
+        print("{}\t{}\t\t\t\t{}".format(mapping_a, mapping_b, each_overlap.get('jaccard')))
+        for each_pair in each_overlap.get('objectives'):
+            print("{}\t{}\t{}\t{}\t{}\t{}".format(mapping_a, mapping_b,
+                                                  each_pair.get('objective_a'),
+                                                  each_pair.get('objective_b'),
+                                                  each_pair.get('shared'),
+                                                  each_pair.get('jaccard')))
+
+
+def main():
+    """Command-line entry point for the script."""
+    parser = argparse.ArgumentParser(description="Compare the SOLVE-IT objective mappings")
+    parser.add_argument('--mapping', '-m', action='append', type=str,
+                        help="Mapping file to compare (can be repeated). If not given, all mappings are compared.")
+    parser.add_argument('--json', '-j', action='store_true',
+                        help="Print the comparison as JSON")
+    args = parser.parse_args()
+
+    # Calculate the path to the solve-it directory relative to this script
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    solve_it_root = os.path.dirname(script_dir)  # Go up from reporting_scripts to solve-it root
+
+    kb = KnowledgeBase(solve_it_root, 'solve-it.json', trusted=True)
+    try:
+        comparison = kb.compare_mappings(args.mapping)
+    except ValueError as e:
+        print(f"Error: {str(e)}")
+        return 1
+
+    if args.json:
+        print(json.dumps(comparison, indent=2))
+    else:
+        print_comparison(kb, comparison)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
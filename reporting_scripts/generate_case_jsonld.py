@@ -0,0 +1,64 @@
+"""
+SOLVE-IT CASE JSON-LD Exporter
+
+This script exports the SOLVE-IT techniques with their CASE ontology output
+classes as a JSON-LD document, for ingestion into CASE-based tooling. The
+document is streamed to the output one technique at a time.
+
+Examples:
+    python reporting_scripts/generate_case_jsonld.py -o solve-it-case.jsonld
+    python reporting_scripts/generate_case_jsonld.py --classes 'observable:*'
+
+The script can be used directly from the command line
+
+"""
+
+import argparse
+import sys
+import os
+import logging
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from solve_it_library import KnowledgeBase
+
+# Configure logging to show errors to console
+logging.basicConfig(level=logging.ERROR, format='ERROR: %(message)s')
+
+
+def main():
+    """Command-line entry point for the script."""
+    parser = argparse.ArgumentParser(description="Export SOLVE-IT techniques and their CASE output classes as JSON-LD")
+    parser.add_argument('-o', action='store', type=str, dest='output_file',
+                        help="output path for the JSON-LD document (default: stdout).")
+    parser.add_argument('--classes', '-c', action='store', type=str, default=None,
+                        help="only export techniques outputting this class, or a prefix ending in '*' (e.g. 'observable:*').")
+    parser.add_argument('--base_iri', '-b', action='store', type=str, default=None,
+                        help="IRI the technique IDs are appended to (default: 'urn:solve-it:').")
+    parser.add_argument('--compact', action='store_true',
+                        help="write the document without newlines.")
+    args = parser.parse_args()
+
+    # Calculate the path to the solve-it directory relative to this script
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    solve_it_root = os.path.dirname(script_dir)  # Go up from reporting_scripts to solve-it root
+
+    kb = KnowledgeBase(solve_it_root, 'solve-it.json', trusted=True)
+
+    options = {'indent': not args.compact}
+    if args.base_iri is not None:
+        options['base_iri'] = args.base_iri
+    chunks = kb.iter_case_jsonld(args.classes, **options)
+
+    if args.output_file is None:
+        sys.stdout.writelines(chunks)
+    else:
+        out_folder = os.path.dirname(args.output_file)
+        if out_folder and not os.path.exists(out_folder):
+            os.makedirs(out_folder)
+        with open(args.output_file, 'w', encoding='utf-8') as f:
+            f.writelines(chunks)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
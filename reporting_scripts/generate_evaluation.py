@@ -17,13 +17,12 @@ by other Python code.
 import os
 import sys
 import json
-import xlsxwriter
 import argparse
 import logging
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from solve_it_library import KnowledgeBase
-from xlsxwriter.utility import xl_col_to_name
+from solve_it_library.excel_formats import FormatRegistry, RowTemplate, WEAKNESS_CLASS_HEADERS, WEAKNESS_CLASS_FIELDS
 
 # Configure logging to show info and errors to console
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
@@ -94,7 +93,9 @@ def generate_evaluation(techniques=None, lab_config=None, output_file=None, labe
         except Exception as e:
             raise ValueError(f"Error loading lab config file: {str(e)}")
 
-    # Create the workbook
+    # Create the workbook (xlsxwriter is imported here, as it is slow to import)
+    import xlsxwriter
+    from xlsxwriter.utility import xl_col_to_name
     workbook = xlsxwriter.Workbook(output_file)
     workbook.set_size(2000, 1024)
     main_worksheet = workbook.add_worksheet(name='Main')
@@ -105,57 +106,31 @@ def generate_evaluation(techniques=None, lab_config=None, output_file=None, labe
 
     # Define various cell formats for different parts of the spreadsheet
     # Each format controls appearance aspects like alignment, text wrapping,
-    # borders, colors, and font styles
-    
+    # borders, colors, and font styles. Formats come from a registry, so each
+    # distinct style is only created once.
+    formats = FormatRegistry(workbook)
+
     # Primary header format for column titles
-    header_type_format = workbook.add_format()
-    header_type_format.set_align('center')
-    header_type_format.set_align('vcenter')
-    header_type_format.set_text_wrap(True)
-    header_type_format.set_bold(True)
+    header_type_format = formats['header']
 
     # Header format that is left aligned
-    header_type_format_left = workbook.add_format()
-    header_type_format_left.set_align('left')
-    header_type_format_left.set_align('vcenter')
-    header_type_format_left.set_text_wrap(True)
-    header_type_format_left.set_bold(True)
-
+    header_type_format_left = formats['header_left']
 
     # Set format for header
-    header_small_format = workbook.add_format()
-    header_small_format.set_align('center')
-    header_small_format.set_align('vcenter')
-    header_small_format.set_text_wrap(True)
-    header_small_format.set_bold(True)
-    header_small_format.set_font_size(9)
+    header_small_format = formats['header_small']
 
     # Set format for centralised x marks
-    weakness_type_format = workbook.add_format()
-    weakness_type_format.set_align('center')
-    weakness_type_format.set_align('vcenter')
+    weakness_type_format = formats['weakness_type']
 
     # Set format for blanked out bits
-    blank_grey_format = workbook.add_format()
-    blank_grey_format.set_align('center')
-    blank_grey_format.set_align('vcenter')
-    blank_grey_format.set_bg_color('#a9a9a9')
-
-    # Set format a blank cell
-    blank_white_format = workbook.add_format()
-    blank_white_format.set_align('center')
-    blank_white_format.set_align('vcenter')
+    blank_grey_format = formats['blank_grey']
 
     # Set format for mitigation cell to complete
-    blank_white_format.set_border(style=1)
-    blank_white_format.set_border_color('blue')
-    blank_white_format.set_bg_color('#ffffff')
+    blank_white_format = formats.get(align='center', valign='vcenter', border=1, border_color='blue',
+                                     bg_color='#ffffff')
 
     # Set format for wrapped title
-    wrapped_title = workbook.add_format()
-    wrapped_title.set_align('center')
-    wrapped_title.set_align('vcenter')
-    wrapped_title.set_text_wrap(True)
+    wrapped_title = formats.get(align='center', valign='vcenter', text_wrap=True)
 
     # ----------------------------------------
     # Setup workbook layout with column headers and formatting
@@ -164,21 +139,16 @@ def generate_evaluation(techniques=None, lab_config=None, output_file=None, labe
     # Set width for the weakness description column (needs to be wide)
     main_worksheet.set_column(1, 1, 140)
 
-    main_worksheet.write_string(0, 1, "Potential Weaknesses", header_type_format)
-    main_worksheet.write_string(0, 2, "INCOMP", header_type_format)
-    main_worksheet.write_string(0, 3, "INAC-EX", header_type_format)
-    main_worksheet.write_string(0, 4, "INAC-AS", header_type_format)
-    main_worksheet.write_string(0, 5, "INAC-ALT", header_type_format)
-    main_worksheet.write_string(0, 6, "INAC-COR", header_type_format)
-    main_worksheet.write_string(0, 7, "MISINT", header_type_format)
+    main_worksheet.write_row(0, 1, ["Potential Weaknesses"] + WEAKNESS_CLASS_HEADERS, header_type_format)
     # main_worksheet.write_string(0, 8, "Mitigations", header_type_format) # written later now as merged cell
 
-    main_worksheet.write_string(1, 2, "Relevant information has not been acquired or found", header_small_format)
-    main_worksheet.write_string(1, 3, "Do all artefacts reported as present actually exist", header_small_format)
-    main_worksheet.write_string(1, 4, "For every set of items identified by a given tool, is each item truly part of that set", header_small_format)
-    main_worksheet.write_string(1, 5, "Does a tool alter data in a way that changes its meaning?", header_small_format)
-    main_worksheet.write_string(1, 6, "Does the forensic tool detect and compensate for missing and corrupted data", header_small_format)
-    main_worksheet.write_string(1, 7, "The results are displayed in a manner that encourages, or does not prevent misinterpretation", header_small_format)
+    main_worksheet.write_row(1, 2, ["Relevant information has not been acquired or found",
+                                    "Do all artefacts reported as present actually exist",
+                                    "For every set of items identified by a given tool, is each item truly part of that set",
+                                    "Does a tool alter data in a way that changes its meaning?",
+                                    "Does the forensic tool detect and compensate for missing and corrupted data",
+                                    "The results are displayed in a manner that encourages, or does not prevent misinterpretation"],
+                             header_small_format)
 
     # Write mitigations top header
     max_mits = kb.get_max_mitigations_per_technique()
@@ -191,23 +161,9 @@ def generate_evaluation(techniques=None, lab_config=None, output_file=None, labe
         main_worksheet.set_column(8 + i, 8 + i, 12)     # set width of mitigations columns
 
     # Write column headings for totals Y. N etc.
-    main_worksheet.write_string(0, 8 + max_mits + 0, "Y", header_type_format)
-    main_worksheet.write_string(0, 8 + max_mits + 1, "N", header_type_format)
-    main_worksheet.write_string(0, 8 + max_mits + 2, "-", header_type_format)
-    main_worksheet.write_string(0, 8 + max_mits + 3, "NA", header_type_format)
-    main_worksheet.write_string(0, 8 + max_mits + 4, "Max", header_type_format)
-    main_worksheet.write_string(0, 8 + max_mits + 5, "Met", header_type_format)
-    main_worksheet.write_string(0, 8 + max_mits + 6, "Status", header_type_format)
-    main_worksheet.write_string(0, 8 + max_mits + 7, "s1", header_type_format)
-    main_worksheet.write_string(0, 8 + max_mits + 8, "f1", header_type_format)
-    main_worksheet.write_string(0, 8 + max_mits + 9, "d1", header_type_format)
-    main_worksheet.write_string(0, 8 + max_mits + 10, "t1", header_type_format)
-    main_worksheet.write_string(0, 8 + max_mits + 11, "s2", header_type_format)
-    main_worksheet.write_string(0, 8 + max_mits + 12, "f2", header_type_format)
-    main_worksheet.write_string(0, 8 + max_mits + 13, "d2", header_type_format)
-    main_worksheet.write_string(0, 8 + max_mits + 14, "t2", header_type_format)
-
-    main_worksheet.write_string(0, 8 + max_mits + 15, "Notes", header_type_format)
+    main_worksheet.write_row(0, 8 + max_mits, ["Y", "N", "-", "NA", "Max", "Met", "Status",
+                                               "s1", "f1", "d1", "t1", "s2", "f2", "d2", "t2", "Notes"],
+                             header_type_format)
 
     # Format the size of the extra columns at the end
     main_worksheet.set_column(8 + max_mits + 0, 8 + max_mits + 15, 4)
@@ -231,6 +187,12 @@ def generate_evaluation(techniques=None, lab_config=None, output_file=None, labe
     # Generate content for each technique
     # ----------------------------------------
 
+    # Rows repeated for every technique and weakness
+    grey_divider_row = RowTemplate.blank(8 + max_mits, blank_grey_format)
+    weakness_types_header_row = RowTemplate(WEAKNESS_CLASS_HEADERS, header_type_format)
+    # mask out whole grid grey for mitigations (visual cue for cells not applicable to this weakness)
+    mitigations_mask_row = RowTemplate.blank(max_mits, blank_grey_format)
+
     technique_log_list = []
     weakness_log_list = []
     mitigation_log_list = []
@@ -246,8 +208,7 @@ def generate_evaluation(techniques=None, lab_config=None, output_file=None, labe
             continue
             
         # Add a grey divider row
-        for i in range(0, 8 + max_mits):
-            main_worksheet.write_string(start_pos, i, '', cell_format=blank_grey_format)
+        grey_divider_row.write(main_worksheet, start_pos)
         start_pos += 1
 
         if labels is None: 
@@ -265,12 +226,7 @@ def generate_evaluation(techniques=None, lab_config=None, output_file=None, labe
         main_worksheet.write_string(start_pos, 1, technique_header_str, header_type_format_left)
 
         # Write the headers for INCOMP etc. each time...
-        main_worksheet.write_string(start_pos, 2, "INCOMP", header_type_format)
-        main_worksheet.write_string(start_pos, 3, "INAC-EX", header_type_format)
-        main_worksheet.write_string(start_pos, 4, "INAC-AS", header_type_format)
-        main_worksheet.write_string(start_pos, 5, "INAC-ALT", header_type_format)
-        main_worksheet.write_string(start_pos, 6, "INAC-COR", header_type_format)
-        main_worksheet.write_string(start_pos, 7, "MISINT", header_type_format)
+        weakness_types_header_row.write(main_worksheet, start_pos, 2)
 
         # Write all the mitigation titles
         mit_index = {}
@@ -286,23 +242,13 @@ def generate_evaluation(techniques=None, lab_config=None, output_file=None, labe
             weakness_info = kb.get_weakness(each_weakness)
             main_worksheet.write_string(start_pos + 1, 0, "{}".format(each_weakness))
             main_worksheet.write_string(start_pos + 1, 1, "{}".format(weakness_info.get('name')))
-            main_worksheet.write_string(start_pos + 1, 2, weakness_info.get('INCOMP', ''),
-                                      cell_format=weakness_type_format)
-            main_worksheet.write_string(start_pos + 1, 3, weakness_info.get('INAC_EX', ''),
-                                      cell_format=weakness_type_format)
-            main_worksheet.write_string(start_pos + 1, 4, weakness_info.get('INAC_AS', ''),
-                                      cell_format=weakness_type_format)
-            main_worksheet.write_string(start_pos + 1, 5, weakness_info.get('INAC_ALT', ''),
-                                      cell_format=weakness_type_format)
-            main_worksheet.write_string(start_pos + 1, 6, weakness_info.get('INAC_COR', ''),
-                                      cell_format=weakness_type_format)
-            main_worksheet.write_string(start_pos + 1, 7, weakness_info.get('MISINT', ''),
-                                      cell_format=weakness_type_format)
+            main_worksheet.write_row(start_pos + 1, 2,
+                                     [weakness_info.get(field, '') for field in WEAKNESS_CLASS_FIELDS],
+                                     weakness_type_format)
 
             # Now do the mitigations for this weakness
-            # First mask out whole grid grey for mitigations (visual cue for cells not applicable to this weakness)
-            for i in range(0, max_mits):
-                main_worksheet.write_string(start_pos + 1, 8 + i, '', cell_format=blank_grey_format)
+            # First mask out whole grid grey for mitigations
+            mitigations_mask_row.write(main_worksheet, start_pos + 1, 8)
 
             # For each mitigation that applies to the current weakness:
             # - Write a white cell with dropdown selection options (Y/N/NA)
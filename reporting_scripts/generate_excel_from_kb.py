@@ -1,5 +1,19 @@
+"""
+SOLVE-IT Excel Generator
+
+This script generates an Excel version of the SOLVE-IT knowledge base: a 'Main'
+sheet laying the techniques out by objective, summary sheets for techniques,
+weaknesses and mitigations, and one sheet per technique.
+
+With --shard, the output is split instead into one workbook per objective
+(holding that objective's technique sheets) plus an index workbook with the
+'Main' layout and summary sheets. Links between workbooks are external
+hyperlinks, so the files must be kept in the same folder. The shards are
+written in parallel processes (--jobs).
+
+The script can be used directly from the command line
+"""
 import os
-import xlsxwriter
 import sys
 import datetime
 import argparse
@@ -8,18 +22,23 @@ import pprint
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from solve_it_library import KnowledgeBase
+from solve_it_library.excel_formats import (FormatRegistry, RowTemplate, SheetTemplate,
+                                            WEAKNESS_CLASS_HEADERS, WEAKNESS_CLASS_FIELDS)
+from solve_it_library.weakness_classes import WEAKNESS_CLASS_BITS
 
 # Configure logging to show info and errors to console
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 
-def format_headings_in_workbook(workbook, tactics):
-    header_format = workbook.add_format()
-    header_format.set_bold()
-    header_format.set_align('vcenter')
-    header_format.set_align('center')
-    header_format.set_border(style=1)
-    header_format.set_text_wrap()
-    header_format.set_bg_color('#b5b8b7')
+# Order of the weakness class columns in the 'all weaknesses' worksheet
+SUMMARY_WEAKNESS_CLASSES = ['INCOMP', 'INAC-EX', 'INAC-ALT', 'INAC-AS', 'INAC-COR', 'MISINT']
+
+# Knowledge base loaded once by each shard worker process
+_worker_kb = None
+
+
+def format_headings_in_workbook(workbook, tactics, formats):
+    header_format = formats.get(bold=True, align='center', valign='vcenter', border=1, text_wrap=True,
+                                bg_color='#b5b8b7')
 
     worksheet = workbook.get_worksheet_by_name('Main')
 
@@ -28,8 +47,8 @@ def format_headings_in_workbook(workbook, tactics):
     worksheet.set_column(0, len(tactics), 20)
 
     # write headers
+    worksheet.write_row(0, 0, [tactic.get('name') for tactic in tactics], header_format)
     for i in range(0,len(tactics)):
-        worksheet.write_string(0, i, tactics[i].get('name'), header_format)
         worksheet.write_comment(0, i, tactics[i].get('description'), {'font_size': 12, 'width': 200, 'height': 200})
 
     return workbook
@@ -39,62 +58,67 @@ def format_techinque_sheet(worksheet):
     return worksheet
 
 
-if __name__ == '__main__':
-
-    """Command-line entry point for the script."""
-    # Parse command line arguments
-    parser = argparse.ArgumentParser(description="Generate an Excel version of the SOLVE-IT knowledge base")
-    parser.add_argument('-o', action='store', type=str, dest='output_file',
-                        help="output path for spreadsheet.")
-    args = parser.parse_args()
-
-
-    # Replace technique organisation configuration file here if needed
-    config_file = 'solve-it.json'
-
-    # Calculate the path to the solve-it directory relative to this script
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    solve_it_root = os.path.dirname(script_dir)  # Go up from reporting_scripts to solve-it root
-    
-    kb = KnowledgeBase(solve_it_root, config_file)
-
-    print("Using configuration file: {}".format(config_file))
-
-    tactics_name_list = kb.list_tactics()
-
-    # Determine and if necessary create output folder path
-    if args.output_file is not None:
-        out_folder = os.path.dirname(args.output_file)
-        if not os.path.exists(out_folder):
-            os.makedirs(out_folder)
-        outpath = args.output_file
-    else:
-        if not os.path.exists('output'):
-            os.mkdir('output')
-        outpath = os.path.join('output', 'solve-it.xlsx')
-
-
-    print("Output will be to: {}".format(outpath))
-
-    workbook = xlsxwriter.Workbook(outpath)
-
-    # Create all the worksheets
-    print('Creating worksheets...')
-
-    workbook.add_worksheet(name='Main')
-    workbook.set_size(2000, 1024)
-    format_headings_in_workbook(workbook, kb.tactics)
-    print("- added 'main' worksheet")
-
-    info_sheet = workbook.add_worksheet(name='Info')
-    techniques_sheet = workbook.add_worksheet(name='Techniques')
-    weaknesses_sheet = workbook.add_worksheet(name='Weaknesses')
-    mitigations_sheet = workbook.add_worksheet(name='Mitigations')
-
-    for each_technique_id in sorted(kb.list_techniques()):
-        technique_name = kb.get_technique(each_technique_id).get('name')
-        workbook.add_worksheet(each_technique_id)
-
+def internal_link(technique_id):
+    """Returns the hyperlink to a technique sheet in the same workbook"""
+    return 'internal:{}!A1'.format(technique_id)
+
+
+def shard_link(shard_files, current_file):
+    """
+    Returns a function giving the hyperlink to a technique sheet from the workbook current_file:
+    internal if the technique has a sheet there, otherwise external to the shard that holds it.
+    """
+    def link(technique_id):
+        target = shard_files.get(technique_id, current_file)
+        if target == current_file:
+            return internal_link(technique_id)
+        return 'external:{}#{}!A1'.format(target, technique_id)
+    return link
+
+
+def create_formats(workbook):
+    """Returns the formats and technique sheet template used by the workbook (one set per workbook)"""
+    # every format is taken from the registry, so each distinct style is created once
+    formats = FormatRegistry(workbook)
+
+    styles = {
+        'formats': formats,
+        # set format for techniques in main
+        'technique': formats.get(bold=False, align='center', valign='vcenter', border=1, text_wrap=True,
+                                 bg_color="#F3F3F3"),
+        # Set format to see which ones have some content populated
+        'technique_with_weaknesses': formats.get(bold=False, align='center', valign='vcenter', border=1,
+                                                 text_wrap=True, bg_color="#E9E9E9"),
+        # subtechqniue format 1
+        'subtechnique': formats.get(bold=False, align='center', valign='vcenter', border=1, text_wrap=True,
+                                    indent=3),
+        # set format for centralised x marks
+        'weakness_type': formats['weakness_type'],
+        # formats for the individual technique sheets
+        'technique_list': formats['wrapped_text'],
+        'bold': formats['bold_wrap'],
+    }
+
+    # fixed layout of every individual technique sheet: column widths, labels and the weakness table header
+    technique_sheet_template = SheetTemplate()
+    technique_sheet_template.set_column(0, 0, 20)
+    technique_sheet_template.set_column(1, 1, 50)
+    technique_sheet_template.set_column(8, 8, 30)
+    technique_sheet_template.set_column(9, 9, 140, None, {'hidden': True})
+    technique_sheet_template.add(0, 0, RowTemplate(['Technique name: ', 'Technique ID: ', 'Category: ',
+                                                    'Description: ', 'Synonyms: ', 'Details: ', 'Subtechniques: ',
+                                                    'CASE output entities: ', 'Examples: '],
+                                                   styles['bold'], vertical=True))
+    technique_sheet_template.add(10, 0, RowTemplate(['Potential Weaknesses:'], styles['bold']))
+    technique_sheet_template.add(11, 0, RowTemplate(['Weakness ID:', 'Detail:'] + WEAKNESS_CLASS_HEADERS +
+                                                    ['Potential Mitigations', 'Potential Mitigations (details)'],
+                                                    styles['bold']))
+    styles['technique_sheet'] = technique_sheet_template
+    return styles
+
+
+def write_summary_sheets(kb, techniques_sheet, weaknesses_sheet, mitigations_sheet):
+    """Populates the 'Techniques', 'Weaknesses' and 'Mitigations' worksheets"""
     for i, each_technique in enumerate(sorted(kb.list_techniques())):
         techniques_sheet.write_string(i, 0, each_technique)
         techniques_sheet.write_string(i, 1, kb.get_technique(each_technique).get('name'))
@@ -104,17 +128,14 @@ if __name__ == '__main__':
         for each_weakness in kb.get_technique(each_technique).get('weaknesses', []):
             weakness_obj = kb.get_weakness(each_weakness)
             if weakness_obj is None:
-                logging.error(
-                    f'Weakness {each_weakness} not found for technique {each_technique} - Excel generation failed')
-                sys.exit(-1)
-            else:
-                total_mits += len(weakness_obj.get('mitigations', []))
+                raise ValueError(f'Weakness {each_weakness} not found for technique {each_technique}')
+            total_mits += len(weakness_obj.get('mitigations', []))
 
         techniques_sheet.write_number(i, 3, total_mits)
-        techniques_sheet.write_string(0, 2, "Weaknesses")
-        techniques_sheet.write_string(0, 3, "Mitigations")
 
-    print("- populated 'all techniques' worksheet")
+    techniques_sheet.write_row(0, 2, ["Weaknesses", "Mitigations"])
+
+    print("- populated 'Techniques' worksheet")
 
     for i, each_weakness in enumerate(sorted(kb.list_weaknesses())):
         weaknesses_sheet.write_string(i+1, 0, each_weakness)
@@ -126,33 +147,16 @@ if __name__ == '__main__':
         technique_ids = [t['id'] for t in techniques_for_weakness]
         weaknesses_sheet.write_string(i + 1, 4, str(technique_ids))
 
-        if kb.get_weakness(each_weakness).get('INCOMP') in ['x', 'X']:
-            weaknesses_sheet.write_string(i + 1, 5, 'X')
-        if kb.get_weakness(each_weakness).get('INAC_EX') in ['x', 'X']:
-            weaknesses_sheet.write_string(i + 1, 6, 'X')
-        if kb.get_weakness(each_weakness).get('INAC_ALT') in ['x', 'X']:
-            weaknesses_sheet.write_string(i + 1, 7, 'X')
-        if kb.get_weakness(each_weakness).get('INAC_AS') in ['x', 'X']:
-            weaknesses_sheet.write_string(i + 1, 8, 'X')
-        if kb.get_weakness(each_weakness).get('INAC_COR') in ['x', 'X']:
-            weaknesses_sheet.write_string(i + 1, 9, 'X')
-        if kb.get_weakness(each_weakness).get('MISINT') in ['x', 'X']:
-            weaknesses_sheet.write_string(i + 1, 10, 'X')
+        weakness_classes = kb.get_weakness_class_mask(each_weakness)
+        for column, class_name in enumerate(SUMMARY_WEAKNESS_CLASSES, start=5):
+            if weakness_classes & WEAKNESS_CLASS_BITS[class_name]:
+                weaknesses_sheet.write_string(i + 1, column, 'X')
 
     # write some headers for weakness sheet
-    weaknesses_sheet.write_string(0, 0, "ID")
-    weaknesses_sheet.write_string(0, 1, "Description")
-    weaknesses_sheet.write_string(0, 2, "Mitigations")
-    weaknesses_sheet.write_string(0, 3, "Has none")
-    weaknesses_sheet.write_string(0, 4, "In technique")
-    weaknesses_sheet.write_string(0, 5, "INCOMP")
-    weaknesses_sheet.write_string(0, 6, "INAC-EX")
-    weaknesses_sheet.write_string(0, 7, "INAC-ALT")
-    weaknesses_sheet.write_string(0, 8, "INAC-AS")
-    weaknesses_sheet.write_string(0, 9, "INAC-COR")
-    weaknesses_sheet.write_string(0, 10, "MISINT")
-
-    print("- populated 'all weaknesses' worksheet")
+    weaknesses_sheet.write_row(0, 0, ["ID", "Description", "Mitigations", "Has none", "In technique"] +
+                               SUMMARY_WEAKNESS_CLASSES)
+
+    print("- populated 'Weaknesses' worksheet")
 
     for i, each_mitigation in enumerate(sorted(kb.list_mitigations())):
         mitigations_sheet.write_string(i+1, 0, each_mitigation)
@@ -160,70 +164,48 @@ if __name__ == '__main__':
         techniques_for_mitigation = kb.get_techniques_for_mitigation(each_mitigation)
         technique_ids = [t['id'] for t in techniques_for_mitigation]
         mitigations_sheet.write_string(i+1, 2, str(technique_ids))
-        
+
         weaknesses_for_mitigation = kb.get_weaknesses_for_mitigation(each_mitigation)
         weakness_ids = [w['id'] for w in weaknesses_for_mitigation]
         mitigations_sheet.write_string(i+1, 3, str(weakness_ids))
         mitigations_sheet.write_number(i + 1, 4, len(weakness_ids))
 
-    # write some headers for weakness sheet
-    mitigations_sheet.write_string(0, 0, "ID")
-    mitigations_sheet.write_string(0, 1, "Description")
-    mitigations_sheet.write_string(0, 2, "In techniques")
-    mitigations_sheet.write_string(0, 3, "In weakness")
-    mitigations_sheet.write_string(0, 4, "Weakness occurrences")
+    # write some headers for mitigation sheet
+    mitigations_sheet.write_row(0, 0, ["ID", "Description", "In techniques", "In weakness", "Weakness occurrences"])
+
+    print("- populated 'Mitigations' worksheet")
 
-    print("- populated 'all techniques' worksheet")
+
+def subtechnique_format(styles, level):
+    """Returns the format of a subtechnique nested level deep in the 'Main' worksheet"""
+    if level == 1:
+        return styles['subtechnique']
+    return styles['formats'].get(bold=False, align='center', valign='vcenter', border=1, text_wrap=True,
+                                 indent=3 * level)
+
+
+def write_main_sheet(kb, main_worksheet, tactics, styles, link=internal_link):
+    """
+    Writes the techniques of each tactic (objective) into its column of the 'Main' worksheet,
+    each linking to its technique sheet.
+
+    Returns:
+        (techniques added, number of techniques with weaknesses)
+    """
+    tactics_name_list = [each_tactic.get('name') for each_tactic in tactics]
 
     # records max row written so far for populating techniques in main
     tactics_row_indexes = {}
-    for each in kb.list_tactics():
+    for each in tactics_name_list:
         tactics_row_indexes[each] = 1
 
-    # set format for techniques in main
-    technique_format = workbook.add_format()
-    technique_format.set_bold(False)
-    technique_format.set_align('vcenter')
-    technique_format.set_align('center')
-    technique_format.set_border(style=1)
-    technique_format.set_text_wrap()
-    technique_format.set_bg_color("#F3F3F3")
-
-    # Set format to see which ones have some content populated
-    technique_format2 = workbook.add_format()
-    technique_format2.set_bold(False)
-    technique_format2.set_align('vcenter')
-    technique_format2.set_align('center')
-    technique_format2.set_text_wrap()
-    technique_format2.set_border(style=1)
-    technique_format2.set_bg_color("#E9E9E9")
-
-    # subtechqniue format 1
-    sub_technique_format1 = workbook.add_format()
-    sub_technique_format1.set_bold(False)
-    sub_technique_format1.set_align('vcenter')
-    sub_technique_format1.set_align('center')
-    sub_technique_format1.set_border(style=1)
-    sub_technique_format1.set_text_wrap()
-    sub_technique_format1.set_indent(3)
-
-
-    # set format for centralised x marks
-    weakness_type_format = workbook.add_format()
-    weakness_type_format.set_align('center')
-    weakness_type_format.set_align('vcenter')
-
-    # -------------------------------------------------------------------------------------------
-
-    print("Updating 'main' worksheet with links to techniques...")
-    main_worksheet = workbook.get_worksheet_by_name('Main')
     main_worksheet.set_default_row(60)
 
     techniques_added = []
 
     total_techniques_with_weaknesses = 0
 
-    for each_tactic in kb.tactics:
+    for each_tactic in tactics:
         tactic = each_tactic.get('name')
         column = tactics_name_list.index(tactic)
 
@@ -240,12 +222,12 @@ if __name__ == '__main__':
                 try:
                     row = tactics_row_indexes[tactic]
                     if len(each_technique['weaknesses']) == 0:
-                        the_format = technique_format
+                        the_format = styles['technique']
                     else:
-                        the_format = technique_format2
+                        the_format = styles['technique_with_weaknesses']
                         total_techniques_with_weaknesses += 1
 
-                    main_worksheet.write_url(row, column, 'internal:{}!A1'.format(each_technique_id),
+                    main_worksheet.write_url(row, column, link(each_technique_id),
                                              string=technique_name + '\n' + each_technique_id,
                                              cell_format=the_format)
                     techniques_added.append(each_technique_id)
@@ -253,21 +235,19 @@ if __name__ == '__main__':
 
                     # check for subtechqniues and do those first before moving on
                     for each_subtechnique_id in subtechniques:
-                        row = tactics_row_indexes[tactic]
-                        each_subtechnique = kb.get_technique(each_subtechnique_id)
-                        if each_subtechnique is None:
+                        if kb.get_technique(each_subtechnique_id) is None:
                             raise ValueError(f'Subtechnqiue {each_subtechnique_id} not found. ({each_technique_id})')
-                            sys.exit(-1)
-
 
-                        main_worksheet.write_url(row, column, 'internal:{}!A1'.format(each_subtechnique.get('id')),
-                                                 string='> ' + each_subtechnique.get('name') + '\n' + each_subtechnique.get('id'),
-                                                 cell_format=sub_technique_format1)
+                    # nested subtechniques follow their parent, one more '>' and indent step per level
+                    top_depth = kb.get_technique_depth(each_technique_id)
+                    for each_subtechnique_id in kb.get_technique_descendants(each_technique_id):
+                        row = tactics_row_indexes[tactic]
+                        each_subtechnique = kb.get_technique(each_subtechnique_id)
+                        level = max(1, kb.get_technique_depth(each_subtechnique_id) - top_depth)
 
-                        if len(each_subtechnique.get('subtechniques')) > 0:
-                            logging.error(f'Nested subtechniques are not currently supported')
-                            logging.error(f"{str(each_subtechnique.get('subtechniques'))}")
-                            sys.exit(-1)
+                        main_worksheet.write_url(row, column, link(each_subtechnique.get('id')),
+                                                 string='>' * level + ' ' + each_subtechnique.get('name') + '\n' + each_subtechnique.get('id'),
+                                                 cell_format=subtechnique_format(styles, level))
 
                         techniques_added.append(each_subtechnique_id)
 
@@ -280,201 +260,123 @@ if __name__ == '__main__':
                     print('Technique {} ({}) had a tactic not found in the tactics ({})'.format(each_technique_id,
                                                                                                 technique_name,
                                                                                                 tactic))
-    print("- 'main' worksheet updated")
-    # ---------------------------------------------------------------------------------------------------------------
-    # check if any are missed from index sheet
+    return techniques_added, total_techniques_with_weaknesses
 
-    for each in kb.list_techniques():
-        if each not in techniques_added and each != "T1000":  # T1000 is demo technique so not expected to be referenced
-            print("WARNING: Technique {} exists, but is not indexed in sheet".format(each))
 
+def write_technique_sheet(kb, worksheet, each_technique_id, styles, link=internal_link):
+    """Writes the details, weaknesses, mitigations and references of one technique to its worksheet"""
+    technique_list_format = styles['technique_list']
+    bold_format = styles['bold']
+
+    technique_name = kb.get_technique(each_technique_id).get('name')
 
+    # find tactics that it belongs to
+    parent_tactics = []
+    for each_tactic in kb.tactics:
+        if each_technique_id in each_tactic.get('techniques'):
+            parent_tactics.append(each_tactic.get('name'))
+
+    styles['technique_sheet'].apply(worksheet)
+    worksheet.write_url(0, 2, 'internal:Main!A1', string='back to main')
+
+    worksheet.write_string(0, 1, technique_name)
+    worksheet.write_string(1, 1, each_technique_id)
+    worksheet.write_string(2, 1, str(parent_tactics))
+
+    description = kb.get_technique(each_technique_id).get('description') or ''
+    worksheet.write_string(3, 1, description, cell_format=technique_list_format)
+    synonyms = kb.get_technique(each_technique_id).get('synonyms') or []
+    worksheet.write_string(4, 1, pprint.pformat(synonyms), cell_format=technique_list_format)
+    details = kb.get_technique(each_technique_id).get('details') or ''
+    worksheet.write_string(5, 1, details, cell_format=technique_list_format)
+    subtechniques = kb.get_technique(each_technique_id).get('subtechniques') or []
+
+    sub_techniques_out = [sub_t + ':' + kb.get_technique(sub_t).get('name') for sub_t in subtechniques]
+    worksheet.write_string(6, 1, pprint.pformat(sub_techniques_out), cell_format=technique_list_format)
+
+    case_output = kb.get_technique(each_technique_id).get('CASE_output_classes') or []
+    worksheet.write_string(7, 1, pprint.pformat(case_output), cell_format=technique_list_format)
+
+    examples = kb.get_technique(each_technique_id).get('examples') or []
+    worksheet.write_string(8, 1, pprint.pformat(examples), cell_format=technique_list_format)
+
+    i = 0
+    mit_list_for_this_technique = []
+    err_list_start_row = 12
+    for each_weakness in kb.get_technique(each_technique_id).get('weaknesses'):
+        weakness_info = kb.get_weakness(each_weakness)
+
+        try:
+            worksheet.write_string(err_list_start_row + i, 0, each_weakness, cell_format=technique_list_format)   # write ID
+            worksheet.write_string(err_list_start_row + i, 1, weakness_info.get('name'), cell_format=technique_list_format)
+            worksheet.write_row(err_list_start_row + i, 2,
+                                [weakness_info.get(field, '') for field in WEAKNESS_CLASS_FIELDS],
+                                styles['weakness_type'])
+        except AttributeError:
+            raise ValueError('Weakness {} not found for technique {}'.format(each_weakness, each_technique_id))
+
+        # Write the mitigations at the end of each weakness
+        mit_string_short = ''
+        mit_string_long = ''
+        for each_mitigation in weakness_info.get('mitigations'):
+            mit_string_short = mit_string_short + f"{each_mitigation}, "
+            mit_string_long = mit_string_long + f"{each_mitigation} ({kb.get_mitigation(each_mitigation).get('name')})\n"
+            mit_list_for_this_technique.append(each_mitigation)
+        worksheet.write_string(err_list_start_row + i, 8, mit_string_short.rstrip(', '), cell_format=technique_list_format)
+        worksheet.write_comment(err_list_start_row + i, 8, mit_string_long.rstrip('\n'), {"font_size": 12, "x_scale": 3.0, "height": len(weakness_info.get('mitigations') * 14 * 3)})
+        # worksheet.write_string(err_list_start_row + i, 9, mit_string_long.rstrip('\n'))
+        i = i+1
+
+    mitigation_start_row = err_list_start_row + i + 1
+    worksheet.write_string(mitigation_start_row, 0, 'Potential Mitigations:', bold_format)
 
     # ----------------------------------------------------------------------------------------------------------------
-    print('Adding the individual techniques sheets...')
-    for each_technique_id in kb.list_techniques():
-        technique_name = kb.get_technique(each_technique_id).get('name')
-
-        # find tactics that it belongs to
-        parent_tactics = []
-        for each_tactic in kb.tactics:
-            if each_technique_id in each_tactic.get('techniques'):
-                parent_tactics.append(each_tactic.get('name'))
-
-        worksheet = workbook.get_worksheet_by_name(each_technique_id)
-
-        technique_list_format = workbook.add_format()
-        technique_list_format.set_text_wrap()
-        technique_list_format.set_align('left')
-        technique_list_format.set_align('vcenter')
-
-        bold_format = workbook.add_format()
-        bold_format.set_bold()
-        bold_format.set_text_wrap()
-
-        worksheet.write_url(0, 2, 'internal:Main!A1', string='back to main')
-
-        worksheet.set_column(0, 0, 20)
-        worksheet.set_column(1, 1, 50)
-        worksheet.set_column(8, 8, 30)
-        worksheet.set_column(9, 9, 140, None, {'hidden': True})
-
-        worksheet.write_string(0, 0, 'Technique name: ', bold_format)
-        worksheet.write_string(0, 1, technique_name)
-        worksheet.write_string(1, 0, 'Technique ID: ', bold_format)
-        worksheet.write_string(1, 1, each_technique_id)
-        worksheet.write_string(2, 0, 'Category: ', bold_format)
-        worksheet.write_string(2, 1, str(parent_tactics))
-
-        worksheet.write_string(3, 0, 'Description: ', bold_format)
-        description = kb.get_technique(each_technique_id).get('description') or ''
-        worksheet.write_string(3, 1, description, cell_format=technique_list_format)
-        worksheet.write_string(4, 0, 'Synonyms: ', bold_format)
-        synonyms = kb.get_technique(each_technique_id).get('synonyms') or []
-        worksheet.write_string(4, 1, pprint.pformat(synonyms), cell_format=technique_list_format)
-        worksheet.write_string(5, 0, 'Details: ', bold_format)
-        details = kb.get_technique(each_technique_id).get('details') or ''
-        worksheet.write_string(5, 1, details, cell_format=technique_list_format)
-        worksheet.write_string(6, 0, 'Subtechniques: ', bold_format)
-        subtechniques = kb.get_technique(each_technique_id).get('subtechniques') or []
-        
-        sub_techniques_out = [sub_t + ':' + kb.get_technique(sub_t).get('name') for sub_t in subtechniques]
-        worksheet.write_string(6, 1, pprint.pformat(sub_techniques_out), cell_format=technique_list_format)
-
-        worksheet.write_string(7, 0, 'CASE output entities: ', bold_format)        
-        case_output = kb.get_technique(each_technique_id).get('CASE_output_classes') or []
-        worksheet.write_string(7, 1, pprint.pformat(case_output), cell_format=technique_list_format)
-
-        worksheet.write_string(8, 0, 'Examples: ', bold_format)
-        examples = kb.get_technique(each_technique_id).get('examples') or []
-        worksheet.write_string(8, 1, pprint.pformat(examples), cell_format=technique_list_format)
-
-        worksheet.write_string(10, 0, 'Potential Weaknesses:', bold_format)
-
-        worksheet.write_string(11, 0, 'Weakness ID:', bold_format)
-        worksheet.write_string(11, 1, 'Detail:', bold_format)
-        worksheet.write_string(11, 2, 'INCOMP', bold_format)
-        worksheet.write_string(11, 3, 'INAC-EX', bold_format)
-        worksheet.write_string(11, 4, 'INAC-AS', bold_format)
-        worksheet.write_string(11, 5, 'INAC-ALT', bold_format)
-        worksheet.write_string(11, 6, 'INAC-COR', bold_format)
-        worksheet.write_string(11, 7, 'MISINT', bold_format)
-        worksheet.write_string(11, 8, 'Potential Mitigations', bold_format)
-        worksheet.write_string(11, 9, 'Potential Mitigations (details)', bold_format)
-
-        i = 0
-        mit_list_for_this_technique = []
-        err_list_start_row = 12
-        for each_weakness in kb.get_technique(each_technique_id).get('weaknesses'):
-            weakness_info = kb.get_weakness(each_weakness)
-
-            try:
-                worksheet.write_string(err_list_start_row + i, 0, each_weakness, cell_format=technique_list_format)   # write ID
-                worksheet.write_string(err_list_start_row + i, 1, weakness_info.get('name'), cell_format=technique_list_format)
-                worksheet.write_string(err_list_start_row + i, 2, weakness_info.get('INCOMP', ''), cell_format=weakness_type_format)
-                worksheet.write_string(err_list_start_row + i, 3, weakness_info.get('INAC_EX', ''), cell_format=weakness_type_format)
-                worksheet.write_string(err_list_start_row + i, 4, weakness_info.get('INAC_AS', ''), cell_format=weakness_type_format)
-                worksheet.write_string(err_list_start_row + i, 5, weakness_info.get('INAC_ALT', ''), cell_format=weakness_type_format)
-                worksheet.write_string(err_list_start_row + i, 6, weakness_info.get('INAC_COR', ''), cell_format=weakness_type_format)
-                worksheet.write_string(err_list_start_row + i, 7, weakness_info.get('MISINT', ''), cell_format=weakness_type_format)
-            except AttributeError:
-                print('attribute error with {} in {}'.format(each_weakness, each_technique_id))
-                quit()
-
-            # Write the mitigations at the end of each weakness
-            mit_string_short = ''
-            mit_string_long = ''
-            for each_mitigation in weakness_info.get('mitigations'):
-                mit_string_short = mit_string_short + f"{each_mitigation}, "  
-                mit_string_long = mit_string_long + f"{each_mitigation} ({kb.get_mitigation(each_mitigation).get('name')})\n"  
-                mit_list_for_this_technique.append(each_mitigation)
-            worksheet.write_string(err_list_start_row + i, 8, mit_string_short.rstrip(', '), cell_format=technique_list_format)
-            worksheet.write_comment(err_list_start_row + i, 8, mit_string_long.rstrip('\n'), {"font_size": 12, "x_scale": 3.0, "height": len(weakness_info.get('mitigations') * 14 * 3)})
-            # worksheet.write_string(err_list_start_row + i, 9, mit_string_long.rstrip('\n'))
-            i = i+1
-
-        mitigation_start_row = err_list_start_row + i + 1
-        worksheet.write_string(mitigation_start_row, 0, 'Potential Mitigations:', bold_format)
-
-        # ----------------------------------------------------------------------------------------------------------------
-        # build list of *all* mitigations for this technique
-        mits_written = []
-        for each_mitigation in mit_list_for_this_technique:
-            if each_mitigation not in mits_written:
-                mits_written.append(each_mitigation)
-
-        # do the write of the full mitigations list
-        i = 1
-        for each_mit in sorted(mits_written):
-            worksheet.write_string(mitigation_start_row + i, 0, each_mit)
-            try:
-                if kb.get_mitigation(each_mit).get('technique') is not None: # there is a link to a technique
-                    cell_str = kb.get_mitigation(each_mit).get('name')  + ' ({})'.format( kb.get_mitigation(each_mit).get('technique'))
-                    worksheet.write_url(mitigation_start_row + i, 1, 'internal:{}!A1'.format(kb.get_mitigation(each_mit).get('technique')),
-                                        string=cell_str,
-                                        cell_format=technique_format)
-                else:
-                    worksheet.write_string(mitigation_start_row + i, 1, kb.get_mitigation(each_mit).get('name'), cell_format=technique_list_format)
-            except AttributeError:
-                print("Mitigation not found '{}'".format(each_mit))
-                quit()
-            mits_written.append(each_mit)
-            i += 1
-
-        # ----------------------------------------------------------------------------------------------------------------
-        #   Write references
-        # ----------------------------------------------------------------------------------------------------------------
-
-        # build big refs dict:
-        references = {}
-        # References from Technique
-        technique_refs = kb.get_technique(each_technique_id).get('references') or []
-        for each_reference in technique_refs:
-            if each_reference in references:
-                if each_technique_id not in references[each_reference]:
-                    references[each_reference].append(each_technique_id)
+    # build list of *all* mitigations for this technique
+    mits_written = []
+    for each_mitigation in mit_list_for_this_technique:
+        if each_mitigation not in mits_written:
+            mits_written.append(each_mitigation)
+
+    # do the write of the full mitigations list
+    i = 1
+    for each_mit in sorted(mits_written):
+        worksheet.write_string(mitigation_start_row + i, 0, each_mit)
+        try:
+            if kb.get_mitigation(each_mit).get('technique') is not None: # there is a link to a technique
+                cell_str = kb.get_mitigation(each_mit).get('name')  + ' ({})'.format( kb.get_mitigation(each_mit).get('technique'))
+                worksheet.write_url(mitigation_start_row + i, 1, link(kb.get_mitigation(each_mit).get('technique')),
+                                    string=cell_str,
+                                    cell_format=styles['technique'])
             else:
-                references[each_reference] = [each_technique_id,]
-
-        # References from weaknesses within technique
-        technique_weaknesses = kb.get_technique(each_technique_id).get('weaknesses', [])
-        for each_weakness_id in technique_weaknesses:
-            weakness_refs = kb.get_weakness(each_weakness_id).get('references') or []
-            for each_reference in weakness_refs:
-                if each_reference in references:
-                    if each_weakness_id not in references[each_reference]:
-                        references[each_reference].append(each_weakness_id)
-                else:
-                    references[each_reference] = [each_weakness_id, ]
-
-        # References from mitigations within technique
-        tech_mits = mits_written
-        for each_mit_id in tech_mits:
-            mitigation_refs = kb.get_mitigation(each_mit_id).get('references') or []
-            for each_reference in mitigation_refs:
-                if each_reference in references:
-                    if each_mit_id not in references[each_reference]:
-                        references[each_reference].append(each_mit_id)
-                else:
-                    references[each_reference] = [each_mit_id,]
-
-
-        # write the header
-        refs_start = mitigation_start_row + i + 2
-        worksheet.write_string(refs_start, 0, 'References:', bold_format)
-        i = 1
-
-        # write the actual references, with indication as to whether they came from T, E or M
-        for each_reference in references:
-            # worksheet.setrow(refs_start+i+1, 100)
-            worksheet.merge_range("B" + str(refs_start+i+1) + ":H" + str(refs_start+i+1), "")
-            worksheet.write_string(refs_start + i, 1, each_reference, cell_format=technique_list_format)
-            worksheet.write_string(refs_start + i, 8, str(references.get(each_reference)), cell_format=technique_list_format)
-            i += 1
-    print("- all individual techniques worksheets updated")
+                worksheet.write_string(mitigation_start_row + i, 1, kb.get_mitigation(each_mit).get('name'), cell_format=technique_list_format)
+        except AttributeError:
+            raise ValueError("Mitigation {} not found for technique {}".format(each_mit, each_technique_id))
+        mits_written.append(each_mit)
+        i += 1
+
+    # ----------------------------------------------------------------------------------------------------------------
+    #   Write references
+    # ----------------------------------------------------------------------------------------------------------------
+
+    # references of the technique, its weaknesses and mitigations, with the IDs citing each
+    references = kb.get_references_for_technique(each_technique_id)
+
+    # write the header
+    refs_start = mitigation_start_row + i + 2
+    worksheet.write_string(refs_start, 0, 'References:', bold_format)
+    i = 1
 
+    # write the actual references, with indication as to whether they came from T, E or M
+    for each_reference in references:
+        # worksheet.setrow(refs_start+i+1, 100)
+        worksheet.merge_range("B" + str(refs_start+i+1) + ":H" + str(refs_start+i+1), "")
+        worksheet.write_string(refs_start + i, 1, each_reference, cell_format=technique_list_format)
+        worksheet.write_string(refs_start + i, 8, str(references.get(each_reference)), cell_format=technique_list_format)
+        i += 1
 
-    # Adds some stats into the workbook
+
+def write_info_sheet(kb, info_sheet, total_techniques_with_weaknesses):
+    """Adds some stats into the workbook"""
     info_sheet.set_column(0, 0, 20)
     info_sheet.set_column(1, 1, 30)
     info_sheet.write_string(0, 0, "Property")
@@ -495,4 +397,246 @@ if __name__ == '__main__':
     info_sheet.write_number(7, 1, round(total_techniques_with_weaknesses / len(kb.list_techniques()), 2))
 
 
+def warn_unindexed(kb, techniques_added):
+    """Warns about techniques that are not in any objective of the mapping"""
+    for each in kb.list_techniques():
+        if each not in techniques_added and each != "T1000":  # T1000 is demo technique so not expected to be referenced
+            print("WARNING: Technique {} exists, but is not indexed in sheet".format(each))
+
+
+def create_index_workbook(kb, outpath):
+    """
+    Creates a workbook with the 'Main' headings and the 'Info' and summary worksheets.
+
+    Returns:
+        (workbook, styles, (main, info, techniques, weaknesses, mitigations worksheets))
+    """
+    # Imported here so that --help and argument errors do not pay for it
+    import xlsxwriter
+    workbook = xlsxwriter.Workbook(outpath)
+    styles = create_formats(workbook)
+
+    # Create all the worksheets
+    print('Creating worksheets...')
+
+    main_worksheet = workbook.add_worksheet(name='Main')
+    workbook.set_size(2000, 1024)
+    format_headings_in_workbook(workbook, kb.tactics, styles['formats'])
+    print("- added 'main' worksheet")
+
+    info_sheet = workbook.add_worksheet(name='Info')
+    techniques_sheet = workbook.add_worksheet(name='Techniques')
+    weaknesses_sheet = workbook.add_worksheet(name='Weaknesses')
+    mitigations_sheet = workbook.add_worksheet(name='Mitigations')
+
+    return workbook, styles, (main_worksheet, info_sheet, techniques_sheet, weaknesses_sheet, mitigations_sheet)
+
+
+def generate_workbook(kb, outpath):
+    """Writes the whole knowledge base to a single workbook, with one sheet per technique"""
+    workbook, styles, sheets = create_index_workbook(kb, outpath)
+    main_worksheet, info_sheet, techniques_sheet, weaknesses_sheet, mitigations_sheet = sheets
+
+    for each_technique_id in sorted(kb.list_techniques()):
+        workbook.add_worksheet(each_technique_id)
+
+    write_summary_sheets(kb, techniques_sheet, weaknesses_sheet, mitigations_sheet)
+
+    print("Updating 'main' worksheet with links to techniques...")
+    techniques_added, total_techniques_with_weaknesses = write_main_sheet(kb, main_worksheet, kb.tactics, styles)
+    print("- 'main' worksheet updated")
+
+    # check if any are missed from index sheet
+    warn_unindexed(kb, techniques_added)
+
+    print('Adding the individual techniques sheets...')
+    for each_technique_id in kb.list_techniques():
+        write_technique_sheet(kb, workbook.get_worksheet_by_name(each_technique_id), each_technique_id, styles)
+    print("- all individual techniques worksheets updated")
+
+    write_info_sheet(kb, info_sheet, total_techniques_with_weaknesses)
+
+    workbook.close()
+
+
+def plan_shards(kb, outpath):
+    """
+    Assigns the techniques to shard workbooks: one per objective of the current mapping, holding its
+    techniques and their (nested) subtechniques, plus one for techniques not in any objective (if there are any).
+
+    Returns:
+        (list of (shard file name, objective, technique IDs), technique ID -> file name of the first
+        shard holding it)
+    """
+    stem = os.path.splitext(os.path.basename(outpath))[0]
+    shards = []
+    shard_files = {}
+    for i, each_tactic in enumerate(kb.tactics):
+        technique_ids = []
+        for each_technique_id in sorted(each_tactic.get('techniques')):
+            technique = kb.get_technique(each_technique_id)
+            if technique is None:
+                continue
+            for each_id in [each_technique_id] + kb.get_technique_descendants(each_technique_id):
+                if each_id not in technique_ids and kb.get_technique(each_id) is not None:
+                    technique_ids.append(each_id)
+        file_name = '{}-{:02d}.xlsx'.format(stem, i + 1)
+        shards.append((file_name, each_tactic, technique_ids))
+        for each_id in technique_ids:
+            shard_files.setdefault(each_id, file_name)
+
+    unassigned = [each_id for each_id in sorted(kb.list_techniques()) if each_id not in shard_files]
+    if unassigned:
+        file_name = '{}-unassigned.xlsx'.format(stem)
+        shards.append((file_name, {'name': 'Not in an objective',
+                                   'description': 'Techniques not referenced by any objective of the mapping',
+                                   'techniques': unassigned}, unassigned))
+        for each_id in unassigned:
+            shard_files[each_id] = file_name
+    return shards, shard_files
+
+
+def write_shard(kb, out_folder, file_name, tactic, technique_ids, shard_files, index_file):
+    """Writes one shard workbook: a 'Main' sheet for its objective and a sheet per technique"""
+    # Imported here so that --help and argument errors do not pay for it
+    import xlsxwriter
+    workbook = xlsxwriter.Workbook(os.path.join(out_folder, file_name))
+    styles = create_formats(workbook)
+    link = shard_link(shard_files, file_name)
+
+    main_worksheet = workbook.add_worksheet(name='Main')
+    workbook.set_size(2000, 1024)
+    format_headings_in_workbook(workbook, [tactic], styles['formats'])
+    main_worksheet.write_url(0, 1, 'external:{}#Main!A1'.format(index_file), string='back to index')
+    for each_technique_id in technique_ids:
+        workbook.add_worksheet(each_technique_id)
+
+    write_main_sheet(kb, main_worksheet, [tactic], styles, link)
+    for each_technique_id in technique_ids:
+        write_technique_sheet(kb, workbook.get_worksheet_by_name(each_technique_id), each_technique_id, styles, link)
+
     workbook.close()
+    return file_name
+
+
+def _init_shard_worker(solve_it_root, config_file):
+    """Loads the knowledge base once in each worker process"""
+    global _worker_kb
+    _worker_kb = KnowledgeBase(solve_it_root, config_file)
+
+
+def _write_shard_in_worker(out_folder, file_name, tactic, technique_ids, shard_files, index_file):
+    return write_shard(_worker_kb, out_folder, file_name, tactic, technique_ids, shard_files, index_file)
+
+
+def generate_sharded_workbooks(kb, outpath, solve_it_root, config_file, jobs=None):
+    """
+    Writes one workbook per objective and an index workbook at outpath (see plan_shards).
+
+    Args:
+        kb: The loaded knowledge base.
+        outpath: Path of the index workbook; the shards are written to the same folder.
+        solve_it_root, config_file: Used by worker processes to load the knowledge base.
+        jobs: Number of worker processes (default: number of CPUs; 1 writes the shards in this process).
+
+    Returns:
+        List of the shard file names.
+    """
+    out_folder = os.path.dirname(outpath)
+    index_file = os.path.basename(outpath)
+    shards, shard_files = plan_shards(kb, outpath)
+    jobs = jobs or os.cpu_count() or 1
+    print('Writing {} shards with {} process(es)...'.format(len(shards), jobs))
+
+    executor = None
+    if jobs > 1 and len(shards) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(max_workers=min(jobs, len(shards)), initializer=_init_shard_worker,
+                                       initargs=(solve_it_root, config_file))
+        futures = [executor.submit(_write_shard_in_worker, out_folder, file_name, tactic, technique_ids,
+                                   shard_files, index_file)
+                   for file_name, tactic, technique_ids in shards]
+    else:
+        for file_name, tactic, technique_ids in shards:
+            write_shard(kb, out_folder, file_name, tactic, technique_ids, shard_files, index_file)
+            print("- wrote shard '{}'".format(file_name))
+
+    # The index is written while the workers write the shards
+    workbook, styles, sheets = create_index_workbook(kb, outpath)
+    main_worksheet, info_sheet, techniques_sheet, weaknesses_sheet, mitigations_sheet = sheets
+    link = shard_link(shard_files, index_file)
+    shards_sheet = workbook.add_worksheet(name='Shards')
+
+    write_summary_sheets(kb, techniques_sheet, weaknesses_sheet, mitigations_sheet)
+
+    print("Updating 'main' worksheet with links to shards...")
+    techniques_added, total_techniques_with_weaknesses = write_main_sheet(kb, main_worksheet, kb.tactics, styles, link)
+    print("- 'main' worksheet updated")
+    warn_unindexed(kb, techniques_added)
+
+    shards_sheet.set_column(0, 1, 40)
+    shards_sheet.write_row(0, 0, ["Workbook", "Objective", "Techniques"], styles['bold'])
+    for i, (file_name, tactic, technique_ids) in enumerate(shards):
+        shards_sheet.write_url(i + 1, 0, 'external:{}#Main!A1'.format(file_name), string=file_name)
+        shards_sheet.write_string(i + 1, 1, tactic.get('name'))
+        shards_sheet.write_number(i + 1, 2, len(technique_ids))
+
+    write_info_sheet(kb, info_sheet, total_techniques_with_weaknesses)
+    info_sheet.write_string(8, 0, "Number of shard workbooks")
+    info_sheet.write_number(8, 1, len(shards))
+    workbook.close()
+
+    if executor is not None:
+        with executor:
+            for future in futures:
+                print("- wrote shard '{}'".format(future.result()))
+    return [file_name for file_name, _, _ in shards]
+
+
+if __name__ == '__main__':
+
+    """Command-line entry point for the script."""
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description="Generate an Excel version of the SOLVE-IT knowledge base")
+    parser.add_argument('-o', action='store', type=str, dest='output_file',
+                        help="output path for spreadsheet.")
+    parser.add_argument('--shard', '-s', action='store_true',
+                        help="write one workbook per objective, with the output path as an index workbook linking to them.")
+    parser.add_argument('--jobs', '-j', action='store', type=int, default=None,
+                        help="number of processes writing shards (default: number of CPUs).")
+    args = parser.parse_args()
+
+
+    # Replace technique organisation configuration file here if needed
+    config_file = 'solve-it.json'
+
+    # Calculate the path to the solve-it directory relative to this script
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    solve_it_root = os.path.dirname(script_dir)  # Go up from reporting_scripts to solve-it root
+
+    kb = KnowledgeBase(solve_it_root, config_file)
+
+    print("Using configuration file: {}".format(config_file))
+
+    # Determine and if necessary create output folder path
+    if args.output_file is not None:
+        out_folder = os.path.dirname(args.output_file)
+        if out_folder and not os.path.exists(out_folder):
+            os.makedirs(out_folder)
+        outpath = args.output_file
+    else:
+        if not os.path.exists('output'):
+            os.mkdir('output')
+        outpath = os.path.join('output', 'solve-it.xlsx')
+
+
+    print("Output will be to: {}".format(outpath))
+
+    try:
+        if args.shard:
+            generate_sharded_workbooks(kb, outpath, solve_it_root, config_file, args.jobs)
+        else:
+            generate_workbook(kb, outpath)
+    except ValueError as e:
+        logging.error('%s - Excel generation failed', e)
+        sys.exit(-1)
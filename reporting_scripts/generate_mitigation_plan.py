@@ -0,0 +1,93 @@
+"""
+SOLVE-IT Minimal Mitigation Plan Generator
+
+This script prints the smallest set of mitigations that covers every weakness
+of the supplied techniques, ranked by how many outstanding weaknesses each one
+addresses. An optional lab config (the same format used by generate_evaluation.py)
+marks mitigations that are already implemented.
+
+The script can be used directly from the command line
+
+"""
+
+import argparse
+import sys
+import os
+import logging
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from solve_it_library import KnowledgeBase
+
+# Configure logging to show errors to console
+logging.basicConfig(level=logging.ERROR, format='ERROR: %(message)s')
+
+
+def print_plan(plan):
+    """Prints a mitigation plan to stdout in TSV format"""
+    print('Rank\tID\tName\tNew coverage\tCovers')
+    for each_entry in plan.get('plan'):
+        print("{}\t{}\t{}\t{}\t{}".format(each_entry.get('rank'),
+                                          each_entry.get('id'),
+                                          each_entry.get('name'),
+                                          each_entry.get('new_coverage'),
+                                          ', '.join(each_entry.get('covers'))))
+    print()
+    print("Weaknesses in scope\t{}".format(len(plan.get('weaknesses'))))
+    print("Already mitigated\t{}".format(', '.join(plan.get('already_mitigated'))))
+    print("No mitigations available\t{}".format(', '.join(plan.get('unmitigable_weaknesses'))))
+    print("Missing mitigations\t{}".format(', '.join(plan.get('missing_mitigations'))))
+    print("Method\t{} ({})".format(plan.get('method'), 'optimal' if plan.get('optimal') else 'best found'))
+
+
+def main():
+    """Command-line entry point for the script."""
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description="Find the minimal set of mitigations covering the weaknesses of a list of techniques")
+    parser.add_argument('techniques', action='store', type=str, nargs='*',
+                        help="The list of techniques to include. If none are given, all techniques are used.")
+    parser.add_argument('--lab_config', '-l', action='store', type=str,
+                        help="Path to a json configuration file for a specific lab setup.")
+    parser.add_argument('--case_config', '-c', action='store', type=str,
+                        help="Path to a text file of techniques to include for a specific case.")
+    parser.add_argument('--exact', action='store_true',
+                        help="Always run the exact branch-and-bound search, even for large inputs")
+    parser.add_argument('--greedy', action='store_true',
+                        help="Only use the greedy solver")
+    args = parser.parse_args()
+
+    techniques = args.techniques
+    if args.case_config:
+        try:
+            with open(args.case_config, 'r') as f:
+                techniques.extend([line.strip() for line in f if line.strip()])
+        except Exception as e:
+            print(f"Error reading case config file: {str(e)}")
+            return 1
+
+    # Calculate the path to the solve-it directory relative to this script
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    solve_it_root = os.path.dirname(script_dir)  # Go up from reporting_scripts to solve-it root
+
+    kb = KnowledgeBase(solve_it_root, 'solve-it.json')
+
+    if not techniques:
+        techniques = kb.list_techniques()
+
+    exact = None
+    if args.exact:
+        exact = True
+    elif args.greedy:
+        exact = False
+
+    try:
+        plan = kb.get_minimal_mitigation_plan(techniques, lab_config=args.lab_config, exact=exact)
+    except ValueError as e:
+        print(f"Error generating mitigation plan: {str(e)}")
+        return -1
+
+    print_plan(plan)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -24,7 +24,7 @@ def main():
     script_dir = os.path.dirname(os.path.abspath(__file__))
     solve_it_root = os.path.dirname(script_dir)  # Go up from reporting_scripts to solve-it root
     
-    kb = KnowledgeBase(solve_it_root, 'solve-it.json')
+    kb = KnowledgeBase(solve_it_root, 'solve-it.json', trusted=True)
 
     output_json = {}
     output_json['num_objectives'] = len(kb.list_tactics())
@@ -102,6 +102,19 @@ def print_case_mapping(kb, long):
         t = kb.get_technique(each_techniques)
         print("{}\t{}\t{}".format(each_techniques, t.get('name'), str(t.get('CASE_output_classes'))))
 
+def print_tools(kb, long):
+    """Prints the tools named in technique examples, with the number of techniques listing each, to stdout"""
+    if long is True:
+        print('Tool\tTechniques\tTechnique IDs')
+    else:
+        print('Tool\tTechniques')
+
+    for each_tool in kb.list_tools():
+        if long is True:
+            print("{}\t{}\t{}".format(each_tool['tool'], each_tool['count'], ', '.join(each_tool['techniques'])))
+        else:
+            print("{}\t{}".format(each_tool['tool'], each_tool['count']))
+
 def main():
     """Command-line entry point for the script."""
     # Parse command line arguments
@@ -116,6 +129,8 @@ def main():
                         help="Print the mitigations from SOLVE-IT in TSV format")
     parser.add_argument('--case', '-c', action='store_true',
                         help="Print the mapping of techniques to CASE ontology")
+    parser.add_argument('--tools', '-x', action='store_true',
+                        help="Print the tools named in technique examples, with the number of techniques for each")
     parser.add_argument('--long', '-l', action='store_true',
                         help="Print extended fields other than ID and name")
 
@@ -125,7 +140,7 @@ def main():
     script_dir = os.path.dirname(os.path.abspath(__file__))
     solve_it_root = os.path.dirname(script_dir)  # Go up from reporting_scripts to solve-it root
     
-    kb = KnowledgeBase(solve_it_root, 'solve-it.json')
+    kb = KnowledgeBase(solve_it_root, 'solve-it.json', trusted=True)
 
     if args.objectives is True:
         print_objectives(kb, args.long)
@@ -137,6 +152,8 @@ def main():
         print_mitigations(kb, args.long)
     elif args.case is True:
         print_case_mapping(kb, args.long)
+    elif args.tools is True:
+        print_tools(kb, args.long)
     else:
         parser.print_help()
 
@@ -0,0 +1,112 @@
+"""
+SOLVE-IT Knowledge Base Integrity Checker
+
+This script checks the knowledge base and its objective mappings for broken
+references (missing weaknesses, mitigations and subtechniques, subtechnique
+cycles, orphan items, unmapped techniques and duplicate IDs) and prints the
+issues found, either as TSV or as JSON.
+
+With --changed (or --changed_list), only the given data files are validated
+against the models and their references checked against an index of the rest
+of the knowledge base, e.g. for pull requests:
+
+    git diff --name-only origin/main | python reporting_scripts/validate_kb.py --changed_list -
+
+The exit code is 1 if any errors are found, so the script can be used as a
+CI check. Warnings do not change the exit code unless --strict is given.
+
+The script can be used directly from the command line
+
+"""
+
+import argparse
+import json
+import sys
+import os
+import logging
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from solve_it_library import KnowledgeBase
+from solve_it_library.change_validation import validate_changed_files
+
+# Configure logging to show errors to console
+logging.basicConfig(level=logging.ERROR, format='ERROR: %(message)s')
+
+
+def print_report(report):
+    """Prints an integrity report to stdout in TSV format"""
+    print('Severity\tType\tItem\tReference\tLocation\tMessage')
+    for each_issue in report.get('issues'):
+        print("{}\t{}\t{}\t{}\t{}\t{}".format(each_issue.get('severity'),
+                                              each_issue.get('type'),
+                                              each_issue.get('item'),
+                                              each_issue.get('reference') or '',
+                                              each_issue.get('location') or '',
+                                              each_issue.get('message')))
+    summary = report.get('summary')
+    print()
+    print("Errors\t{}".format(summary.get('errors')))
+    print("Warnings\t{}".format(summary.get('warnings')))
+    if 'max_subtechnique_depth' in report:
+        print("Max subtechnique depth\t{}".format(report.get('max_subtechnique_depth')))
+    else:
+        print("Files checked\t{}".format(summary.get('files_checked')))
+
+
+def main():
+    """Command-line entry point for the script."""
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description="Check the SOLVE-IT knowledge base for broken references")
+    parser.add_argument('--mapping', '-m', action='append', type=str,
+                        help="Mapping file to check (can be repeated). If not given, all mappings are checked.")
+    parser.add_argument('--json', '-j', action='store_true',
+                        help="Print the full report as JSON")
+    parser.add_argument('--errors_only', '-e', action='store_true',
+                        help="Only list errors, not warnings")
+    parser.add_argument('--strict', '-s', action='store_true',
+                        help="Also return a non-zero exit code if there are warnings")
+    parser.add_argument('--changed', '-c', action='store', type=str, nargs='+',
+                        help="Only validate these changed files (paths relative to the repository root)")
+    parser.add_argument('--changed_list', '-l', action='store', type=str,
+                        help="Text file listing changed files, one per line ('-' reads stdin)")
+    parser.add_argument('--cache', action='store', type=str,
+                        help="Reference index cache file used with --changed/--changed_list")
+    args = parser.parse_args()
+
+    # Calculate the path to the solve-it directory relative to this script
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    solve_it_root = os.path.dirname(script_dir)  # Go up from reporting_scripts to solve-it root
+
+    if args.changed or args.changed_list:
+        changed_paths = list(args.changed or [])
+        if args.changed_list:
+            try:
+                if args.changed_list == '-':
+                    changed_paths.extend(line.strip() for line in sys.stdin if line.strip())
+                else:
+                    with open(args.changed_list, 'r') as f:
+                        changed_paths.extend(line.strip() for line in f if line.strip())
+            except Exception as e:
+                print(f"Error reading changed files list: {str(e)}")
+                return 1
+        report = validate_changed_files(solve_it_root, changed_paths, args.cache)
+    else:
+        kb = KnowledgeBase(solve_it_root, 'solve-it.json')
+        report = kb.check_integrity(args.mapping)
+
+    if args.errors_only:
+        report['issues'] = [i for i in report['issues'] if i['severity'] == 'error']
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+    summary = report.get('summary')
+    if summary.get('errors') or (args.strict and summary.get('warnings')):
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,8 +2,30 @@
 SOLVE-IT Knowledge Base Library (`solve_it_library`)
 
 This package provides programmatic access to the SOLVE-IT knowledge base data.
+
+The public classes are imported on first access, so importing the package (or
+only one of its modules) does not pull in the whole library.
 """
 
-from .solveit_library import KnowledgeBase
+import importlib
+
+# Public name -> module that defines it
+_EXPORTS = {
+    "KnowledgeBase": ".solveit_library",
+    "AsyncKnowledgeBase": ".async_kb",
+}
+
+__all__ = ["KnowledgeBase", "AsyncKnowledgeBase"]
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
 
-__all__ = ["KnowledgeBase"]
+def __dir__():
+    return sorted(list(globals()) + __all__)
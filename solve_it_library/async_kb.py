@@ -0,0 +1,217 @@
+"""
+Asyncio facade for the SOLVE-IT Knowledge Base Library.
+
+AsyncKnowledgeBase lets asyncio applications load and query the knowledge base
+without blocking the event loop. File reads and Pydantic validation run in an
+executor in batches, with a bounded number of batches in flight, and expensive queries such
+as search are awaitable and run in the executor too. Only the cheap lookups listed in
+SYNC_METHODS (e.g. get_technique), which are plain dictionary reads, are delegated
+synchronously; every other KnowledgeBase method is awaitable. Iterators (iter_search,
+iter_case_jsonld) become async iterators that produce their items in the executor.
+"""
+
+import asyncio
+import itertools
+import logging
+import os
+from concurrent.futures import Executor
+from functools import partial
+from typing import Dict, Any, Optional, List, Union, Iterator, AsyncIterator
+
+from .solveit_library import KnowledgeBase
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 8
+# Files read and validated per executor task (amortises the hand-off cost)
+FILES_PER_TASK = 16
+# Items produced per executor task by the async iterators
+ITEMS_PER_TASK = 64
+
+# KnowledgeBase methods that only read loaded dictionaries (no file access, no index
+# building, no scan of every item) and are called synchronously
+SYNC_METHODS = frozenset({
+    'get_technique', 'get_weakness', 'get_mitigation',
+    'get_weaknesses_for_technique', 'get_mitigations_for_weakness',
+    'get_techniques_for_weakness', 'get_weaknesses_for_mitigation', 'get_techniques_for_mitigation',
+    'get_mit_list_for_technique', 'list_objectives', 'get_techniques_for_objective', 'list_tactics',
+    'list_techniques', 'list_weaknesses', 'list_mitigations', 'get_item_sources',
+    'search_cache_info', 'clear_search_cache', 'snapshot',
+})
+
+
+class AsyncKnowledgeBase:
+    """
+    Awaitable interface to a KnowledgeBase.
+
+    Create instances with `await AsyncKnowledgeBase.load(base_path)`. Attributes
+    and the methods in SYNC_METHODS are delegated to the wrapped KnowledgeBase
+    unchanged; other KnowledgeBase methods not defined here are awaitable and run
+    in the executor.
+
+    Attributes:
+        kb (KnowledgeBase): The wrapped knowledge base.
+        executor (Optional[Executor]): Executor used for blocking work (None for
+            the event loop's default executor).
+    """
+
+    def __init__(self, kb: KnowledgeBase, executor: Optional[Executor] = None):
+        self.kb = kb
+        self.executor = executor
+        # Queries are thread-safe and run concurrently; calls changing the active mapping run one at a time
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    async def load(cls, base_path: str, mapping_file: str = KnowledgeBase.DEFAULT_MAPPING_FILE,
+                   max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                   executor: Optional[Executor] = None,
+                   search_cache_size: int = KnowledgeBase.DEFAULT_SEARCH_CACHE_SIZE,
+                   trusted: bool = False) -> 'AsyncKnowledgeBase':
+        """
+        Loads a knowledge base without blocking the event loop.
+
+        Args:
+            base_path (str): The root directory of the solve-it repository clone.
+            mapping_file (str): The objective mapping file to activate.
+            max_concurrency (int): Maximum number of executor tasks (each reading and
+                validating up to FILES_PER_TASK files) in flight at once.
+            executor (Optional[Executor]): Executor for file reads, validation and
+                index building. If None, the event loop's default executor is used.
+            search_cache_size (int): Maximum number of cached search results.
+            trusted (bool): If True, records and mappings are not validated (see KnowledgeBase).
+
+        Returns:
+            AsyncKnowledgeBase: The loaded knowledge base.
+
+        Raises:
+            FileNotFoundError: If the base_path or the data subdirectories do not exist.
+            ValueError: If max_concurrency is less than 1.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(max_concurrency)
+        data_path = os.path.join(base_path, 'data')
+
+        async def read_files(file_paths: List[str], model_name: str) -> List[Optional[Dict[str, Any]]]:
+            async with semaphore:
+                return await loop.run_in_executor(executor, KnowledgeBase._read_record_files,
+                                                  file_paths, model_name, trusted)
+
+        async def load_directory(directory_name: str, model_name: str) -> Dict[str, Dict[str, Any]]:
+            directory_path = os.path.join(data_path, directory_name)
+            if not os.path.isdir(directory_path):
+                raise FileNotFoundError(f"Required directory not found: {directory_path}")
+            filenames = await loop.run_in_executor(executor, os.listdir, directory_path)
+            file_paths = [os.path.join(directory_path, filename) for filename in filenames
+                          if filename.lower().endswith('.json')]
+            batches = await asyncio.gather(*(read_files(file_paths[i:i + FILES_PER_TASK], model_name)
+                                             for i in range(0, len(file_paths), FILES_PER_TASK)))
+            records = [record for batch in batches for record in batch]
+
+            loaded_data: Dict[str, Dict[str, Any]] = {}
+            for file_path, record in zip(file_paths, records):
+                if record is None:
+                    continue
+                if record['id'] in loaded_data:
+                    logger.warning("Duplicate ID %s in %s, replacing earlier definition", record['id'], file_path)
+                item_sources.setdefault(record['id'], []).append(file_path)
+                loaded_data[record['id']] = record
+            return loaded_data
+
+        item_sources: Dict[str, List[str]] = {}
+        techniques, weaknesses, mitigations = await asyncio.gather(
+            load_directory('techniques', 'Technique'),
+            load_directory('weaknesses', 'Weakness'),
+            load_directory('mitigations', 'Mitigation'),
+        )
+        kb = await loop.run_in_executor(executor, partial(
+            KnowledgeBase.from_records, base_path, techniques, weaknesses, mitigations,
+            mapping_file=mapping_file, search_cache_size=search_cache_size, item_sources=item_sources,
+            trusted=trusted))
+        instance = cls(kb, executor)
+        # Build the search index now, rather than in the first search
+        await instance._run(lambda: kb._search_index)
+        return instance
+
+    async def _run(self, function, *args, exclusive: bool = False, **kwargs) -> Any:
+        """Runs a blocking call in the executor (one exclusive call at a time)."""
+        loop = asyncio.get_running_loop()
+        if not exclusive:
+            return await loop.run_in_executor(self.executor, partial(function, *args, **kwargs))
+        async with self._lock:
+            return await loop.run_in_executor(self.executor, partial(function, *args, **kwargs))
+
+    async def _iterate(self, make_iterator, *args, **kwargs) -> AsyncIterator[Any]:
+        """Creates an iterator and consumes it in the executor, ITEMS_PER_TASK items per task."""
+        iterator: Iterator[Any] = await self._run(make_iterator, *args, **kwargs)
+        while True:
+            items = await self._run(lambda: list(itertools.islice(iterator, ITEMS_PER_TASK)))
+            for item in items:
+                yield item
+            if len(items) < ITEMS_PER_TASK:
+                return
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self.kb, name)
+        # Attributes and cheap, non-blocking KnowledgeBase methods
+        if name in SYNC_METHODS or name.startswith('_') or not callable(attribute):
+            return attribute
+
+        async def call(*args, **kwargs):
+            return await self._run(attribute, *args, **kwargs)
+        call.__name__ = name
+        call.__doc__ = "Awaitable KnowledgeBase.%s." % name
+        return call
+
+    async def search(self, keywords: str, **kwargs) -> Dict[str, List[Dict[str, Any]]]:
+        """Awaitable KnowledgeBase.search (see its documentation for arguments)."""
+        return await self._run(self.kb.search, keywords, **kwargs)
+
+    def iter_search(self, keywords: str, **kwargs) -> AsyncIterator[Dict[str, Any]]:
+        """Async iterator over KnowledgeBase.iter_search (see its documentation for arguments)."""
+        return self._iterate(self.kb.iter_search, keywords, **kwargs)
+
+    def iter_case_jsonld(self, *args, **kwargs) -> AsyncIterator[str]:
+        """Async iterator over the pieces of KnowledgeBase.iter_case_jsonld."""
+        return self._iterate(self.kb.iter_case_jsonld, *args, **kwargs)
+
+    async def compare_mappings(self, mapping_names: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Awaitable KnowledgeBase.compare_mappings."""
+        return await self._run(self.kb.compare_mappings, mapping_names)
+
+    async def get_mitigation_closure(self, technique_id: str) -> Optional[Dict[str, Any]]:
+        """Awaitable KnowledgeBase.get_mitigation_closure."""
+        return await self._run(self.kb.get_mitigation_closure, technique_id)
+
+    async def get_all_mitigation_closures(self) -> Dict[str, Dict[str, Any]]:
+        """Awaitable KnowledgeBase.get_all_mitigation_closures."""
+        return await self._run(self.kb.get_all_mitigation_closures)
+
+    async def get_objective_weakness_class_counts(self, *args, **kwargs) -> Dict[str, Any]:
+        """Awaitable KnowledgeBase.get_objective_weakness_class_counts."""
+        return await self._run(self.kb.get_objective_weakness_class_counts, *args, **kwargs)
+
+    async def get_minimal_mitigation_plan(self, technique_ids: List[str],
+                                          lab_config: Union[str, Dict[str, Any], None] = None,
+                                          exact: Optional[bool] = None) -> Dict[str, Any]:
+        """Awaitable KnowledgeBase.get_minimal_mitigation_plan."""
+        return await self._run(self.kb.get_minimal_mitigation_plan, technique_ids, lab_config, exact)
+
+    async def check_integrity(self, mapping_files: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Awaitable KnowledgeBase.check_integrity."""
+        return await self._run(self.kb.check_integrity, mapping_files)
+
+    async def load_objective_mapping(self, mapping_filename: str) -> bool:
+        """Awaitable KnowledgeBase.load_objective_mapping."""
+        return await self._run(self.kb.load_objective_mapping, mapping_filename, exclusive=True)
+
+    async def rebuild_indices(self) -> None:
+        """Awaitable KnowledgeBase.rebuild_indices; also rebuilds the search index."""
+        await self._run(self.kb.rebuild_indices, exclusive=True)
+        await self._run(lambda: self.kb._search_index)
+
+    async def reload(self) -> None:
+        """Awaitable KnowledgeBase.reload; also builds the new search index."""
+        await self._run(self.kb.reload, exclusive=True)
+        await self._run(lambda: self.kb._search_index)
@@ -0,0 +1,160 @@
+"""
+CASE ontology class index for the SOLVE-IT Knowledge Base Library.
+
+Maps each CASE/UCO class named in a technique's CASE_output_classes (e.g.
+'observable:File') to the techniques that output it, and each technique to its
+classes. Class names are namespaced ('prefix:LocalName'); patterns ending in
+'*' select every class starting with the text before it, so 'observable:*'
+selects the whole observable namespace.
+
+iter_jsonld() streams the techniques and their output classes as a JSON-LD
+document, one technique node at a time, for ingestion into CASE-based tooling.
+"""
+
+import bisect
+import json
+from typing import Dict, Any, List, Iterator, Iterable
+from urllib.parse import quote
+
+# Known CASE/UCO namespace prefixes used in CASE_output_classes
+CASE_NAMESPACES: Dict[str, str] = {
+    'core': 'https://ontology.unifiedcyberontology.org/uco/core/',
+    'observable': 'https://ontology.unifiedcyberontology.org/uco/observable/',
+    'analysis': 'https://ontology.unifiedcyberontology.org/uco/analysis/',
+    'configuration': 'https://ontology.unifiedcyberontology.org/uco/configuration/',
+    'action': 'https://ontology.unifiedcyberontology.org/uco/action/',
+    'identity': 'https://ontology.unifiedcyberontology.org/uco/identity/',
+    'location': 'https://ontology.unifiedcyberontology.org/uco/location/',
+    'tool': 'https://ontology.unifiedcyberontology.org/uco/tool/',
+    'types': 'https://ontology.unifiedcyberontology.org/uco/types/',
+    'vocabulary': 'https://ontology.unifiedcyberontology.org/uco/vocabulary/',
+    'investigation': 'https://ontology.caseontology.org/case/investigation/',
+}
+
+# Base IRI of the technique nodes in exported JSON-LD
+DEFAULT_BASE_IRI = 'urn:solve-it:'
+
+
+def case_class_name(name: str) -> str:
+    """Returns a CASE class name with surrounding whitespace removed."""
+    return name.strip()
+
+
+class CaseIndex:
+    """
+    CASE class -> techniques outputting it, and technique -> CASE classes.
+
+    Attributes:
+        classes (List[str]): Every class named by a technique, sorted.
+    """
+
+    def __init__(self, techniques: Dict[str, Dict[str, Any]]):
+        """
+        Builds the index.
+
+        Args:
+            techniques (Dict[str, Dict[str, Any]]): Techniques keyed by ID.
+        """
+        # Class -> technique IDs, in first-seen order
+        self._techniques: Dict[str, Dict[str, None]] = {}
+        # Technique ID -> its classes, deduplicated, in the order listed
+        self._technique_classes: Dict[str, List[str]] = {}
+        for technique_id, technique in techniques.items():
+            classes = self._technique_classes[technique_id] = []
+            for name in technique.get('CASE_output_classes') or []:
+                name = case_class_name(name)
+                if name and name not in classes:
+                    classes.append(name)
+                    self._techniques.setdefault(name, {})[technique_id] = None
+        self.classes: List[str] = sorted(self._techniques)
+
+    def find_classes(self, pattern: str) -> List[str]:
+        """
+        Returns the classes matching a pattern, sorted.
+
+        Args:
+            pattern (str): A class name, or a prefix followed by '*' (e.g. 'observable:*').
+        """
+        pattern = case_class_name(pattern)
+        if not pattern.endswith('*'):
+            return [pattern] if pattern in self._techniques else []
+        # Classes are sorted, so those sharing the prefix are contiguous
+        prefix = pattern[:-1]
+        start = bisect.bisect_left(self.classes, prefix)
+        end = start
+        while end < len(self.classes) and self.classes[end].startswith(prefix):
+            end += 1
+        return self.classes[start:end]
+
+    def techniques_for_class(self, pattern: str) -> List[str]:
+        """Returns the IDs of the techniques outputting any class matching a pattern, sorted."""
+        technique_ids = set()
+        for name in self.find_classes(pattern):
+            technique_ids.update(self._techniques[name])
+        return sorted(technique_ids)
+
+    def classes_for_technique(self, technique_id: str) -> List[str]:
+        """Returns the classes a technique outputs, in the order listed."""
+        return list(self._technique_classes.get(technique_id, []))
+
+    def namespaces(self) -> Dict[str, int]:
+        """Returns the number of distinct classes in each namespace prefix ('' for unprefixed names)."""
+        counts: Dict[str, int] = {}
+        for name in self.classes:
+            prefix = name.split(':', 1)[0] if ':' in name else ''
+            counts[prefix] = counts.get(prefix, 0) + 1
+        return counts
+
+
+def _class_iri(name: str) -> str:
+    """Returns a class name as a compact IRI, percent-encoding characters not allowed in IRIs (e.g. spaces)."""
+    prefix, separator, local_name = name.partition(':')
+    if not separator:
+        return quote(name, safe='')
+    return prefix + ':' + quote(local_name, safe='')
+
+
+def iter_jsonld(techniques: Dict[str, Dict[str, Any]], index: CaseIndex, technique_ids: Iterable[str],
+                base_iri: str = DEFAULT_BASE_IRI, indent: bool = True) -> Iterator[str]:
+    """
+    Streams techniques and their CASE output classes as a JSON-LD document.
+
+    Each technique is a node of type solveit:Technique with its name (rdfs:label) and
+    solveit:caseOutputClass links to its classes. The document is yielded in chunks
+    (the context, then one node per technique) so it can be written to a file or socket
+    without being built in memory.
+
+    Args:
+        techniques (Dict[str, Dict[str, Any]]): Techniques keyed by ID.
+        index (CaseIndex): The CASE class index of the techniques.
+        technique_ids (Iterable[str]): IDs of the techniques to emit, in order.
+        base_iri (str): IRI the technique IDs are appended to (bound to the 'solveit' prefix).
+        indent (bool): Put each node on its own line (otherwise the output has no newlines).
+
+    Yields:
+        str: Consecutive pieces of the JSON-LD document.
+    """
+    context = {'solveit': base_iri, 'rdfs': 'http://www.w3.org/2000/01/rdf-schema#'}
+    prefixes = {name.split(':', 1)[0] for name in index.classes if ':' in name}
+    for prefix in sorted(prefixes):
+        if prefix in CASE_NAMESPACES:
+            context[prefix] = CASE_NAMESPACES[prefix]
+    context['caseOutputClass'] = {'@id': 'solveit:caseOutputClass', '@type': '@id', '@container': '@set'}
+    context['name'] = 'rdfs:label'
+
+    newline = '\n' if indent else ''
+    yield '{' + newline + '"@context": ' + json.dumps(context) + ',' + newline + '"@graph": [' + newline
+    separator = ''
+    for technique_id in technique_ids:
+        technique = techniques.get(technique_id)
+        if technique is None:
+            continue
+        node = {
+            '@id': 'solveit:' + quote(technique_id, safe=''),
+            '@type': 'solveit:Technique',
+            'name': technique.get('name'),
+            'caseOutputClass': [_class_iri(name) for name in index.classes_for_technique(technique_id)],
+        }
+        yield separator + json.dumps(node, ensure_ascii=False)
+        separator = ',' + newline
+    yield newline + ']' + newline + '}' + newline
@@ -0,0 +1,463 @@
+"""
+Changed-files validation for the SOLVE-IT Knowledge Base Library.
+
+Validates only the data files touched by a contribution (e.g. the output of
+`git diff --name-only`) instead of loading the whole knowledge base. Changed
+files are validated against the Pydantic models, and their references are
+checked against a reference index of the rest of the knowledge base.
+
+The reference index records, for every data file, the ID it defines and the
+IDs it references. It can be saved to a cache file; on the next run only
+files whose size or modification time changed are looked at again, and of
+those only files whose content changed (by hash, e.g. after a fresh checkout)
+are parsed again, so the cost of a check grows with the size of the change
+rather than the size of the knowledge base.
+
+Pydantic and the models are imported on first use (see record_validation.get_model).
+"""
+
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, Any, Optional, List, Set
+
+from .integrity import _issue, SEVERITY_ERROR
+from .record_validation import get_model
+
+logger = logging.getLogger(__name__)
+
+INDEX_FORMAT_VERSION = 2
+
+# Data subdirectory -> (item kind, model name)
+ITEM_DIRECTORIES: Dict[str, Any] = {
+    'techniques': ('technique', 'Technique'),
+    'weaknesses': ('weakness', 'Weakness'),
+    'mitigations': ('mitigation', 'Mitigation'),
+}
+
+# Fields holding references, and the kind of item they point to
+REFERENCE_FIELDS: Dict[str, Dict[str, str]] = {
+    'technique': {'weaknesses': 'weakness', 'subtechniques': 'technique'},
+    'weakness': {'mitigations': 'mitigation'},
+    'mitigation': {'technique': 'technique'},
+    'mapping': {'techniques': 'technique'},
+}
+
+
+def _classify(relative_path: str) -> Optional[str]:
+    """
+    Returns the kind of data file a path (relative to the data directory) points to.
+
+    Returns:
+        Optional[str]: 'technique', 'weakness', 'mitigation', 'mapping', or None
+            for files that are not knowledge base data.
+    """
+    parts = relative_path.replace(os.sep, '/').split('/')
+    if not parts[-1].lower().endswith('.json'):
+        return None
+    if len(parts) == 1:
+        return 'mapping'
+    if len(parts) == 2 and parts[0] in ITEM_DIRECTORIES:
+        return ITEM_DIRECTORIES[parts[0]][0]
+    return None
+
+
+def _extract_references(kind: str, data: Any) -> Dict[str, List[str]]:
+    """Collects the referenced IDs of a loaded data file, grouped by field."""
+    references: Dict[str, List[str]] = {}
+    if kind == 'mapping':
+        technique_ids = []
+        for objective in data if isinstance(data, list) else []:
+            if isinstance(objective, dict):
+                technique_ids.extend(t for t in objective.get('techniques') or [] if isinstance(t, str))
+        references['techniques'] = technique_ids
+        return references
+    if not isinstance(data, dict):
+        return references
+    for field in REFERENCE_FIELDS[kind]:
+        value = data.get(field)
+        if isinstance(value, str):
+            references[field] = [value] if value else []
+        elif isinstance(value, list):
+            references[field] = [v for v in value if isinstance(v, str)]
+    return references
+
+
+class ReferenceIndex:
+    """
+    IDs defined and referenced by each knowledge base data file.
+
+    Attributes:
+        data_path (str): Path to the 'data' directory.
+        files (Dict[str, Dict[str, Any]]): Entry per data file, keyed by path relative
+            to data_path: 'kind', 'id', 'references', 'mtime', 'size' and 'sha1'.
+        files_read (int): Number of files parsed (not served from the cache) by the last refresh.
+    """
+
+    def __init__(self, data_path: str, files: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.data_path = data_path
+        self.files: Dict[str, Dict[str, Any]] = files or {}
+        self.files_read = 0
+        self._ids: Optional[Dict[str, List[str]]] = None
+        self._referenced_by: Optional[Dict[str, Set[str]]] = None
+
+    @classmethod
+    def load(cls, data_path: str, cache_path: Optional[str] = None, refresh: bool = True) -> 'ReferenceIndex':
+        """
+        Creates an index, reusing a cache file if one exists.
+
+        Args:
+            data_path (str): Path to the 'data' directory.
+            cache_path (Optional[str]): Path of the cache file. If None, nothing is cached.
+            refresh (bool): Whether to bring the index up to date with the files on disk.
+
+        Returns:
+            ReferenceIndex: The loaded index.
+        """
+        files = {}
+        if cache_path and os.path.isfile(cache_path):
+            try:
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    cached = json.load(f)
+                if cached.get('version') == INDEX_FORMAT_VERSION:
+                    files = cached.get('files', {})
+            except (IOError, json.JSONDecodeError, AttributeError) as e:
+                logger.warning("Ignoring unreadable reference index cache %s: %s", cache_path, e)
+        index = cls(data_path, files)
+        if refresh:
+            index.refresh()
+        return index
+
+    def save(self, cache_path: str) -> None:
+        """
+        Writes the index to a cache file.
+
+        Args:
+            cache_path (str): Path of the cache file.
+        """
+        cache_dir = os.path.dirname(cache_path)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_FORMAT_VERSION, 'files': self.files}, f)
+
+    def _data_files(self) -> List[str]:
+        """Lists the data files (mappings and items), relative to data_path."""
+        relative_paths = []
+        for filename in os.listdir(self.data_path):
+            if os.path.isfile(os.path.join(self.data_path, filename)) and _classify(filename):
+                relative_paths.append(filename)
+        for subdir in ITEM_DIRECTORIES:
+            directory = os.path.join(self.data_path, subdir)
+            if os.path.isdir(directory):
+                relative_paths.extend(subdir + '/' + filename for filename in os.listdir(directory)
+                                      if filename.lower().endswith('.json'))
+        return relative_paths
+
+    def refresh(self, skip: Optional[Set[str]] = None) -> None:
+        """
+        Re-reads files that are new or whose size or modification time changed, and drops deleted ones.
+
+        A file whose modification time changed but whose content hash did not (e.g. after
+        a fresh checkout restored from a cached index) is not parsed again.
+
+        Args:
+            skip (Optional[Set[str]]): Relative paths to leave alone (e.g. files the
+                caller reads and updates itself).
+        """
+        self.files_read = 0
+        skip = skip or set()
+        present = set()
+        for relative_path in self._data_files():
+            present.add(relative_path)
+            if relative_path in skip:
+                continue
+            try:
+                stat = os.stat(os.path.join(self.data_path, relative_path))
+            except OSError:
+                continue
+            entry = self.files.get(relative_path)
+            if entry is None or entry.get('size') != stat.st_size:
+                self.update_file(relative_path)
+            elif entry.get('mtime') != stat.st_mtime:
+                content = self._read_bytes(relative_path)
+                if content is not None and entry.get('sha1') == hashlib.sha1(content).hexdigest():
+                    entry['mtime'] = stat.st_mtime
+                else:
+                    self.update_file(relative_path)
+        for relative_path in list(self.files):
+            if relative_path not in present and relative_path not in skip:
+                del self.files[relative_path]
+        self._invalidate()
+
+    def update_file(self, relative_path: str, data: Any = None) -> None:
+        """
+        Reads (or takes the given parsed data of) one data file into the index.
+
+        Args:
+            relative_path (str): Path relative to data_path.
+            data (Any): Parsed JSON content, if already loaded.
+        """
+        kind = _classify(relative_path)
+        file_path = os.path.join(self.data_path, relative_path)
+        if kind is None or not os.path.isfile(file_path):
+            self.files.pop(relative_path, None)
+            self._invalidate()
+            return
+        stat = os.stat(file_path)
+        content = self._read_bytes(relative_path)
+        if data is None:
+            self.files_read += 1
+            try:
+                data = json.loads(content) if content is not None else None
+            except ValueError as e:
+                logger.error("Could not read %s: %s", file_path, e)
+                data = None
+        item_id = data.get('id') if isinstance(data, dict) and isinstance(data.get('id'), str) else None
+        self.files[relative_path] = {
+            'kind': kind,
+            'id': item_id,
+            'references': _extract_references(kind, data) if data is not None else {},
+            'mtime': stat.st_mtime,
+            'size': stat.st_size,
+            'sha1': hashlib.sha1(content).hexdigest() if content is not None else None,
+        }
+        self._invalidate()
+
+    def _read_bytes(self, relative_path: str) -> Optional[bytes]:
+        """Returns the raw content of a data file, or None if it cannot be read."""
+        try:
+            with open(os.path.join(self.data_path, relative_path), 'rb') as f:
+                return f.read()
+        except IOError as e:
+            logger.error("Could not read %s: %s", relative_path, e)
+            return None
+
+    def _invalidate(self) -> None:
+        """Drops the derived lookups after the file entries change."""
+        self._ids = None
+        self._referenced_by = None
+
+    @property
+    def ids(self) -> Dict[str, List[str]]:
+        """Files defining each item ID."""
+        if self._ids is None:
+            self._ids = {}
+            for relative_path, entry in self.files.items():
+                if entry.get('id'):
+                    self._ids.setdefault(entry['id'], []).append(relative_path)
+        return self._ids
+
+    @property
+    def referenced_by(self) -> Dict[str, Set[str]]:
+        """Files referencing each ID."""
+        if self._referenced_by is None:
+            self._referenced_by = {}
+            for relative_path, entry in self.files.items():
+                for referenced_ids in entry.get('references', {}).values():
+                    for referenced_id in referenced_ids:
+                        self._referenced_by.setdefault(referenced_id, set()).add(relative_path)
+        return self._referenced_by
+
+    def defines(self, item_id: str, kind: str) -> bool:
+        """Returns True if a data file of the given kind defines item_id."""
+        return any(self.files[relative_path]['kind'] == kind for relative_path in self.ids.get(item_id, []))
+
+
+def _to_data_relative(data_path: str, changed_path: str) -> Optional[str]:
+    """
+    Converts a changed path (absolute, or relative to the repository root or the
+    current directory) into a path relative to the data directory.
+
+    Returns:
+        Optional[str]: The relative path, or None if the path is outside the data directory.
+    """
+    repo_root = os.path.dirname(os.path.abspath(data_path))
+    candidate = changed_path if os.path.isabs(changed_path) else os.path.join(repo_root, changed_path)
+    relative_path = os.path.relpath(os.path.abspath(candidate), os.path.abspath(data_path))
+    if relative_path.startswith('..'):
+        return None
+    return relative_path.replace(os.sep, '/')
+
+
+def _format_validation_errors(error: Any) -> str:
+    """Summarises Pydantic validation errors on one line."""
+    return '; '.join("%s: %s" % ('.'.join(str(loc) for loc in each.get('loc', ())) or '(root)', each.get('msg'))
+                     for each in error.errors())
+
+
+def _validate_schema(kind: str, data: Any, model_name: Optional[str]) -> Optional[str]:
+    """
+    Validates a parsed data file against its model.
+
+    Args:
+        kind (str): Kind of data file (see _classify).
+        data (Any): Parsed JSON content.
+        model_name (Optional[str]): Name of the item model, or None for mapping files.
+
+    Returns:
+        Optional[str]: A description of the validation errors, or None if valid.
+    """
+    from pydantic import ValidationError
+    if kind == 'mapping':
+        objective_model = get_model('Objective')
+        if not isinstance(data, list):
+            return "Mapping file does not contain a list"
+        problems = []
+        for i, objective in enumerate(data):
+            try:
+                objective_model.model_validate(objective)
+            except ValidationError as e:
+                problems.append("objective %d: %s" % (i, _format_validation_errors(e)))
+        return '; '.join(problems) or None
+    try:
+        get_model(model_name).model_validate(data)
+    except ValidationError as e:
+        return _format_validation_errors(e)
+    return None
+
+
+def validate_changed_files(base_path: str, changed_paths: List[str],
+                           cache_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Validates the given changed data files and the references they make or break.
+
+    Each changed file that still exists is validated against its Pydantic model, and
+    its references (weaknesses, subtechniques, mitigations, Mitigation.technique and
+    mapping techniques) must resolve. Its ID must not be defined by another file and
+    should match the file name. For deleted files, any remaining references to the
+    ID they defined are reported. Paths outside the data directory are ignored.
+
+    Args:
+        base_path (str): Root of the solve-it repository (containing the 'data' folder).
+        changed_paths (List[str]): Changed file paths, e.g. from `git diff --name-only`.
+        cache_path (Optional[str]): Reference index cache file. If given, the index is
+            read from and written back to this file.
+
+    Returns:
+        Dict[str, Any]: Dictionary containing:
+            - 'issues': list of issues (see integrity.check_integrity)
+            - 'summary': 'files_checked', 'files_skipped', 'files_read', 'errors',
+              'warnings' and 'issue_counts'
+            - 'valid': True if no errors were found
+
+    Raises:
+        FileNotFoundError: If the data directory does not exist.
+    """
+    data_path = os.path.join(base_path, 'data')
+    if not os.path.isdir(data_path):
+        raise FileNotFoundError(f"Required directory not found: {data_path}")
+
+    cached_index = ReferenceIndex.load(data_path, cache_path, refresh=False)
+    issues: List[Dict[str, Any]] = []
+    previous_ids: Dict[str, Optional[str]] = {}
+    checked: List[str] = []
+    skipped = 0
+
+    for changed_path in dict.fromkeys(changed_paths):
+        relative_path = _to_data_relative(data_path, changed_path)
+        kind = _classify(relative_path) if relative_path else None
+        if kind is None:
+            skipped += 1
+            continue
+        checked.append(relative_path)
+        # The ID the file defined before the change (from the cache, or else its file name)
+        previous_entry = cached_index.files.get(relative_path)
+        if previous_entry is not None:
+            previous_ids[relative_path] = previous_entry.get('id')
+        elif kind != 'mapping':
+            previous_ids[relative_path] = os.path.splitext(os.path.basename(relative_path))[0]
+
+    # Bring the rest of the index up to date, then parse and validate each changed file
+    cached_index.refresh(skip=set(checked))
+    for relative_path in checked:
+        kind = _classify(relative_path)
+        file_path = os.path.join(data_path, relative_path)
+        if not os.path.isfile(file_path):
+            cached_index.update_file(relative_path)
+            continue
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (IOError, json.JSONDecodeError) as e:
+            issues.append(_issue('invalid_json', relative_path, "Could not read %s: %s" % (relative_path, e),
+                                 location=relative_path))
+            cached_index.update_file(relative_path, {})
+            continue
+        model_name = ITEM_DIRECTORIES[relative_path.split('/')[0]][1] if kind != 'mapping' else None
+        problems = _validate_schema(kind, data, model_name)
+        if problems:
+            issues.append(_issue('schema_error', relative_path, "%s fails validation: %s" % (relative_path, problems),
+                                 location=relative_path))
+        cached_index.update_file(relative_path, data)
+
+    # Check references made by, and to, the changed files against the updated index
+    for relative_path in checked:
+        entry = cached_index.files.get(relative_path)
+        if entry is None:
+            deleted_id = previous_ids.get(relative_path)
+            if deleted_id and deleted_id not in cached_index.ids:
+                for referencing_path in sorted(cached_index.referenced_by.get(deleted_id, ())):
+                    referencing_id = cached_index.files[referencing_path].get('id') or referencing_path
+                    issues.append(_issue('deleted_but_referenced', referencing_id,
+                                         "%s references %s, which was deleted" % (referencing_id, deleted_id),
+                                         reference=deleted_id, location=referencing_path))
+            continue
+
+        item_id = entry.get('id')
+        if item_id:
+            if len(cached_index.ids.get(item_id, [])) > 1:
+                issues.append(_issue('duplicate_id', item_id,
+                                     "%s is defined in %d files" % (item_id, len(cached_index.ids[item_id])),
+                                     location=', '.join(sorted(cached_index.ids[item_id]))))
+            file_id = os.path.splitext(os.path.basename(relative_path))[0]
+            if file_id != item_id:
+                issues.append(_issue('filename_mismatch', item_id,
+                                     "File %s defines %s" % (os.path.basename(relative_path), item_id),
+                                     reference=file_id, location=relative_path))
+
+        kind = entry['kind']
+        source_id = item_id or relative_path
+        for field, referenced_ids in entry.get('references', {}).items():
+            target_kind = REFERENCE_FIELDS[kind][field]
+            for referenced_id in referenced_ids:
+                if cached_index.defines(referenced_id, target_kind):
+                    continue
+                issue_type = {'weaknesses': 'dangling_weakness', 'mitigations': 'dangling_mitigation',
+                              'subtechniques': 'dangling_subtechnique',
+                              'technique': 'dangling_mitigation_technique',
+                              'techniques': 'dangling_mapping_technique'}[field]
+                issues.append(_issue(issue_type, source_id,
+                                     "%s references missing %s %s" % (source_id, target_kind, referenced_id),
+                                     reference=referenced_id, location=relative_path))
+
+        # An ID that changed or moved may leave references to the old ID dangling
+        previous_id = previous_ids.get(relative_path)
+        if previous_id and previous_id != item_id and previous_id not in cached_index.ids:
+            for referencing_path in sorted(cached_index.referenced_by.get(previous_id, ())):
+                referencing_id = cached_index.files[referencing_path].get('id') or referencing_path
+                issues.append(_issue('deleted_but_referenced', referencing_id,
+                                     "%s references %s, which no longer exists" % (referencing_id, previous_id),
+                                     reference=previous_id, location=referencing_path))
+
+    if cache_path:
+        cached_index.save(cache_path)
+
+    issue_counts: Dict[str, int] = {}
+    for each_issue in issues:
+        issue_counts[each_issue['type']] = issue_counts.get(each_issue['type'], 0) + 1
+    errors = sum(1 for each_issue in issues if each_issue['severity'] == SEVERITY_ERROR)
+
+    return {
+        'issues': issues,
+        'summary': {
+            'files_checked': len(checked),
+            'files_skipped': skipped,
+            'files_read': cached_index.files_read,
+            'errors': errors,
+            'warnings': len(issues) - errors,
+            'issue_counts': issue_counts,
+        },
+        'valid': errors == 0,
+    }
@@ -0,0 +1,118 @@
+"""
+Citation index for the SOLVE-IT Knowledge Base Library.
+
+Maps each reference (citation string) to the techniques, weaknesses and
+mitigations that cite it, and each technique to the references of the
+technique itself, its weaknesses and their mitigations, with the IDs each
+reference came from (its provenance). The index is built once over all items,
+so exporters do not have to walk the relationships again for every technique.
+
+References are normalised by collapsing whitespace; references that differ only
+in case or a trailing full stop are treated as the same reference, and the
+first spelling seen is kept.
+"""
+
+import re
+from typing import Dict, Any, List, Optional
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalise_reference(reference: str) -> str:
+    """Returns a reference with runs of whitespace collapsed and surrounding whitespace removed."""
+    return _WHITESPACE.sub(' ', reference).strip()
+
+
+def reference_key(reference: str) -> str:
+    """Returns the key under which equivalent spellings of a reference are merged."""
+    return normalise_reference(reference).casefold().rstrip('.')
+
+
+class CitationIndex:
+    """
+    Reference -> citing items, and technique -> aggregated references.
+
+    Attributes:
+        references (Dict[str, str]): Display form of each reference, keyed by reference_key().
+    """
+
+    def __init__(self, techniques: Dict[str, Dict[str, Any]], weaknesses: Dict[str, Dict[str, Any]],
+                 mitigations: Dict[str, Dict[str, Any]]):
+        """
+        Builds the index.
+
+        Args:
+            techniques (Dict[str, Dict[str, Any]]): Techniques keyed by ID.
+            weaknesses (Dict[str, Dict[str, Any]]): Weaknesses keyed by ID.
+            mitigations (Dict[str, Dict[str, Any]]): Mitigations keyed by ID.
+        """
+        self.references: Dict[str, str] = {}
+        # Reference key -> citing item IDs, in first-seen order
+        self._items: Dict[str, Dict[str, None]] = {}
+        # Item ID -> its reference keys, deduplicated, in the order listed
+        self._item_references: Dict[str, List[str]] = {}
+        for collection in (techniques, weaknesses, mitigations):
+            for item_id, item in collection.items():
+                keys = self._item_references[item_id] = []
+                for reference in item.get('references') or []:
+                    key = reference_key(reference)
+                    if not key:
+                        continue
+                    self.references.setdefault(key, normalise_reference(reference))
+                    if key not in keys:
+                        keys.append(key)
+                        self._items.setdefault(key, {})[item_id] = None
+
+        # Technique -> {reference key: [provenance IDs]}
+        self._technique_references: Dict[str, Dict[str, List[str]]] = {}
+        for technique_id, technique in techniques.items():
+            weakness_ids = [w_id for w_id in technique.get('weaknesses') or [] if w_id in weaknesses]
+            mitigation_ids: Dict[str, None] = {}
+            for weakness_id in weakness_ids:
+                for mitigation_id in weaknesses[weakness_id].get('mitigations') or []:
+                    if mitigation_id in mitigations:
+                        mitigation_ids[mitigation_id] = None
+            aggregated: Dict[str, List[str]] = {}
+            for item_id in [technique_id] + weakness_ids + list(mitigation_ids):
+                for key in self._item_references.get(item_id, []):
+                    provenance = aggregated.setdefault(key, [])
+                    if item_id not in provenance:
+                        provenance.append(item_id)
+            self._technique_references[technique_id] = aggregated
+
+    def items_for_reference(self, reference: str) -> List[str]:
+        """Returns the IDs of the items citing a reference (any spelling), sorted."""
+        return sorted(self._items.get(reference_key(reference), {}))
+
+    def references_for_item(self, item_id: str) -> List[str]:
+        """Returns the normalised references of a single item, in the order listed."""
+        return [self.references[key] for key in self._item_references.get(item_id, [])]
+
+    def references_for_technique(self, technique_id: str) -> Dict[str, List[str]]:
+        """
+        Returns the references of a technique, its weaknesses and their mitigations.
+
+        Returns:
+            Dict[str, List[str]]: Normalised reference -> IDs it came from, technique
+                references first, then weakness, then mitigation references.
+        """
+        return {self.references[key]: list(provenance)
+                for key, provenance in self._technique_references.get(technique_id, {}).items()}
+
+    def find(self, text: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Finds references containing some text (case-insensitive).
+
+        Args:
+            text (str): Text to look for, e.g. an author name or year.
+            limit (Optional[int]): Maximum number of results.
+
+        Returns:
+            List[Dict[str, Any]]: {'reference', 'items'} for each match, most cited first.
+        """
+        needle = normalise_reference(text).casefold()
+        matches = [(key, display) for key, display in self.references.items() if needle in key]
+        matches.sort(key=lambda match: (-len(self._items[match[0]]), match[1]))
+        if limit is not None:
+            matches = matches[:limit]
+        return [{'reference': display, 'items': sorted(self._items[key])} for key, display in matches]
@@ -0,0 +1,173 @@
+"""
+Single-file data pack for the SOLVE-IT Knowledge Base Library.
+
+Packs every technique, weakness and mitigation record, all objective mappings
+and the precomputed reverse relationship indices into one file, so a knowledge
+base can be shipped and opened without reading hundreds of small JSON files.
+
+Pack layout:
+    - 12 byte magic (PACK_MAGIC)
+    - 4 byte little-endian format version
+    - 8 byte little-endian header length
+    - header: UTF-8 JSON with the offset table ({collection: {id: [offset, length]}}),
+      the mappings, the reverse indices and the source file of each item
+    - records: UTF-8 JSON of each validated item, at the offsets given in the header
+      (relative to the end of the header)
+
+The pack is opened with mmap and records are only decoded when first accessed.
+Records are validated when the pack is built, so they are not validated again on load.
+"""
+
+import json
+import mmap
+import os
+import struct
+from functools import partial
+from typing import Dict, Any, Optional, List
+
+from .lazy_records import LazyRecordDict
+
+PACK_MAGIC = b'SOLVEIT-PACK'
+PACK_FORMAT_VERSION = 1
+COLLECTIONS = ('techniques', 'weaknesses', 'mitigations')
+REVERSE_INDICES = ('weakness_to_techniques', 'mitigation_to_weaknesses', 'mitigation_to_techniques')
+
+_PREAMBLE = struct.Struct('<12sIQ')
+
+
+def build_pack(kb: Any, output_path: str) -> Dict[str, int]:
+    """
+    Writes the content of a loaded knowledge base to a data pack.
+
+    All mappings available in the knowledge base's data directory are read and
+    included. The knowledge base itself is left untouched: its content is read
+    from a snapshot, and mappings are read without loading them into it.
+
+    Args:
+        kb: A loaded KnowledgeBase instance.
+        output_path (str): Path of the pack file to write.
+
+    Returns:
+        Dict[str, int]: Number of records per collection, number of mappings, and
+            the size of the pack in bytes ('size').
+    """
+    # Pinned, so a concurrent reload cannot mix old and new content in the pack
+    kb = kb._pinned()
+    mappings = {}
+    for mapping_name in sorted(kb.list_available_mappings()):
+        objectives = kb._read_objective_mapping(mapping_name)
+        if objectives is not None:
+            mappings[mapping_name] = objectives
+
+    records = []
+    offsets: Dict[str, Dict[str, List[int]]] = {}
+    position = 0
+    for collection_name in COLLECTIONS:
+        offsets[collection_name] = {}
+        for item_id, item in getattr(kb, collection_name).items():
+            record = json.dumps(item, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            offsets[collection_name][item_id] = [position, len(record)]
+            records.append(record)
+            position += len(record)
+
+    data_path = os.path.abspath(kb.data_path)
+    header = {
+        'collections': offsets,
+        'mappings': mappings,
+        'indices': {
+            'weakness_to_techniques': kb._weakness_to_techniques,
+            'mitigation_to_weaknesses': kb._mitigation_to_weaknesses,
+            'mitigation_to_techniques': kb._mitigation_to_techniques,
+        },
+        'sources': {item_id: [os.path.relpath(os.path.abspath(p), data_path).replace(os.sep, '/') for p in paths]
+                    for item_id, paths in kb.get_item_sources().items()},
+    }
+    header_bytes = json.dumps(header, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    with open(output_path, 'wb') as f:
+        f.write(_PREAMBLE.pack(PACK_MAGIC, PACK_FORMAT_VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        for record in records:
+            f.write(record)
+
+    summary = {collection_name: len(offsets[collection_name]) for collection_name in COLLECTIONS}
+    summary['mappings'] = len(mappings)
+    summary['size'] = os.path.getsize(output_path)
+    return summary
+
+
+class DataPack:
+    """
+    Read access to a data pack through a memory map.
+
+    Attributes:
+        path (str): Path of the pack file.
+        mappings (Dict[str, List[Dict[str, Any]]]): Objective mappings keyed by filename.
+        indices (Dict[str, Dict[str, List[str]]]): Precomputed reverse relationship indices.
+        sources (Dict[str, List[str]]): Source files of each item (relative to the data directory).
+    """
+
+    def __init__(self, path: str):
+        """
+        Opens a data pack.
+
+        Args:
+            path (str): Path of the pack file.
+
+        Raises:
+            FileNotFoundError: If the pack file does not exist.
+            ValueError: If the file is not a data pack or has an unsupported version.
+        """
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"Data pack not found: {path}")
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, header_length = _PREAMBLE.unpack_from(self._mmap, 0)
+        except struct.error:
+            self.close()
+            raise ValueError(f"Not a SOLVE-IT data pack: {path}")
+        if magic != PACK_MAGIC:
+            self.close()
+            raise ValueError(f"Not a SOLVE-IT data pack: {path}")
+        if version != PACK_FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"Unsupported data pack version {version} in {path}")
+        header_end = _PREAMBLE.size + header_length
+        header = json.loads(self._mmap[_PREAMBLE.size:header_end].decode('utf-8'))
+        self._records_start = header_end
+        self._offsets: Dict[str, Dict[str, List[int]]] = header['collections']
+        self.mappings: Dict[str, List[Dict[str, Any]]] = header['mappings']
+        self.indices: Dict[str, Dict[str, List[str]]] = header['indices']
+        self.sources: Dict[str, List[str]] = header['sources']
+
+    def ids(self, collection_name: str) -> List[str]:
+        """Returns the item IDs of a collection, in pack order."""
+        return list(self._offsets[collection_name])
+
+    def read_record(self, collection_name: str, item_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Decodes a single record.
+
+        Args:
+            collection_name (str): 'techniques', 'weaknesses' or 'mitigations'.
+            item_id (str): The item ID.
+
+        Returns:
+            Optional[Dict[str, Any]]: The record, or None if the ID is not in the pack.
+        """
+        location = self._offsets[collection_name].get(item_id)
+        if location is None:
+            return None
+        start = self._records_start + location[0]
+        return json.loads(self._mmap[start:start + location[1]].decode('utf-8'))
+
+    def collection(self, collection_name: str) -> LazyRecordDict:
+        """Returns a dictionary view of a collection that decodes records on first access."""
+        return LazyRecordDict(self.ids(collection_name), partial(self.read_record, collection_name))
+
+    def close(self) -> None:
+        """Closes the memory map."""
+        if not self._mmap.closed:
+            self._mmap.close()
@@ -0,0 +1,139 @@
+"""
+Shared cell formats and row templates for the SOLVE-IT Excel reports.
+
+FormatRegistry creates each distinct cell format once per workbook and hands
+out the same xlsxwriter Format for equal properties, so report generators can
+ask for a format wherever they need one (e.g. inside a per-technique loop)
+without adding a new Format object each time. Named styles used by more than
+one report are defined once in STYLES.
+
+RowTemplate and SheetTemplate hold fixed cells (header rows, label columns,
+grey masks) that are written to many rows or sheets, so they are described
+once and written with bulk write_row()/write_column() calls.
+
+xlsxwriter itself is not imported here; the registry only calls methods of the
+workbook and worksheets it is given.
+"""
+
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+# Weakness class headings and fields, imported from here by the reports
+from .weakness_classes import WEAKNESS_CLASS_HEADERS, WEAKNESS_CLASS_FIELDS
+
+# Named styles shared by the reports (xlsxwriter add_format() properties)
+STYLES: Dict[str, Dict[str, Any]] = {
+    # centred x marks for the weakness classes
+    'weakness_type': {'align': 'center', 'valign': 'vcenter'},
+    'bold_wrap': {'bold': True, 'text_wrap': True},
+    'wrapped_text': {'text_wrap': True, 'align': 'left', 'valign': 'vcenter'},
+    'header': {'bold': True, 'align': 'center', 'valign': 'vcenter', 'text_wrap': True},
+    'header_left': {'bold': True, 'align': 'left', 'valign': 'vcenter', 'text_wrap': True},
+    'header_small': {'bold': True, 'align': 'center', 'valign': 'vcenter', 'text_wrap': True, 'font_size': 9},
+    # blanked out cells
+    'blank_grey': {'align': 'center', 'valign': 'vcenter', 'bg_color': '#a9a9a9'},
+}
+
+
+class FormatRegistry:
+    """
+    Pool of the cell formats of one workbook.
+
+    Equal property sets always give the same Format object, so a workbook holds
+    one Format per distinct style, however often it is asked for.
+    """
+
+    def __init__(self, workbook: Any, styles: Optional[Dict[str, Dict[str, Any]]] = None):
+        """
+        Args:
+            workbook (Any): The xlsxwriter Workbook to add formats to.
+            styles (Optional[Dict[str, Dict[str, Any]]]): Named styles available by
+                name (defaults to STYLES).
+        """
+        self.workbook = workbook
+        self.styles = STYLES if styles is None else styles
+        self._formats: Dict[Tuple[Tuple[str, Any], ...], Any] = {}
+
+    def get(self, **properties: Any) -> Any:
+        """
+        Returns the format with the given add_format() properties, creating it on first use.
+
+        Example:
+            formats.get(bold=True, bg_color='#b5b8b7', border=1)
+        """
+        key = tuple(sorted(properties.items()))
+        cell_format = self._formats.get(key)
+        if cell_format is None:
+            cell_format = self._formats[key] = self.workbook.add_format(dict(properties))
+        return cell_format
+
+    def __getitem__(self, name: str) -> Any:
+        """Returns the format of a named style (KeyError if there is no such style)."""
+        return self.get(**self.styles[name])
+
+    def __len__(self) -> int:
+        """Number of distinct formats created so far."""
+        return len(self._formats)
+
+
+class RowTemplate:
+    """
+    A run of fixed cell values with one format, written with a single write_row()
+    (or write_column() when vertical).
+
+    Values are written with worksheet.write(), so empty strings become formatted
+    blank cells (as for the grey masks) and strings starting with '=' would be
+    written as formulas.
+    """
+
+    def __init__(self, values: Sequence[Any], cell_format: Any = None, vertical: bool = False):
+        """
+        Args:
+            values (Sequence[Any]): The cell values, in order.
+            cell_format (Any): Format applied to every cell (None for the default).
+            vertical (bool): Write the values down a column instead of along a row.
+        """
+        self.values = list(values)
+        self.cell_format = cell_format
+        self.vertical = vertical
+
+    @classmethod
+    def blank(cls, width: int, cell_format: Any) -> 'RowTemplate':
+        """Returns a template of `width` formatted blank cells."""
+        return cls([''] * width, cell_format)
+
+    def write(self, worksheet: Any, row: int, col: int = 0) -> None:
+        """Writes the template with its first cell at (row, col)."""
+        if self.vertical:
+            worksheet.write_column(row, col, self.values, self.cell_format)
+        else:
+            worksheet.write_row(row, col, self.values, self.cell_format)
+
+
+class SheetTemplate:
+    """
+    The fixed parts of a worksheet layout that is repeated across many sheets:
+    column widths and rows of fixed cells.
+    """
+
+    def __init__(self):
+        self.columns: List[Tuple[int, int, Optional[float], Any, Dict[str, Any]]] = []
+        self.blocks: List[Tuple[int, int, RowTemplate]] = []
+
+    def set_column(self, first_col: int, last_col: int, width: Optional[float], cell_format: Any = None,
+                   options: Optional[Dict[str, Any]] = None) -> 'SheetTemplate':
+        """Adds a column width (as worksheet.set_column()). Returns the template for chaining."""
+        self.columns.append((first_col, last_col, width, cell_format, options or {}))
+        return self
+
+    def add(self, row: int, col: int, template: RowTemplate) -> 'SheetTemplate':
+        """Adds a row template at (row, col). Returns the template for chaining."""
+        self.blocks.append((row, col, template))
+        return self
+
+    def apply(self, worksheet: Any) -> Any:
+        """Writes the layout to a worksheet and returns the worksheet."""
+        for first_col, last_col, width, cell_format, options in self.columns:
+            worksheet.set_column(first_col, last_col, width, cell_format, options)
+        for row, col, template in self.blocks:
+            template.write(worksheet, row, col)
+        return worksheet
@@ -0,0 +1,257 @@
+"""
+Referential integrity checks for the SOLVE-IT Knowledge Base Library.
+
+Finds broken links between knowledge base items in a single linear pass over
+the loaded techniques, weaknesses and mitigations and all objective mapping
+files, so problems are reported up front instead of surfacing while a
+spreadsheet is half written.
+
+Reported issue types:
+    - dangling_weakness: a technique lists a weakness that does not exist
+    - dangling_mitigation: a weakness lists a mitigation that does not exist
+    - dangling_subtechnique: a technique lists a subtechnique that does not exist
+    - dangling_mitigation_technique: Mitigation.technique names a missing technique
+    - dangling_mapping_technique: a mapping objective lists a missing technique
+    - subtechnique_cycle: subtechniques refer back to one of their ancestors
+    - nested_subtechnique: a subtechnique has subtechniques of its own
+    - multiple_parents: a technique is a subtechnique of more than one technique
+    - duplicate_id: the same ID is defined in more than one file
+    - filename_mismatch: a file's name does not match the ID it defines
+    - orphan_weakness: a weakness not referenced by any technique
+    - orphan_mitigation: a mitigation not referenced by any weakness
+    - unmapped_technique: a technique missing from a mapping (subtechniques of
+      mapped techniques, at any depth, count as mapped)
+
+Issue types only reported by changed-files validation (see change_validation.py):
+    - invalid_json: a changed file cannot be read or decoded
+    - schema_error: a changed file fails validation against its model
+    - deleted_but_referenced: a removed or renamed ID is still referenced
+"""
+
+import json
+import logging
+import os
+from typing import Dict, Any, Optional, List
+
+from .technique_hierarchy import TechniqueHierarchy
+
+logger = logging.getLogger(__name__)
+
+SEVERITY_ERROR = 'error'
+SEVERITY_WARNING = 'warning'
+
+ISSUE_SEVERITIES = {
+    'dangling_weakness': SEVERITY_ERROR,
+    'dangling_mitigation': SEVERITY_ERROR,
+    'dangling_subtechnique': SEVERITY_ERROR,
+    'dangling_mitigation_technique': SEVERITY_ERROR,
+    'dangling_mapping_technique': SEVERITY_ERROR,
+    'subtechnique_cycle': SEVERITY_ERROR,
+    'duplicate_id': SEVERITY_ERROR,
+    'filename_mismatch': SEVERITY_ERROR,
+    'invalid_json': SEVERITY_ERROR,
+    'schema_error': SEVERITY_ERROR,
+    'deleted_but_referenced': SEVERITY_ERROR,
+    'nested_subtechnique': SEVERITY_WARNING,
+    'multiple_parents': SEVERITY_WARNING,
+    'orphan_weakness': SEVERITY_WARNING,
+    'orphan_mitigation': SEVERITY_WARNING,
+    'unmapped_technique': SEVERITY_WARNING,
+}
+
+# Items that exist on purpose without being in a mapping: T1000 is the template
+# technique described in CONTRIBUTING.md
+PLACEHOLDER_IDS = ('T1000',)
+
+
+def _issue(issue_type: str, item_id: str, message: str, reference: Optional[str] = None,
+           location: Optional[str] = None) -> Dict[str, Any]:
+    """Builds a single issue record."""
+    return {
+        'type': issue_type,
+        'severity': ISSUE_SEVERITIES[issue_type],
+        'item': item_id,
+        'reference': reference,
+        'location': location,
+        'message': message,
+    }
+
+
+def read_mapping_file(mapping_path: str) -> List[Dict[str, Any]]:
+    """
+    Reads the objectives of a mapping file without activating it.
+
+    Args:
+        mapping_path (str): Path to the objective mapping JSON file.
+
+    Returns:
+        List[Dict[str, Any]]: The objectives listed in the file.
+
+    Raises:
+        ValueError: If the file cannot be read, decoded, or does not contain a list.
+    """
+    try:
+        with open(mapping_path, 'r', encoding='utf-8') as f:
+            mapping_data = json.load(f)
+    except (IOError, json.JSONDecodeError) as e:
+        raise ValueError(f"Error loading mapping file {mapping_path}: {str(e)}")
+    if not isinstance(mapping_data, list):
+        raise ValueError(f"Mapping file {mapping_path} does not contain a list")
+    return [objective for objective in mapping_data if isinstance(objective, dict)]
+
+
+def _check_subtechnique_hierarchy(hierarchy: TechniqueHierarchy,
+                                  issues: List[Dict[str, Any]]) -> int:
+    """
+    Reports the subtechnique cycles found while building the hierarchy index.
+
+    Args:
+        hierarchy: The subtechnique hierarchy of the loaded techniques.
+        issues: List that found issues are appended to.
+
+    Returns:
+        int: Depth of the deepest subtechnique chain (0 if there are no subtechniques).
+    """
+    for cycle in hierarchy.cycles:
+        issues.append(_issue('subtechnique_cycle', cycle[-2],
+                             "Subtechnique cycle: %s" % ' -> '.join(cycle),
+                             reference=cycle[-1]))
+    return hierarchy.max_depth
+
+
+def check_integrity(kb: Any, mapping_files: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Checks the referential integrity of a loaded knowledge base and its mappings.
+
+    Args:
+        kb: A loaded KnowledgeBase instance.
+        mapping_files (Optional[List[str]]): Mapping filenames in the data directory
+            to check. If None, all available mappings are checked.
+
+    Returns:
+        Dict[str, Any]: Dictionary containing:
+            - 'issues': list of {'type', 'severity', 'item', 'reference', 'location', 'message'}
+            - 'summary': counts of checked items, errors, warnings and issues per type
+            - 'max_subtechnique_depth': depth of the deepest subtechnique chain
+            - 'valid': True if no errors were found (warnings are allowed)
+    """
+    techniques = kb.techniques
+    weaknesses = kb.weaknesses
+    mitigations = kb.mitigations
+    issues: List[Dict[str, Any]] = []
+
+    # Files defining each ID (duplicates and mismatching file names)
+    for item_id, file_paths in kb.get_item_sources().items():
+        if len(file_paths) > 1:
+            issues.append(_issue('duplicate_id', item_id,
+                                 "%s is defined in %d files" % (item_id, len(file_paths)),
+                                 location=', '.join(file_paths)))
+        for file_path in file_paths:
+            file_id = os.path.splitext(os.path.basename(file_path))[0]
+            if file_id != item_id:
+                issues.append(_issue('filename_mismatch', item_id,
+                                     "File %s defines %s" % (os.path.basename(file_path), item_id),
+                                     reference=file_id, location=file_path))
+
+    # Techniques: weaknesses and subtechniques
+    referenced_weaknesses = set()
+    parents: Dict[str, List[str]] = {}
+    for technique_id, technique in techniques.items():
+        for weakness_id in technique.get('weaknesses') or []:
+            referenced_weaknesses.add(weakness_id)
+            if weakness_id not in weaknesses:
+                issues.append(_issue('dangling_weakness', technique_id,
+                                     "Technique %s references missing weakness %s" % (technique_id, weakness_id),
+                                     reference=weakness_id))
+        for subtechnique_id in technique.get('subtechniques') or []:
+            parents.setdefault(subtechnique_id, []).append(technique_id)
+            if subtechnique_id not in techniques:
+                issues.append(_issue('dangling_subtechnique', technique_id,
+                                     "Technique %s references missing subtechnique %s" % (technique_id, subtechnique_id),
+                                     reference=subtechnique_id))
+
+    for subtechnique_id, parent_ids in parents.items():
+        if len(parent_ids) > 1:
+            issues.append(_issue('multiple_parents', subtechnique_id,
+                                 "Technique %s is a subtechnique of %s" % (subtechnique_id, ', '.join(parent_ids)),
+                                 reference=', '.join(parent_ids)))
+        if subtechnique_id in techniques and techniques[subtechnique_id].get('subtechniques'):
+            issues.append(_issue('nested_subtechnique', subtechnique_id,
+                                 "Subtechnique %s has subtechniques of its own" % subtechnique_id,
+                                 reference=', '.join(parent_ids)))
+
+    hierarchy = TechniqueHierarchy(techniques)
+    max_depth = _check_subtechnique_hierarchy(hierarchy, issues)
+
+    # Weaknesses: mitigations
+    referenced_mitigations = set()
+    for weakness_id, weakness in weaknesses.items():
+        if weakness_id not in referenced_weaknesses:
+            issues.append(_issue('orphan_weakness', weakness_id,
+                                 "Weakness %s is not referenced by any technique" % weakness_id))
+        for mitigation_id in weakness.get('mitigations') or []:
+            referenced_mitigations.add(mitigation_id)
+            if mitigation_id not in mitigations:
+                issues.append(_issue('dangling_mitigation', weakness_id,
+                                     "Weakness %s references missing mitigation %s" % (weakness_id, mitigation_id),
+                                     reference=mitigation_id))
+
+    # Mitigations: linked techniques
+    for mitigation_id, mitigation in mitigations.items():
+        if mitigation_id not in referenced_mitigations:
+            issues.append(_issue('orphan_mitigation', mitigation_id,
+                                 "Mitigation %s is not referenced by any weakness" % mitigation_id))
+        linked_technique = mitigation.get('technique')
+        if linked_technique and linked_technique not in techniques:
+            issues.append(_issue('dangling_mitigation_technique', mitigation_id,
+                                 "Mitigation %s links to missing technique %s" % (mitigation_id, linked_technique),
+                                 reference=linked_technique))
+
+    # Mappings: dangling and missing techniques
+    if mapping_files is None:
+        mapping_files = sorted(kb.list_available_mappings())
+    for mapping_file in mapping_files:
+        try:
+            if kb.data_pack is not None:
+                objectives = kb.data_pack.mappings[mapping_file]
+            else:
+                objectives = read_mapping_file(os.path.join(kb.data_path, mapping_file))
+        except (ValueError, KeyError) as e:
+            logger.error("Could not read mapping %s: %s", mapping_file, e)
+            continue
+        mapped = set()
+        for objective in objectives:
+            for technique_id in objective.get('techniques') or []:
+                mapped.add(technique_id)
+                if technique_id not in techniques:
+                    issues.append(_issue('dangling_mapping_technique', technique_id,
+                                         "Objective '%s' references missing technique %s" % (objective.get('name'), technique_id),
+                                         reference=objective.get('name'), location=mapping_file))
+        for technique_id in techniques:
+            if technique_id in mapped or technique_id in PLACEHOLDER_IDS:
+                continue
+            if any(ancestor_id in mapped for ancestor_id in hierarchy.ancestors(technique_id)):
+                continue
+            issues.append(_issue('unmapped_technique', technique_id,
+                                 "Technique %s is not in mapping %s" % (technique_id, mapping_file),
+                                 location=mapping_file))
+
+    issue_counts: Dict[str, int] = {}
+    for each_issue in issues:
+        issue_counts[each_issue['type']] = issue_counts.get(each_issue['type'], 0) + 1
+    errors = sum(1 for each_issue in issues if each_issue['severity'] == SEVERITY_ERROR)
+
+    return {
+        'issues': issues,
+        'summary': {
+            'techniques': len(techniques),
+            'weaknesses': len(weaknesses),
+            'mitigations': len(mitigations),
+            'mappings': list(mapping_files),
+            'errors': errors,
+            'warnings': len(issues) - errors,
+            'issue_counts': issue_counts,
+        },
+        'max_subtechnique_depth': max_depth,
+        'valid': errors == 0,
+    }
@@ -0,0 +1,87 @@
+"""
+Lazily loaded record collections for the SOLVE-IT Knowledge Base Library.
+
+A LazyRecordDict behaves like the plain ID -> record dictionaries the
+KnowledgeBase normally holds, but only loads a full record the first time it
+is accessed. It can also hold a light summary of each record (e.g. ID, name
+and relationship lists) that is available without loading the full record.
+"""
+
+from collections.abc import MutableMapping
+from typing import Dict, Any, Optional, Iterable, Iterator, Callable
+
+
+class LazyRecordDict(MutableMapping):
+    """
+    Dictionary of records keyed by ID, loading each record on first access.
+
+    Loaded records are cached. Items can be added, replaced or removed like in
+    a plain dictionary. If the loader returns None for an ID (e.g. the record
+    fails validation), the ID is dropped from the collection and a KeyError raised.
+
+    Reads are safe from several threads: a record accessed concurrently for the
+    first time may be loaded more than once, but every caller gets a full record.
+    """
+
+    def __init__(self, item_ids: Iterable[str], loader: Callable[[str], Optional[Dict[str, Any]]],
+                 summaries: Optional[Dict[str, Dict[str, Any]]] = None):
+        """
+        Args:
+            item_ids (Iterable[str]): IDs in the collection, in order.
+            loader (Callable[[str], Optional[Dict[str, Any]]]): Returns the full record for an ID.
+            summaries (Optional[Dict[str, Dict[str, Any]]]): Light records available without
+                loading, keyed by ID.
+        """
+        self._loader = loader
+        self._summaries: Dict[str, Dict[str, Any]] = summaries or {}
+        # Keys in order, mapped to the loaded record (None until first accessed)
+        self._records: Dict[str, Optional[Dict[str, Any]]] = dict.fromkeys(item_ids)
+
+    def __getitem__(self, item_id: str) -> Dict[str, Any]:
+        record = self._records[item_id]
+        if record is None:
+            record = self._loader(item_id)
+            if record is None:
+                # pop: another thread may have dropped the same record meanwhile
+                self._records.pop(item_id, None)
+                self._summaries.pop(item_id, None)
+                raise KeyError(item_id)
+            self._records[item_id] = record
+        return record
+
+    def __setitem__(self, item_id: str, record: Dict[str, Any]) -> None:
+        self._records[item_id] = record
+
+    def __delitem__(self, item_id: str) -> None:
+        del self._records[item_id]
+        self._summaries.pop(item_id, None)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._records))
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, item_id: object) -> bool:
+        return item_id in self._records
+
+    def summary(self, item_id: str) -> Dict[str, Any]:
+        """
+        Returns the loaded record if available, else the light summary, else loads the record.
+
+        Raises:
+            KeyError: If the ID is not in the collection.
+        """
+        record = self._records[item_id]
+        if record is not None:
+            return record
+        if item_id in self._summaries:
+            return self._summaries[item_id]
+        return self[item_id]
+
+    def loaded_count(self) -> int:
+        """Returns how many full records have been loaded (or assigned) so far."""
+        return sum(1 for record in self._records.values() if record is not None)
+
+    def __repr__(self) -> str:
+        return "LazyRecordDict(%d items, %d loaded)" % (len(self), self.loaded_count())
@@ -0,0 +1,137 @@
+"""
+Objective mapping file cache for the SOLVE-IT Knowledge Base Library.
+
+Mapping files (solve-it.json, carrier.json, ...) are small but are listed,
+read and validated again whenever a mapping is activated. MappingCache keeps
+the discovered file names and the validated objectives of each file resident,
+shared by every KnowledgeBase reading the same data folder, and checks the
+disk with a single stat() call per request:
+
+    - the file listing is rescanned only when the data folder's modification
+      time changes (files added, removed or renamed)
+    - a mapping is read again only when its modification time or size changes,
+      and validated again only when the SHA-256 of its content changes (so a
+      touched but unchanged file is not revalidated)
+
+Files and folders modified within RACY_WINDOW_NS of being read are not trusted
+by their modification time alone and are checked again on the next request.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+from .record_validation import validate_records, normalise_records
+
+# A file or folder modified this soon before it was read may change again without
+# its modification time changing (coarse timestamps), so it is checked again next time
+RACY_WINDOW_NS = 2 * 10 ** 9
+
+
+class MappingCache:
+    """
+    Discovered mapping files and validated objectives of one data folder.
+
+    Attributes:
+        data_path (str): The data folder.
+        trusted (bool): Whether objectives are only normalised instead of validated.
+        files_read (int): Number of mapping files read from disk so far.
+        files_validated (int): Number of mapping files validated (or normalised) so far.
+    """
+
+    def __init__(self, data_path: str, trusted: bool = False):
+        """
+        Creates an empty cache.
+
+        Args:
+            data_path (str): The data folder containing the mapping files.
+            trusted (bool): If True, objectives are only normalised, not validated.
+        """
+        self.data_path = data_path
+        self.trusted = trusted
+        self.files_read = 0
+        self.files_validated = 0
+        self._lock = threading.Lock()
+        # (data folder mtime, mapping file names); None until listed or while racy
+        self._listing: Optional[Tuple[int, List[str]]] = None
+        # File name -> (mtime, size, content digest, objectives); mtime is None while racy
+        self._entries: Dict[str, Tuple[Optional[int], int, str, List[Dict[str, Any]]]] = {}
+
+    def list_mappings(self) -> List[str]:
+        """
+        Returns the names of the JSON files directly in the data folder.
+
+        Raises:
+            OSError: If the data folder cannot be listed.
+        """
+        mtime = os.stat(self.data_path).st_mtime_ns
+        listing = self._listing
+        if listing is not None and listing[0] == mtime:
+            return list(listing[1])
+        listed_at = time.time_ns()
+        mapping_files = []
+        for filename in os.listdir(self.data_path):
+            # The item folders (techniques, ...) are skipped by the isfile() check
+            if filename.lower().endswith('.json') and os.path.isfile(os.path.join(self.data_path, filename)):
+                mapping_files.append(filename)
+        self._listing = (mtime, mapping_files) if listed_at - mtime > RACY_WINDOW_NS else None
+        return list(mapping_files)
+
+    def load(self, mapping_filename: str) -> List[Dict[str, Any]]:
+        """
+        Returns the valid objectives of a mapping file, reading it only if it changed.
+
+        The returned list is shared with other callers and must not be modified.
+
+        Args:
+            mapping_filename (str): The filename of the mapping in the data folder.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            json.JSONDecodeError: If the file is not valid JSON.
+            ValueError: If the file does not contain a list.
+            OSError: If the file cannot be read.
+        """
+        mapping_path = os.path.join(self.data_path, mapping_filename)
+        stat = os.stat(mapping_path)
+        entry = self._entries.get(mapping_filename)
+        if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            return entry[3]
+
+        with self._lock:
+            entry = self._entries.get(mapping_filename)
+            if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+                return entry[3]
+            read_at = time.time_ns()
+            with open(mapping_path, 'rb') as f:
+                content = f.read()
+            self.files_read += 1
+            digest = hashlib.sha256(content).hexdigest()
+            if entry is not None and entry[2] == digest:
+                objectives = entry[3]
+            else:
+                objectives = self._validate(mapping_filename, json.loads(content.decode('utf-8')))
+            mtime = stat.st_mtime_ns if read_at - stat.st_mtime_ns > RACY_WINDOW_NS else None
+            self._entries[mapping_filename] = (mtime, stat.st_size, digest, objectives)
+            return objectives
+
+    def _validate(self, mapping_filename: str, mapping_data: Any) -> List[Dict[str, Any]]:
+        """Returns the valid objectives of a decoded mapping file."""
+        if not isinstance(mapping_data, list):
+            raise ValueError(f"Objective mapping file '{mapping_filename}' does not contain a list.")
+        self.files_validated += 1
+        # Validate the objectives in one batch, skipping invalid ones
+        process = normalise_records if self.trusted else validate_records
+        objectives = process('Objective', mapping_data,
+                             ["objective %d of mapping '%s'" % (i, mapping_filename)
+                              for i in range(len(mapping_data))])
+        return [obj for obj in objectives if obj is not None]
+
+    def clear(self) -> None:
+        """Forgets the file listing and all cached mappings."""
+        with self._lock:
+            self._listing = None
+            self._entries = {}
@@ -0,0 +1,135 @@
+"""
+Cross-mapping comparison for the SOLVE-IT Knowledge Base Library.
+
+The objective mappings in data/ (solve-it.json, carrier.json, dfrws.json, ...)
+group the same techniques into different objectives. MappingComparison indexes
+several mappings at once, in one pass over their objectives, so they can be
+compared without activating each mapping in turn:
+
+    - matrix: the objectives each technique belongs to in every mapping
+    - unmapped: the techniques each mapping leaves out
+    - overlap: the Jaccard similarity of the technique sets of each pair of
+      objectives from two mappings, and of the mappings as a whole
+
+A technique belongs to the objectives listing it or any of its parent
+techniques, as in KnowledgeBase.get_objectives_for_technique(). Techniques
+listed by a mapping but missing from the knowledge base are ignored (they are
+reported by check_integrity).
+"""
+
+import itertools
+from typing import Dict, Any, List, Optional, Set
+
+
+def jaccard(first: Set[str], second: Set[str]) -> float:
+    """Returns the Jaccard similarity of two sets (0.0 if both are empty)."""
+    union = len(first | second)
+    return len(first & second) / union if union else 0.0
+
+
+class MappingComparison:
+    """
+    Objective membership of every technique in several mappings.
+
+    Attributes:
+        mappings (List[str]): The compared mapping names, in the order given.
+    """
+
+    def __init__(self, mappings: Dict[str, List[Dict[str, Any]]], technique_ids: List[str],
+                 descendants: Optional[Dict[str, List[str]]] = None):
+        """
+        Builds the index.
+
+        Args:
+            mappings (Dict[str, List[Dict[str, Any]]]): Objectives of each mapping, keyed by mapping name.
+            technique_ids (List[str]): IDs of the techniques in the knowledge base, in the order to report them.
+            descendants (Optional[Dict[str, List[str]]]): Subtechniques of each technique at any
+                depth; they belong to the objectives of the technique.
+        """
+        self.mappings: List[str] = list(mappings)
+        self._technique_ids = list(technique_ids)
+        known = set(technique_ids)
+        descendants = descendants or {}
+        # Mapping -> objective name -> technique IDs (with subtechniques)
+        self._objectives: Dict[str, Dict[str, Set[str]]] = {}
+        # Technique -> mapping -> objective names, in mapping order
+        self._memberships: Dict[str, Dict[str, List[str]]] = {technique_id: {} for technique_id in technique_ids}
+        for mapping_name, objectives in mappings.items():
+            members = self._objectives[mapping_name] = {}
+            for objective in objectives:
+                objective_name = objective.get('name')
+                technique_set = members.setdefault(objective_name, set())
+                for technique_id in objective.get('techniques') or []:
+                    for each_id in [technique_id] + list(descendants.get(technique_id, [])):
+                        if each_id not in known or each_id in technique_set:
+                            continue
+                        technique_set.add(each_id)
+                        names = self._memberships[each_id].setdefault(mapping_name, [])
+                        if objective_name not in names:
+                            names.append(objective_name)
+
+    def objectives(self, mapping_name: str) -> Dict[str, List[str]]:
+        """Returns the technique IDs (with subtechniques) of each objective of a mapping, sorted."""
+        return {name: sorted(members) for name, members in self._objectives.get(mapping_name, {}).items()}
+
+    def matrix(self) -> Dict[str, Dict[str, List[str]]]:
+        """
+        Returns the technique x mapping objective matrix.
+
+        Returns:
+            Dict[str, Dict[str, List[str]]]: For each technique (in technique_ids order), the
+                objective names it belongs to in each mapping (empty if it is unmapped).
+        """
+        return {technique_id: {mapping_name: list(self._memberships[technique_id].get(mapping_name, []))
+                               for mapping_name in self.mappings}
+                for technique_id in self._technique_ids}
+
+    def unmapped(self, mapping_name: str) -> List[str]:
+        """Returns the techniques in no objective of a mapping, in technique_ids order."""
+        return [technique_id for technique_id in self._technique_ids
+                if mapping_name not in self._memberships[technique_id]]
+
+    def mapped(self, mapping_name: str) -> Set[str]:
+        """Returns the techniques in at least one objective of a mapping."""
+        return set().union(*self._objectives.get(mapping_name, {}).values())
+
+    def overlap(self, first: str, second: str) -> Dict[str, Any]:
+        """
+        Compares the objectives of two mappings.
+
+        Returns:
+            Dict[str, Any]:
+                - 'mapping_a', 'mapping_b': the mapping names
+                - 'jaccard': the similarity of the sets of techniques mapped by each
+                - 'objectives': {'objective_a', 'objective_b', 'shared', 'jaccard'} for every
+                  pair of objectives sharing a technique, most similar first
+        """
+        pairs = []
+        for name_a, members_a in self._objectives.get(first, {}).items():
+            for name_b, members_b in self._objectives.get(second, {}).items():
+                shared = len(members_a & members_b)
+                if shared:
+                    pairs.append({'objective_a': name_a, 'objective_b': name_b, 'shared': shared,
+                                  'jaccard': round(jaccard(members_a, members_b), 4)})
+        pairs.sort(key=lambda pair: (-pair['jaccard'], -pair['shared']))
+        return {
+            'mapping_a': first,
+            'mapping_b': second,
+            'jaccard': round(jaccard(self.mapped(first), self.mapped(second)), 4),
+            'objectives': pairs,
+        }
+
+    def compare(self) -> Dict[str, Any]:
+        """
+        Returns the full comparison of the mappings.
+
+        Returns:
+            Dict[str, Any]: 'mappings' (names), 'matrix' (see matrix()), 'unmapped' (mapping ->
+                technique IDs) and 'overlap' (see overlap(), for every pair of mappings).
+        """
+        return {
+            'mappings': list(self.mappings),
+            'matrix': self.matrix(),
+            'unmapped': {mapping_name: self.unmapped(mapping_name) for mapping_name in self.mappings},
+            'overlap': [self.overlap(first, second) for first, second in itertools.combinations(self.mappings, 2)],
+        }
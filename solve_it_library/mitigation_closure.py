@@ -0,0 +1,207 @@
+"""
+Mitigation chain closure for the SOLVE-IT Knowledge Base Library.
+
+A mitigation can link to a technique (Mitigation.technique) that carries out
+the mitigation, and that technique has weaknesses and mitigations of its own.
+Following these links gives a dependency graph of techniques:
+
+    technique -> weakness -> mitigation -> linked technique -> weakness -> ...
+
+The graph is split into strongly connected components once (an iterative
+Tarjan search), so techniques whose mitigation chains lead back to themselves
+form one component and are reported as a cycle. Components are finished in
+reverse topological order, so the closure of each component (every technique,
+weakness and mitigation reachable from it) is the union of its own items and
+the memoised closures of the components it links to. Closures for every
+technique are therefore computed in one linear pass over the links.
+
+Links to missing techniques, weaknesses or mitigations are ignored here (they
+are reported by check_integrity).
+"""
+
+import copy
+from typing import Dict, Any, List, Optional, Tuple, FrozenSet
+
+# (technique ID, mitigation ID, linked technique ID)
+Link = Tuple[str, str, str]
+
+
+class MitigationClosure:
+    """
+    Techniques, weaknesses and mitigations reachable through Mitigation.technique links.
+
+    Attributes:
+        cycles (List[List[str]]): The technique IDs of each group of techniques whose
+            mitigation chains lead back to each other, in load order.
+    """
+
+    def __init__(self, techniques: Dict[str, Dict[str, Any]], weaknesses: Dict[str, Dict[str, Any]],
+                 mitigations: Dict[str, Dict[str, Any]]):
+        """
+        Builds the closure of every technique.
+
+        Args:
+            techniques (Dict[str, Dict[str, Any]]): Techniques keyed by ID.
+            weaknesses (Dict[str, Dict[str, Any]]): Weaknesses keyed by ID.
+            mitigations (Dict[str, Dict[str, Any]]): Mitigations keyed by ID.
+        """
+        self._techniques = techniques
+        self._order = {technique_id: position for position, technique_id in enumerate(techniques)}
+        # Technique -> its existing weaknesses and their existing mitigations, in the order listed
+        self._weaknesses: Dict[str, Tuple[str, ...]] = {}
+        self._mitigations: Dict[str, Tuple[str, ...]] = {}
+        # Technique -> links to other techniques through its mitigations
+        self._links: Dict[str, Tuple[Link, ...]] = {}
+        for technique_id, technique in techniques.items():
+            weakness_ids: Dict[str, None] = {}
+            mitigation_ids: Dict[str, None] = {}
+            links: Dict[Link, None] = {}
+            for weakness_id in technique.get('weaknesses') or []:
+                weakness = weaknesses.get(weakness_id)
+                if weakness is None:
+                    continue
+                weakness_ids[weakness_id] = None
+                for mitigation_id in weakness.get('mitigations') or []:
+                    mitigation = mitigations.get(mitigation_id)
+                    if mitigation is None:
+                        continue
+                    mitigation_ids[mitigation_id] = None
+                    linked_id = mitigation.get('technique')
+                    if linked_id and linked_id in techniques:
+                        links[(technique_id, mitigation_id, linked_id)] = None
+            self._weaknesses[technique_id] = tuple(weakness_ids)
+            self._mitigations[technique_id] = tuple(mitigation_ids)
+            self._links[technique_id] = tuple(links)
+
+        # Component of each technique, and per component: members, reachable items and depth
+        self._component: Dict[str, int] = {}
+        self._members: List[Tuple[str, ...]] = []
+        self._reach: List[Tuple[FrozenSet[str], FrozenSet[str], FrozenSet[str]]] = []
+        self._depth: List[int] = []
+        self._find_components()
+        self.cycles: List[List[str]] = [list(members) for index, members in enumerate(self._members)
+                                        if self._is_cycle(index)]
+        self.cycles.sort(key=lambda cycle: self._order[cycle[0]])
+
+        # Closures assembled on first request
+        self._closures: Dict[str, Dict[str, Any]] = {}
+
+    def _find_components(self) -> None:
+        """
+        Splits the link graph into strongly connected components (iterative Tarjan search),
+        memoising the reachable items and link depth of each component as it is finished.
+        """
+        index: Dict[str, int] = {}
+        lowlink: Dict[str, int] = {}
+        stack: List[str] = []
+        on_stack = set()
+
+        for root_id in self._techniques:
+            if root_id in index:
+                continue
+            index[root_id] = lowlink[root_id] = len(index)
+            stack.append(root_id)
+            on_stack.add(root_id)
+            work = [(root_id, iter(self._links[root_id]))]
+            while work:
+                technique_id, links = work[-1]
+                link = next(links, None)
+                if link is not None:
+                    linked_id = link[2]
+                    if linked_id not in index:
+                        index[linked_id] = lowlink[linked_id] = len(index)
+                        stack.append(linked_id)
+                        on_stack.add(linked_id)
+                        work.append((linked_id, iter(self._links[linked_id])))
+                    elif linked_id in on_stack:
+                        lowlink[technique_id] = min(lowlink[technique_id], index[linked_id])
+                    continue
+
+                work.pop()
+                if work:
+                    caller_id = work[-1][0]
+                    lowlink[caller_id] = min(lowlink[caller_id], lowlink[technique_id])
+                if lowlink[technique_id] == index[technique_id]:
+                    members = []
+                    while True:
+                        member_id = stack.pop()
+                        on_stack.discard(member_id)
+                        members.append(member_id)
+                        if member_id == technique_id:
+                            break
+                    self._add_component(sorted(members, key=self._order.__getitem__))
+
+    def _add_component(self, members: List[str]) -> None:
+        """Records a finished component; every component it links to is already finished."""
+        component = len(self._members)
+        for member_id in members:
+            self._component[member_id] = component
+        techniques = set(members)
+        weaknesses = set()
+        mitigations = set()
+        depth = 0
+        for member_id in members:
+            weaknesses.update(self._weaknesses[member_id])
+            mitigations.update(self._mitigations[member_id])
+            for _, _, linked_id in self._links[member_id]:
+                linked = self._component[linked_id]
+                if linked == component:
+                    continue
+                linked_techniques, linked_weaknesses, linked_mitigations = self._reach[linked]
+                techniques.update(linked_techniques)
+                weaknesses.update(linked_weaknesses)
+                mitigations.update(linked_mitigations)
+                depth = max(depth, self._depth[linked] + 1)
+        self._members.append(tuple(members))
+        self._reach.append((frozenset(techniques), frozenset(weaknesses), frozenset(mitigations)))
+        self._depth.append(depth)
+
+    def _is_cycle(self, component: int) -> bool:
+        """Returns True if a component's techniques link back to themselves."""
+        members = self._members[component]
+        if len(members) > 1:
+            return True
+        return any(linked_id == members[0] for _, _, linked_id in self._links[members[0]])
+
+    def closure(self, technique_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns everything a technique depends on through its mitigations' linked techniques.
+
+        Returns:
+            Optional[Dict[str, Any]]: None if the technique is not found, otherwise:
+                - 'technique': the technique ID
+                - 'techniques': the technique, then every technique reachable from it, sorted
+                - 'weaknesses', 'mitigations': the weaknesses and mitigations of those techniques, sorted
+                - 'links': the dependency DAG, as {'technique', 'mitigation', 'linked_technique'}
+                  for each link between reachable techniques that does not close a cycle
+                - 'cycles': the cycles reachable from the technique (see the cycles attribute)
+                - 'depth': the length of the longest chain in 'links' starting from the technique
+                  (0 if it links to no technique outside its own cycle)
+        """
+        closure = self._closures.get(technique_id)
+        if closure is None:
+            component = self._component.get(technique_id)
+            if component is None:
+                return None
+            techniques, weaknesses, mitigations = self._reach[component]
+            reached = [technique_id] + sorted(techniques - {technique_id})
+            links = []
+            for each_id in reached:
+                for source_id, mitigation_id, linked_id in self._links[each_id]:
+                    if self._component[source_id] != self._component[linked_id]:
+                        links.append({'technique': source_id, 'mitigation': mitigation_id,
+                                      'linked_technique': linked_id})
+            closure = self._closures[technique_id] = {
+                'technique': technique_id,
+                'techniques': reached,
+                'weaknesses': sorted(weaknesses),
+                'mitigations': sorted(mitigations),
+                'links': links,
+                'cycles': [cycle for cycle in self.cycles if cycle[0] in techniques],
+                'depth': self._depth[component],
+            }
+        return copy.deepcopy(closure)
+
+    def closures(self) -> Dict[str, Dict[str, Any]]:
+        """Returns the closure of every technique, keyed by technique ID in load order."""
+        return {technique_id: self.closure(technique_id) for technique_id in self._techniques}
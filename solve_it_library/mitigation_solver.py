@@ -0,0 +1,328 @@
+"""
+Mitigation set solver for the SOLVE-IT Knowledge Base Library.
+
+Answers the question "which smallest set of mitigations covers every weakness
+of these techniques?" as an unweighted set cover problem. Weakness sets are
+packed into integer bitsets so coverage checks are single bitwise operations.
+A greedy solver is always run; an exact branch-and-bound search is used for
+small inputs to prove (or improve on) the greedy result.
+"""
+
+import json
+import logging
+from typing import Dict, Any, Optional, List, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Above this number of candidate mitigations the exact search is skipped by default
+EXACT_MAX_CANDIDATES = 40
+# Upper limit on branch-and-bound nodes before falling back to the best found plan
+EXACT_NODE_LIMIT = 200000
+
+IMPLEMENTED_STATUSES = ('Y',)
+
+
+def _popcount(mask: int) -> int:
+    """Returns the number of set bits in a bitset (int.bit_count needs Python 3.10+)."""
+    return bin(mask).count('1')
+
+
+def load_lab_config(lab_config: Union[str, Dict[str, Any], None]) -> Dict[str, Any]:
+    """
+    Loads a lab configuration (as used by generate_evaluation.py).
+
+    Args:
+        lab_config (Union[str, Dict[str, Any], None]): Path to a lab config JSON
+            file, an already loaded lab config dictionary, or None.
+
+    Returns:
+        Dict[str, Any]: The lab configuration data (empty if none supplied).
+
+    Raises:
+        ValueError: If the lab config file cannot be read or decoded.
+    """
+    if lab_config is None:
+        return {}
+    if isinstance(lab_config, dict):
+        return lab_config
+    try:
+        with open(lab_config, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (IOError, json.JSONDecodeError) as e:
+        raise ValueError(f"Error loading lab config file: {str(e)}")
+
+
+def get_implemented_mitigations(lab_config_data: Dict[str, Any]) -> List[str]:
+    """
+    Extracts the mitigation IDs a lab has marked as implemented.
+
+    A mitigation with status 'Y' against any technique/weakness entry in the lab
+    config is treated as implemented lab-wide.
+
+    Args:
+        lab_config_data (Dict[str, Any]): Loaded lab configuration data.
+
+    Returns:
+        List[str]: Sorted list of implemented mitigation IDs.
+    """
+    implemented = set()
+    for technique_data in lab_config_data.values():
+        if not isinstance(technique_data, dict):
+            # e.g. the "Lab config notes" entry
+            continue
+        for weakness_data in technique_data.values():
+            if not isinstance(weakness_data, dict):
+                continue
+            for mitigation_id, mitigation_data in weakness_data.items():
+                if not isinstance(mitigation_data, dict):
+                    continue
+                status = str(mitigation_data.get('status', '')).strip().upper()
+                if status in IMPLEMENTED_STATUSES:
+                    implemented.add(mitigation_id)
+    return sorted(implemented)
+
+
+def _greedy_cover(universe: int, candidates: List[Tuple[str, int]]) -> List[str]:
+    """
+    Greedy set cover over bitsets.
+
+    Args:
+        universe: Bitset of the weaknesses that need covering.
+        candidates: List of (mitigation_id, weakness bitset) tuples, sorted by ID.
+
+    Returns:
+        List[str]: Mitigation IDs in the order they were picked.
+    """
+    uncovered = universe
+    chosen = []
+    while uncovered:
+        best_id = None
+        best_mask = 0
+        best_gain = 0
+        for mitigation_id, mask in candidates:
+            gain = _popcount(mask & uncovered)
+            if gain > best_gain:
+                best_id, best_mask, best_gain = mitigation_id, mask, gain
+        if best_id is None:
+            break
+        chosen.append(best_id)
+        uncovered &= ~best_mask
+    return chosen
+
+
+def _exact_cover(universe: int, candidates: List[Tuple[str, int]], upper_bound: List[str],
+                 node_limit: int = EXACT_NODE_LIMIT) -> Tuple[List[str], bool]:
+    """
+    Branch-and-bound minimum set cover over bitsets.
+
+    Branches on the uncovered weakness with the fewest covering mitigations and
+    prunes with the bound ceil(uncovered / largest candidate set).
+
+    Args:
+        universe: Bitset of the weaknesses that need covering.
+        candidates: List of (mitigation_id, weakness bitset) tuples.
+        upper_bound: A known feasible cover (e.g. the greedy result).
+        node_limit: Maximum number of search nodes to expand.
+
+    Returns:
+        Tuple[List[str], bool]: The best cover found, and whether the search
+            completed (i.e. the cover is proven minimal).
+    """
+    best = list(upper_bound)
+    masks = dict(candidates)
+    max_size = max((_popcount(mask) for _, mask in candidates), default=1) or 1
+
+    # Covering mitigations per weakness bit, largest sets first
+    covering: Dict[int, List[str]] = {}
+    for mitigation_id, mask in sorted(candidates, key=lambda c: (-_popcount(c[1]), c[0])):
+        remaining = mask
+        while remaining:
+            low_bit = remaining & -remaining
+            covering.setdefault(low_bit, []).append(mitigation_id)
+            remaining ^= low_bit
+
+    nodes = 0
+    completed = True
+
+    def search(uncovered: int, chosen: List[str]) -> None:
+        nonlocal best, nodes, completed
+        if not uncovered:
+            if len(chosen) < len(best):
+                best = list(chosen)
+            return
+        nodes += 1
+        if nodes > node_limit:
+            completed = False
+            return
+        lower_bound = -(-_popcount(uncovered) // max_size)
+        if len(chosen) + lower_bound >= len(best):
+            return
+
+        # Pick the uncovered weakness with the fewest options
+        branch_options = None
+        remaining = uncovered
+        while remaining:
+            low_bit = remaining & -remaining
+            options = covering.get(low_bit, [])
+            if branch_options is None or len(options) < len(branch_options):
+                branch_options = options
+                if len(options) <= 1:
+                    break
+            remaining ^= low_bit
+
+        for mitigation_id in branch_options or []:
+            chosen.append(mitigation_id)
+            search(uncovered & ~masks[mitigation_id], chosen)
+            chosen.pop()
+            if not completed:
+                return
+
+    search(universe, [])
+    return best, completed
+
+
+def solve_minimal_mitigations(kb: Any,
+                              technique_ids: List[str],
+                              lab_config: Union[str, Dict[str, Any], None] = None,
+                              exact: Optional[bool] = None) -> Dict[str, Any]:
+    """
+    Computes a minimal set of mitigations covering every weakness of the given techniques.
+
+    Weaknesses already addressed by a mitigation implemented in the lab config
+    are treated as covered. Weaknesses with no mitigations at all cannot be
+    covered and are reported separately. Mitigation IDs that weaknesses list
+    but the knowledge base does not define are left out of the plan and
+    reported; a weakness listing only such IDs counts as unmitigable.
+
+    Args:
+        kb: A loaded KnowledgeBase instance.
+        technique_ids (List[str]): Technique IDs in the workflow/SOP.
+        lab_config (Union[str, Dict[str, Any], None]): Optional lab config (path
+            or loaded dictionary) listing already implemented mitigations.
+        exact (Optional[bool]): True forces the branch-and-bound search, False
+            uses greedy only. If None, the exact search is used when there are
+            at most EXACT_MAX_CANDIDATES candidate mitigations.
+
+    Returns:
+        Dict[str, Any]: Dictionary containing:
+            - 'techniques': technique IDs considered (unknown IDs are dropped)
+            - 'weaknesses': all weakness IDs in scope
+            - 'implemented_mitigations': mitigations implemented per the lab config
+            - 'already_mitigated': weaknesses covered by implemented mitigations
+            - 'unmitigable_weaknesses': weaknesses with no (defined) mitigations listed
+            - 'missing_mitigations': mitigation IDs listed by weaknesses in scope
+              but not defined in the knowledge base
+            - 'plan': ranked list of {'rank', 'id', 'name', 'covers', 'new_coverage'}
+            - 'method': 'greedy' or 'exact'
+            - 'optimal': True if the plan is proven minimal
+    """
+    lab_config_data = load_lab_config(lab_config)
+    implemented = set(get_implemented_mitigations(lab_config_data))
+
+    # Collect weaknesses in scope, preserving first-seen order
+    techniques_in_scope = []
+    weakness_ids: List[str] = []
+    seen_weaknesses = set()
+    for technique_id in technique_ids:
+        technique = kb.get_technique(technique_id)
+        if technique is None:
+            logger.warning("Technique %s not found, excluded from mitigation plan", technique_id)
+            continue
+        if technique_id not in techniques_in_scope:
+            techniques_in_scope.append(technique_id)
+        for weakness_id in technique.get('weaknesses', []):
+            if weakness_id not in seen_weaknesses and kb.get_weakness(weakness_id) is not None:
+                seen_weaknesses.add(weakness_id)
+                weakness_ids.append(weakness_id)
+
+    bit_for_weakness = {weakness_id: 1 << i for i, weakness_id in enumerate(weakness_ids)}
+
+    # Pack the weakness set of each candidate mitigation into a bitset
+    mitigation_masks: Dict[str, int] = {}
+    unmitigable = []
+    missing_mitigations = set()
+    already_covered = 0
+    for weakness_id in weakness_ids:
+        bit = bit_for_weakness[weakness_id]
+        mitigation_ids = []
+        for mitigation_id in kb.get_weakness(weakness_id).get('mitigations', []):
+            if kb.get_mitigation(mitigation_id) is None:
+                missing_mitigations.add(mitigation_id)
+            else:
+                mitigation_ids.append(mitigation_id)
+        if not mitigation_ids:
+            unmitigable.append(weakness_id)
+        for mitigation_id in mitigation_ids:
+            if mitigation_id in implemented:
+                already_covered |= bit
+            mitigation_masks[mitigation_id] = mitigation_masks.get(mitigation_id, 0) | bit
+
+    if missing_mitigations:
+        logger.warning("Mitigations %s not found, excluded from mitigation plan", ', '.join(sorted(missing_mitigations)))
+
+    coverable = 0
+    for mask in mitigation_masks.values():
+        coverable |= mask
+    universe = coverable & ~already_covered
+
+    candidates = sorted(
+        (mitigation_id, mask & universe)
+        for mitigation_id, mask in mitigation_masks.items()
+        if mitigation_id not in implemented and mask & universe
+    )
+
+    # Drop candidates whose weakness set is a subset of another's (never needed in a minimum cover).
+    # Largest sets come first, so a set is only compared with the kept sets at least as large
+    # that also cover its lowest weakness bit (of equal sets, the lowest ID is kept).
+    kept = []
+    kept_masks_by_bit: Dict[int, List[int]] = {}
+    for mitigation_id, mask in sorted(candidates, key=lambda c: (-_popcount(c[1]), c[0])):
+        if any(mask | other_mask == other_mask for other_mask in kept_masks_by_bit.get(mask & -mask, ())):
+            continue
+        kept.append((mitigation_id, mask))
+        remaining = mask
+        while remaining:
+            low_bit = remaining & -remaining
+            kept_masks_by_bit.setdefault(low_bit, []).append(mask)
+            remaining ^= low_bit
+    candidates = sorted(kept)
+
+    chosen = _greedy_cover(universe, candidates)
+    method = 'greedy'
+    optimal = len(chosen) <= 1
+
+    use_exact = exact if exact is not None else len(candidates) <= EXACT_MAX_CANDIDATES
+    if use_exact and len(chosen) > 1:
+        exact_chosen, optimal = _exact_cover(universe, candidates, chosen)
+        method = 'exact'
+        if len(exact_chosen) < len(chosen):
+            chosen = exact_chosen
+
+    # Rank by marginal coverage: largest new contribution first
+    masks = dict(candidates)
+    plan = []
+    uncovered = universe
+    remaining = list(chosen)
+    while remaining:
+        remaining.sort(key=lambda m: (-_popcount(masks[m] & uncovered), m))
+        mitigation_id = remaining.pop(0)
+        plan.append({
+            'rank': len(plan) + 1,
+            'id': mitigation_id,
+            'name': kb.get_mitigation(mitigation_id).get('name', ''),
+            'covers': [w for w in weakness_ids if bit_for_weakness[w] & masks[mitigation_id]],
+            'new_coverage': _popcount(masks[mitigation_id] & uncovered),
+        })
+        uncovered &= ~masks[mitigation_id]
+
+    return {
+        'techniques': techniques_in_scope,
+        'weaknesses': weakness_ids,
+        'implemented_mitigations': sorted(implemented),
+        'already_mitigated': [w for w in weakness_ids if bit_for_weakness[w] & already_covered],
+        'unmitigable_weaknesses': unmitigable,
+        'missing_mitigations': sorted(missing_mitigations),
+        'plan': plan,
+        'method': method,
+        'optimal': optimal,
+    }
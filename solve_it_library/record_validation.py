@@ -0,0 +1,187 @@
+"""
+Batched record validation for the SOLVE-IT Knowledge Base Library.
+
+Validates a whole collection of raw JSON records with one Pydantic TypeAdapter
+call, instead of a model_validate()/model_dump() pair per file, and converts
+the result to the plain dictionaries the KnowledgeBase stores. Records whose
+keys are exactly the model's fields (and the model has no aliases) are kept as
+loaded, since validation would not change them; the others are dumped in one
+batch.
+
+normalise_records() produces the same dictionaries without validating, for
+trusted data that has already been validated (e.g. by CI, or checked against
+a known hash).
+
+Pydantic and the models are imported on first use (see get_model);
+normalise_records() works from a copy of the model fields and never imports them.
+"""
+
+import logging
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Fields of each model as (field name, input key, required, default factory), in model
+# order, so trusted records are normalised without importing Pydantic. Must match
+# .models (checked by the unit tests).
+_OPTIONAL_LIST = (False, list)
+_OPTIONAL_STR = (False, lambda: None)
+NORMALISED_FIELDS: Dict[str, Tuple[Tuple[str, str, bool, Any], ...]] = {
+    'Technique': (
+        ('id', 'id', True, None),
+        ('name', 'name', True, None),
+        ('description', 'description', True, None),
+        ('synonyms', 'synonyms') + _OPTIONAL_LIST,
+        ('details', 'details') + _OPTIONAL_STR,
+        ('subtechniques', 'subtechniques') + _OPTIONAL_LIST,
+        ('examples', 'examples') + _OPTIONAL_LIST,
+        ('weaknesses', 'weaknesses') + _OPTIONAL_LIST,
+        ('CASE_output_classes', 'CASE_output_classes') + _OPTIONAL_LIST,
+        ('references', 'references') + _OPTIONAL_LIST,
+    ),
+    'Weakness': (
+        ('id', 'id', True, None),
+        ('name', 'name', True, None),
+        ('description', 'description') + _OPTIONAL_STR,
+        ('mitigations', 'mitigations') + _OPTIONAL_LIST,
+        ('INCOMP', 'INCOMP') + _OPTIONAL_STR,
+        ('INAC_EX', 'INAC-EX') + _OPTIONAL_STR,
+        ('INAC_AS', 'INAC-AS') + _OPTIONAL_STR,
+        ('INAC_ALT', 'INAC-ALT') + _OPTIONAL_STR,
+        ('INAC_COR', 'INAC-COR') + _OPTIONAL_STR,
+        ('MISINT', 'MISINT') + _OPTIONAL_STR,
+        ('references', 'references') + _OPTIONAL_LIST,
+    ),
+    'Mitigation': (
+        ('id', 'id', True, None),
+        ('name', 'name', True, None),
+        ('description', 'description') + _OPTIONAL_STR,
+        ('technique', 'technique') + _OPTIONAL_STR,
+        ('references', 'references') + _OPTIONAL_LIST,
+    ),
+    'Objective': (
+        ('name', 'name', True, None),
+        ('description', 'description', True, None),
+        ('techniques', 'techniques') + _OPTIONAL_LIST,
+    ),
+}
+
+
+def get_model(model_name: str) -> Any:
+    """
+    Returns a Pydantic model class from .models by name.
+
+    Pydantic and the models are only imported when a record is first validated,
+    so processes that load from a data pack or only index records in lazy mode
+    do not pay for the import.
+    """
+    from . import models
+    return getattr(models, model_name)
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model_name: str) -> Any:
+    """Returns a TypeAdapter validating and dumping lists of a model."""
+    from pydantic import TypeAdapter
+    return TypeAdapter(List[get_model(model_name)])
+
+
+@lru_cache(maxsize=None)
+def _fields(model_name: str) -> Tuple[Tuple[str, str, Any], ...]:
+    """Returns (field name, input key, field info) for each field of a model."""
+    return tuple((name, field.alias or name, field) for name, field in get_model(model_name).model_fields.items())
+
+
+@lru_cache(maxsize=None)
+def _reusable_keys(model_name: str) -> Optional[frozenset]:
+    """Keys a raw record must have exactly to be stored as loaded (None if the model uses aliases)."""
+    fields = _fields(model_name)
+    if any(name != key for name, key, _ in fields):
+        return None
+    return frozenset(name for name, _, _ in fields)
+
+
+def validate_records(model_name: str, records: List[Any], sources: List[str]) -> List[Optional[Dict[str, Any]]]:
+    """
+    Validates raw records against a model in one batch.
+
+    Args:
+        model_name (str): Name of the model ('Technique', 'Weakness', 'Mitigation' or 'Objective').
+        records (List[Any]): Raw records, as decoded from JSON.
+        sources (List[str]): Description of where each record came from (e.g. its file
+            path), used in log messages.
+
+    Returns:
+        List[Optional[Dict[str, Any]]]: The validated record for each input, in the
+            same shape as model_dump(), or None where validation failed (logged).
+    """
+    from pydantic import ValidationError
+    adapter = _list_adapter(model_name)
+    results: List[Optional[Dict[str, Any]]] = [None] * len(records)
+    positions = list(range(len(records)))
+    try:
+        validated = adapter.validate_python(records)
+    except ValidationError as e:
+        # Log each failing record with its own errors, then validate the rest
+        failed = sorted({error['loc'][0] for error in e.errors() if error['loc']})
+        model_class = get_model(model_name)
+        for position in failed:
+            try:
+                model_class.model_validate(records[position])
+            except ValidationError as record_error:
+                logger.error("Validation error in %s: %s", sources[position], record_error.errors())
+        failed_positions = set(failed)
+        positions = [position for position in positions if position not in failed_positions]
+        validated = adapter.validate_python([records[position] for position in positions])
+
+    reusable_keys = _reusable_keys(model_name)
+    to_dump = []
+    for position, model in zip(positions, validated):
+        if reusable_keys is not None and records[position].keys() == reusable_keys:
+            results[position] = records[position]
+        else:
+            to_dump.append((position, model))
+    if to_dump:
+        dumped = adapter.dump_python([model for _, model in to_dump])
+        for (position, _), record in zip(to_dump, dumped):
+            results[position] = record
+    return results
+
+
+def normalise_records(model_name: str, records: List[Any], sources: List[str]) -> List[Optional[Dict[str, Any]]]:
+    """
+    Converts trusted raw records to the shape of model_dump() without validating them.
+
+    Missing fields get their defaults and aliased keys (e.g. 'INAC-EX') are renamed
+    to the field names (e.g. 'INAC_EX'). Values are not checked, and Pydantic is
+    not imported (see NORMALISED_FIELDS).
+
+    Args:
+        model_name (str): Name of the model the records conform to.
+        records (List[Any]): Raw records, as decoded from JSON.
+        sources (List[str]): Description of where each record came from, used in log messages.
+
+    Returns:
+        List[Optional[Dict[str, Any]]]: The normalised records, or None where a record
+            is not an object or lacks a required field (logged).
+    """
+    fields = NORMALISED_FIELDS[model_name]
+    results: List[Optional[Dict[str, Any]]] = []
+    for record, source in zip(records, sources):
+        if not isinstance(record, dict):
+            logger.error("Record in %s is not an object", source)
+            results.append(None)
+            continue
+        normalised = {}
+        for name, key, required, default_factory in fields:
+            if key in record:
+                normalised[name] = record[key]
+            elif required:
+                logger.error("Missing required field '%s' in %s", key, source)
+                normalised = None
+                break
+            else:
+                normalised[name] = default_factory()
+        results.append(normalised)
+    return results
@@ -0,0 +1,634 @@
+"""
+Search index for the SOLVE-IT Knowledge Base Library.
+
+Pre-computes per-field token statistics (term frequencies, field lengths,
+document frequencies) for each collection when the knowledge base is loaded,
+so ranked searches only touch the postings of the query terms instead of
+re-scanning and re-tokenising every item.
+"""
+
+import math
+import re
+import heapq
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Tuple, Iterable, Iterator
+
+# Text fields that are indexed, in display order
+SEARCH_FIELDS = ('name', 'description', 'synonyms', 'details', 'examples', 'references')
+
+# Default BM25F field weights - matches in names and synonyms count for more
+DEFAULT_FIELD_WEIGHTS: Dict[str, float] = {
+    'name': 3.0,
+    'synonyms': 2.0,
+    'description': 1.0,
+    'examples': 1.0,
+    'details': 0.5,
+    'references': 0.25,
+}
+
+# Default weights applied to match counts by the default (bucketed) scoring
+DEFAULT_MATCH_WEIGHTS: Dict[str, float] = {
+    'name': 1.0,
+    'description': 1.0,
+    'synonyms': 3.0,
+    'examples': 3.0,
+    'details': 1.0,
+    'references': 1.0,
+}
+
+# Fields whose vocabulary is used for typo-tolerant (fuzzy) matching
+FUZZY_FIELDS = ('name', 'description', 'synonyms', 'examples')
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TOKEN_PATTERN = re.compile(r'\b\w+\b')
+_PHRASE_PATTERN = re.compile(r'"([^"]+)"')
+
+# Words ignored in search queries
+STOP_WORDS = frozenset({'and', 'or', 'not', 'the', 'a', 'an', 'is', 'are', 'was', 'were'})
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Splits lower-cased text into word tokens, matching the query parser.
+
+    Args:
+        text (str): Text to tokenize.
+
+    Returns:
+        List[str]: List of word tokens.
+    """
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+@lru_cache(maxsize=256)
+def parse_query(keywords: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """
+    Parses a search query into individual terms and quoted phrases.
+
+    Results are memoised, so repeated queries are only parsed once.
+
+    Args:
+        keywords (str): The search query string.
+
+    Returns:
+        Tuple[Tuple[str, ...], Tuple[str, ...]]: (lower-cased terms, lower-cased phrases).
+    """
+    # Extract quoted phrases first
+    phrases = tuple(phrase.lower().strip() for phrase in _PHRASE_PATTERN.findall(keywords))
+
+    # Remove quoted phrases from the original string
+    keywords_without_phrases = _PHRASE_PATTERN.sub('', keywords)
+
+    # Filter out very short words and common stop words
+    terms = tuple(word for word in tokenize(keywords_without_phrases)
+                  if len(word) > 2 and word not in STOP_WORDS)
+    return terms, phrases
+
+
+def field_text(item: Dict[str, Any], field: str) -> str:
+    """
+    Returns the normalised (lower-cased) text of a field, joining list fields.
+
+    Args:
+        item (Dict[str, Any]): The item data dictionary.
+        field (str): The field name.
+
+    Returns:
+        str: Lower-cased field text ('' if the field is missing or empty).
+    """
+    value = item.get(field)
+    if not value:
+        return ''
+    if isinstance(value, list):
+        return '\n'.join(str(v) for v in value).lower()
+    return str(value).lower()
+
+
+class CollectionIndex:
+    """
+    Inverted index and BM25 statistics for a single collection.
+
+    Attributes:
+        doc_count (int): Number of items in the collection.
+        positions (Dict[str, int]): Load order of each item ID (used to keep result order stable).
+        texts (Dict[str, Dict[str, str]]): Lower-cased text per item ID and field.
+        field_lengths (Dict[str, Dict[str, int]]): Token count per item ID and field.
+        avg_field_lengths (Dict[str, float]): Average token count per field.
+        postings (Dict[str, Dict[str, Dict[str, int]]]): token -> item ID -> field -> term frequency.
+    """
+
+    def __init__(self, collection: Dict[str, Dict[str, Any]]):
+        self.doc_count: int = len(collection)
+        self.positions: Dict[str, int] = {item_id: i for i, item_id in enumerate(collection)}
+        self.texts: Dict[str, Dict[str, str]] = {}
+        self.field_lengths: Dict[str, Dict[str, int]] = {}
+        self.avg_field_lengths: Dict[str, float] = {}
+        self.postings: Dict[str, Dict[str, Dict[str, int]]] = {}
+
+        totals = {field: 0 for field in SEARCH_FIELDS}
+        for item_id, item in collection.items():
+            self.texts[item_id] = {}
+            self.field_lengths[item_id] = {}
+            for field in SEARCH_FIELDS:
+                text = field_text(item, field)
+                if not text:
+                    continue
+                tokens = tokenize(text)
+                self.texts[item_id][field] = text
+                self.field_lengths[item_id][field] = len(tokens)
+                totals[field] += len(tokens)
+                for token in tokens:
+                    fields = self.postings.setdefault(token, {}).setdefault(item_id, {})
+                    fields[field] = fields.get(field, 0) + 1
+
+        for field, total in totals.items():
+            self.avg_field_lengths[field] = (total / self.doc_count) if self.doc_count else 0.0
+
+    def idf(self, doc_freq: int) -> float:
+        """
+        BM25 inverse document frequency (always positive).
+
+        Args:
+            doc_freq (int): Number of items containing the term.
+
+        Returns:
+            float: The IDF weight.
+        """
+        return math.log(1.0 + (self.doc_count - doc_freq + 0.5) / (doc_freq + 0.5))
+
+    def matching_tokens(self, term: str, substring_match: bool) -> List[str]:
+        """
+        Finds the indexed tokens a query term matches.
+
+        Args:
+            term (str): Lower-cased query term.
+            substring_match (bool): If True, any token containing the term matches.
+
+        Returns:
+            List[str]: Matching vocabulary tokens.
+        """
+        if not substring_match:
+            return [term] if term in self.postings else []
+        return [token for token in self.postings if term in token]
+
+    def term_frequencies(self, term: str, substring_match: bool,
+                         alternatives: Optional[List[str]] = None) -> Dict[str, Dict[str, int]]:
+        """
+        Gets per-item, per-field frequencies of a single query term.
+
+        Args:
+            term (str): Lower-cased query term.
+            substring_match (bool): If True, any token containing the term matches.
+            alternatives (Optional[List[str]]): Spellings to match instead of the
+                term itself (e.g. fuzzy expansions).
+
+        Returns:
+            Dict[str, Dict[str, int]]: item ID -> field -> term frequency.
+        """
+        tokens = []
+        for spelling in (alternatives or [term]):
+            tokens.extend(t for t in self.matching_tokens(spelling, substring_match) if t not in tokens)
+        if not tokens:
+            return {}
+        if len(tokens) == 1:
+            return self.postings[tokens[0]]
+        merged: Dict[str, Dict[str, int]] = {}
+        for token in tokens:
+            for item_id, fields in self.postings[token].items():
+                merged_fields = merged.setdefault(item_id, {})
+                for field, tf in fields.items():
+                    merged_fields[field] = merged_fields.get(field, 0) + tf
+        return merged
+
+    def phrase_frequencies(self, phrase: str, substring_match: bool) -> Dict[str, Dict[str, int]]:
+        """
+        Gets per-item, per-field occurrence counts of a quoted phrase.
+
+        Candidate items are narrowed using the postings of the phrase's tokens
+        before the phrase itself is verified against the field text.
+
+        Args:
+            phrase (str): Lower-cased phrase.
+            substring_match (bool): If True, the phrase may occur inside words.
+
+        Returns:
+            Dict[str, Dict[str, int]]: item ID -> field -> phrase frequency.
+        """
+        candidates: Optional[set] = None
+        for token in tokenize(phrase):
+            item_ids = set(self.term_frequencies(token, substring_match))
+            candidates = item_ids if candidates is None else candidates & item_ids
+            if not candidates:
+                return {}
+        if candidates is None:
+            candidates = set(self.texts)
+
+        escaped_phrase = re.escape(phrase)
+        pattern = re.compile(escaped_phrase if substring_match else r'\b' + escaped_phrase + r'\b')
+        frequencies: Dict[str, Dict[str, int]] = {}
+        for item_id in candidates:
+            for field, text in self.texts[item_id].items():
+                count = len(pattern.findall(text))
+                if count:
+                    frequencies.setdefault(item_id, {})[field] = count
+        return frequencies
+
+    def candidates(self,
+                   terms: List[str],
+                   phrases: List[str],
+                   substring_match: bool,
+                   search_logic: str,
+                   fields: Iterable[str],
+                   term_alternatives: Optional[Dict[str, List[str]]] = None) -> List[str]:
+        """
+        Finds the items that can possibly match a query, using the postings only.
+
+        An item is a candidate for a term if one of the term's matching tokens
+        occurs in one of the given fields; phrases require all of their tokens.
+        Candidates still need verifying against the field text.
+
+        Args:
+            terms (List[str]): Lower-cased query terms.
+            phrases (List[str]): Lower-cased quoted phrases.
+            substring_match (bool): Whether terms may match inside words.
+            search_logic (str): 'AND' intersects the candidates of each term/phrase, 'OR' unites them.
+            fields (Iterable[str]): Fields to consider.
+            term_alternatives (Optional[Dict[str, List[str]]]): Spellings each term
+                should match instead of itself (used by fuzzy search).
+
+        Returns:
+            List[str]: Candidate item IDs in load order.
+        """
+        fields = set(fields)
+        term_alternatives = term_alternatives or {}
+
+        def in_fields(frequencies: Dict[str, Dict[str, int]]) -> set:
+            return {item_id for item_id, item_fields in frequencies.items()
+                    if any(field in fields for field in item_fields)}
+
+        unit_candidates = [in_fields(self.term_frequencies(term, substring_match, term_alternatives.get(term)))
+                           for term in terms]
+        for phrase in phrases:
+            phrase_items: Optional[set] = None
+            for token in tokenize(phrase):
+                token_items = in_fields(self.term_frequencies(token, substring_match))
+                phrase_items = token_items if phrase_items is None else phrase_items & token_items
+            # A phrase without word characters cannot be narrowed down
+            unit_candidates.append(phrase_items if phrase_items is not None else set(self.positions))
+
+        if not unit_candidates:
+            return []
+        if search_logic == "AND":
+            matched = set.intersection(*unit_candidates)
+        else:
+            matched = set.union(*unit_candidates)
+        return sorted(matched, key=self.positions.__getitem__)
+
+    def bm25_scores(self,
+                    terms: List[str],
+                    phrases: List[str],
+                    substring_match: bool,
+                    search_logic: str,
+                    field_weights: Dict[str, float],
+                    term_alternatives: Optional[Dict[str, List[str]]] = None) -> Dict[str, float]:
+        """
+        Scores items with BM25F across the weighted fields.
+
+        Args:
+            terms (List[str]): Lower-cased query terms.
+            phrases (List[str]): Lower-cased quoted phrases (scored as single units).
+            substring_match (bool): Whether terms may match inside words.
+            search_logic (str): 'AND' requires every term/phrase to match, 'OR' any.
+            field_weights (Dict[str, float]): Weight per field; unlisted fields are ignored.
+            term_alternatives (Optional[Dict[str, List[str]]]): Spellings each term
+                should match instead of itself (used by fuzzy search).
+
+        Returns:
+            Dict[str, float]: item ID -> BM25 score for every matching item.
+        """
+        term_alternatives = term_alternatives or {}
+        units = [self.term_frequencies(term, substring_match, term_alternatives.get(term)) for term in terms]
+        units += [self.phrase_frequencies(phrase, substring_match) for phrase in phrases]
+
+        scores: Dict[str, float] = {}
+        matched_units: Dict[str, int] = {}
+        for frequencies in units:
+            # Only fields with a weight count towards matching
+            weighted = {
+                item_id: fields for item_id, fields in frequencies.items()
+                if any(field_weights.get(field) for field in fields)
+            }
+            if not weighted:
+                continue
+            idf = self.idf(len(weighted))
+            for item_id, fields in weighted.items():
+                pseudo_tf = 0.0
+                lengths = self.field_lengths[item_id]
+                for field, tf in fields.items():
+                    weight = field_weights.get(field, 0.0)
+                    if not weight:
+                        continue
+                    avg_length = self.avg_field_lengths.get(field) or 1.0
+                    norm = 1.0 - BM25_B + BM25_B * lengths.get(field, 0) / avg_length
+                    pseudo_tf += weight * tf / norm
+                scores[item_id] = scores.get(item_id, 0.0) + idf * pseudo_tf / (BM25_K1 + pseudo_tf)
+                matched_units[item_id] = matched_units.get(item_id, 0) + 1
+
+        if search_logic == "AND":
+            required = len(units)
+            return {item_id: score for item_id, score in scores.items() if matched_units[item_id] >= required}
+        return scores
+
+
+def max_edit_distance(term: str) -> int:
+    """
+    Returns the number of typos tolerated for a query term of a given length.
+
+    Args:
+        term (str): The query term.
+
+    Returns:
+        int: 0 for very short terms, 1 for terms up to 5 characters, otherwise 2.
+    """
+    if len(term) <= 3:
+        return 0
+    if len(term) <= 5:
+        return 1
+    return 2
+
+
+def bounded_edit_distance(a: str, b: str, max_distance: int) -> Optional[int]:
+    """
+    Levenshtein distance between two strings, abandoned once it exceeds a bound.
+
+    Args:
+        a (str): First string.
+        b (str): Second string.
+        max_distance (int): Largest distance of interest.
+
+    Returns:
+        Optional[int]: The distance, or None if it is greater than max_distance.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return None
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1,
+                               current[j - 1] + 1,
+                               previous[j - 1] + (char_a != char_b)))
+        if min(current) > max_distance:
+            return None
+        previous = current
+    return previous[-1] if previous[-1] <= max_distance else None
+
+
+def trigrams(token: str) -> set:
+    """
+    Returns the set of character trigrams of a token, padded at both ends.
+
+    Args:
+        token (str): The token.
+
+    Returns:
+        set: Distinct trigrams (e.g. '$$d', '$dc', 'dcf', ...).
+    """
+    padded = '$$' + token + '$$'
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """
+    Character-trigram index over a vocabulary, used to find near-miss spellings.
+
+    Candidate tokens are found through shared trigrams (each edit can remove at
+    most three of a term's trigrams), and only those candidates are verified
+    with a bounded edit distance.
+
+    Attributes:
+        tokens (List[str]): The indexed vocabulary.
+        postings (Dict[str, List[int]]): trigram -> positions in tokens.
+    """
+
+    def __init__(self, vocabulary: Iterable[str]):
+        self.tokens: List[str] = sorted(set(vocabulary))
+        self.postings: Dict[str, List[int]] = {}
+        for position, token in enumerate(self.tokens):
+            for trigram in trigrams(token):
+                self.postings.setdefault(trigram, []).append(position)
+
+    def expand(self, term: str, max_distance: Optional[int] = None) -> List[str]:
+        """
+        Finds vocabulary tokens within the allowed edit distance of a term.
+
+        Args:
+            term (str): Lower-cased query term.
+            max_distance (Optional[int]): Allowed typos (defaults to max_edit_distance(term)).
+
+        Returns:
+            List[str]: Matching tokens, closest first (the term itself if indexed).
+        """
+        if max_distance is None:
+            max_distance = max_edit_distance(term)
+        term_trigrams = trigrams(term)
+        required = len(term_trigrams) - 3 * max_distance
+
+        if required > 0:
+            shared: Dict[int, int] = {}
+            for trigram in term_trigrams:
+                for position in self.postings.get(trigram, []):
+                    shared[position] = shared.get(position, 0) + 1
+            candidates = [self.tokens[p] for p, count in shared.items() if count >= required]
+        else:
+            # Term too short for the trigram filter to prune anything
+            candidates = self.tokens
+
+        matches = []
+        for token in candidates:
+            distance = bounded_edit_distance(term, token, max_distance)
+            if distance is not None:
+                matches.append((distance, token))
+        matches.sort()
+        return [token for _, token in matches]
+
+
+class SearchIndex:
+    """
+    Search indices for all collections of a knowledge base.
+
+    Attributes:
+        collections (Dict[str, CollectionIndex]): Index per collection name
+            ('techniques', 'weaknesses', 'mitigations').
+        trigrams (TrigramIndex): Trigram index over the vocabulary of FUZZY_FIELDS.
+    """
+
+    def __init__(self, collections: Dict[str, Dict[str, Dict[str, Any]]]):
+        self.collections: Dict[str, CollectionIndex] = {
+            name: CollectionIndex(collection) for name, collection in collections.items()
+        }
+        vocabulary = set()
+        for index in self.collections.values():
+            for token, items in index.postings.items():
+                if any(field in FUZZY_FIELDS for fields in items.values() for field in fields):
+                    vocabulary.add(token)
+        self.trigrams: TrigramIndex = TrigramIndex(vocabulary)
+
+    def get(self, collection_name: str) -> Optional[CollectionIndex]:
+        """Returns the index for a collection, or None if it was not indexed."""
+        return self.collections.get(collection_name)
+
+    def fuzzy_expand(self, terms: List[str]) -> Dict[str, List[str]]:
+        """
+        Maps each query term to the indexed spellings it should match.
+
+        Args:
+            terms (List[str]): Lower-cased query terms.
+
+        Returns:
+            Dict[str, List[str]]: term -> tokens within its allowed edit distance.
+                Terms with no close match map to themselves.
+        """
+        return {term: self.trigrams.expand(term) or [term] for term in terms}
+
+
+class SearchResultCache:
+    """
+    Bounded LRU cache of search results, invalidated by a data version number.
+
+    Versions only increase, so when get()/put() is called with a newer version
+    than the cached entries were computed for, the cache is emptied first. Calls
+    with an older version (a search pinned to an earlier state, e.g. through a
+    snapshot) bypass the cache without disturbing it. All methods are safe to
+    call from several threads.
+
+    Attributes:
+        maxsize (int): Maximum number of cached queries (0 disables caching).
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups that had to be computed.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize: int = maxsize
+        self.hits: int = 0
+        self.misses: int = 0
+        self._version: Optional[int] = None
+        self._entries: 'OrderedDict[Tuple, Dict[str, List[Dict[str, Any]]]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _sync(self, version: int) -> bool:
+        """
+        Drops all entries if they were computed for an older data version.
+
+        Returns:
+            bool: False if the version is older than the cached entries' (do not use the cache).
+        """
+        if self._version is not None and version < self._version:
+            return False
+        if version != self._version:
+            self._entries.clear()
+            self._version = version
+        return True
+
+    def get(self, key: Tuple, version: int) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+        """
+        Looks up cached results.
+
+        Args:
+            key (Tuple): The normalised query key.
+            version (int): The current data version of the knowledge base.
+
+        Returns:
+            Optional[Dict[str, List[Dict[str, Any]]]]: A copy of the cached results, or None.
+        """
+        with self._lock:
+            results = self._entries.get(key) if self._sync(version) else None
+            if results is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return {name: list(items) for name, items in results.items()}
+
+    def put(self, key: Tuple, version: int, results: Dict[str, List[Dict[str, Any]]]) -> None:
+        """
+        Stores results, evicting the least recently used entry when full.
+
+        Args:
+            key (Tuple): The normalised query key.
+            version (int): The data version the results were computed for.
+            results (Dict[str, List[Dict[str, Any]]]): The search results.
+        """
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            if not self._sync(version):
+                return
+            self._entries[key] = {name: list(items) for name, items in results.items()}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Empties the cache and resets the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> Dict[str, int]:
+        """
+        Returns cache statistics.
+
+        Returns:
+            Dict[str, int]: 'hits', 'misses', 'size' and 'maxsize'.
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries), 'maxsize': self.maxsize}
+
+
+def top_k(scored: Iterable[Tuple[Any, float, Any]], limit: Optional[int], offset: int = 0) -> List[Any]:
+    """
+    Orders scored items by descending score, breaking ties on the tie-break key.
+
+    Uses heap selection when a limit is given so only the top offset + limit
+    results are ordered.
+
+    Args:
+        scored (Iterable[Tuple[Any, float, Any]]): (item, score, tie_break_key) tuples.
+        limit (Optional[int]): Maximum number of results, or None for all.
+        offset (int): Number of top results to skip.
+
+    Returns:
+        List[Any]: The items, best first.
+    """
+    key = lambda entry: (-entry[1], entry[2])
+    if limit is None:
+        ordered = sorted(scored, key=key)
+    else:
+        ordered = heapq.nsmallest(offset + limit, scored, key=key)
+    return [entry[0] for entry in ordered[offset:]]
+
+
+def iter_ranked(scored: List[Tuple[Any, float, Any]]) -> Iterator[Any]:
+    """
+    Lazily yields scored items by descending score (ties on the tie-break key).
+
+    The list is heapified in linear time and items are popped one at a time,
+    so consumers that stop early never pay for a full sort.
+
+    Args:
+        scored (List[Tuple[Any, float, Any]]): (item, score, tie_break_key) tuples.
+
+    Yields:
+        Any: The items, best first.
+    """
+    heap = [(-score, tie_break, position) for position, (_, score, tie_break) in enumerate(scored)]
+    heapq.heapify(heap)
+    while heap:
+        yield scored[heapq.heappop(heap)[2]][0]
@@ -6,22 +6,154 @@ access to the SOLVE-IT data (techniques, weaknesses, mitigations).
 """
 
 import os
+import copy
 import json
+import itertools
 import logging
-from typing import Dict, Any, Optional, List, Type, Union, Tuple
-from pydantic import ValidationError
-
-from .models import (
-    Technique, Weakness, Mitigation, Objective,
-    TechniqueValidationError, WeaknessValidationError, MitigationValidationError, ObjectiveValidationError,
-    ErrorCodes
+import threading
+from typing import Dict, Any, Optional, List, Union, Tuple, Iterator, Callable, TYPE_CHECKING
+
+# Modules needed to load and search the data. The tool and CASE modules are needed
+# here for the TOOL_ALIASES class attribute and the default CASE base IRI; modules
+# used only by optional features are imported when the feature is first used.
+from .lazy_records import LazyRecordDict
+from .record_validation import validate_records, normalise_records
+from .tool_index import ToolIndex, TOOL_ALIASES
+from .case_index import CaseIndex, iter_jsonld, DEFAULT_BASE_IRI
+from .mapping_cache import MappingCache
+from .search_index import (
+    SearchIndex, SearchResultCache, SEARCH_FIELDS, DEFAULT_FIELD_WEIGHTS, DEFAULT_MATCH_WEIGHTS,
+    field_text, top_k, iter_ranked, parse_query
 )
 
+if TYPE_CHECKING:
+    from .data_pack import DataPack
+    from .citation_index import CitationIndex
+    from .technique_hierarchy import TechniqueHierarchy
+    from .mitigation_closure import MitigationClosure
+    from .weakness_classes import WeaknessClassIndex
+    from .mapping_comparison import MappingComparison
+
 # Set up basic logging for the library
 logger = logging.getLogger(__name__)
 # Configure logging level (optional, could be configured by application)
 # logging.basicConfig(level=logging.INFO)
 
+
+
+# Source of data versions; unique across all states so cached results never collide
+_VERSION_COUNTER = itertools.count(1)
+
+
+class _KnowledgeBaseState:
+    """
+    The loaded content of a KnowledgeBase: collections, mappings (and which is
+    active) and indices.
+
+    A state is built completely before it is published, and is not modified
+    afterwards except for building derived indices (search, citations, ...) on
+    first use (under a lock). Reloading, rebuilding or loading another objective
+    mapping creates a new state and swaps it in with a single assignment, so a
+    reader holding a state always sees collections, mappings and indices that
+    belong together.
+    """
+
+    def __init__(self):
+        self.techniques: Dict[str, Dict[str, Any]] = {}
+        self.weaknesses: Dict[str, Dict[str, Any]] = {}
+        self.mitigations: Dict[str, Dict[str, Any]] = {}
+        self.objective_mappings: Dict[str, List[Dict[str, Any]]] = {}
+        self.current_mapping_name: Optional[str] = None
+        self.weakness_to_techniques: Dict[str, List[str]] = {}
+        self.mitigation_to_weaknesses: Dict[str, List[str]] = {}
+        self.mitigation_to_techniques: Dict[str, List[str]] = {}
+        # Files each item ID was loaded from (more than one means a duplicate ID)
+        self.item_sources: Dict[str, List[str]] = {}
+        self.data_pack: Optional['DataPack'] = None
+        # Indices derived from the collections, built on first use (see derived_index)
+        self.derived_indices: Dict[str, Any] = {}
+        self.derived_indices_lock = threading.RLock()
+        self.version: int = next(_VERSION_COUNTER)
+
+    def derived_index(self, name: str, build: Callable[['_KnowledgeBaseState'], Any]) -> Any:
+        """
+        Returns a derived index, building it on first use.
+
+        Concurrent first requests build the index once; the lock is reentrant so
+        one index may be built from another.
+
+        Args:
+            name (str): Name of the index (e.g. 'search').
+            build (Callable): Builds the index from this state.
+        """
+        index = self.derived_indices.get(name)
+        if index is None:
+            with self.derived_indices_lock:
+                index = self.derived_indices.get(name)
+                if index is None:
+                    index = self.derived_indices[name] = build(self)
+        return index
+
+    def copy(self) -> '_KnowledgeBaseState':
+        """Returns a new state sharing the collections and mappings, without the derived indices."""
+        state = _KnowledgeBaseState()
+        for name in ('techniques', 'weaknesses', 'mitigations', 'objective_mappings', 'current_mapping_name',
+                     'weakness_to_techniques', 'mitigation_to_weaknesses', 'mitigation_to_techniques',
+                     'item_sources', 'data_pack'):
+            setattr(state, name, getattr(self, name))
+        return state
+
+    def with_mapping(self, mapping_name: str, objectives: List[Dict[str, Any]],
+                     activate: bool = False) -> '_KnowledgeBaseState':
+        """
+        Returns a new state with an objective mapping added (or replaced), and optionally
+        made the active mapping, leaving this state unchanged.
+
+        The content is unchanged, so the derived indices (built or not yet built) are shared;
+        the version only changes if the mapping's objectives change.
+        """
+        state = self.copy()
+        if self.objective_mappings.get(mapping_name) is objectives:
+            state.version = self.version
+        else:
+            state.objective_mappings = dict(self.objective_mappings)
+            state.objective_mappings[mapping_name] = objectives
+        if activate:
+            state.current_mapping_name = mapping_name
+        state.derived_indices = self.derived_indices
+        state.derived_indices_lock = self.derived_indices_lock
+        return state
+
+
+class _StateHolder:
+    """Shared, swappable reference to the current state of a knowledge base and its views."""
+
+    def __init__(self, state: _KnowledgeBaseState):
+        self.state = state
+        # Serialises swaps that are derived from the current state; readers never take it
+        self.lock = threading.Lock()
+
+
+def _state_attribute(name: str) -> property:
+    """
+    Exposes an attribute of the current state as a KnowledgeBase attribute.
+
+    Assigning it publishes a copy of the state holding the new value (without the
+    derived indices, which are rebuilt on next use); the published state is never modified.
+    """
+    def getter(self):
+        return getattr(self._state_holder.state, name)
+
+    def setter(self, value):
+        holder = self._state_holder
+        with holder.lock:
+            state = holder.state.copy()
+            setattr(state, name, value)
+            holder.state = state
+
+    return property(getter, setter)
+
+
 class KnowledgeBase:
     """
     Provides an interface to load and query the SOLVE-IT knowledge base.
@@ -38,58 +170,233 @@ class KnowledgeBase:
         objective_mappings (Dict[str, List[Dict[str, Any]]]): Dictionary storing loaded
             objective mappings, keyed by mapping filename (e.g., "solve-it.json").
         current_mapping_name (Optional[str]): The name of the currently active objective
-            mapping file.
+            mapping file (held in the state, or fixed for a with_mapping() view).
+        data_version (int): Number that changes whenever the loaded content or the
+            loaded mappings change; used to invalidate cached query results.
+        data_pack (Optional[DataPack]): The data pack the content was loaded from, if any.
+        lazy (bool): Whether full records are loaded and validated on first access.
+        trusted (bool): Whether records and mappings are loaded without validation.
+
+    Thread safety:
+        Collections, indices, mappings and the active mapping live in one state
+        object. Queries may run in several threads at once; reload(),
+        rebuild_indices() and load_objective_mapping() build a new state and swap
+        it in atomically, so concurrent readers see either the old or the new
+        content and active mapping, never a mix. Each search runs against a
+        single state; use snapshot() to pin one state across several calls. Use
+        with_mapping() to give each thread or request its own active mapping.
     """
     DEFAULT_MAPPING_FILE = "solve-it.json"
-
-    def __init__(self, base_path: str, mapping_file: str = DEFAULT_MAPPING_FILE):
+    DEFAULT_SEARCH_CACHE_SIZE = 128
+    # Fields (besides id and name) kept for every item in lazy mode
+    LIGHT_FIELDS = {
+        'Technique': ('subtechniques', 'weaknesses'),
+        'Weakness': ('mitigations',),
+        'Mitigation': ('technique',),
+    }
+    # Alternative tool names merged by the tool index (alias -> canonical name)
+    TOOL_ALIASES = TOOL_ALIASES
+
+    # Instances returned by shared(), keyed by class and real base and data paths
+    _shared_instances: Dict[Tuple[type, str, str], 'KnowledgeBase'] = {}
+    _shared_lock = threading.Lock()
+    # Mapping file caches shared by all instances, keyed by real data path and trusted flag
+    _mapping_caches: Dict[Tuple[str, bool], MappingCache] = {}
+    # Separate from _shared_lock, which is held while shared() constructs an instance
+    _mapping_caches_lock = threading.Lock()
+
+    techniques = _state_attribute('techniques')
+    weaknesses = _state_attribute('weaknesses')
+    mitigations = _state_attribute('mitigations')
+    objective_mappings = _state_attribute('objective_mappings')
+    data_pack = _state_attribute('data_pack')
+    _weakness_to_techniques = _state_attribute('weakness_to_techniques')
+    _mitigation_to_weaknesses = _state_attribute('mitigation_to_weaknesses')
+    _mitigation_to_techniques = _state_attribute('mitigation_to_techniques')
+    _item_sources = _state_attribute('item_sources')
+
+    def __init__(self, base_path: str, mapping_file: str = DEFAULT_MAPPING_FILE,
+                 search_cache_size: int = DEFAULT_SEARCH_CACHE_SIZE,
+                 data_pack: Optional[str] = None,
+                 lazy: bool = False,
+                 trusted: bool = False,
+                 data_path: Optional[str] = None):
         """
         Initializes the KnowledgeBase by loading data from the specified path.
 
         Args:
             base_path (str): The path to the root directory of the solve-it
                 repository clone (containing the 'data' folder).
+            mapping_file (str): The objective mapping file to activate.
+            search_cache_size (int): Maximum number of search results kept in the
+                LRU query cache (0 disables caching).
+            data_pack (Optional[str]): Path to a data pack (see data_pack.py) to load
+                instead of the JSON files in the 'data' folder. Records are decoded
+                from the memory-mapped pack on first access.
+            lazy (bool): If True, only the ID, name and relationship fields of each
+                item are read at startup; full records are loaded and validated the
+                first time they are accessed (e.g. through get_technique), then cached.
+                Items that fail validation are dropped when first accessed instead of
+                at startup. Searching loads every record.
+            trusted (bool): If True, records and mappings are not validated, only
+                converted to the same dictionaries validation produces. Only use this
+                for data that has already been validated, e.g. checked by CI or
+                verified against a known hash.
+            data_path (Optional[str]): The data directory, if it is not the 'data'
+                folder of base_path.
 
         Raises:
-            FileNotFoundError: If the base_path or essential subdirectories
+            FileNotFoundError: If the base_path, the data pack or essential subdirectories
                                (data, techniques, weaknesses, mitigations) do not exist.
+            ValueError: If data_pack is not a valid data pack.
+        """
+        self._initialize(base_path, search_cache_size, lazy, require_data_dirs=data_pack is None, trusted=trusted,
+                         data_path=data_path)
+
+        if data_pack is not None:
+            # Load core data and precomputed reverse indices from the pack
+            self._load_data_pack(data_pack)
+        else:
+            # Load core data
+            self._load_techniques()
+            self._load_weaknesses()
+            self._load_mitigations()
+
+            # Build reverse indices for performance optimization
+            self._build_reverse_indices()
+
+        # Build search index (term statistics for ranked search)
+        self._build_search_index()
+
+        # Load the specified objective mapping
+        self._activate_initial_mapping(mapping_file)
+
+    @classmethod
+    def from_records(cls, base_path: str,
+                     techniques: Dict[str, Dict[str, Any]],
+                     weaknesses: Dict[str, Dict[str, Any]],
+                     mitigations: Dict[str, Dict[str, Any]],
+                     mapping_file: str = DEFAULT_MAPPING_FILE,
+                     search_cache_size: int = DEFAULT_SEARCH_CACHE_SIZE,
+                     item_sources: Optional[Dict[str, List[str]]] = None,
+                     trusted: bool = False) -> 'KnowledgeBase':
+        """
+        Creates a KnowledgeBase from records that were already loaded and validated
+        (e.g. by AsyncKnowledgeBase), building the indices and loading the mapping.
+
+        Args:
+            base_path (str): The root directory of the solve-it repository clone.
+            techniques (Dict[str, Dict[str, Any]]): Validated techniques keyed by ID.
+            weaknesses (Dict[str, Dict[str, Any]]): Validated weaknesses keyed by ID.
+            mitigations (Dict[str, Dict[str, Any]]): Validated mitigations keyed by ID.
+            mapping_file (str): The objective mapping file to activate.
+            search_cache_size (int): Maximum number of cached search results.
+            item_sources (Optional[Dict[str, List[str]]]): Files each ID was loaded from.
+            trusted (bool): If True, objective mappings are not validated.
+
+        Returns:
+            KnowledgeBase: The knowledge base.
+
+        Raises:
+            FileNotFoundError: If the base_path or its 'data' directory does not exist.
+        """
+        kb = cls.__new__(cls)
+        kb._initialize(base_path, search_cache_size, lazy=False, require_data_dirs=True, trusted=trusted)
+        kb.techniques = techniques
+        kb.weaknesses = weaknesses
+        kb.mitigations = mitigations
+        kb._item_sources = item_sources or {}
+        kb._build_reverse_indices()
+        kb._build_search_index()
+        kb._activate_initial_mapping(mapping_file)
+        return kb
+
+    @classmethod
+    def shared(cls, base_path: str, mapping_file: str = DEFAULT_MAPPING_FILE,
+               data_path: Optional[str] = None) -> 'KnowledgeBase':
+        """
+        Returns the process-wide knowledge base for a repository, loading it on first use.
+
+        Every caller asking for the same base path (and data directory) gets the same
+        loaded data, so modules (and the legacy solveitcore.SOLVEIT view) do not load it twice.
+        If mapping_file differs from the active mapping of the shared instance, a
+        with_mapping() view is returned instead of changing the shared instance.
+
+        Args:
+            base_path (str): The root directory of the solve-it repository clone.
+            mapping_file (str): The objective mapping file to activate.
+            data_path (Optional[str]): The data directory, if it is not the 'data'
+                folder of base_path.
+
+        Returns:
+            KnowledgeBase: The shared instance, or a view of it.
+
+        Raises:
+            FileNotFoundError: If the base_path or the data subdirectories do not exist.
+            ValueError: If mapping_file cannot be loaded.
+        """
+        key = (cls, os.path.realpath(base_path), os.path.realpath(data_path or os.path.join(base_path, 'data')))
+        with cls._shared_lock:
+            kb = cls._shared_instances.get(key)
+            if kb is None:
+                kb = cls(base_path, mapping_file, data_path=data_path)
+                cls._shared_instances[key] = kb
+        if kb.current_mapping_name != mapping_file:
+            return kb.with_mapping(mapping_file)
+        return kb
+
+    def _initialize(self, base_path: str, search_cache_size: int, lazy: bool, require_data_dirs: bool,
+                    trusted: bool = False, data_path: Optional[str] = None):
+        """
+        Sets up paths and empty data storage.
+
+        Raises:
+            FileNotFoundError: If the base_path, or (when require_data_dirs is True)
+                               the data subdirectories, do not exist.
         """
         if not os.path.isdir(base_path):
             raise FileNotFoundError(f"Base path not found: {base_path}")
 
         self.base_path: str = base_path
         # Path to the data directory
-        self.data_path: str = os.path.join(self.base_path, 'data')
+        self.data_path: str = data_path if data_path is not None else os.path.join(self.base_path, 'data')
         self.techniques_path: str = os.path.join(self.data_path, 'techniques')
         self.weaknesses_path: str = os.path.join(self.data_path, 'weaknesses')
         self.mitigations_path: str = os.path.join(self.data_path, 'mitigations')
 
-        # Validate essential paths
-        for path in [self.data_path, self.techniques_path, self.weaknesses_path, self.mitigations_path]:
-            if not os.path.isdir(path):
-                raise FileNotFoundError(f"Required directory not found: {path}")
-
-        # Initialize data storage
-        self.techniques: Dict[str, Dict[str, Any]] = {}
-        self.weaknesses: Dict[str, Dict[str, Any]] = {}
-        self.mitigations: Dict[str, Dict[str, Any]] = {}
-        self.objective_mappings: Dict[str, List[Dict[str, Any]]] = {}
-        self.current_mapping_name: Optional[str] = None
-
-        # Initialize reverse lookup indices
-        self._weakness_to_techniques: Dict[str, List[str]] = {}
-        self._mitigation_to_weaknesses: Dict[str, List[str]] = {}
-        self._mitigation_to_techniques: Dict[str, List[str]] = {}
-
-        # Load core data
-        self._load_techniques()
-        self._load_weaknesses()
-        self._load_mitigations()
-        
-        # Build reverse indices for performance optimization
-        self._build_reverse_indices()
-
-        # Load the specified objective mapping
+        # Validate essential paths (a data pack replaces the data folder)
+        if require_data_dirs:
+            for path in [self.data_path, self.techniques_path, self.weaknesses_path, self.mitigations_path]:
+                if not os.path.isdir(path):
+                    raise FileNotFoundError(f"Required directory not found: {path}")
+
+        # Initialize empty data storage and reverse lookup indices
+        self._state_holder = _StateHolder(_KnowledgeBaseState())
+        # Active mapping of a with_mapping() view; None follows the mapping activated in the state
+        self._view_mapping_name: Optional[str] = None
+        self._search_cache = SearchResultCache(search_cache_size)
+        self.lazy: bool = lazy
+        self.trusted: bool = trusted
+
+    @property
+    def _state(self) -> _KnowledgeBaseState:
+        """The current state (read it once per operation for a consistent view)."""
+        return self._state_holder.state
+
+    @property
+    def current_mapping_name(self) -> Optional[str]:
+        """The name of the active objective mapping file."""
+        if self._view_mapping_name is not None:
+            return self._view_mapping_name
+        return self._state.current_mapping_name
+
+    @property
+    def data_version(self) -> int:
+        """Version of the current content, used to invalidate cached query results."""
+        return self._state.version
+
+    def _activate_initial_mapping(self, mapping_file: str):
+        """Loads the requested objective mapping, falling back to the default mapping."""
         if not self.load_objective_mapping(mapping_file):
             # Optionally load the default if the specified one failed
             logger.warning(
@@ -102,13 +409,17 @@ class KnowledgeBase:
                     self.DEFAULT_MAPPING_FILE
                 )
 
-    def _load_json_files(self, directory_path: str, model_class: Type[Union[Technique, Weakness, Mitigation]]) -> Dict[str, Dict[str, Any]]:
+    def _load_json_files(self, directory_path: str, model_name: str) -> Dict[str, Dict[str, Any]]:
         """
         Loads all JSON files from a specified directory and validates them against a Pydantic model.
 
+        The records of the directory are validated in one batch (see record_validation.py),
+        or only normalised if the knowledge base is trusted.
+
         Args:
             directory_path (str): The path to the directory containing JSON files.
-            model_class (Type): The Pydantic model class to validate the data against.
+            model_name (str): Name of the Pydantic model to validate the data against
+                ('Technique', 'Weakness' or 'Mitigation').
 
         Returns:
             Dict[str, Dict[str, Any]]: A dictionary where keys are the item IDs
@@ -121,70 +432,201 @@ class KnowledgeBase:
             Error if a file cannot be read due to IO issues.
             Error if a JSON file fails validation against the model.
         """
+        if self.lazy:
+            return self._index_json_files(directory_path, model_name)
+
         loaded_data: Dict[str, Dict[str, Any]] = {}
         if not os.path.isdir(directory_path):
             logger.warning("Directory not found, skipping load: %s", directory_path)
             return loaded_data
 
-        for filename in os.listdir(directory_path):
-            if filename.lower().endswith('.json'):
+        file_paths = [os.path.join(directory_path, filename) for filename in os.listdir(directory_path)
+                      if filename.lower().endswith('.json')]
+        for file_path, record in zip(file_paths, self._read_record_files(file_paths, model_name, self.trusted)):
+            if record is not None:
+                self._add_loaded_record(loaded_data, file_path, record)
+        
+        return loaded_data
+
+    def _add_loaded_record(self, loaded_data: Dict[str, Dict[str, Any]], file_path: str,
+                           record: Dict[str, Any]) -> None:
+        """Adds a validated record to a collection, recording its source file."""
+        item_id = record['id']
+        if item_id in loaded_data:
+            logger.warning("Duplicate ID %s in %s, replacing earlier definition",
+                           item_id, file_path)
+        self._item_sources.setdefault(item_id, []).append(file_path)
+        loaded_data[item_id] = record
+
+    @staticmethod
+    def _read_record_files(file_paths: List[str], model_name: str,
+                           trusted: bool = False) -> List[Optional[Dict[str, Any]]]:
+        """
+        Reads JSON files and validates their records against a Pydantic model in one batch.
+
+        Does not touch any KnowledgeBase state, so it can run in worker threads.
+
+        Args:
+            file_paths (List[str]): Paths of the JSON files.
+            model_name (str): Name of the Pydantic model to validate the data against.
+            trusted (bool): If True, records are normalised but not validated.
+
+        Returns:
+            List[Optional[Dict[str, Any]]]: The validated record of each file, or None
+                where the file cannot be read, decoded or validated (the problem is logged).
+        """
+        records: List[Optional[Dict[str, Any]]] = [None] * len(file_paths)
+        raw_records = []
+        positions = []
+        for position, file_path in enumerate(file_paths):
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    raw_records.append(json.load(f))
+                    positions.append(position)
+            except json.JSONDecodeError as e:
+                logger.error("Could not decode JSON from %s: %s", file_path, e)
+            except IOError as e:
+                logger.error("Could not read file %s: %s", file_path, e)
+            except Exception as e:
+                logger.error("Unexpected error processing %s: %s", file_path, e)
+
+        process = normalise_records if trusted else validate_records
+        for position, record in zip(positions, process(model_name, raw_records,
+                                                       [file_paths[position] for position in positions])):
+            records[position] = record
+        return records
+
+    @classmethod
+    def _read_record_file(cls, file_path: str, model_name: str, trusted: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Reads a JSON file and validates it against a Pydantic model.
+
+        Args:
+            file_path (str): Path of the JSON file.
+            model_name (str): Name of the Pydantic model to validate the data against.
+            trusted (bool): If True, the record is normalised but not validated.
+
+        Returns:
+            Optional[Dict[str, Any]]: The validated record, or None if the file cannot
+                be read, decoded or validated (the problem is logged).
+        """
+        return cls._read_record_files([file_path], model_name, trusted)[0]
+
+    def _index_json_files(self, directory_path: str, model_name: str) -> LazyRecordDict:
+        """
+        Reads the ID, name and relationship fields of all JSON files in a directory.
+
+        Full records are loaded and validated by _hydrate_record on first access.
+
+        Args:
+            directory_path (str): The path to the directory containing JSON files.
+            model_name (str): Name of the Pydantic model records are validated against.
+
+        Returns:
+            LazyRecordDict: The items keyed by ID, with their light fields as summaries.
+        """
+        summaries: Dict[str, Dict[str, Any]] = {}
+        if not os.path.isdir(directory_path):
+            logger.warning("Directory not found, skipping load: %s", directory_path)
+        else:
+            light_fields = self.LIGHT_FIELDS[model_name]
+            for filename in os.listdir(directory_path):
+                if not filename.lower().endswith('.json'):
+                    continue
                 file_path = os.path.join(directory_path, filename)
                 try:
                     with open(file_path, 'r', encoding='utf-8') as f:
                         data = json.load(f)
-                        
-                        # Validate the data against the model
-                        try:
-                            validated_data = model_class.model_validate(data)
-                            item_id = validated_data.id
-                            # Convert back to dict for compatibility with existing code
-                            loaded_data[item_id] = validated_data.model_dump()
-                        except ValidationError as e:
-                            # Determine the appropriate exception type based on the model class
-                            if model_class == Technique:
-                                error_class = TechniqueValidationError
-                            elif model_class == Weakness:
-                                error_class = WeaknessValidationError
-                            elif model_class == Mitigation:
-                                error_class = MitigationValidationError
-                            else:
-                                error_class = Exception
-                            
-                            # Log the validation error with details
-                            logger.error(
-                                "Validation error in %s: %s",
-                                file_path,
-                                e.errors()
-                            )
-                            
-                            # Skip this file and continue with the next one
-                            continue
-                        
                 except json.JSONDecodeError as e:
                     logger.error("Could not decode JSON from %s: %s", file_path, e)
+                    continue
                 except IOError as e:
                     logger.error("Could not read file %s: %s", file_path, e)
-                except Exception as e:
-                    logger.error("Unexpected error processing %s: %s", file_path, e)
-        
-        return loaded_data
+                    continue
+                item_id = data.get('id') if isinstance(data, dict) else None
+                if not isinstance(item_id, str):
+                    logger.error("Missing 'id' in %s", file_path)
+                    continue
+                if item_id in summaries:
+                    logger.warning("Duplicate ID %s in %s, replacing earlier definition", item_id, file_path)
+                self._item_sources.setdefault(item_id, []).append(file_path)
+                summary = {'id': item_id, 'name': data.get('name', '')}
+                for field in light_fields:
+                    default = None if model_name == 'Mitigation' else []
+                    summary[field] = data.get(field) or default
+                summaries[item_id] = summary
+
+        item_sources = self._item_sources
+        return LazyRecordDict(list(summaries),
+                              lambda item_id: self._hydrate_record(item_id, model_name, item_sources), summaries)
+
+    def _hydrate_record(self, item_id: str, model_name: str,
+                        item_sources: Optional[Dict[str, List[str]]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Loads and validates the full record of an item indexed in lazy mode.
+
+        Args:
+            item_id (str): The item ID.
+            model_name (str): Name of the Pydantic model to validate the data against.
+            item_sources (Optional[Dict[str, List[str]]]): Source files of the state the
+                item belongs to (defaults to the current state).
+
+        Returns:
+            Optional[Dict[str, Any]]: The validated record, or None if it cannot be
+                read or fails validation.
+        """
+        if item_sources is None:
+            item_sources = self._item_sources
+        return self._read_record_file(item_sources[item_id][-1], model_name, self.trusted)
+
+    def _light_items(self, collection: Dict[str, Dict[str, Any]]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Iterates over (id, item) pairs of a collection without loading full records in lazy mode.
+
+        The items may only hold the ID, name and relationship fields.
+        """
+        if isinstance(collection, LazyRecordDict):
+            for item_id in collection:
+                yield item_id, collection.summary(item_id)
+        else:
+            yield from collection.items()
 
     def _load_techniques(self):
         """Loads techniques from the techniques directory."""
-        self.techniques = self._load_json_files(self.techniques_path, Technique)
+        self.techniques = self._load_json_files(self.techniques_path, 'Technique')
         logger.info("Loaded %d techniques.", len(self.techniques))
 
     def _load_weaknesses(self):
         """Loads weaknesses from the weaknesses directory."""
-        self.weaknesses = self._load_json_files(self.weaknesses_path, Weakness)
+        self.weaknesses = self._load_json_files(self.weaknesses_path, 'Weakness')
         logger.info("Loaded %d weaknesses.", len(self.weaknesses))
 
     def _load_mitigations(self):
         """Loads mitigations from the mitigations directory."""
-        self.mitigations = self._load_json_files(self.mitigations_path, Mitigation)
+        self.mitigations = self._load_json_files(self.mitigations_path, 'Mitigation')
         logger.info("Loaded %d mitigations.", len(self.mitigations))
 
-    def _build_reverse_indices(self):
+    def _load_data_pack(self, pack_path: str):
+        """
+        Opens a data pack and exposes its records and precomputed indices.
+
+        Args:
+            pack_path (str): Path to the data pack file.
+        """
+        from .data_pack import DataPack
+        self.data_pack = DataPack(pack_path)
+        self.techniques = self.data_pack.collection('techniques')
+        self.weaknesses = self.data_pack.collection('weaknesses')
+        self.mitigations = self.data_pack.collection('mitigations')
+        self._weakness_to_techniques = self.data_pack.indices['weakness_to_techniques']
+        self._mitigation_to_weaknesses = self.data_pack.indices['mitigation_to_weaknesses']
+        self._mitigation_to_techniques = self.data_pack.indices['mitigation_to_techniques']
+        self._item_sources = {item_id: [os.path.join(self.data_path, p) for p in paths]
+                              for item_id, paths in self.data_pack.sources.items()}
+        logger.info("Opened data pack %s: %d techniques, %d weaknesses, %d mitigations.",
+                    pack_path, len(self.techniques), len(self.weaknesses), len(self.mitigations))
+
+    def _build_reverse_indices(self, state: Optional[_KnowledgeBaseState] = None):
         """
         Pre-compute reverse relationship indices.
         
@@ -192,140 +634,380 @@ class KnowledgeBase:
         - weakness_id -> [technique_ids] that reference it
         - mitigation_id -> [weakness_ids] that reference it  
         - mitigation_id -> [technique_ids] that reference it (through weaknesses)
+
+        Args:
+            state (Optional[_KnowledgeBaseState]): The state to index (defaults to the
+                current state). The indices are built separately and assigned at the end.
         """
         logger.info("Building reverse indices for performance optimization...")
+        if state is None:
+            state = self._state
         
         # Initialize empty indices
-        self._weakness_to_techniques = {}
-        self._mitigation_to_weaknesses = {}
-        self._mitigation_to_techniques = {}
+        weakness_to_techniques: Dict[str, List[str]] = {}
+        mitigation_to_weaknesses: Dict[str, List[str]] = {}
+        mitigation_to_techniques: Dict[str, List[str]] = {}
         
         # Build weakness -> techniques mapping
-        for technique_id, technique in self.techniques.items():
+        for technique_id, technique in self._light_items(state.techniques):
             for weakness_id in technique.get('weaknesses', []):
-                if weakness_id not in self._weakness_to_techniques:
-                    self._weakness_to_techniques[weakness_id] = []
-                self._weakness_to_techniques[weakness_id].append(technique_id)
+                if weakness_id not in weakness_to_techniques:
+                    weakness_to_techniques[weakness_id] = []
+                weakness_to_techniques[weakness_id].append(technique_id)
         
         # Build mitigation -> weaknesses mapping
-        for weakness_id, weakness in self.weaknesses.items():
+        for weakness_id, weakness in self._light_items(state.weaknesses):
             for mitigation_id in weakness.get('mitigations', []):
-                if mitigation_id not in self._mitigation_to_weaknesses:
-                    self._mitigation_to_weaknesses[mitigation_id] = []
-                self._mitigation_to_weaknesses[mitigation_id].append(weakness_id)
+                if mitigation_id not in mitigation_to_weaknesses:
+                    mitigation_to_weaknesses[mitigation_id] = []
+                mitigation_to_weaknesses[mitigation_id].append(weakness_id)
         
         # Build mitigation -> techniques mapping (through weaknesses)
-        for mitigation_id, weakness_ids in self._mitigation_to_weaknesses.items():
+        for mitigation_id, weakness_ids in mitigation_to_weaknesses.items():
             technique_ids = set()  # Use set to avoid duplicates
             for weakness_id in weakness_ids:
-                technique_ids.update(self._weakness_to_techniques.get(weakness_id, []))
-            self._mitigation_to_techniques[mitigation_id] = sorted(list(technique_ids))
+                technique_ids.update(weakness_to_techniques.get(weakness_id, []))
+            mitigation_to_techniques[mitigation_id] = sorted(list(technique_ids))
         
         # Sort all reverse index lists for consistent output
-        for weakness_id in self._weakness_to_techniques:
-            self._weakness_to_techniques[weakness_id].sort()
+        for weakness_id in weakness_to_techniques:
+            weakness_to_techniques[weakness_id].sort()
         
-        for mitigation_id in self._mitigation_to_weaknesses:
-            self._mitigation_to_weaknesses[mitigation_id].sort()
+        for mitigation_id in mitigation_to_weaknesses:
+            mitigation_to_weaknesses[mitigation_id].sort()
+
+        state.weakness_to_techniques = weakness_to_techniques
+        state.mitigation_to_weaknesses = mitigation_to_weaknesses
+        state.mitigation_to_techniques = mitigation_to_techniques
         
         logger.info("Reverse indices built: %d weakness->technique, %d mitigation->weakness, %d mitigation->technique",
-                    len(self._weakness_to_techniques), 
-                    len(self._mitigation_to_weaknesses),
-                    len(self._mitigation_to_techniques))
+                    len(weakness_to_techniques), 
+                    len(mitigation_to_weaknesses),
+                    len(mitigation_to_techniques))
+
+    def _build_search_index(self):
+        """
+        Invalidates the search index (and other derived indices) so they are rebuilt
+        from the current data on next use.
+
+        Only used while a state is being built; published states are replaced instead.
+        """
+        state = self._state
+        state.derived_indices = {}
+        state.version = next(_VERSION_COUNTER)
+
+    @property
+    def _search_index(self) -> SearchIndex:
+        """
+        Per-field term statistics used by search, built on first use.
+
+        Holds token postings, field lengths and document frequencies for each
+        collection so that searches do not need to re-scan the items. Building
+        it is deferred so that processes which never search (or load from a data
+        pack) do not pay for it at startup. Concurrent first searches build it once.
+        """
+        return self._state.derived_index('search', self._create_search_index)
+
+    def _create_search_index(self, state: Optional[_KnowledgeBaseState] = None) -> SearchIndex:
+        """Builds the search index over all collections of a state (defaults to the current state)."""
+        if state is None:
+            state = self._state
+        search_index = SearchIndex({
+            "techniques": state.techniques,
+            "weaknesses": state.weaknesses,
+            "mitigations": state.mitigations
+        })
+        logger.info("Search index built: %s",
+                    ", ".join("%d %s terms" % (len(index.postings), name)
+                              for name, index in search_index.collections.items()))
+        return search_index
+
+    @property
+    def _citation_index(self) -> 'CitationIndex':
+        """Reference -> citing items and technique -> aggregated references, built on first use."""
+        from .citation_index import CitationIndex
+        return self._state.derived_index('citations', lambda state: CitationIndex(
+            state.techniques, state.weaknesses, state.mitigations))
+
+    @property
+    def _tool_index(self) -> ToolIndex:
+        """Tool named in technique examples -> techniques, built on first use."""
+        return self._state.derived_index('tools', lambda state: ToolIndex(state.techniques, self.TOOL_ALIASES))
+
+    @property
+    def _case_index(self) -> CaseIndex:
+        """CASE class -> techniques and technique -> CASE classes, built on first use."""
+        return self._state.derived_index('case', lambda state: CaseIndex(state.techniques))
+
+    @property
+    def _technique_hierarchy(self) -> 'TechniqueHierarchy':
+        """Subtechnique -> parents, ancestry and inherited weaknesses, built on first use."""
+        from .technique_hierarchy import TechniqueHierarchy
+        return self._state.derived_index('hierarchy', lambda state: TechniqueHierarchy(
+            state.techniques, state.weaknesses))
+
+    @property
+    def _mitigation_closure(self) -> 'MitigationClosure':
+        """Techniques, weaknesses and mitigations reachable through Mitigation.technique links, built on first use."""
+        from .mitigation_closure import MitigationClosure
+        return self._state.derived_index('mitigation_closure', lambda state: MitigationClosure(
+            state.techniques, state.weaknesses, state.mitigations))
+
+    @property
+    def _weakness_class_index(self) -> 'WeaknessClassIndex':
+        """Class mask of each weakness and class counts per technique, built on first use."""
+        from .weakness_classes import WeaknessClassIndex
+        return self._state.derived_index('weakness_classes', lambda state: WeaknessClassIndex(
+            state.techniques, state.weaknesses))
 
     def load_objective_mapping(self, mapping_filename: str) -> bool:
         """
         Loads a specific objective mapping file (e.g., "solve-it.json") from the data directory.
 
+        Validated mappings are kept in a cache shared by the instances reading the same
+        data directory, so the file is only read again when its modification time or size
+        changes, and only validated again when its content changes.
+
         Args:
             mapping_filename (str): The filename of the objective mapping JSON file.
 
         Returns:
             bool: True if the mapping was loaded successfully, False otherwise.
         """
-        mapping_path = os.path.join(self.data_path, mapping_filename)
-        if not os.path.isfile(mapping_path):
-            logger.error("Objective mapping file not found: %s", mapping_path)
+        objectives = self._read_objective_mapping(mapping_filename)
+        if objectives is None:
             return False
+        if self._view_mapping_name is not None:
+            # A view activates the mapping for itself only
+            self._publish_mapping(mapping_filename, objectives)
+            self._view_mapping_name = mapping_filename
+        else:
+            self._publish_mapping(mapping_filename, objectives, activate=True)
+        return True
+
+    def _publish_mapping(self, mapping_filename: str, objectives: List[Dict[str, Any]],
+                         activate: bool = False) -> None:
+        """
+        Swaps in a new state holding a mapping (and, with activate, making it the active
+        mapping), unless the current state already does. The published state is never
+        modified, so readers holding it (e.g. snapshots) keep their mappings.
+        """
+        holder = self._state_holder
+        with holder.lock:
+            state = holder.state
+            if (state.objective_mappings.get(mapping_filename) is not objectives
+                    or (activate and state.current_mapping_name != mapping_filename)):
+                holder.state = state.with_mapping(mapping_filename, objectives, activate)
+
+    def _read_objective_mapping(self, mapping_filename: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Reads and validates the objectives of a mapping file (or data pack entry) without activating it.
+
+        Args:
+            mapping_filename (str): The filename of the objective mapping JSON file.
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: The valid objectives, or None if the mapping
+                cannot be loaded (the reason is logged).
+        """
+        if self.data_pack is not None:
+            if mapping_filename not in self.data_pack.mappings:
+                logger.error("Objective mapping '%s' not found in data pack %s", mapping_filename, self.data_pack.path)
+                return None
+            # Objectives were validated when the pack was built
+            return self.data_pack.mappings[mapping_filename]
 
+        mapping_path = os.path.join(self.data_path, mapping_filename)
         try:
-            with open(mapping_path, 'r', encoding='utf-8') as f:
-                mapping_data = json.load(f)
-                if isinstance(mapping_data, list):
-                    # Validate each objective in the mapping
-                    validated_objectives = []
-                    for i, obj in enumerate(mapping_data):
-                        try:
-                            validated_obj = Objective.model_validate(obj)
-                            validated_objectives.append(validated_obj.model_dump())
-                        except ValidationError as e:
-                            logger.error(
-                                "Validation error in objective %d of mapping '%s': %s",
-                                i,
-                                mapping_filename,
-                                e.errors()
-                            )
-                            # Continue with the next objective
-                            continue
-                    
-                    # Store the validated objectives
-                    self.objective_mappings[mapping_filename] = validated_objectives
-                    self.current_mapping_name = mapping_filename
-                    
-                    # Log success message with mapping details
-                    logger.info(
-                        "Loaded objective mapping '%s' with %d objectives.",
-                        mapping_filename,
-                        len(validated_objectives)
-                    )
-                    return True
-
-                logger.error(
-                    "Objective mapping file '%s' does not contain a list.",
-                    mapping_filename
-                )
-                return False
+            validated_objectives = self._mapping_cache.load(mapping_filename)
+        except FileNotFoundError:
+            logger.error("Objective mapping file not found: %s", mapping_path)
+            return None
         except json.JSONDecodeError as e:
             logger.error("Could not decode JSON from %s: %s", mapping_path, e)
-            return False
+            return None
+        except ValueError as e:
+            logger.error("%s", e)
+            return None
         except IOError as e:
             logger.error("Could not read file %s: %s", mapping_path, e)
-            return False
+            return None
         except Exception as e:
             logger.error("Unexpected error loading mapping '%s': %s", mapping_filename, e)
-            return False
+            return None
+
+        # Log success message with mapping details
+        logger.info(
+            "Loaded objective mapping '%s' with %d objectives.",
+            mapping_filename,
+            len(validated_objectives)
+        )
+        return validated_objectives
+
+    @property
+    def _mapping_cache(self) -> MappingCache:
+        """The mapping file cache of this data folder, shared with other instances reading it."""
+        key = (os.path.realpath(self.data_path), self.trusted)
+        cache = self._mapping_caches.get(key)
+        if cache is None:
+            with self._mapping_caches_lock:
+                cache = self._mapping_caches.setdefault(key, MappingCache(self.data_path, self.trusted))
+        return cache
+
+    def rebuild_indices(self) -> None:
+        """
+        Rebuilds the reverse and search indices after the loaded data has been
+        modified in place, and invalidates cached search results.
+
+        The indices are built into a new state which then replaces the current
+        one, so concurrent queries keep using the old indices until the swap.
+        """
+        holder = self._state_holder
+        with holder.lock:
+            state = holder.state.copy()
+            self._build_reverse_indices(state)
+            holder.state = state
+
+    def reload(self) -> None:
+        """
+        Re-reads the data (from the 'data' folder, or the data pack it was loaded
+        from) and atomically replaces the current content.
+
+        The new content, its indices and all previously loaded mappings are
+        prepared without touching the current state, so queries running in other
+        threads are never blocked and never see partly loaded data. Views created
+        with with_mapping() see the new content; snapshots keep the old one.
+
+        Raises:
+            FileNotFoundError: If the data directories or the data pack no longer exist.
+            ValueError: If the data pack is no longer a valid data pack.
+        """
+        old_state = self._state
+        fresh = KnowledgeBase(self.base_path, old_state.current_mapping_name or self.DEFAULT_MAPPING_FILE,
+                              search_cache_size=0,
+                              data_pack=old_state.data_pack.path if old_state.data_pack is not None else None,
+                              lazy=self.lazy, trusted=self.trusted, data_path=self.data_path)
+        holder = self._state_holder
+        with holder.lock:
+            # Mappings loaded by other threads since old_state was read are carried over too
+            for mapping_name in list(holder.state.objective_mappings):
+                if mapping_name not in fresh.objective_mappings:
+                    objectives = fresh._read_objective_mapping(mapping_name)
+                    if objectives is not None:
+                        fresh._publish_mapping(mapping_name, objectives)
+            # The old data pack is left open for snapshots still reading from it
+            holder.state = fresh._state
+        logger.info("Knowledge base reloaded from %s", self.base_path)
+
+    def snapshot(self) -> 'KnowledgeBase':
+        """
+        Returns a read-only view pinned to the current content.
+
+        Later calls to reload() or rebuild_indices() on this knowledge base do not
+        affect the snapshot, so a sequence of queries against it is consistent.
+        The snapshot has its own (empty) search cache.
+
+        Returns:
+            KnowledgeBase: The snapshot.
+        """
+        snapshot = self._pinned()
+        snapshot._search_cache = SearchResultCache(self._search_cache.maxsize)
+        return snapshot
+
+    def _pinned(self) -> 'KnowledgeBase':
+        """Returns a shallow copy pinned to the current state, sharing the search cache."""
+        pinned = copy.copy(self)
+        pinned._state_holder = _StateHolder(self._state)
+        return pinned
+
+    def with_mapping(self, mapping_name: str) -> 'KnowledgeBase':
+        """
+        Returns a view of this knowledge base with a different active objective mapping.
+
+        The view shares the content (including later reloads) and the search cache,
+        but has its own active mapping, so threads can work with different mappings
+        without changing the mapping of this instance.
+
+        Args:
+            mapping_name (str): The filename of the objective mapping to activate.
+
+        Returns:
+            KnowledgeBase: The view.
+
+        Raises:
+            ValueError: If the mapping cannot be loaded.
+        """
+        view = copy.copy(self)
+        if mapping_name not in view.objective_mappings:
+            objectives = view._read_objective_mapping(mapping_name)
+            if objectives is None:
+                raise ValueError(f"Could not load objective mapping '{mapping_name}'")
+            view._publish_mapping(mapping_name, objectives)
+        view._view_mapping_name = mapping_name
+        return view
+
+    def search_cache_info(self) -> Dict[str, int]:
+        """
+        Returns statistics for the search result cache.
+
+        Returns:
+            Dict[str, int]: 'hits', 'misses', 'size' (cached queries) and 'maxsize'.
+        """
+        return self._search_cache.info()
+
+    def clear_search_cache(self) -> None:
+        """Empties the search result cache and resets its hit/miss counters."""
+        self._search_cache.clear()
+
+    def get_item_sources(self) -> Dict[str, List[str]]:
+        """
+        Returns the files each technique, weakness and mitigation ID was loaded from.
+
+        Returns:
+            Dict[str, List[str]]: File paths keyed by item ID. More than one path
+                means the ID is defined in several files (the last one loaded wins).
+        """
+        return {item_id: list(file_paths) for item_id, file_paths in self._item_sources.items()}
+
+    def check_integrity(self, mapping_files: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Checks the knowledge base and its mapping files for broken references.
+
+        Reports dangling weakness, mitigation, subtechnique, Mitigation.technique and
+        mapping technique IDs, subtechnique cycles and nesting, orphan items, techniques
+        missing from mappings and duplicate IDs. See integrity.check_integrity for details.
+
+        Args:
+            mapping_files (Optional[List[str]]): Mapping filenames to check. If None,
+                all available mappings are checked.
+
+        Returns:
+            Dict[str, Any]: The integrity report, with an 'issues' list, a 'summary'
+                and 'valid' (True if no errors were found).
+        """
+        from .integrity import check_integrity
+        return check_integrity(self, mapping_files)
 
     # --- Public Query Methods ---
 
     def list_available_mappings(self) -> List[str]:
         """
         Lists the filenames of potential objective mapping JSON files found
-        directly within the 'data' directory.
+        directly within the 'data' directory (or stored in the data pack).
+
+        The directory is only listed again when its modification time changes.
 
         Returns:
             List[str]: A list of filenames (e.g., ["solve-it.json", "carrier.json"]).
         """
-        mapping_files = []
-        excluded_dirs = ['techniques', 'weaknesses', 'mitigations']
+        if self.data_pack is not None:
+            return list(self.data_pack.mappings)
+
         try:
-            for filename in os.listdir(self.data_path):
-                # Check if it's a file, ends with .json, and not in excluded dirs (implicit check)
-                full_path = os.path.join(self.data_path, filename)
-                if os.path.isfile(full_path) and filename.lower().endswith('.json'):
-                    # Basic check to exclude known subdirs - assumes mappings
-                    # are top-level in data/
-                    is_subdir_file = False
-                    for subdir in excluded_dirs:
-                        # Unlikely but needed for safety
-                        if filename.startswith(subdir + os.path.sep):
-                            is_subdir_file = True
-                            break
-                    # Should always be true if isfile() check passes
-                    if not is_subdir_file:
-                        mapping_files.append(filename)
+            return self._mapping_cache.list_mappings()
         except OSError as e:
             logger.error("Error listing directory %s: %s", self.data_path, e)
-        return mapping_files
+            return []
 
     def list_objectives(self, mapping_name: Optional[str] = None) -> List[Dict[str, Any]]:
         """
@@ -340,12 +1022,13 @@ class KnowledgeBase:
                 containing 'name', 'description', 'techniques'). Returns an empty
                 list if no mapping is loaded or the specified mapping doesn't exist.
         """
-        active_mapping_name = mapping_name or self.current_mapping_name
-        if not active_mapping_name or active_mapping_name not in self.objective_mappings:
+        state = self._state
+        active_mapping_name = mapping_name or self._view_mapping_name or state.current_mapping_name
+        if not active_mapping_name or active_mapping_name not in state.objective_mappings:
             logger.warning("No objective mapping loaded or '%s' not found.", active_mapping_name)
             return []
         # Return a copy to prevent external modification
-        return [obj.copy() for obj in self.objective_mappings[active_mapping_name]]
+        return [obj.copy() for obj in state.objective_mappings[active_mapping_name]]
 
     def get_techniques_for_objective(self, objective_name: str, mapping_name: Optional[str] = None) -> List[Dict[str, Any]]:
         """
@@ -576,7 +1259,7 @@ class KnowledgeBase:
                                  for a weakness.
         """
         return [{'id': w_id, 'name': weakness.get('name', '')} 
-                for w_id, weakness in self.weaknesses.items()]
+                for w_id, weakness in self._light_items(self.weaknesses)]
 
     def get_all_weaknesses_with_full_detail(self) -> List[Dict[str, Any]]:
         """
@@ -597,7 +1280,7 @@ class KnowledgeBase:
                                  for a technique.
         """
         return [{'id': t_id, 'name': technique.get('name', '')} 
-                for t_id, technique in self.techniques.items()]
+                for t_id, technique in self._light_items(self.techniques)]
 
     def get_all_techniques_with_full_detail(self) -> List[Dict[str, Any]]:
         """
@@ -618,7 +1301,7 @@ class KnowledgeBase:
                                  for a mitigation.
         """
         return [{'id': m_id, 'name': mitigation.get('name', '')} 
-                for m_id, mitigation in self.mitigations.items()]
+                for m_id, mitigation in self._light_items(self.mitigations)]
 
     def get_all_mitigations_with_full_detail(self) -> List[Dict[str, Any]]:
         """
@@ -634,12 +1317,32 @@ class KnowledgeBase:
               keywords: str,
               item_types: Optional[List[str]] = None,
               substring_match: bool = False,
-              search_logic: str = "AND") -> Dict[str, List[Dict[str, Any]]]:
+              search_logic: str = "AND",
+              ranking: str = "default",
+              limit: Optional[int] = None,
+              field_weights: Optional[Dict[str, float]] = None,
+              fuzzy: bool = False,
+              offset: int = 0,
+              fields: Optional[List[str]] = None) -> Dict[str, List[Dict[str, Any]]]:
         """
         Search for techniques, weaknesses, or mitigations matching specified keywords.
 
-        Performs a case-insensitive search across name and description fields.
-        Supports quoted phrases and configurable search logic (AND/OR).
+        Performs a case-insensitive search across the name, description, synonyms,
+        details, examples and references fields (SEARCH_FIELDS, or the subset given in
+        fields). Supports quoted phrases and configurable search logic (AND/OR). Matches in
+        name and description keep their scoring tiers; every field's match count adds
+        weighted points (DEFAULT_MATCH_WEIGHTS: synonyms 3.0, examples 3.0, name,
+        description, details and references 1.0). Candidate items are looked up in the
+        pre-built per-field index, so only items containing the search terms are scored.
+
+        With ranking='bm25', items are instead ranked with BM25F over the same six
+        fields, using term statistics pre-computed at load time and the field weights
+        in DEFAULT_FIELD_WEIGHTS (name 3.0, synonyms 2.0, description 1.0, examples 1.0,
+        details 0.5, references 0.25).
+
+        With fuzzy=True, each search term also matches indexed words within a small
+        edit distance (e.g. 'volitile' matches 'volatile'). Candidate spellings are
+        found through a character-trigram index, so only those are verified.
 
         Args:
             keywords (str): Keywords to search for. Use quotes for exact phrases.
@@ -650,43 +1353,216 @@ class KnowledgeBase:
                                   Default is False (word boundary matching for precision).
             search_logic (str): Search logic to use. 'AND' requires all terms to match,
                               'OR' requires any term to match. Default is 'AND'.
+            ranking (str): 'default' for the bucketed relevance score, or 'bm25' for
+                         BM25F ranking. Default is 'default'.
+            limit (Optional[int]): Maximum number of results per item type. The top
+                                 results are selected with a heap rather than a full sort.
+            field_weights (Optional[Dict[str, float]]): Per-field weights overriding the
+                defaults of the ranking mode (e.g. {'examples': 5.0}). Defaults are
+                DEFAULT_MATCH_WEIGHTS for 'default' ranking and DEFAULT_FIELD_WEIGHTS for 'bm25'.
+            fuzzy (bool): If True, tolerate typos in search terms (quoted phrases are
+                        still matched exactly). Default is False.
+            offset (int): Number of top results to skip per item type, for paging
+                        together with limit. Default is 0.
+            fields (Optional[List[str]]): Fields to search (any of 'name', 'description',
+                'synonyms', 'details', 'examples', 'references'). If None, searches all.
 
         Returns:
             Dict[str, List[Dict[str, Any]]]: Dictionary with keys for each item type
                                              and values as lists of matching items, sorted by relevance.
         
         Raises:
-            ValueError: If search_logic is not 'AND' or 'OR'.
+            ValueError: If search_logic is not 'AND' or 'OR', ranking is unknown,
+                        limit/offset is negative, or fields contains an unknown field.
         """
         # Validate search parameters
-        self._validate_search_parameters(search_logic)
+        self._validate_search_parameters(search_logic, ranking, limit, offset, fields)
         
         # Initialize result dictionary
         results = self._initialize_search_results()
 
-        # Determine which collections to search
-        collections_to_search = self._determine_search_collections(item_types)
-
         # Parse search terms (handle quoted phrases)
         search_terms, phrases = self._parse_search_query(keywords)
         if not search_terms and not phrases:
             return results
 
+        # Run the whole search against one state, even if it is replaced meanwhile
+        pinned = self._pinned()
+
+        # Return cached results for repeated queries
+        cache_key = self._search_cache_key(search_terms, phrases, item_types, substring_match, search_logic,
+                                           ranking, limit, field_weights, fuzzy, offset, fields)
+        cached_results = self._search_cache.get(cache_key, pinned.data_version)
+        if cached_results is not None:
+            return cached_results
+
+        results = pinned._run_search(search_terms, phrases, item_types, substring_match, search_logic,
+                                     ranking, limit, field_weights, fuzzy, results, offset, fields)
+        self._search_cache.put(cache_key, pinned.data_version, results)
+        return results
+
+    def _search_cache_key(self, search_terms: List[str], phrases: List[str], item_types: Optional[List[str]],
+                          substring_match: bool, search_logic: str, ranking: str, limit: Optional[int],
+                          field_weights: Optional[Dict[str, float]], fuzzy: bool, offset: int = 0,
+                          fields: Optional[List[str]] = None) -> Tuple:
+        """
+        Builds the normalised key identifying a search in the result cache.
+
+        Returns:
+            Tuple: Hashable key of the parsed query and all search options.
+        """
+        return (
+            tuple(search_terms),
+            tuple(phrases),
+            tuple(sorted(set(item_types))) if item_types is not None else None,
+            bool(substring_match),
+            search_logic.upper(),
+            ranking.lower(),
+            limit,
+            tuple(sorted(field_weights.items())) if field_weights is not None else None,
+            bool(fuzzy),
+            offset,
+            tuple(sorted(set(fields))) if fields is not None else None,
+        )
+
+    def _run_search(self, search_terms: List[str], phrases: List[str], item_types: Optional[List[str]],
+                    substring_match: bool, search_logic: str, ranking: str, limit: Optional[int],
+                    field_weights: Optional[Dict[str, float]], fuzzy: bool,
+                    results: Dict[str, List[Dict[str, Any]]], offset: int = 0,
+                    fields: Optional[List[str]] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Runs a parsed search against the collections (bypassing the result cache).
+
+        Returns:
+            Dict[str, List[Dict[str, Any]]]: Search results sorted by relevance
+        """
+        # Determine which collections to search
+        collections_to_search = self._determine_search_collections(item_types)
+
+        # Expand terms to their close spellings for typo-tolerant search
+        term_alternatives = self._search_index.fuzzy_expand(search_terms) if fuzzy else None
+
+        weights = self._resolve_field_weights(ranking, field_weights, fields)
+
+        if ranking.lower() == "bm25":
+            return self._search_collections_bm25(collections_to_search, search_terms, phrases, substring_match,
+                                                 search_logic, results, limit, weights, term_alternatives,
+                                                 offset)
+
         # Search each collection and sort results
-        return self._search_collections(collections_to_search, search_terms, phrases, substring_match, search_logic, results)
+        return self._search_collections(collections_to_search, search_terms, phrases, substring_match, search_logic,
+                                        results, limit, term_alternatives, offset, weights)
+
+    def _resolve_field_weights(self, ranking: str, field_weights: Optional[Dict[str, float]],
+                               fields: Optional[List[str]]) -> Dict[str, float]:
+        """
+        Combine the default weights of a ranking mode with overrides and a field filter.
+
+        Args:
+            ranking: 'default' or 'bm25'
+            field_weights: Per-field weight overrides (None for the defaults)
+            fields: Fields to search (None for all)
+
+        Returns:
+            Dict[str, float]: Weight for every field that should be searched
+        """
+        weights = dict(DEFAULT_FIELD_WEIGHTS if ranking.lower() == "bm25" else DEFAULT_MATCH_WEIGHTS)
+        if field_weights:
+            weights.update(field_weights)
+        selected = fields if fields is not None else SEARCH_FIELDS
+        return {field: weights.get(field, 0.0) for field in SEARCH_FIELDS if field in selected}
+
+    def iter_search(self,
+                    keywords: str,
+                    item_types: Optional[List[str]] = None,
+                    substring_match: bool = False,
+                    search_logic: str = "AND",
+                    ranking: str = "default",
+                    field_weights: Optional[Dict[str, float]] = None,
+                    fuzzy: bool = False,
+                    fields: Optional[List[str]] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Lazily yields search results in relevance order, one item type at a time.
+
+        Accepts the same options as search(). Each item type is only scored when
+        the caller reaches it, and results within a type are popped from a heap
+        one at a time, so callers that stop early avoid sorting the remainder.
+
+        Args:
+            keywords (str): Keywords to search for. Use quotes for exact phrases.
+            item_types (Optional[List[str]]): Types of items to search, in the order
+                they should be yielded. If None, yields techniques, weaknesses, then mitigations.
+            substring_match (bool): If True, uses substring matching instead of word boundaries.
+            search_logic (str): 'AND' or 'OR'. Default is 'AND'.
+            ranking (str): 'default' or 'bm25'. Default is 'default'.
+            field_weights (Optional[Dict[str, float]]): Per-field weight overrides.
+            fuzzy (bool): If True, tolerate typos in search terms.
+            fields (Optional[List[str]]): Fields to search. If None, searches all.
+
+        Yields:
+            Tuple[str, Dict[str, Any]]: (item type, item) pairs, best match first within each type.
+
+        Raises:
+            ValueError: If search_logic, ranking or fields is invalid.
+        """
+        self._validate_search_parameters(search_logic, ranking, fields=fields)
+        search_terms, phrases = self._parse_search_query(keywords)
+        if not search_terms and not phrases:
+            return
+
+        search_logic = search_logic.upper()
+        # Yield results from one state, even if it is replaced while the caller iterates
+        pinned = self._pinned()
+        term_alternatives = pinned._search_index.fuzzy_expand(search_terms) if fuzzy else None
+        weights = self._resolve_field_weights(ranking, field_weights, fields)
+        collection_names = item_types if item_types is not None else ["techniques", "weaknesses", "mitigations"]
+        collections = pinned._determine_search_collections(item_types)
+
+        for collection_name in collection_names:
+            collection = collections.get(collection_name)
+            if collection is None:
+                continue
+            if ranking.lower() == "bm25":
+                scored_results = pinned._score_collection_bm25(collection_name, collection, search_terms, phrases,
+                                                               substring_match, search_logic, weights,
+                                                               term_alternatives)
+            else:
+                scored_results = [(item, score, position) for position, (item, score) in enumerate(
+                    pinned._score_collection(collection, search_terms, phrases, substring_match, search_logic,
+                                             term_alternatives, weights, collection_name))]
+            for item in iter_ranked(scored_results):
+                yield collection_name, item
 
-    def _validate_search_parameters(self, search_logic: str) -> None:
+    def _validate_search_parameters(self, search_logic: str, ranking: str = "default",
+                                    limit: Optional[int] = None, offset: int = 0,
+                                    fields: Optional[List[str]] = None) -> None:
         """
         Validate search parameters and raise appropriate errors.
         
         Args:
             search_logic (str): Search logic to validate
+            ranking (str): Ranking mode to validate
+            limit (Optional[int]): Result limit to validate
+            offset (int): Result offset to validate
+            fields (Optional[List[str]]): Field filter to validate
             
         Raises:
-            ValueError: If search_logic is not 'AND' or 'OR'
+            ValueError: If search_logic is not 'AND' or 'OR', ranking is not
+                        'default' or 'bm25', limit/offset is negative, or
+                        fields contains an unknown field
         """
         if search_logic.upper() not in ["AND", "OR"]:
             raise ValueError("search_logic must be 'AND' or 'OR'")
+        if ranking.lower() not in ["default", "bm25"]:
+            raise ValueError("ranking must be 'default' or 'bm25'")
+        if limit is not None and limit < 0:
+            raise ValueError("limit must be a non-negative integer")
+        if offset < 0:
+            raise ValueError("offset must be a non-negative integer")
+        if fields is not None:
+            unknown_fields = [field for field in fields if field not in SEARCH_FIELDS]
+            if unknown_fields:
+                raise ValueError("Unknown search fields %s, expected any of %s" % (unknown_fields, list(SEARCH_FIELDS)))
 
     def _initialize_search_results(self) -> Dict[str, List[Dict[str, Any]]]:
         """
@@ -726,7 +1602,11 @@ class KnowledgeBase:
                           phrases: List[str], 
                           substring_match: bool, 
                           search_logic: str, 
-                          results: Dict[str, List[Dict[str, Any]]]) -> Dict[str, List[Dict[str, Any]]]:
+                          results: Dict[str, List[Dict[str, Any]]],
+                          limit: Optional[int] = None,
+                          term_alternatives: Optional[Dict[str, List[str]]] = None,
+                          offset: int = 0,
+                          field_weights: Optional[Dict[str, float]] = None) -> Dict[str, List[Dict[str, Any]]]:
         """
         Search each collection and sort results by relevance.
         
@@ -737,6 +1617,10 @@ class KnowledgeBase:
             substring_match: Whether to use substring matching
             search_logic: Search logic ('AND' or 'OR')
             results: Results dictionary to populate
+            limit: Maximum number of results per collection (None for all)
+            term_alternatives: Spellings each term should match instead of itself (fuzzy search)
+            offset: Number of top results to skip per collection
+            field_weights: Weight for each field to search (None for all fields with default weights)
             
         Returns:
             Dict[str, List[Dict[str, Any]]]: Search results sorted by relevance
@@ -744,65 +1628,174 @@ class KnowledgeBase:
         search_logic = search_logic.upper()
         
         for collection_name, collection in collections_to_search.items():
-            scored_results = []
-            
-            for _, item in collection.items():
-                score = self._calculate_search_score(item, search_terms, phrases, substring_match, search_logic)
-                if score > 0:
-                    scored_results.append((item, score))
+            scored_results = self._score_collection(collection, search_terms, phrases, substring_match, search_logic,
+                                                    term_alternatives, field_weights, collection_name)
             
             # Sort by score (highest first) and extract items
-            results[collection_name] = self._sort_search_results(scored_results)
+            results[collection_name] = self._sort_search_results(scored_results, limit, offset)
 
         return results
 
-    def _sort_search_results(self, scored_results: List[Tuple[Dict[str, Any], int]]) -> List[Dict[str, Any]]:
+    def _score_collection(self,
+                          collection: Dict[str, Dict[str, Any]],
+                          search_terms: List[str],
+                          phrases: List[str],
+                          substring_match: bool,
+                          search_logic: str,
+                          term_alternatives: Optional[Dict[str, List[str]]] = None,
+                          field_weights: Optional[Dict[str, float]] = None,
+                          collection_name: Optional[str] = None) -> List[Tuple[Dict[str, Any], int]]:
         """
-        Sort search results by relevance score.
-        
+        Score the items of a collection with the default relevance score.
+
+        When the collection is indexed, only the candidate items found through the
+        per-field postings are scored, using their pre-normalised field text.
+
         Args:
-            scored_results: List of tuples containing (item, score)
-            
+            collection: The collection to score
+            search_terms: List of individual search terms
+            phrases: List of quoted phrases
+            substring_match: Whether to use substring matching
+            search_logic: Search logic ('AND' or 'OR'), upper-cased
+            term_alternatives: Spellings each term should match instead of itself (fuzzy search)
+            field_weights: Weight for each field to search (None for all fields with default weights)
+            collection_name: Name of the collection in the search index
+
         Returns:
-            List[Dict[str, Any]]: Sorted list of items (highest score first)
+            List[Tuple[Dict[str, Any], int]]: (item, score) for matching items, in collection order
         """
-        scored_results.sort(key=lambda x: x[1], reverse=True)
-        return [item for item, _ in scored_results]
+        if field_weights is None:
+            field_weights = self._resolve_field_weights("default", None, None)
+        index = self._search_index.get(collection_name) if collection_name else None
+
+        scored_results = []
+        if index is None:
+            for _, item in collection.items():
+                score = self._calculate_search_score(item, search_terms, phrases, substring_match, search_logic,
+                                                     term_alternatives, field_weights)
+                if score > 0:
+                    scored_results.append((item, score))
+            return scored_results
+
+        for item_id in index.candidates(search_terms, phrases, substring_match, search_logic, field_weights,
+                                        term_alternatives):
+            item = collection.get(item_id)
+            if item is None:
+                continue
+            score = self._calculate_search_score(item, search_terms, phrases, substring_match, search_logic,
+                                                 term_alternatives, field_weights, index.texts[item_id])
+            if score > 0:
+                scored_results.append((item, score))
+        return scored_results
+
+    def _search_collections_bm25(self,
+                                 collections_to_search: Dict[str, Dict[str, Dict[str, Any]]],
+                                 search_terms: List[str],
+                                 phrases: List[str],
+                                 substring_match: bool,
+                                 search_logic: str,
+                                 results: Dict[str, List[Dict[str, Any]]],
+                                 limit: Optional[int] = None,
+                                 field_weights: Optional[Dict[str, float]] = None,
+                                 term_alternatives: Optional[Dict[str, List[str]]] = None,
+                                 offset: int = 0) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Search each collection using BM25F scores from the pre-computed search index.
+
+        Only the postings of the query terms are visited; ties are broken by item ID.
 
-    def _parse_search_query(self, keywords: str) -> Tuple[List[str], List[str]]:
-        """
-        Parse search query to extract individual terms and quoted phrases.
-        
         Args:
-            keywords (str): The search query string
-            
+            collections_to_search: Dictionary of collections to search
+            search_terms: List of individual search terms
+            phrases: List of quoted phrases
+            substring_match: Whether to use substring matching
+            search_logic: Search logic ('AND' or 'OR')
+            results: Results dictionary to populate
+            limit: Maximum number of results per collection (None for all)
+            field_weights: Per-field weights (defaults to DEFAULT_FIELD_WEIGHTS)
+            term_alternatives: Spellings each term should match instead of itself (fuzzy search)
+            offset: Number of top results to skip per collection
+
         Returns:
-            tuple: (list of individual terms, list of quoted phrases)
+            Dict[str, List[Dict[str, Any]]]: Search results sorted by BM25 score
         """
-        import re
-        
-        terms = []
-        phrases = []
-        
-        # Extract quoted phrases first
-        phrase_pattern = r'"([^"]+)"'
-        quoted_matches = re.findall(phrase_pattern, keywords)
-        phrases.extend([phrase.lower().strip() for phrase in quoted_matches])
-        
-        # Remove quoted phrases from the original string
-        keywords_without_phrases = re.sub(phrase_pattern, '', keywords)
-        
-        # Extract individual words (excluding common boolean operators for now)
-        word_pattern = r'\b\w+\b'
-        word_matches = re.findall(word_pattern, keywords_without_phrases.lower())
+        search_logic = search_logic.upper()
+
+        for collection_name, collection in collections_to_search.items():
+            scored_results = self._score_collection_bm25(collection_name, collection, search_terms, phrases,
+                                                         substring_match, search_logic, field_weights,
+                                                         term_alternatives)
+            results[collection_name] = top_k(scored_results, limit, offset)
+
+        return results
+
+    def _score_collection_bm25(self,
+                               collection_name: str,
+                               collection: Dict[str, Dict[str, Any]],
+                               search_terms: List[str],
+                               phrases: List[str],
+                               substring_match: bool,
+                               search_logic: str,
+                               field_weights: Optional[Dict[str, float]] = None,
+                               term_alternatives: Optional[Dict[str, List[str]]] = None) -> List[Tuple[Dict[str, Any], float, str]]:
+        """
+        Score the matching items of a collection with BM25F.
+
+        Args:
+            collection_name: Name of the collection ('techniques', 'weaknesses', 'mitigations')
+            collection: The collection data
+            search_terms: List of individual search terms
+            phrases: List of quoted phrases
+            substring_match: Whether to use substring matching
+            search_logic: Search logic ('AND' or 'OR'), upper-cased
+            field_weights: Per-field weights (defaults to DEFAULT_FIELD_WEIGHTS)
+            term_alternatives: Spellings each term should match instead of itself (fuzzy search)
+
+        Returns:
+            List[Tuple[Dict[str, Any], float, str]]: (item, score, item ID) for matching items
+        """
+        weights = field_weights if field_weights is not None else self._resolve_field_weights("bm25", None, None)
+        index = self._search_index.get(collection_name)
+        scores = index.bm25_scores(search_terms, phrases, substring_match, search_logic, weights,
+                                   term_alternatives)
+        return [(collection[item_id], score, item_id) for item_id, score in scores.items()]
+
+    def _sort_search_results(self, scored_results: List[Tuple[Dict[str, Any], int]],
+                             limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Sort search results by relevance score.
+
+        Equal scores keep their original order. When a limit is given, only the
+        top results are selected (heap selection) instead of sorting everything.
         
-        # Filter out very short words and common stop words
-        stop_words = {'and', 'or', 'not', 'the', 'a', 'an', 'is', 'are', 'was', 'were'}
-        terms.extend([word for word in word_matches if len(word) > 2 and word not in stop_words])
+        Args:
+            scored_results: List of tuples containing (item, score)
+            limit: Maximum number of results to return (None for all)
+            offset: Number of top results to skip
+            
+        Returns:
+            List[Dict[str, Any]]: Sorted list of items (highest score first)
+        """
+        return top_k(((item, score, position) for position, (item, score) in enumerate(scored_results)), limit, offset)
+
+    def _parse_search_query(self, keywords: str) -> Tuple[List[str], List[str]]:
+        """
+        Parse search query to extract individual terms and quoted phrases.
         
-        return terms, phrases
+        Args:
+            keywords (str): The search query string
+            
+        Returns:
+            tuple: (list of individual terms, list of quoted phrases)
+        """
+        # Parsing is memoised in parse_query, so repeated queries are not re-parsed
+        terms, phrases = parse_query(keywords)
+        return list(terms), list(phrases)
 
-    def _calculate_search_score(self, item: Dict[str, Any], terms: List[str], phrases: List[str], substring_match: bool = False, search_logic: str = "AND") -> int:
+    def _calculate_search_score(self, item: Dict[str, Any], terms: List[str], phrases: List[str], substring_match: bool = False, search_logic: str = "AND",
+                                term_alternatives: Optional[Dict[str, List[str]]] = None,
+                                field_weights: Optional[Dict[str, float]] = None,
+                                item_texts: Optional[Dict[str, str]] = None) -> int:
         """
         Calculate relevance score for a search result.
         
@@ -810,7 +1803,10 @@ class KnowledgeBase:
         - Name + Description matches: 100+ points
         - Name only matches: 50+ points  
         - Description only matches: 10+ points
+        - Matches only in other fields (synonyms, details, examples, references): 5+ points
         - No matches: 0 points
+
+        Matches in other fields add their weighted count to the score.
         
         For OR logic, scores are adjusted based on match percentage.
         
@@ -820,27 +1816,40 @@ class KnowledgeBase:
             phrases: List of quoted phrases
             substring_match: If True, uses substring matching instead of word boundaries
             search_logic: 'AND' requires all terms to match, 'OR' requires any term to match
+            term_alternatives: Spellings each term should match instead of itself (fuzzy search)
+            field_weights: Weight for each field to search (None for all fields with default weights)
+            item_texts: Pre-normalised field text of the item (e.g. from the search index)
             
         Returns:
             int: Relevance score (0 = no match)
         """
+        if field_weights is None:
+            field_weights = self._resolve_field_weights("default", None, None)
+
         # Extract and normalize text fields
-        name = str(item.get("name", "")).lower()
-        description = str(item.get("description", "")).lower()
+        if item_texts is None:
+            item_texts = {field: field_text(item, field) for field in field_weights}
+        name = item_texts.get("name", "") if "name" in field_weights else ""
+        description = item_texts.get("description", "") if "description" in field_weights else ""
+        other_fields = {field: item_texts.get(field, "") for field in field_weights
+                        if field not in ("name", "description")}
         
         # Find all term and phrase matches
-        match_results = self._find_term_matches(name, description, terms, phrases, substring_match)
+        match_results = self._find_term_matches(name, description, terms, phrases, substring_match, term_alternatives,
+                                                other_fields)
         
         # Apply search logic filtering
         if not self._apply_search_logic(match_results, terms, phrases, search_logic):
             return 0
         
         # Calculate final score
-        return self._calculate_final_score(match_results, terms, phrases, search_logic)
+        return self._calculate_final_score(match_results, terms, phrases, search_logic, field_weights)
 
-    def _find_term_matches(self, name: str, description: str, terms: List[str], phrases: List[str], substring_match: bool) -> Dict[str, Any]:
+    def _find_term_matches(self, name: str, description: str, terms: List[str], phrases: List[str], substring_match: bool,
+                           term_alternatives: Optional[Dict[str, List[str]]] = None,
+                           other_fields: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
         """
-        Find which terms and phrases match in name and description fields.
+        Find which terms and phrases match in name, description and other fields.
         
         Args:
             name: Normalized name text
@@ -848,6 +1857,8 @@ class KnowledgeBase:
             terms: List of search terms
             phrases: List of quoted phrases
             substring_match: Whether to use substring matching
+            term_alternatives: Spellings each term should match instead of itself (fuzzy search)
+            other_fields: Normalized text of further fields to search, keyed by field name
             
         Returns:
             Dict[str, Any]: Dictionary containing match results
@@ -858,21 +1869,30 @@ class KnowledgeBase:
         found_phrases = set()
         name_matches = 0
         desc_matches = 0
+        other_fields = other_fields or {}
+        field_matches = {field: 0 for field in other_fields}
         
         # Check individual terms
         for term in terms:
-            pattern = re.escape(term) if substring_match else r'\b' + re.escape(term) + r'\b'
+            spellings = (term_alternatives or {}).get(term, [term])
+            escaped_term = '|'.join(re.escape(spelling) for spelling in spellings)
+            if len(spellings) > 1:
+                escaped_term = '(?:' + escaped_term + ')'
+            pattern = escaped_term if substring_match else r'\b' + escaped_term + r'\b'
             
             found_in_name = bool(re.search(pattern, name))
             found_in_desc = bool(re.search(pattern, description))
+            found_in_other = [field for field, text in other_fields.items() if text and re.search(pattern, text)]
             
-            if found_in_name or found_in_desc:
+            if found_in_name or found_in_desc or found_in_other:
                 found_terms.add(term)
                 
             if found_in_name:
                 name_matches += 1
             if found_in_desc:
                 desc_matches += 1
+            for field in found_in_other:
+                field_matches[field] += 1
         
         # Check phrases (worth more points)
         for phrase in phrases:
@@ -881,20 +1901,24 @@ class KnowledgeBase:
             
             found_in_name = bool(re.search(pattern, name))
             found_in_desc = bool(re.search(pattern, description))
+            found_in_other = [field for field, text in other_fields.items() if text and re.search(pattern, text)]
             
-            if found_in_name or found_in_desc:
+            if found_in_name or found_in_desc or found_in_other:
                 found_phrases.add(phrase)
                 
             if found_in_name:
                 name_matches += 2  # Phrases worth more
             if found_in_desc:
                 desc_matches += 2
+            for field in found_in_other:
+                field_matches[field] += 2
         
         return {
             'found_terms': found_terms,
             'found_phrases': found_phrases,
             'name_matches': name_matches,
-            'desc_matches': desc_matches
+            'desc_matches': desc_matches,
+            'field_matches': field_matches
         }
 
     def _apply_search_logic(self, match_results: Dict[str, Any], terms: List[str], phrases: List[str], search_logic: str) -> bool:
@@ -920,7 +1944,8 @@ class KnowledgeBase:
             # Must match AT LEAST ONE term/phrase
             return total_found > 0
 
-    def _calculate_final_score(self, match_results: Dict[str, Any], terms: List[str], phrases: List[str], search_logic: str) -> int:
+    def _calculate_final_score(self, match_results: Dict[str, Any], terms: List[str], phrases: List[str], search_logic: str,
+                               field_weights: Optional[Dict[str, float]] = None) -> int:
         """
         Calculate final weighted score based on match results.
         
@@ -929,20 +1954,29 @@ class KnowledgeBase:
             terms: List of search terms
             phrases: List of quoted phrases
             search_logic: 'AND' or 'OR'
+            field_weights: Weights applied to the match count of each field
+                           (defaults to DEFAULT_MATCH_WEIGHTS)
             
         Returns:
             int: Final relevance score
         """
+        weights = field_weights if field_weights is not None else DEFAULT_MATCH_WEIGHTS
         name_matches = match_results['name_matches']
         desc_matches = match_results['desc_matches']
+        name_points = name_matches * weights.get('name', 1.0)
+        desc_points = desc_matches * weights.get('description', 1.0)
+        other_points = sum(count * weights.get(field, 0.0)
+                           for field, count in match_results.get('field_matches', {}).items())
         
         # Calculate base score based on where matches were found
         if name_matches > 0 and desc_matches > 0:
-            base_score = 100 + name_matches + desc_matches
+            base_score = 100 + name_points + desc_points + other_points
         elif name_matches > 0:
-            base_score = 50 + name_matches
+            base_score = 50 + name_points + other_points
         elif desc_matches > 0:
-            base_score = 10 + desc_matches
+            base_score = 10 + desc_points + other_points
+        elif other_points > 0:
+            base_score = 5 + other_points
         else:
             base_score = 0
         
@@ -954,9 +1988,9 @@ class KnowledgeBase:
             # Scale score: 100% match gets full score, partial matches get reduced score
             # But ensure at least some score for any match
             score_multiplier = max(0.3, match_percentage)
-            base_score = int(base_score * score_multiplier)
+            base_score = base_score * score_multiplier
         
-        return base_score
+        return int(base_score)
 
     def get_mit_list_for_technique(self, technique_id: str) -> List[str]:
         """
@@ -976,15 +2010,41 @@ class KnowledgeBase:
         if not technique:
             return mit_list_for_this_technique
             
+        seen = set()
         for weakness_id in technique.get('weaknesses', []):
             weakness_info = self.get_weakness(weakness_id)
             if weakness_info:
                 for mitigation_id in weakness_info.get('mitigations', []):
-                    if mitigation_id not in mit_list_for_this_technique:
+                    if mitigation_id not in seen:
+                        seen.add(mitigation_id)
                         mit_list_for_this_technique.append(mitigation_id)
         
         return mit_list_for_this_technique
 
+    def get_minimal_mitigation_plan(self,
+                                    technique_ids: List[str],
+                                    lab_config: Union[str, Dict[str, Any], None] = None,
+                                    exact: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        Computes the smallest set of mitigations covering every weakness of the given techniques.
+
+        Mitigations marked as implemented ('Y') in the optional lab config are treated
+        as already in place. See mitigation_solver.solve_minimal_mitigations for details.
+
+        Args:
+            technique_ids (List[str]): Technique IDs in the workflow/SOP being reviewed.
+            lab_config (Union[str, Dict[str, Any], None]): Path to, or loaded data of, a
+                lab config file in the generate_evaluation.py format.
+            exact (Optional[bool]): Force (True) or disable (False) the exact
+                branch-and-bound search. If None, it is used for small inputs only.
+
+        Returns:
+            Dict[str, Any]: The mitigation plan, with a ranked 'plan' list of mitigations
+                and the covered, already mitigated and unmitigable weaknesses.
+        """
+        from .mitigation_solver import solve_minimal_mitigations
+        return solve_minimal_mitigations(self, technique_ids, lab_config, exact)
+
     def get_max_mitigations_per_technique(self) -> int:
         """
         Returns the maximum number of mitigations across all techniques.
@@ -1000,15 +2060,19 @@ class KnowledgeBase:
                 max_mits = len(mits)
         return max_mits
 
-    def list_tactics(self) -> List[str]:
+    def list_tactics(self, mapping_name: Optional[str] = None) -> List[str]:
         """
         Compatibility method - returns list of objective names.
         Maintains compatibility with original solveitcore.py API.
+
+        Args:
+            mapping_name (Optional[str]): The filename of the mapping to use.
+                                          If None, uses the currently loaded mapping.
         
         Returns:
-            List[str]: List of objective names from current mapping
+            List[str]: List of objective names from the mapping
         """
-        objectives = self.list_objectives()
+        objectives = self.list_objectives(mapping_name)
         return [obj.get('name') for obj in objectives]
 
     @property 
@@ -1086,3 +2150,571 @@ class KnowledgeBase:
             logger.debug("No techniques found that reference mitigation %s.", mitigation_id)
 
         return associated_techniques
+
+    # --- Citation Queries ---
+
+    def list_references(self) -> List[str]:
+        """
+        Returns every distinct reference cited by a technique, weakness or mitigation.
+
+        References are normalised (whitespace collapsed) and spellings differing only
+        in case or a trailing full stop are merged.
+
+        Returns:
+            List[str]: Sorted list of references.
+        """
+        return sorted(self._citation_index.references.values())
+
+    def get_items_for_reference(self, reference: str) -> List[str]:
+        """
+        Returns the IDs of the techniques, weaknesses and mitigations citing a reference.
+
+        Args:
+            reference (str): The reference (any whitespace, case or trailing full stop).
+
+        Returns:
+            List[str]: Sorted item IDs; empty if the reference is not cited.
+        """
+        return self._citation_index.items_for_reference(reference)
+
+    def get_references_for_technique(self, technique_id: str) -> Dict[str, List[str]]:
+        """
+        Returns the references of a technique together with those of its weaknesses
+        and their mitigations, with the IDs each reference came from.
+
+        Args:
+            technique_id (str): The ID of the technique.
+
+        Returns:
+            Dict[str, List[str]]: Reference -> IDs citing it (the technique, then its
+                weaknesses, then their mitigations). Empty if the technique is not found.
+        """
+        return self._citation_index.references_for_technique(technique_id)
+
+    def find_references(self, text: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Finds cited references containing some text, e.g. an author name or year.
+
+        Args:
+            text (str): Text to look for (case-insensitive).
+            limit (Optional[int]): Maximum number of results.
+
+        Returns:
+            List[Dict[str, Any]]: {'reference': str, 'items': List[str]} for each
+                matching reference, most cited first.
+        """
+        return self._citation_index.find(text, limit)
+
+    # --- Tool Queries ---
+
+    def list_tools(self) -> List[Dict[str, Any]]:
+        """
+        Returns every tool named in the technique examples, with the number of techniques listing it.
+
+        The tool name is the start of each example (e.g. 'FTK Imager' in "FTK Imager - Can
+        capture both RAM and the pagefile"); examples that read as prose, artefacts, datasets
+        or citations rather than a tool name are skipped (see tool_index.tool_name). Spellings
+        differing in case or whitespace, and the aliases in TOOL_ALIASES, are merged.
+
+        Returns:
+            List[Dict[str, Any]]: {'tool': str, 'count': int, 'techniques': List[str]} for
+                each tool, most techniques first.
+        """
+        return self._tool_index.counts()
+
+    def get_techniques_for_tool(self, tool_name: str) -> List[Dict[str, Any]]:
+        """
+        Returns the techniques whose examples name a tool.
+
+        Args:
+            tool_name (str): The tool name (any case or whitespace, or an alias).
+
+        Returns:
+            List[Dict[str, Any]]: Technique dictionaries sorted by ID; empty if no
+                technique names the tool.
+        """
+        techniques = self.techniques
+        return [techniques[t_id] for t_id in self._tool_index.techniques_for_tool(tool_name) if t_id in techniques]
+
+    def get_tools_for_technique(self, technique_id: str) -> List[str]:
+        """
+        Returns the tools named in a technique's examples.
+
+        Args:
+            technique_id (str): The ID of the technique.
+
+        Returns:
+            List[str]: Canonical tool names in the order listed; empty if the technique is not found.
+        """
+        return self._tool_index.tools_for_technique(technique_id)
+
+    # --- CASE Ontology Queries ---
+
+    def list_case_classes(self, pattern: Optional[str] = None) -> List[str]:
+        """
+        Returns the CASE classes output by any technique.
+
+        Args:
+            pattern (Optional[str]): Only return classes matching this pattern: a class
+                name, or a prefix followed by '*' (e.g. 'observable:*').
+
+        Returns:
+            List[str]: Sorted class names.
+        """
+        if pattern is None:
+            return list(self._case_index.classes)
+        return self._case_index.find_classes(pattern)
+
+    def get_techniques_for_case_class(self, pattern: str) -> List[Dict[str, Any]]:
+        """
+        Returns the techniques outputting a CASE class, or any class matching a prefix pattern.
+
+        Args:
+            pattern (str): A class name (e.g. 'observable:File') or a prefix followed by
+                '*' (e.g. 'observable:*' for the whole observable namespace).
+
+        Returns:
+            List[Dict[str, Any]]: Technique dictionaries sorted by ID; empty if none match.
+        """
+        techniques = self.techniques
+        return [techniques[t_id] for t_id in self._case_index.techniques_for_class(pattern) if t_id in techniques]
+
+    def get_case_classes_for_technique(self, technique_id: str) -> List[str]:
+        """
+        Returns the CASE classes a technique outputs.
+
+        Args:
+            technique_id (str): The ID of the technique.
+
+        Returns:
+            List[str]: Class names in the order listed; empty if the technique is not found.
+        """
+        return self._case_index.classes_for_technique(technique_id)
+
+    def iter_case_jsonld(self, pattern: Optional[str] = None, base_iri: str = DEFAULT_BASE_IRI,
+                         indent: bool = True) -> Iterator[str]:
+        """
+        Streams the techniques with CASE output classes as a JSON-LD document.
+
+        The document is yielded in pieces (one technique node at a time) and reflects
+        the content loaded when iteration starts, even if the knowledge base is
+        reloaded meanwhile.
+
+        Args:
+            pattern (Optional[str]): Only emit techniques outputting a class matching this
+                pattern (see get_techniques_for_case_class); by default every technique
+                with at least one class.
+            base_iri (str): IRI the technique IDs are appended to.
+            indent (bool): Put each technique node on its own line.
+
+        Yields:
+            str: Consecutive pieces of the JSON-LD document.
+
+        Example:
+            with open('solve-it-case.jsonld', 'w', encoding='utf-8') as f:
+                f.writelines(kb.iter_case_jsonld('observable:*'))
+        """
+        state = self._state
+        index = state.derived_index('case', lambda state: CaseIndex(state.techniques))
+        if pattern is None:
+            technique_ids = sorted(t_id for t_id in state.techniques if index.classes_for_technique(t_id))
+        else:
+            technique_ids = index.techniques_for_class(pattern)
+        return iter_jsonld(state.techniques, index, technique_ids, base_iri, indent)
+
+    # --- Subtechnique Hierarchy Queries ---
+
+    def get_parent_technique(self, technique_id: str) -> Optional[str]:
+        """
+        Returns the technique listing a technique as one of its subtechniques.
+
+        Args:
+            technique_id (str): The ID of the technique.
+
+        Returns:
+            Optional[str]: The parent technique ID (the first in load order if several list
+                it), or None for a top-level or unknown technique.
+        """
+        return self._technique_hierarchy.parent(technique_id)
+
+    def get_technique_depth(self, technique_id: str) -> Optional[int]:
+        """
+        Returns how deeply a technique is nested below top-level techniques.
+
+        Args:
+            technique_id (str): The ID of the technique.
+
+        Returns:
+            Optional[int]: 0 for a top-level technique, 1 for its subtechniques and so on;
+                None if the technique is not found.
+        """
+        return self._technique_hierarchy.depth(technique_id)
+
+    def get_technique_path(self, technique_id: str) -> List[str]:
+        """
+        Returns the chain of parent techniques down to a technique, e.g. for breadcrumbs.
+
+        Args:
+            technique_id (str): The ID of the technique.
+
+        Returns:
+            List[str]: Technique IDs from the top-level technique to technique_id (just
+                [technique_id] for a top-level technique); empty if the technique is not found.
+        """
+        return self._technique_hierarchy.path(technique_id)
+
+    def get_technique_ancestors(self, technique_id: str) -> List[str]:
+        """
+        Returns every technique a technique is nested under, through any parent.
+
+        Args:
+            technique_id (str): The ID of the technique.
+
+        Returns:
+            List[str]: Technique IDs, nearest first; empty for a top-level technique.
+        """
+        return self._technique_hierarchy.ancestors(technique_id)
+
+    def get_technique_descendants(self, technique_id: str) -> List[str]:
+        """
+        Returns every subtechnique nested under a technique, at any depth.
+
+        Args:
+            technique_id (str): The ID of the technique.
+
+        Returns:
+            List[str]: Technique IDs, depth first in the order listed; subtechniques that
+                do not exist are left out.
+        """
+        return self._technique_hierarchy.descendants(technique_id)
+
+    def get_subtechnique_cycles(self) -> List[List[str]]:
+        """
+        Returns the subtechnique cycles in the knowledge base.
+
+        Returns:
+            List[List[str]]: Each cycle as the chain of technique IDs from its first
+                technique back to itself (e.g. ['T1', 'T2', 'T1']); empty if there are none.
+        """
+        return [list(cycle) for cycle in self._technique_hierarchy.cycles]
+
+    def get_inherited_weaknesses(self, technique_id: str) -> List[Dict[str, Any]]:
+        """
+        Returns the weaknesses of a technique and of all subtechniques nested under it.
+
+        Results are cached until the knowledge base is reloaded.
+
+        Args:
+            technique_id (str): The ID of the technique.
+
+        Returns:
+            List[Dict[str, Any]]: Weakness dictionaries, deduplicated, the technique's own
+                first; empty if the technique is not found.
+        """
+        weaknesses = self.weaknesses
+        return [weaknesses[w_id] for w_id in self._technique_hierarchy.inherited_weaknesses(technique_id)
+                if w_id in weaknesses]
+
+    def get_inherited_mitigations(self, technique_id: str) -> List[Dict[str, Any]]:
+        """
+        Returns the mitigations of the inherited weaknesses of a technique (see get_inherited_weaknesses).
+
+        Args:
+            technique_id (str): The ID of the technique.
+
+        Returns:
+            List[Dict[str, Any]]: Mitigation dictionaries, deduplicated, in the order first
+                reached; empty if the technique is not found.
+        """
+        mitigations = self.mitigations
+        return [mitigations[m_id] for m_id in self._technique_hierarchy.inherited_mitigations(technique_id)
+                if m_id in mitigations]
+
+    def get_objectives_for_technique(self, technique_id: str, mapping_name: Optional[str] = None) -> List[str]:
+        """
+        Returns the objectives a technique belongs to, directly or through a parent technique.
+
+        Subtechniques are usually not listed in objective mappings themselves, so a
+        subtechnique belongs to the objectives listing any of its ancestors.
+
+        Args:
+            technique_id (str): The ID of the technique.
+            mapping_name (Optional[str]): The filename of the mapping to use.
+                                          If None, uses the currently loaded mapping.
+
+        Returns:
+            List[str]: Objective names in mapping order; empty if none list the technique
+                or its ancestors.
+        """
+        if technique_id not in self.techniques:
+            return []
+        members = {technique_id}
+        members.update(self._technique_hierarchy.ancestors(technique_id))
+        return [objective.get('name') for objective in self.list_objectives(mapping_name)
+                if members.intersection(objective.get('techniques') or [])]
+
+    # --- Mitigation Chain Queries ---
+
+    def get_mitigation_closure(self, technique_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Expands a technique's mitigations through their linked techniques, to any depth.
+
+        A mitigation may link to a technique (Mitigation.technique) that has weaknesses
+        and mitigations of its own; the closure follows these links until no new
+        technique is reached. Closures of all techniques are computed together on the
+        first call and cached until the knowledge base is reloaded.
+
+        Args:
+            technique_id (str): The ID of the technique.
+
+        Returns:
+            Optional[Dict[str, Any]]: None if the technique is not found, otherwise:
+                - 'technique': the technique ID
+                - 'techniques': the technique, then every technique reached, sorted
+                - 'weaknesses', 'mitigations': IDs of the weaknesses and mitigations of
+                  those techniques, sorted
+                - 'links': the dependency DAG, as {'technique', 'mitigation',
+                  'linked_technique'} for each link that does not close a cycle
+                - 'cycles': the groups of reached techniques whose links lead back to each other
+                - 'depth': the length of the longest chain of links from the technique
+
+        Example:
+            closure = kb.get_mitigation_closure('T1002')
+            for link in closure['links']:
+                print(link['technique'], '->', link['mitigation'], '->', link['linked_technique'])
+        """
+        return self._mitigation_closure.closure(technique_id)
+
+    def get_all_mitigation_closures(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the mitigation closure of every technique (see get_mitigation_closure).
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Closures keyed by technique ID, in load order.
+        """
+        return self._mitigation_closure.closures()
+
+    def get_mitigation_link_cycles(self) -> List[List[str]]:
+        """
+        Returns the groups of techniques whose Mitigation.technique links lead back to each other.
+
+        Returns:
+            List[List[str]]: The technique IDs of each group (a single technique if one of
+                its mitigations links to itself); empty if there are none.
+        """
+        return [list(cycle) for cycle in self._mitigation_closure.cycles]
+
+    # --- Weakness Class Queries ---
+
+    def get_weakness_class_mask(self, weakness_id: str) -> Optional[int]:
+        """
+        Returns the classes marked on a weakness as a 6-bit mask.
+
+        Bit i is set for the class WEAKNESS_CLASS_HEADERS[i] (INCOMP, INAC-EX, INAC-AS,
+        INAC-ALT, INAC-COR, MISINT), so INCOMP is 1 and MISINT is 32.
+
+        Args:
+            weakness_id (str): The ID of the weakness.
+
+        Returns:
+            Optional[int]: The mask, or None if the weakness is not found.
+        """
+        return self._weakness_class_index.masks.get(weakness_id)
+
+    def get_weakness_classes(self, weakness_id: str) -> List[str]:
+        """
+        Returns the names of the classes marked on a weakness.
+
+        Args:
+            weakness_id (str): The ID of the weakness.
+
+        Returns:
+            List[str]: Class names (e.g. ['INCOMP', 'MISINT']); empty if none are marked
+                or the weakness is not found.
+        """
+        from .weakness_classes import class_names
+        return class_names(self._weakness_class_index.masks.get(weakness_id, 0))
+
+    def get_weaknesses_by_class(self, classes: Union[str, List[str]], technique_id: Optional[str] = None,
+                                objective_name: Optional[str] = None, mapping_name: Optional[str] = None,
+                                match_all: bool = False) -> List[Dict[str, Any]]:
+        """
+        Returns the weaknesses marked with some classes, optionally only those of a technique or objective.
+
+        Args:
+            classes (Union[str, List[str]]): Class names, e.g. 'MISINT' or ['INAC-EX', 'INAC-AS']
+                (case-insensitive; '_' and '-' are interchangeable).
+            technique_id (Optional[str]): Only weaknesses of this technique.
+            objective_name (Optional[str]): Only weaknesses of the techniques (and their
+                subtechniques) of this objective.
+            mapping_name (Optional[str]): The mapping of objective_name; if None, uses the
+                currently loaded mapping.
+            match_all (bool): Require every class instead of any of them.
+
+        Returns:
+            List[Dict[str, Any]]: Weakness dictionaries, sorted by ID.
+
+        Raises:
+            ValueError: If a class name is not a weakness class.
+
+        Example:
+            kb.get_weaknesses_by_class('MISINT', objective_name='Acquire data')
+        """
+        from .weakness_classes import class_mask
+        selected = class_mask(classes)
+        index = self._weakness_class_index
+        weakness_ids = index.masks
+        if technique_id is not None:
+            weakness_ids = index.weaknesses_for_techniques([technique_id])
+        if objective_name is not None:
+            in_objective = set(index.weaknesses_for_techniques(self._objective_technique_ids(objective_name,
+                                                                                             mapping_name)))
+            weakness_ids = [w_id for w_id in weakness_ids if w_id in in_objective]
+        weaknesses = self.weaknesses
+        return [weaknesses[w_id] for w_id in sorted(index.filter(weakness_ids, selected, match_all))]
+
+    def get_weakness_class_counts(self, technique_id: str) -> Optional[Dict[str, int]]:
+        """
+        Returns the number of a technique's weaknesses in each class.
+
+        Counts for every technique are computed together on first use and cached
+        until the knowledge base is reloaded.
+
+        Args:
+            technique_id (str): The ID of the technique.
+
+        Returns:
+            Optional[Dict[str, int]]: Count per class name, and 'total' (the number of
+                weaknesses); None if the technique is not found.
+        """
+        return self._weakness_class_index.technique_counts(technique_id)
+
+    def get_objective_weakness_class_counts(self, mapping_name: Optional[str] = None) -> Dict[str, Dict[str, int]]:
+        """
+        Returns the number of weaknesses in each class for every objective of a mapping.
+
+        Each weakness is counted once per objective, even if several of its techniques
+        list it. Subtechniques count towards the objectives of their parents.
+
+        Args:
+            mapping_name (Optional[str]): The filename of the mapping to use.
+                                          If None, uses the currently loaded mapping.
+
+        Returns:
+            Dict[str, Dict[str, int]]: Count per class name and 'total' for each objective
+                name, in mapping order.
+        """
+        index = self._weakness_class_index
+        return {objective.get('name'): index.group_counts(self._with_descendants(objective.get('techniques') or []))
+                for objective in self.list_objectives(mapping_name)}
+
+    def _objective_technique_ids(self, objective_name: str, mapping_name: Optional[str] = None) -> List[str]:
+        """Returns the techniques of an objective and their subtechniques (empty if the objective is not found)."""
+        for objective in self.list_objectives(mapping_name):
+            if objective.get('name') == objective_name:
+                return self._with_descendants(objective.get('techniques') or [])
+        return []
+
+    def _with_descendants(self, technique_ids: List[str]) -> List[str]:
+        """Returns technique IDs followed by their subtechniques at any depth, deduplicated."""
+        hierarchy = self._technique_hierarchy
+        found: Dict[str, None] = {}
+        for technique_id in technique_ids:
+            found[technique_id] = None
+            for descendant_id in hierarchy.descendants(technique_id):
+                found[descendant_id] = None
+        return list(found)
+
+    # --- Mapping Comparison ---
+
+    def compare_mappings(self, mapping_names: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Compares the objectives of several mappings in one pass.
+
+        Mappings that are not loaded yet are loaded without changing the active mapping.
+        A technique belongs to the objectives listing it or any of its parent techniques.
+
+        Args:
+            mapping_names (Optional[List[str]]): Mapping filenames to compare. If None, all
+                available mappings are compared, in sorted order.
+
+        Returns:
+            Dict[str, Any]: Dictionary containing:
+                - 'mappings': the compared mapping names
+                - 'matrix': technique ID (sorted) -> mapping name -> objective names (empty if unmapped)
+                - 'unmapped': mapping name -> sorted IDs of the techniques in none of its objectives
+                - 'overlap': for every pair of mappings, {'mapping_a', 'mapping_b', 'jaccard',
+                  'objectives'}, where 'objectives' lists {'objective_a', 'objective_b',
+                  'shared', 'jaccard'} for each pair of objectives sharing a technique,
+                  most similar first
+
+        Raises:
+            ValueError: If a mapping cannot be loaded.
+        """
+        return self._mapping_comparison(mapping_names).compare()
+
+    def get_unmapped_techniques(self, mapping_name: Optional[str] = None) -> List[str]:
+        """
+        Returns the techniques in no objective of a mapping (subtechniques of mapped techniques count as mapped).
+
+        Args:
+            mapping_name (Optional[str]): The filename of the mapping to use.
+                                          If None, uses the currently loaded mapping.
+
+        Returns:
+            List[str]: Technique IDs, sorted.
+
+        Raises:
+            ValueError: If the mapping cannot be loaded.
+        """
+        mapping_name = mapping_name or self.current_mapping_name
+        return self._mapping_comparison([mapping_name]).unmapped(mapping_name)
+
+    def get_mapping_overlap(self, mapping_a: str, mapping_b: str) -> Dict[str, Any]:
+        """
+        Returns the Jaccard overlap of two mappings and of each pair of their objectives.
+
+        Args:
+            mapping_a (str): The filename of the first mapping.
+            mapping_b (str): The filename of the second mapping.
+
+        Returns:
+            Dict[str, Any]: {'mapping_a', 'mapping_b', 'jaccard', 'objectives'} as in
+                the 'overlap' entries of compare_mappings().
+
+        Raises:
+            ValueError: If a mapping cannot be loaded.
+        """
+        return self._mapping_comparison([mapping_a, mapping_b]).overlap(mapping_a, mapping_b)
+
+    def _mapping_comparison(self, mapping_names: Optional[List[str]] = None) -> 'MappingComparison':
+        """
+        Returns the comparison index of some mappings, loading them if needed.
+
+        Indices are cached with the content; a mapping that is loaded again gets a new index.
+        """
+        if mapping_names is None:
+            mapping_names = sorted(self.list_available_mappings())
+        mappings = {}
+        for mapping_name in mapping_names:
+            objectives = self.objective_mappings.get(mapping_name)
+            if objectives is None:
+                objectives = self._read_objective_mapping(mapping_name)
+                if objectives is None:
+                    raise ValueError(f"Could not load objective mapping '{mapping_name}'")
+                self._publish_mapping(mapping_name, objectives)
+            mappings[mapping_name] = objectives
+
+        state = self._state
+        comparisons = state.derived_index('mapping_comparisons', lambda state: {})
+        # The cached index keeps the objective lists alive, so their ids identify them
+        key = tuple((mapping_name, id(objectives)) for mapping_name, objectives in mappings.items())
+        comparison = comparisons.get(key)
+        if comparison is None:
+            hierarchy = self._technique_hierarchy
+            descendants = {t_id: hierarchy.descendants(t_id) for t_id in state.techniques if hierarchy.children(t_id)}
+            from .mapping_comparison import MappingComparison
+            comparison = MappingComparison(mappings, sorted(state.techniques), descendants)
+            with state.derived_indices_lock:
+                comparison = comparisons.setdefault(key, comparison)
+        return comparison
@@ -0,0 +1,205 @@
+"""
+Subtechnique hierarchy index for the SOLVE-IT Knowledge Base Library.
+
+Techniques only list their children (subtechniques); this index adds the
+reverse direction (parents), each technique's depth, ancestors and
+descendants, and the subtechnique cycles found while building it. Inherited
+queries (the weaknesses and mitigations of a technique and all of its
+descendants) are computed on first request and cached in the index, so they
+are discarded with it when the knowledge base is reloaded.
+
+References to missing subtechniques are ignored here (they are reported by
+check_integrity as dangling_subtechnique), and cycles are cut where they are
+found, so every query terminates.
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+
+
+class TechniqueHierarchy:
+    """
+    Parent/child structure of techniques and subtechniques.
+
+    Attributes:
+        cycles (List[List[str]]): Each subtechnique cycle found, as the chain of IDs
+            from the first technique in the cycle back to itself (e.g. ['T1', 'T2', 'T1']).
+        max_depth (int): Length of the deepest subtechnique chain (0 if there are no
+            subtechniques; edges closing a cycle are not followed).
+    """
+
+    def __init__(self, techniques: Dict[str, Dict[str, Any]], weaknesses: Optional[Dict[str, Dict[str, Any]]] = None):
+        """
+        Builds the index.
+
+        Args:
+            techniques (Dict[str, Dict[str, Any]]): Techniques keyed by ID.
+            weaknesses (Optional[Dict[str, Dict[str, Any]]]): Weaknesses keyed by ID, used
+                by inherited_mitigations().
+        """
+        self._techniques = techniques
+        self._weaknesses = weaknesses or {}
+        # Technique -> existing subtechniques, and subtechnique -> parents, in load order
+        self._children: Dict[str, List[str]] = {}
+        self._parents: Dict[str, List[str]] = {}
+        for technique_id, technique in techniques.items():
+            children = self._children[technique_id] = []
+            for child_id in technique.get('subtechniques') or []:
+                if child_id in techniques and child_id not in children:
+                    children.append(child_id)
+                    self._parents.setdefault(child_id, []).append(technique_id)
+
+        self.cycles: List[List[str]] = []
+        self.max_depth = self._find_cycles()
+
+        # Results computed on first request
+        self._depths: Dict[str, int] = {}
+        self._descendants: Dict[str, Tuple[str, ...]] = {}
+        self._inherited: Dict[Tuple[str, str], Tuple[str, ...]] = {}
+
+    def _find_cycles(self) -> int:
+        """
+        Records subtechnique cycles with an iterative depth-first search.
+
+        Every technique is visited once. Cycles are recorded once each, starting
+        from the technique first reached in load order.
+
+        Returns:
+            int: Depth of the deepest subtechnique chain.
+        """
+        unvisited, in_progress, done = 0, 1, 2
+        state = {technique_id: unvisited for technique_id in self._techniques}
+        height: Dict[str, int] = {}
+
+        for root_id in self._techniques:
+            if state[root_id] != unvisited:
+                continue
+            path = [root_id]
+            iterators = [iter(self._children[root_id])]
+            state[root_id] = in_progress
+            while iterators:
+                child_id = next(iterators[-1], None)
+                if child_id is None:
+                    # All children processed: height is one more than the highest child
+                    finished_id = path.pop()
+                    iterators.pop()
+                    children = [c for c in self._children[finished_id] if c in height]
+                    height[finished_id] = 1 + max((height[c] for c in children), default=-1)
+                    state[finished_id] = done
+                    continue
+                if state[child_id] == in_progress:
+                    self.cycles.append(path[path.index(child_id):] + [child_id])
+                    continue
+                if state[child_id] == unvisited:
+                    state[child_id] = in_progress
+                    path.append(child_id)
+                    iterators.append(iter(self._children[child_id]))
+
+        return max(height.values(), default=0)
+
+    def parent(self, technique_id: str) -> Optional[str]:
+        """Returns the technique listing this one as a subtechnique (the first, if several do)."""
+        parents = self._parents.get(technique_id)
+        return parents[0] if parents else None
+
+    def parents(self, technique_id: str) -> List[str]:
+        """Returns every technique listing this one as a subtechnique, in load order."""
+        return list(self._parents.get(technique_id, []))
+
+    def children(self, technique_id: str) -> List[str]:
+        """Returns the existing subtechniques of a technique, in the order listed."""
+        return list(self._children.get(technique_id, []))
+
+    def roots(self) -> List[str]:
+        """Returns the techniques that are not a subtechnique of any technique, in load order."""
+        return [technique_id for technique_id in self._techniques if technique_id not in self._parents]
+
+    def depth(self, technique_id: str) -> Optional[int]:
+        """
+        Returns the number of parents above a technique, following the first parent
+        (0 for a top-level technique, None if the technique is not found). A chain
+        that loops back on itself is counted up to the repeated technique.
+        """
+        if technique_id not in self._techniques:
+            return None
+        depth = self._depths.get(technique_id)
+        if depth is None:
+            depth = 0
+            seen = {technique_id}
+            parent_id = self.parent(technique_id)
+            while parent_id is not None and parent_id not in seen:
+                depth += 1
+                seen.add(parent_id)
+                parent_id = self.parent(parent_id)
+            self._depths[technique_id] = depth
+        return depth
+
+    def path(self, technique_id: str) -> List[str]:
+        """Returns the chain of first parents from the top-level technique down to this one (e.g. for breadcrumbs)."""
+        if technique_id not in self._techniques:
+            return []
+        chain = [technique_id]
+        parent_id = self.parent(technique_id)
+        while parent_id is not None and parent_id not in chain:
+            chain.append(parent_id)
+            parent_id = self.parent(parent_id)
+        chain.reverse()
+        return chain
+
+    def ancestors(self, technique_id: str) -> List[str]:
+        """Returns every technique above this one (through any parent), nearest first."""
+        ancestors: List[str] = []
+        seen = {technique_id}
+        frontier = [technique_id]
+        while frontier:
+            next_frontier = []
+            for each_id in frontier:
+                for parent_id in self._parents.get(each_id, []):
+                    if parent_id not in seen:
+                        seen.add(parent_id)
+                        ancestors.append(parent_id)
+                        next_frontier.append(parent_id)
+            frontier = next_frontier
+        return ancestors
+
+    def descendants(self, technique_id: str) -> List[str]:
+        """Returns every technique below this one, depth first in the order listed."""
+        descendants = self._descendants.get(technique_id)
+        if descendants is None:
+            found: List[str] = []
+            seen = {technique_id}
+            stack = list(reversed(self._children.get(technique_id, [])))
+            while stack:
+                each_id = stack.pop()
+                if each_id in seen:
+                    continue
+                seen.add(each_id)
+                found.append(each_id)
+                stack.extend(reversed(self._children[each_id]))
+            descendants = self._descendants[technique_id] = tuple(found)
+        return list(descendants)
+
+    def inherited_weaknesses(self, technique_id: str) -> List[str]:
+        """Returns the weakness IDs of a technique and all of its descendants, deduplicated, in order."""
+        key = (technique_id, 'weaknesses')
+        inherited = self._inherited.get(key)
+        if inherited is None:
+            found: Dict[str, None] = {}
+            if technique_id in self._techniques:
+                for each_id in [technique_id] + self.descendants(technique_id):
+                    for weakness_id in self._techniques[each_id].get('weaknesses') or []:
+                        found[weakness_id] = None
+            inherited = self._inherited[key] = tuple(found)
+        return list(inherited)
+
+    def inherited_mitigations(self, technique_id: str) -> List[str]:
+        """Returns the mitigation IDs of the inherited weaknesses of a technique, deduplicated, in order."""
+        key = (technique_id, 'mitigations')
+        inherited = self._inherited.get(key)
+        if inherited is None:
+            found: Dict[str, None] = {}
+            for weakness_id in self.inherited_weaknesses(technique_id):
+                weakness = self._weaknesses.get(weakness_id)
+                for mitigation_id in (weakness or {}).get('mitigations') or []:
+                    found[mitigation_id] = None
+            inherited = self._inherited[key] = tuple(found)
+        return list(inherited)
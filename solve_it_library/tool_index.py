@@ -0,0 +1,143 @@
+"""
+Tool index for the SOLVE-IT Knowledge Base Library.
+
+Maps the tools named in technique examples to the techniques that list them.
+Examples are free text such as "FTK Imager - Can capture both RAM and the
+pagefile of the system"; the tool name is taken as the text before the first
+separator (' - ', ': ', ', ', ' (', a quoted feature name or a URL).
+
+Not every example names a tool. Examples are skipped when their leading text
+reads as prose or an artefact rather than a product name ("Examination of
+syslog", "USB connected devices": a name of several words with an all-lowercase
+word, or more than MAX_TOOL_WORDS words), starts with a year ("2009 M57-Jean",
+a dataset) or is a citation ("Hargreaves, Nelson and Casey (2024) ...", "See
+Hargreaves & Drury (2025)", "sqlite-forensic-corpus (2018)"). A tool feature
+named as "<Tool> ... view/module/plugin" counts as the tool.
+
+Tool names are compared case- and whitespace-insensitively, and aliases (e.g.
+'Axiom' and 'Magnet AXIOM') are merged under one canonical name. The first
+spelling seen is kept for names that are not aliased.
+"""
+
+import re
+from typing import Dict, Any, List, Optional
+
+_WHITESPACE = re.compile(r'\s+')
+# Ends the tool name at the start of an example
+_NAME_END = re.compile(r"\s+-\s|:\s|,\s|\s\(|\s['‘\"“]|\s+https?://|\\n|\n")
+# An example citing a publication or dataset: authors or a title, then a bare year
+_CITATION = re.compile(r"(See\s+)?[\w.'-]+((,\s*|\s+(and|&)\s+)[A-Z][\w'-]+)*(\s+et al\.?)?\s+\(\d{4}\)")
+# A tool feature, e.g. 'Autopsy Interesting Files module' -> 'Autopsy'
+_FEATURE = re.compile(r"(\S+)\s.*\s(view|module|plugin|plug-in)", re.IGNORECASE)
+# Longest tool name accepted, in words
+MAX_TOOL_WORDS = 4
+
+# Alternative name -> canonical tool name (alternatives are matched after normalisation)
+TOOL_ALIASES: Dict[str, str] = {
+    'Axiom': 'Magnet AXIOM',
+    'Magnet Axiom': 'Magnet AXIOM',
+    'Magnet Acquire': 'Magnet ACQUIRE',
+    'Sleuth Kit': 'The Sleuth Kit',
+    'TSK': 'The Sleuth Kit',
+    'X-Ways': 'X-Ways Forensics',
+    'XWays': 'X-Ways Forensics',
+    'bulk_extractor': 'Bulk Extractor',
+    'log2timeline': 'plaso',
+    'Volatility3': 'Volatility',
+    'Volatility 3': 'Volatility',
+}
+
+
+def tool_key(name: str) -> str:
+    """Returns the key under which spellings of a tool name are merged (whitespace collapsed, casefolded)."""
+    return _WHITESPACE.sub(' ', name).strip().casefold()
+
+
+def tool_name(example: str) -> str:
+    """
+    Returns the tool named at the start of an example, or '' if the example does not name a tool.
+
+    Example:
+        tool_name("FTK Imager: This tool can be used to acquire data") -> 'FTK Imager'
+        tool_name("Examination of syslog") -> ''
+    """
+    if _CITATION.match(example):
+        return ''
+    name = _NAME_END.split(example, maxsplit=1)[0]
+    name = _WHITESPACE.sub(' ', name).strip(' \'"‘’“”.,;:')
+    feature = _FEATURE.fullmatch(name)
+    if feature:
+        name = feature.group(1)
+    words = name.split()
+    if not words or len(words) > MAX_TOOL_WORDS or words[0][0].isdigit():
+        return ''
+    # Product names capitalise every word after the first ('FTK Imager', 'X-Ways Forensics');
+    # a lowercase word means a phrase ('prefs.js from Firefox', 'ADB connected hosts')
+    if len(words) > 1 and any(word.isalpha() and word.islower() for word in words):
+        return ''
+    return name
+
+
+class ToolIndex:
+    """
+    Tool -> techniques listing it in their examples, and technique -> tools.
+
+    Attributes:
+        tools (Dict[str, str]): Display name of each tool, keyed by tool_key().
+    """
+
+    def __init__(self, techniques: Dict[str, Dict[str, Any]], aliases: Optional[Dict[str, str]] = None):
+        """
+        Builds the index.
+
+        Args:
+            techniques (Dict[str, Dict[str, Any]]): Techniques keyed by ID.
+            aliases (Optional[Dict[str, str]]): Alternative name -> canonical name
+                (defaults to TOOL_ALIASES).
+        """
+        if aliases is None:
+            aliases = TOOL_ALIASES
+        self._aliases = {tool_key(alias): canonical for alias, canonical in aliases.items()}
+        self.tools: Dict[str, str] = {}
+        # Tool key -> technique IDs, in first-seen order
+        self._techniques: Dict[str, Dict[str, None]] = {}
+        # Technique ID -> its tool keys, in the order listed
+        self._technique_tools: Dict[str, List[str]] = {}
+        for technique_id, technique in techniques.items():
+            keys = self._technique_tools[technique_id] = []
+            for example in technique.get('examples') or []:
+                name = tool_name(example)
+                if not name:
+                    continue
+                key = self.resolve(name)
+                self.tools.setdefault(key, self._aliases.get(tool_key(name), name))
+                if key not in keys:
+                    keys.append(key)
+                    self._techniques.setdefault(key, {})[technique_id] = None
+
+    def resolve(self, name: str) -> str:
+        """Returns the key of a tool name, after merging aliases."""
+        key = tool_key(name)
+        canonical = self._aliases.get(key)
+        return key if canonical is None else tool_key(canonical)
+
+    def techniques_for_tool(self, name: str) -> List[str]:
+        """Returns the IDs of the techniques listing a tool (any spelling or alias), sorted."""
+        return sorted(self._techniques.get(self.resolve(name), {}))
+
+    def tools_for_technique(self, technique_id: str) -> List[str]:
+        """Returns the tools named in a technique's examples, in the order listed."""
+        return [self.tools[key] for key in self._technique_tools.get(technique_id, [])]
+
+    def counts(self) -> List[Dict[str, Any]]:
+        """
+        Returns every tool with the number of techniques listing it.
+
+        Returns:
+            List[Dict[str, Any]]: {'tool', 'count', 'techniques'} for each tool, most
+                techniques first, then by name.
+        """
+        listing = [{'tool': self.tools[key], 'count': len(technique_ids), 'techniques': sorted(technique_ids)}
+                   for key, technique_ids in self._techniques.items()]
+        listing.sort(key=lambda entry: (-entry['count'], entry['tool'].casefold()))
+        return listing
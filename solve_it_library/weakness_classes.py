@@ -0,0 +1,144 @@
+"""
+Weakness class (ASTM error class) masks for the SOLVE-IT Knowledge Base Library.
+
+Each weakness marks the classes of error it can cause with 'x' in six fields
+(INCOMP, INAC-EX, INAC-AS, INAC-ALT, INAC-COR, MISINT). WeaknessClassIndex
+reads these flags once and keeps a 6-bit mask per weakness, so class filters
+are a bitwise AND and class counts are summed per distinct mask instead of
+testing the flag strings of every weakness again.
+
+Per-technique counts are computed when the index is built; counts over a set
+of techniques (e.g. the techniques of an objective) are cached by the set.
+"""
+
+from typing import Dict, Any, List, Iterable, Optional, Tuple, Union
+
+# Weakness classes as they are headed in the reports, and the matching weakness fields
+WEAKNESS_CLASS_HEADERS = ['INCOMP', 'INAC-EX', 'INAC-AS', 'INAC-ALT', 'INAC-COR', 'MISINT']
+WEAKNESS_CLASS_FIELDS = ['INCOMP', 'INAC_EX', 'INAC_AS', 'INAC_ALT', 'INAC_COR', 'MISINT']
+
+# Class name -> bit in the mask (bit i is WEAKNESS_CLASS_HEADERS[i])
+WEAKNESS_CLASS_BITS: Dict[str, int] = {name: 1 << i for i, name in enumerate(WEAKNESS_CLASS_HEADERS)}
+ALL_WEAKNESS_CLASSES = (1 << len(WEAKNESS_CLASS_HEADERS)) - 1
+
+# Flag values marking a class
+_MARKS = ('x', 'X')
+
+
+def weakness_class_mask(weakness: Dict[str, Any]) -> int:
+    """Returns the mask of the classes marked on a weakness record (fields may use '_' or '-')."""
+    mask = 0
+    for i, (header, field) in enumerate(zip(WEAKNESS_CLASS_HEADERS, WEAKNESS_CLASS_FIELDS)):
+        if weakness.get(field, weakness.get(header)) in _MARKS:
+            mask |= 1 << i
+    return mask
+
+
+def class_mask(classes: Union[str, Iterable[str]]) -> int:
+    """
+    Returns the mask of one or more class names.
+
+    Args:
+        classes (Union[str, Iterable[str]]): Class names, e.g. 'MISINT' or ['INAC-EX', 'INAC_AS']
+            (case-insensitive; '_' and '-' are interchangeable).
+
+    Raises:
+        ValueError: If a name is not a weakness class.
+    """
+    if isinstance(classes, str):
+        classes = [classes]
+    mask = 0
+    for name in classes:
+        bit = WEAKNESS_CLASS_BITS.get(name.strip().upper().replace('_', '-'))
+        if bit is None:
+            raise ValueError("Unknown weakness class '%s', expected any of %s" % (name, WEAKNESS_CLASS_HEADERS))
+        mask |= bit
+    return mask
+
+
+def class_names(mask: int) -> List[str]:
+    """Returns the class names set in a mask, in WEAKNESS_CLASS_HEADERS order."""
+    return [name for name, bit in WEAKNESS_CLASS_BITS.items() if mask & bit]
+
+
+def matches(mask: int, selected: int, match_all: bool = False) -> bool:
+    """Returns True if a weakness mask has any (or, with match_all, every) selected class."""
+    return (mask & selected) == selected if match_all else bool(mask & selected)
+
+
+class WeaknessClassIndex:
+    """
+    Class mask of every weakness, and class counts per technique.
+
+    Attributes:
+        masks (Dict[str, int]): Class mask of each weakness, keyed by weakness ID.
+    """
+
+    def __init__(self, techniques: Dict[str, Dict[str, Any]], weaknesses: Dict[str, Dict[str, Any]]):
+        """
+        Builds the index.
+
+        Args:
+            techniques (Dict[str, Dict[str, Any]]): Techniques keyed by ID.
+            weaknesses (Dict[str, Dict[str, Any]]): Weaknesses keyed by ID.
+        """
+        self.masks: Dict[str, int] = {weakness_id: weakness_class_mask(weakness)
+                                      for weakness_id, weakness in weaknesses.items()}
+        # Technique -> its existing weaknesses, deduplicated, in the order listed
+        self._technique_weaknesses: Dict[str, Tuple[str, ...]] = {
+            technique_id: tuple(dict.fromkeys(w_id for w_id in technique.get('weaknesses') or []
+                                              if w_id in self.masks))
+            for technique_id, technique in techniques.items()
+        }
+        self._technique_counts: Dict[str, Tuple[int, ...]] = {
+            technique_id: self._count(weakness_ids) for technique_id, weakness_ids in self._technique_weaknesses.items()
+        }
+        # Sorted technique IDs -> counts over their distinct weaknesses
+        self._group_counts: Dict[Tuple[str, ...], Tuple[int, ...]] = {}
+
+    def _count(self, weakness_ids: Iterable[str]) -> Tuple[int, ...]:
+        """Returns the number of weaknesses in each class, then the number of weaknesses."""
+        mask_counts: Dict[int, int] = {}
+        for weakness_id in weakness_ids:
+            mask = self.masks[weakness_id]
+            mask_counts[mask] = mask_counts.get(mask, 0) + 1
+        counts = [0] * (len(WEAKNESS_CLASS_HEADERS) + 1)
+        for mask, count in mask_counts.items():
+            for i in range(len(WEAKNESS_CLASS_HEADERS)):
+                if mask >> i & 1:
+                    counts[i] += count
+            counts[-1] += count
+        return tuple(counts)
+
+    def weaknesses_for_techniques(self, technique_ids: Iterable[str]) -> List[str]:
+        """Returns the distinct weaknesses of some techniques, in the order first listed."""
+        found: Dict[str, None] = {}
+        for technique_id in technique_ids:
+            for weakness_id in self._technique_weaknesses.get(technique_id, ()):
+                found[weakness_id] = None
+        return list(found)
+
+    def filter(self, weakness_ids: Iterable[str], selected: int, match_all: bool = False) -> List[str]:
+        """Returns the weaknesses having any (or every) class selected in a mask, in the given order."""
+        return [weakness_id for weakness_id in weakness_ids
+                if weakness_id in self.masks and matches(self.masks[weakness_id], selected, match_all)]
+
+    def technique_counts(self, technique_id: str) -> Optional[Dict[str, int]]:
+        """Returns the number of a technique's weaknesses in each class, and 'total'; None if not found."""
+        counts = self._technique_counts.get(technique_id)
+        return None if counts is None else _counts_dict(counts)
+
+    def group_counts(self, technique_ids: Iterable[str]) -> Dict[str, int]:
+        """Returns the number of distinct weaknesses of some techniques in each class, and 'total'."""
+        key = tuple(sorted(set(technique_ids)))
+        counts = self._group_counts.get(key)
+        if counts is None:
+            counts = self._group_counts[key] = self._count(self.weaknesses_for_techniques(key))
+        return _counts_dict(counts)
+
+
+def _counts_dict(counts: Tuple[int, ...]) -> Dict[str, int]:
+    """Returns counts from WeaknessClassIndex._count() keyed by class name, with 'total'."""
+    result = dict(zip(WEAKNESS_CLASS_HEADERS, counts))
+    result['total'] = counts[-1]
+    return result
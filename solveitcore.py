@@ -1,153 +1,181 @@
-import os
+"""
+Legacy interface to the SOLVE-IT data.
+
+SOLVEIT is kept for scripts written against the original API. It no longer
+loads the data itself: it is a thin view over the shared, cached
+KnowledgeBase for the data folder (see KnowledgeBase.shared), so scripts that
+use both APIs load and validate the data only once. Records keep their legacy
+shape: each is read from its JSON file on first access, with every key as in
+the file (e.g. 'INAC-EX', weakness 'details'), and the usage fields are listed
+in the order the original loader produced. The collections and the objectives
+can still be modified, without affecting the shared KnowledgeBase. New code
+should use solve_it_library.KnowledgeBase directly.
+"""
+
+import copy
 import json
+import os
+from collections.abc import MutableMapping
+
+from solve_it_library import KnowledgeBase
+from solve_it_library.weakness_classes import WEAKNESS_CLASS_FIELDS, WEAKNESS_CLASS_HEADERS
+
+
+# Record fields whose legacy name (as in the JSON files) differs, e.g. 'INAC_EX' -> 'INAC-EX'
+LEGACY_FIELD_NAMES = dict(zip(WEAKNESS_CLASS_FIELDS, WEAKNESS_CLASS_HEADERS))
+
+
+def _legacy_record(record):
+    """
+    Returns a copy of a validated record keyed as in the JSON files.
+
+    Used when the item has no source file (e.g. it was loaded from a data pack):
+    fields renamed by validation get their file names back, and optional fields
+    that validation filled in with None (i.e. missing from the file) are left out.
+    """
+    return {LEGACY_FIELD_NAMES.get(field, field): value for field, value in record.items() if value is not None}
+
+
+def _legacy_usages(state):
+    """
+    Returns the legacy usage fields of every weakness and mitigation, as built by the
+    original loader: techniques in load order, each adding its weaknesses and their
+    mitigations in the order listed, without repeats.
+
+    Returns:
+        tuple: (weakness -> in_techniques, mitigation -> in_weaknesses, mitigation -> in_techniques)
+    """
+    weakness_techniques, mitigation_weaknesses, mitigation_techniques = {}, {}, {}
+    for technique_id, technique in state.techniques.items():
+        for weakness_id in technique.get('weaknesses') or []:
+            weakness = state.weaknesses.get(weakness_id)
+            if weakness is None:
+                continue
+            weakness_techniques.setdefault(weakness_id, {})[technique_id] = None
+            for mitigation_id in weakness.get('mitigations') or []:
+                mitigation_weaknesses.setdefault(mitigation_id, {})[weakness_id] = None
+                mitigation_techniques.setdefault(mitigation_id, {})[technique_id] = None
+    return weakness_techniques, mitigation_weaknesses, mitigation_techniques
+
+
+class _LegacyView(MutableMapping):
+    """
+    View of a knowledge base collection giving records in the legacy shape: read from
+    their JSON files and carrying the legacy usage fields (e.g. 'in_techniques').
+
+    Records are read on first access and cached, so changing them, or adding and
+    removing items, changes this view only, never the records held by the KnowledgeBase.
+    """
+
+    def __init__(self, kb, collection, usage_fields=None):
+        self._kb = kb
+        self._collection = collection
+        # Field name -> function returning the field's value for an item ID
+        self._usage_fields = usage_fields or {}
+        # Records accessed or set through the view, and IDs deleted from it
+        self._records = {}
+        self._deleted = set()
+
+    def _read_record(self, item_id):
+        """Returns the record as in its JSON file (the last file loaded for a duplicate ID)."""
+        record = self._collection[item_id]
+        sources = self._kb._item_sources.get(item_id)
+        if not sources:
+            return _legacy_record(record)
+        try:
+            with open(sources[-1], encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return _legacy_record(record)
+
+    def __getitem__(self, item_id):
+        record = self._records.get(item_id)
+        if record is None:
+            if item_id in self._deleted:
+                raise KeyError(item_id)
+            record = self._read_record(item_id)
+            for field, get_usage in self._usage_fields.items():
+                record[field] = get_usage(item_id)
+            self._records[item_id] = record
+        return record
+
+    def __setitem__(self, item_id, record):
+        self._deleted.discard(item_id)
+        self._records[item_id] = record
+
+    def __delitem__(self, item_id):
+        if item_id not in self:
+            raise KeyError(item_id)
+        self._records.pop(item_id, None)
+        self._deleted.add(item_id)
+
+    def __iter__(self):
+        for item_id in self._collection:
+            if item_id not in self._deleted:
+                yield item_id
+        for item_id in list(self._records):
+            if item_id not in self._collection:
+                yield item_id
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __contains__(self, item_id):
+        return item_id in self._records or (item_id in self._collection and item_id not in self._deleted)
+
 
 class SOLVEIT(object):
 
     def __init__(self, path_to_data_folder, objective_config_file='solve-it.json'):
+        '''Opens a view of the shared knowledge base loaded from path_to_data_folder
+
+        Raises FileNotFoundError if the data folder or its subfolders do not exist, and
+        ValueError if the objective mapping cannot be loaded.'''
         self.path_to_weaknesses = os.path.join(path_to_data_folder, 'weaknesses')
         self.path_to_mitigations = os.path.join(path_to_data_folder, 'mitigations')
         self.path_to_techniques = os.path.join(path_to_data_folder, 'techniques')
 
-        path_to_objective_file = os.path.join(path_to_data_folder, objective_config_file)
-
-        self.tactics = self.__load_tactics(path_to_objective_file)
-        self.techniques = self.__load_techniques(self.path_to_techniques)
-        self.weaknesses = self.__load_weaknesses(self.path_to_weaknesses)
-        self.mitigations = self.__load_mitigations(self.path_to_mitigations)
-
-        self.__update_weakness_usages()
-        self.__update_mitigation_usages()
-
-    def __load_tactics(self, path_to_tactics_list):
-        f = open(path_to_tactics_list)
-        tactics_list = json.loads(f.read())
-        f.close()
-        return tactics_list
-
-    def __load_techniques(self, path_to_techniques):
-        '''Loads techniques from on disk json into dictionary'''
-        techniques = {}
-        for each in os.listdir(path_to_techniques):
-            if each[-4:] == 'json':
-                technique_path = os.path.join(path_to_techniques, each)
-                f = open(technique_path)
-                try:
-                    tech_dict = json.loads(f.read())
-                except json.decoder.JSONDecodeError:
-                    print('error loading JSON from {}'.format(technique_path))
-                    quit()
-                techniques[tech_dict.get('id')] = tech_dict
-                f.close()
-        return techniques
-
-    def __load_weaknesses(self, path_to_weaknesses):
-        '''Loads weaknesses from on disk json into dictionary'''
-        weaknesses = {}
-        for each in os.listdir(path_to_weaknesses):
-            if each[-4:] == 'json':
-                f = open(os.path.join(path_to_weaknesses, each))
-                weakness_dict = json.loads(f.read())
-                weaknesses[weakness_dict.get('id')] = weakness_dict
-                weaknesses[weakness_dict.get('id')]['in_techniques'] = []
-                f.close()
-        return weaknesses
-
-    def __load_mitigations(self, path_to_mitigations):
-        '''Loads mitigations from on disk json into dictionary'''
-        mitigations = {}
-        for each in os.listdir(path_to_mitigations):
-            if each[-4:] == 'json':
-                f = open(os.path.join(path_to_mitigations, each))
-                mit_dict = json.loads(f.read())
-                mitigations[mit_dict.get('id')] = mit_dict
-                mitigations[mit_dict.get('id')]['in_techniques'] = []
-                mitigations[mit_dict.get('id')]['in_weaknesses'] = []
-                f.close()
-        return mitigations
-
-    def __update_mitigation_usages(self):
-        '''Adds a list of all techniques and weaknesses that reference the mitigation'''
-        for each_technique in self.techniques:
-            for each_weakness in self.techniques[each_technique].get('weaknesses'):
-                for each_mitigation in self.weaknesses[each_weakness].get('mitigations'):
-                    if each_weakness not in self.mitigations[each_mitigation]['in_weaknesses']:
-                        self.mitigations[each_mitigation]['in_weaknesses'].append(each_weakness)
-                    if each_technique not in self.mitigations[each_mitigation]['in_techniques']:
-                        self.mitigations[each_mitigation]['in_techniques'].append(each_technique)
-        return self.mitigations
-
-    def __update_weakness_usages(self):
-        '''Adds a list of all techniques that reference the weakness'''
-        for each_technique in self.techniques:
-            for each_weakness in self.techniques[each_technique].get('weaknesses'):
-                if each_technique not in self.weaknesses[each_weakness]['in_techniques']:
-                    self.weaknesses[each_weakness]['in_techniques'].append(each_technique)
-        return self.weaknesses
-
+        base_path = os.path.dirname(os.path.abspath(path_to_data_folder))
+        # Pin the content so the view stays consistent if the shared knowledge base is reloaded
+        self.kb = KnowledgeBase.shared(base_path, objective_config_file, data_path=path_to_data_folder).snapshot()
+
+        # Copied, so changes made by legacy callers stay in this object
+        self.tactics = copy.deepcopy(self.kb.objective_mappings[objective_config_file])
+        weakness_techniques, mitigation_weaknesses, mitigation_techniques = self.kb._state.derived_index(
+            'legacy_usages', _legacy_usages)
+        self.techniques = _LegacyView(self.kb, self.kb.techniques)
+        self.weaknesses = _LegacyView(self.kb, self.kb.weaknesses, {
+            'in_techniques': lambda w_id: list(weakness_techniques.get(w_id, ())),
+        })
+        self.mitigations = _LegacyView(self.kb, self.kb.mitigations, {
+            'in_techniques': lambda m_id: list(mitigation_techniques.get(m_id, ())),
+            # As before, only weaknesses that are used by a technique are counted
+            'in_weaknesses': lambda m_id: list(mitigation_weaknesses.get(m_id, ())),
+        })
 
     def list_tactics(self):
-        out_list = []
-        for each_tactic in self.tactics:
-            out_list.append(each_tactic.get('name'))
-        return out_list
+        return [each_tactic.get('name') for each_tactic in self.tactics]
 
     def list_techniques(self):
-        out_list = []
-        for each_technique in self.techniques:
-            out_list.append(each_technique)
-        return sorted(out_list)
+        return sorted(self.techniques)
 
     def list_weaknesses(self):
-        out_list = []
-        for each_weakness in self.weaknesses:
-            out_list.append(each_weakness)
-        return sorted(out_list)
+        return sorted(self.weaknesses)
 
     def list_mitigations(self):
-        out_list = []
-        for each_mitigation in self.mitigations:
-            out_list.append(each_mitigation)
-        return sorted(out_list)
+        return sorted(self.mitigations)
 
     def get_technique(self, t_id):
-        if t_id in self.techniques:
-            return self.techniques[t_id]
-        else:
-            return None
+        return self.techniques.get(t_id)
 
     def get_weakness(self, w_id):
-        if w_id in self.weaknesses:
-            return self.weaknesses[w_id]
-        else:
-            return None
+        return self.weaknesses.get(w_id)
 
     def get_mitigation(self, m_id):
-        if m_id in self.mitigations:
-            return self.mitigations[m_id]
-        else:
-            return None
-
+        return self.mitigations.get(m_id)
 
     def get_mit_list_for_technique(self, t_id):
-        mit_list_for_this_technique = []
-        t = self.get_technique(t_id)
-        for each_weakness in t.get('weaknesses'):
-            weakness_info = self.get_weakness(each_weakness)
-
-            for each_mitigation in weakness_info.get('mitigations'):
-                if each_mitigation not in mit_list_for_this_technique:
-                    mit_list_for_this_technique.append(each_mitigation)
-
-        return mit_list_for_this_technique
-
+        return self.kb.get_mit_list_for_technique(t_id)
 
     def get_max_mitigations_per_technique(self):
-        max_mits = 0
-        for each_technique in self.list_techniques():
-            mits = self.get_mit_list_for_technique(each_technique)
-
-            if len(mits) > max_mits:
-                max_mits = len(mits)
-
-        return max_mits
-
+        return self.kb.get_max_mitigations_per_technique()
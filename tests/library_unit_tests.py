@@ -20,9 +20,15 @@ when testing error handling with non-existent IDs.
 import unittest
 import sys
 import os
+import json
+import tempfile
+import asyncio
+import threading
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '.'))
 
-from solve_it_library import KnowledgeBase
+from solve_it_library import KnowledgeBase, AsyncKnowledgeBase
+from solve_it_library.change_validation import validate_changed_files
+from solve_it_library.data_pack import build_pack
 
 class MyTestCase(unittest.TestCase):
     """
@@ -883,5 +889,1228 @@ class MyTestCase(unittest.TestCase):
         self.assertGreaterEqual(total_or, total_and, "OR search should find >= results than AND search")
 
 
+    def test_get_minimal_mitigation_plan(self):
+        """
+        Test the minimal mitigation set solver.
+
+        Expected outcome:
+        - The plan should cover every weakness of the techniques that has at least one mitigation
+        - Mitigations marked 'Y' in a lab config should be treated as already implemented
+        - The exact search should never produce a larger plan than the greedy solver
+        - Mitigation IDs not defined in the knowledge base should be reported, not planned
+        """
+        kb = KnowledgeBase('.', 'solve-it.json')
+        plan = kb.get_minimal_mitigation_plan(['T1002'])
+        self.assertIn('plan', plan)
+        covered = set()
+        for entry in plan['plan']:
+            covered.update(entry['covers'])
+        for weakness_id in plan['weaknesses']:
+            if kb.get_weakness(weakness_id).get('mitigations'):
+                self.assertIn(weakness_id, covered)
+            else:
+                self.assertIn(weakness_id, plan['unmitigable_weaknesses'])
+        # Ranks should be ordered by new coverage
+        coverage = [entry['new_coverage'] for entry in plan['plan']]
+        self.assertEqual(coverage, sorted(coverage, reverse=True))
+
+        # Lab config marks M1005, M1006 and M1007 as implemented
+        lab_plan = kb.get_minimal_mitigation_plan(['T1002'], lab_config='lab_config_examples/example_lab.json')
+        self.assertIn('M1007', lab_plan['implemented_mitigations'])
+        self.assertIn('W1014', lab_plan['already_mitigated'])
+        self.assertNotIn('M1007', [entry['id'] for entry in lab_plan['plan']])
+
+        # Exact search should be at least as good as greedy
+        techniques = kb.list_techniques()[:20]
+        greedy = kb.get_minimal_mitigation_plan(techniques, exact=False)
+        exact = kb.get_minimal_mitigation_plan(techniques, exact=True)
+        self.assertLessEqual(len(exact['plan']), len(greedy['plan']))
+        self.assertEqual(exact['method'], 'exact')
+
+        # Mitigation IDs missing from the knowledge base are reported, not planned
+        weaknesses = dict(kb.weaknesses)
+        weakness_id = kb.get_technique('T1002')['weaknesses'][0]
+        weaknesses[weakness_id] = dict(weaknesses[weakness_id], mitigations=['M9999'])
+        broken_kb = KnowledgeBase.from_records('.', kb.techniques, weaknesses, kb.mitigations)
+        broken_plan = broken_kb.get_minimal_mitigation_plan(['T1002'])
+        self.assertEqual(broken_plan['missing_mitigations'], ['M9999'])
+        self.assertIn(weakness_id, broken_plan['unmitigable_weaknesses'])
+        self.assertNotIn('M9999', [entry['id'] for entry in broken_plan['plan']])
+
+    def test_search_bm25_ranking(self):
+        """
+        Test the optional BM25 ranking mode of search.
+
+        Expected outcome:
+        - Default ranking should be unchanged when ranking is not specified
+        - BM25 should rank the technique named 'Disk imaging' first for 'disk imaging'
+        - BM25 should also match the examples field (e.g. tool names)
+        - limit should return the same leading results as an unlimited search
+        - Unknown ranking modes should raise ValueError
+        """
+        kb = KnowledgeBase('.', 'solve-it.json')
+        self.assertEqual(kb.search('triage'), kb.search('triage', ranking='default'))
+
+        results = kb.search('disk imaging', ranking='bm25')
+        self.assertEqual(results['techniques'][0]['id'], 'T1002')
+
+        tool_results = kb.search('"FTK Imager"', item_types=['techniques'], ranking='bm25')
+        self.assertIn('T1002', [t['id'] for t in tool_results['techniques']])
+
+        full = kb.search('hash', ranking='bm25', search_logic='OR')
+        limited = kb.search('hash', ranking='bm25', search_logic='OR', limit=3)
+        for category in ['techniques', 'weaknesses', 'mitigations']:
+            self.assertLessEqual(len(limited[category]), 3)
+            self.assertEqual(limited[category], full[category][:3])
+
+        # Limit should also apply to the default ranking
+        default_limited = kb.search('analysis', limit=2)
+        self.assertEqual(default_limited['techniques'], kb.search('analysis')['techniques'][:2])
+
+        with self.assertRaises(ValueError):
+            kb.search('disk', ranking='unknown')
+
+    def test_search_fuzzy(self):
+        """
+        Test typo-tolerant (fuzzy) search.
+
+        Expected outcome:
+        - Misspelled terms should expand to the indexed spelling ('volitile' -> 'volatile')
+        - Fuzzy search should find results where exact search finds none
+        - Very short terms should not be expanded
+        """
+        kb = KnowledgeBase('.', 'solve-it.json')
+        expansions = kb._search_index.fuzzy_expand(['volitile', 'dcflld', 'hsh'])
+        self.assertIn('volatile', expansions['volitile'])
+        self.assertIn('dcfldd', expansions['dcflld'])
+        self.assertEqual(expansions['hsh'], ['hsh'])
+
+        self.assertEqual(kb.search('volitile memory')['techniques'], [])
+        fuzzy_results = kb.search('volitile memory', fuzzy=True)
+        self.assertGreater(len(fuzzy_results['techniques']), 0)
+
+        bm25_results = kb.search('dcflld', item_types=['techniques'], ranking='bm25', fuzzy=True)
+        self.assertIn('T1002', [t['id'] for t in bm25_results['techniques']])
+
+    def test_search_result_cache(self):
+        """
+        Test the LRU search result cache.
+
+        Expected outcome:
+        - Repeating a query should be answered from the cache (hit counter increases)
+        - Cached results should equal freshly computed results and be safe to modify
+        - Equivalent queries (different case/stop words) should share a cache entry
+        - Changing the active mapping or rebuilding indices should invalidate the cache
+        - A cache size of 0 should disable caching
+        """
+        kb = KnowledgeBase('.', 'solve-it.json')
+        first = kb.search('imaging')
+        self.assertEqual(kb.search_cache_info()['misses'], 1)
+        second = kb.search('Imaging the')
+        self.assertEqual(kb.search_cache_info()['hits'], 1)
+        self.assertEqual(first, second)
+
+        # Modifying returned results must not corrupt the cache
+        second['techniques'].clear()
+        self.assertEqual(kb.search('imaging'), first)
+
+        kb.load_objective_mapping('carrier.json')
+        kb.search('imaging')
+        self.assertEqual(kb.search_cache_info()['size'], 1)
+        self.assertEqual(kb.search_cache_info()['misses'], 2)
+
+        kb.rebuild_indices()
+        kb.search('imaging')
+        self.assertEqual(kb.search_cache_info()['misses'], 3)
+
+        uncached_kb = KnowledgeBase('.', 'solve-it.json', search_cache_size=0)
+        uncached_kb.search('imaging')
+        uncached_kb.search('imaging')
+        self.assertEqual(uncached_kb.search_cache_info()['hits'], 0)
+        self.assertEqual(uncached_kb.search_cache_info()['size'], 0)
+
+    def test_search_pagination_and_streaming(self):
+        """
+        Test paginated (limit/offset) and streaming (iter_search) search results.
+
+        Expected outcome:
+        - limit/offset pages should be slices of the full result lists
+        - iter_search should yield the same items, in the same order, as search
+        - iter_search should allow stopping early
+        - Negative offsets should raise ValueError
+        """
+        kb = KnowledgeBase('.', 'solve-it.json')
+        for ranking in ['default', 'bm25']:
+            full = kb.search('data analysis', search_logic='OR', ranking=ranking)
+            page = kb.search('data analysis', search_logic='OR', ranking=ranking, limit=5, offset=5)
+            for category in ['techniques', 'weaknesses', 'mitigations']:
+                self.assertEqual(page[category], full[category][5:10])
+
+            streamed = {'techniques': [], 'weaknesses': [], 'mitigations': []}
+            for item_type, item in kb.iter_search('data analysis', search_logic='OR', ranking=ranking):
+                streamed[item_type].append(item)
+            self.assertEqual(streamed, full)
+
+        first_three = []
+        for item_type, item in kb.iter_search('data', item_types=['techniques']):
+            first_three.append(item)
+            if len(first_three) == 3:
+                break
+        self.assertEqual(first_three, kb.search('data', item_types=['techniques'], limit=3)['techniques'])
+
+        with self.assertRaises(ValueError):
+            kb.search('data', offset=-1)
+
+    def test_search_field_aware(self):
+        """
+        Test searching across all text fields with field filters and weights.
+
+        Expected outcome:
+        - A tool name only listed in examples should be found by the default search
+        - Restricting fields should exclude matches in other fields
+        - Field weights should change scores in the default ranking
+        - Unknown field names should raise ValueError
+        """
+        kb = KnowledgeBase('.', 'solve-it.json')
+        results = kb.search('"FTK Imager"', item_types=['techniques'])
+        self.assertIn('T1002', [t['id'] for t in results['techniques']])
+
+        results = kb.search('"FTK Imager"', item_types=['techniques'], fields=['name', 'description'])
+        self.assertNotIn('T1002', [t['id'] for t in results['techniques']])
+
+        all_results = kb.search('imaging', item_types=['techniques'])
+        restricted = kb.search('imaging', item_types=['techniques'], fields=['name'])
+        self.assertTrue(set(t['id'] for t in restricted['techniques'])
+                        <= set(t['id'] for t in all_results['techniques']))
+        self.assertLess(len(restricted['techniques']), len(all_results['techniques']))
+
+        technique = kb.get_technique('T1002')
+        default_score = kb._calculate_search_score(technique, ['ftk'], [])
+        boosted_score = kb._calculate_search_score(
+            technique, ['ftk'], [], field_weights={'examples': 20.0, 'name': 1.0, 'description': 1.0})
+        self.assertGreater(default_score, 0)
+        self.assertGreater(boosted_score, default_score)
+
+        with self.assertRaises(ValueError):
+            kb.search('imaging', fields=['unknown'])
+
+    def test_check_integrity(self):
+        """
+        Test the referential integrity checker on a small knowledge base with known problems.
+
+        Expected outcome:
+        - Dangling weakness, mitigation, subtechnique, Mitigation.technique and mapping
+          references should be reported as errors
+        - Subtechnique cycles, duplicate IDs and file name mismatches should be errors
+        - Orphan items and unmapped techniques should be warnings
+        """
+        items = {
+            'techniques/T1001.json': {'id': 'T1001', 'name': 'Parent', 'description': '',
+                                      'subtechniques': ['T1002', 'T1009'], 'weaknesses': ['W1001', 'W1009']},
+            'techniques/T1002.json': {'id': 'T1002', 'name': 'Child', 'description': '',
+                                      'subtechniques': ['T1003'], 'weaknesses': []},
+            'techniques/T1003.json': {'id': 'T1003', 'name': 'Grandchild', 'description': '',
+                                      'subtechniques': ['T1002'], 'weaknesses': []},
+            'techniques/T1004.json': {'id': 'T1004', 'name': 'Unmapped', 'description': '', 'weaknesses': []},
+            'weaknesses/W1001.json': {'id': 'W1001', 'name': 'Weakness', 'mitigations': ['M1001', 'M1009']},
+            'weaknesses/W1002.json': {'id': 'W1002', 'name': 'Orphan weakness', 'mitigations': []},
+            'weaknesses/W1003.json': {'id': 'W1002', 'name': 'Duplicate weakness', 'mitigations': []},
+            'mitigations/M1001.json': {'id': 'M1001', 'name': 'Mitigation', 'technique': 'T1008'},
+            'mitigations/M1002.json': {'id': 'M1002', 'name': 'Orphan mitigation'},
+            'solve-it.json': [{'name': 'Objective', 'description': '', 'techniques': ['T1001', 'T1007']}],
+        }
+        with tempfile.TemporaryDirectory() as base_path:
+            for subdir in ['techniques', 'weaknesses', 'mitigations']:
+                os.makedirs(os.path.join(base_path, 'data', subdir))
+            for relative_path, content in items.items():
+                with open(os.path.join(base_path, 'data', relative_path), 'w') as f:
+                    json.dump(content, f)
+
+            kb = KnowledgeBase(base_path, 'solve-it.json')
+            report = kb.check_integrity()
+
+        found = {(i['type'], i['item'], i['reference']) for i in report['issues']}
+        self.assertIn(('dangling_weakness', 'T1001', 'W1009'), found)
+        self.assertIn(('dangling_subtechnique', 'T1001', 'T1009'), found)
+        self.assertIn(('dangling_mitigation', 'W1001', 'M1009'), found)
+        self.assertIn(('dangling_mitigation_technique', 'M1001', 'T1008'), found)
+        self.assertIn(('dangling_mapping_technique', 'T1007', 'Objective'), found)
+        self.assertIn(('filename_mismatch', 'W1002', 'W1003'), found)
+        self.assertIn(('orphan_mitigation', 'M1002', None), found)
+        self.assertIn(('unmapped_technique', 'T1004', None), found)
+        types = [i['type'] for i in report['issues']]
+        self.assertEqual(types.count('subtechnique_cycle'), 1)
+        self.assertIn('duplicate_id', types)
+        self.assertIn('nested_subtechnique', types)
+        self.assertIn('multiple_parents', types)
+        self.assertFalse(report['valid'])
+        self.assertEqual(report['summary']['errors'],
+                         sum(1 for i in report['issues'] if i['severity'] == 'error'))
+
+    def test_validate_changed_files(self):
+        """
+        Test validating only changed files against a cached reference index.
+
+        Expected outcome:
+        - Unchanged files should be served from the cache on later runs, even when
+          their modification times changed
+        - A changed file with a dangling reference or schema error should be reported
+        - Deleting a file that is still referenced should be reported
+        - Paths outside the data directory should be skipped
+        """
+        items = {
+            'techniques/T1001.json': {'id': 'T1001', 'name': 'Technique', 'description': '',
+                                      'weaknesses': ['W1001', 'W1002']},
+            'weaknesses/W1001.json': {'id': 'W1001', 'name': 'Weakness', 'mitigations': ['M1001']},
+            'weaknesses/W1002.json': {'id': 'W1002', 'name': 'Weakness', 'mitigations': []},
+            'mitigations/M1001.json': {'id': 'M1001', 'name': 'Mitigation'},
+            'solve-it.json': [{'name': 'Objective', 'description': '', 'techniques': ['T1001']}],
+        }
+        with tempfile.TemporaryDirectory() as base_path:
+            for subdir in ['techniques', 'weaknesses', 'mitigations']:
+                os.makedirs(os.path.join(base_path, 'data', subdir))
+            for relative_path, content in items.items():
+                with open(os.path.join(base_path, 'data', relative_path), 'w') as f:
+                    json.dump(content, f)
+            cache_path = os.path.join(base_path, 'cache', 'reference_index.json')
+
+            report = validate_changed_files(base_path, ['data/techniques/T1001.json', 'README.md'], cache_path)
+            self.assertTrue(report['valid'])
+            self.assertEqual(report['summary']['files_checked'], 1)
+            self.assertEqual(report['summary']['files_skipped'], 1)
+
+            with open(os.path.join(base_path, 'data', 'weaknesses', 'W1001.json'), 'w') as f:
+                json.dump({'id': 'W1001', 'name': 'Weakness', 'mitigations': ['M1009']}, f)
+            with open(os.path.join(base_path, 'data', 'mitigations', 'M1002.json'), 'w') as f:
+                json.dump({'id': 'X1002', 'name': 'Bad ID'}, f)
+            os.remove(os.path.join(base_path, 'data', 'weaknesses', 'W1002.json'))
+
+            report = validate_changed_files(base_path, ['data/weaknesses/W1001.json',
+                                                        'data/mitigations/M1002.json',
+                                                        'data/weaknesses/W1002.json'], cache_path)
+            self.assertEqual(report['summary']['files_read'], 0)
+
+            # A fresh checkout changes every modification time, but not the content
+            for relative_path in items:
+                file_path = os.path.join(base_path, 'data', relative_path)
+                if os.path.exists(file_path):
+                    os.utime(file_path, (1, 1))
+            rerun = validate_changed_files(base_path, [], cache_path)
+            self.assertEqual(rerun['summary']['files_read'], 0)
+
+        found = {(i['type'], i['item'], i['reference']) for i in report['issues']}
+        self.assertIn(('dangling_mitigation', 'W1001', 'M1009'), found)
+        self.assertIn(('deleted_but_referenced', 'T1001', 'W1002'), found)
+        self.assertIn('schema_error', [i['type'] for i in report['issues']])
+        self.assertFalse(report['valid'])
+
+    def test_data_pack_round_trip(self):
+        """
+        Test that a knowledge base loaded from a data pack matches the JSON directory load.
+
+        Expected outcome:
+        - Building the pack should not publish a new state on the knowledge base
+        - Records should only be decoded when accessed
+        - All items, reverse indices and mappings should be identical
+        - Relationship queries and search should return the same results
+        """
+        kb = KnowledgeBase('.', 'solve-it.json')
+        with tempfile.TemporaryDirectory() as temp_dir:
+            pack_path = os.path.join(temp_dir, 'solve-it.pack')
+            state = kb._state
+            summary = build_pack(kb, pack_path)
+            self.assertEqual(summary['techniques'], len(kb.techniques))
+            self.assertEqual(summary['mappings'], len(kb.list_available_mappings()))
+            self.assertIs(kb._state, state)
+
+            packed_kb = KnowledgeBase('.', 'solve-it.json', data_pack=pack_path)
+            self.assertEqual(packed_kb.techniques.loaded_count(), 0)
+            self.assertEqual(packed_kb.get_technique('T1002'), kb.get_technique('T1002'))
+            self.assertEqual(packed_kb.techniques.loaded_count(), 1)
+
+            self.assertEqual(dict(packed_kb.techniques), kb.techniques)
+            self.assertEqual(dict(packed_kb.weaknesses), kb.weaknesses)
+            self.assertEqual(dict(packed_kb.mitigations), kb.mitigations)
+            self.assertEqual(packed_kb._weakness_to_techniques, kb._weakness_to_techniques)
+            self.assertEqual(packed_kb._mitigation_to_weaknesses, kb._mitigation_to_weaknesses)
+            self.assertEqual(packed_kb._mitigation_to_techniques, kb._mitigation_to_techniques)
+            self.assertEqual(sorted(packed_kb.list_available_mappings()), sorted(kb.list_available_mappings()))
+            for mapping_name in kb.list_available_mappings():
+                kb.load_objective_mapping(mapping_name)
+                packed_kb.load_objective_mapping(mapping_name)
+                self.assertEqual(packed_kb.list_objectives(), kb.list_objectives())
+
+            self.assertEqual(packed_kb.get_techniques_for_mitigation('M1002'), kb.get_techniques_for_mitigation('M1002'))
+            self.assertEqual(packed_kb.search('disk imaging'), kb.search('disk imaging'))
+            self.assertEqual(packed_kb.list_techniques(), kb.list_techniques())
+            packed_kb.data_pack.close()
+
+    def test_lazy_loading(self):
+        """
+        Test lazy mode, where full records are loaded on first access.
+
+        Expected outcome:
+        - No full records should be loaded at startup
+        - ID/name listings and reverse indices should match the eager load without loading records
+        - Getters should return the same validated records as the eager load, cached per item
+        """
+        kb = KnowledgeBase('.', 'solve-it.json')
+        lazy_kb = KnowledgeBase('.', 'solve-it.json', lazy=True)
+        self.assertEqual(lazy_kb.techniques.loaded_count(), 0)
+
+        self.assertEqual(lazy_kb.get_all_techniques_with_name_and_id(), kb.get_all_techniques_with_name_and_id())
+        self.assertEqual(lazy_kb.get_all_weaknesses_with_name_and_id(), kb.get_all_weaknesses_with_name_and_id())
+        self.assertEqual(lazy_kb._mitigation_to_techniques, kb._mitigation_to_techniques)
+        self.assertEqual(lazy_kb.list_weaknesses(), kb.list_weaknesses())
+        self.assertEqual(lazy_kb.techniques.loaded_count(), 0)
+        self.assertEqual(lazy_kb.weaknesses.loaded_count(), 0)
+
+        technique = lazy_kb.get_technique('T1002')
+        self.assertEqual(technique, kb.get_technique('T1002'))
+        self.assertIs(lazy_kb.get_technique('T1002'), technique)
+        self.assertEqual(lazy_kb.techniques.loaded_count(), 1)
+        self.assertEqual(lazy_kb.get_weaknesses_for_technique('T1002'), kb.get_weaknesses_for_technique('T1002'))
+        self.assertIsNone(lazy_kb.get_technique('T9999'))
+
+    def test_async_knowledge_base(self):
+        """
+        Test the asyncio facade.
+
+        Expected outcome:
+        - Awaiting AsyncKnowledgeBase.load should load the same items as KnowledgeBase
+        - Awaitable queries should return the same results as the synchronous methods
+        - Cheap lookups should be delegated synchronously; other queries (mapping comparison,
+          mitigation closures, class counts, ...) should be awaitable
+        - Iterators should be async iterators giving the same items
+        - Concurrent searches should all complete
+        """
+        kb = KnowledgeBase('.', 'solve-it.json')
+
+        async def run():
+            akb = await AsyncKnowledgeBase.load('.', 'solve-it.json', max_concurrency=2)
+            self.assertEqual(akb.techniques, kb.techniques)
+            self.assertEqual(akb.weaknesses, kb.weaknesses)
+            self.assertEqual(akb.mitigations, kb.mitigations)
+            self.assertEqual(akb.get_technique('T1002'), kb.get_technique('T1002'))
+            self.assertEqual(await akb.search('disk imaging'), kb.search('disk imaging'))
+            results = await asyncio.gather(*(akb.search(query) for query in ['memory', 'hash', 'network']))
+            self.assertEqual(results[1], kb.search('hash'))
+            plan = await akb.get_minimal_mitigation_plan(['T1002'])
+            self.assertEqual(plan, kb.get_minimal_mitigation_plan(['T1002']))
+
+            self.assertEqual(await akb.compare_mappings(), kb.compare_mappings())
+            self.assertEqual(await akb.get_mitigation_closure('T1002'), kb.get_mitigation_closure('T1002'))
+            self.assertEqual(await akb.get_objective_weakness_class_counts(), kb.get_objective_weakness_class_counts())
+            # Methods without an explicit wrapper run in the executor too
+            self.assertTrue(asyncio.iscoroutinefunction(akb.get_technique_depth))
+            self.assertEqual(await akb.get_technique_depth('T1002'), kb.get_technique_depth('T1002'))
+            self.assertFalse(asyncio.iscoroutinefunction(akb.list_techniques))
+            self.assertEqual(''.join([piece async for piece in akb.iter_case_jsonld()]),
+                             ''.join(kb.iter_case_jsonld()))
+            self.assertEqual([item async for item in akb.iter_search('memory')], list(kb.iter_search('memory')))
+            with self.assertRaises(ValueError):
+                await AsyncKnowledgeBase.load('.', max_concurrency=0)
+
+        asyncio.run(run())
+
+    def test_concurrent_reads_during_reload(self):
+        """
+        Test that queries from many threads stay consistent while the data is swapped.
+
+        Verifies that:
+        - Searches and relationship lookups never fail or return mixed results while
+          another thread calls reload() and rebuild_indices()
+        - Snapshots keep the content they were taken from
+        - with_mapping() views have their own active mapping
+        """
+        kb = KnowledgeBase('.', 'solve-it.json')
+        expected_search = kb.search('disk imaging')
+        expected_weaknesses = kb.get_weaknesses_for_technique('T1002')
+        expected_techniques = kb.get_techniques_for_weakness(expected_weaknesses[0]['id'])
+        snapshot = kb.snapshot()
+        errors = []
+        stop = threading.Event()
+
+        def reader():
+            try:
+                while not stop.is_set():
+                    kb.clear_search_cache()
+                    self.assertEqual(kb.search('disk imaging'), expected_search)
+                    self.assertEqual(kb.get_weaknesses_for_technique('T1002'), expected_weaknesses)
+                    self.assertEqual(kb.get_techniques_for_weakness(expected_weaknesses[0]['id']),
+                                     expected_techniques)
+                    memory_results = kb.search('memory')
+                    self.assertEqual(len(list(kb.iter_search('memory'))),
+                                     sum(len(items) for items in memory_results.values()))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=reader) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        try:
+            for _ in range(3):
+                old_state = kb._state
+                kb.reload()
+                self.assertIsNot(kb._state, old_state)
+                kb.rebuild_indices()
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(errors, [])
+
+        # The snapshot still holds the original state, and still answers queries
+        self.assertIsNot(snapshot._state, kb._state)
+        self.assertEqual(snapshot.search('disk imaging'), expected_search)
+
+        # Views share the content but not the active mapping
+        mappings = [name for name in kb.list_available_mappings() if name != 'solve-it.json']
+        if mappings:
+            view = kb.with_mapping(mappings[0])
+            self.assertEqual(view.current_mapping_name, mappings[0])
+            self.assertEqual(kb.current_mapping_name, 'solve-it.json')
+            self.assertEqual(view.list_tactics(), kb.list_tactics(mappings[0]))
+        with self.assertRaises(ValueError):
+            kb.with_mapping('no-such-mapping.json')
+
+    def test_mapping_load_publishes_new_state(self):
+        """
+        Test that loading an objective mapping swaps in a new state instead of changing the published one.
+
+        Verifies that:
+        - The state (and snapshot) read before the load keep their mappings and version
+        - Derived indices are shared with the new state
+        - Threads loading different mappings at once do not lose each other's mappings
+        """
+        kb = KnowledgeBase('.', 'solve-it.json')
+        kb.search('disk imaging')
+        old_state = kb._state
+        old_mappings = dict(old_state.objective_mappings)
+        old_version = old_state.version
+        snapshot = kb.snapshot()
+
+        self.assertTrue(kb.load_objective_mapping('carrier.json'))
+        self.assertIsNot(kb._state, old_state)
+        self.assertIn('carrier.json', kb.objective_mappings)
+        self.assertEqual(old_state.objective_mappings, old_mappings)
+        self.assertEqual(old_state.version, old_version)
+        self.assertNotIn('carrier.json', snapshot.objective_mappings)
+        self.assertIs(kb._state.derived_indices, old_state.derived_indices)
+
+        # Loading a mapping that is already held publishes nothing
+        state = kb._state
+        self.assertTrue(kb.load_objective_mapping('carrier.json'))
+        self.assertIs(kb._state, state)
+
+        kb = KnowledgeBase('.', 'solve-it.json')
+        mappings = kb.list_available_mappings()
+        barrier = threading.Barrier(len(mappings))
+
+        def load(mapping_name):
+            barrier.wait()
+            kb.with_mapping(mapping_name)
+
+        threads = [threading.Thread(target=load, args=(mapping_name,)) for mapping_name in mappings]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sorted(kb.objective_mappings), sorted(mappings))
+        self.assertEqual(kb.current_mapping_name, 'solve-it.json')
+
+        # The active mapping is part of the state: one swap changes both, snapshots keep theirs
+        snapshot = kb.snapshot()
+        kb.load_objective_mapping('carrier.json')
+        self.assertEqual(kb._state.current_mapping_name, 'carrier.json')
+        self.assertEqual(snapshot.current_mapping_name, 'solve-it.json')
+        self.assertEqual(kb.with_mapping('dfrws.json').current_mapping_name, 'dfrws.json')
+        self.assertEqual(kb.current_mapping_name, 'carrier.json')
+
+        # Assigning a collection publishes a new state
+        state = kb._state
+        techniques = dict(kb.techniques)
+        kb.techniques = techniques
+        self.assertIs(kb.techniques, techniques)
+        self.assertIsNot(state.techniques, techniques)
+        self.assertIsNot(snapshot.techniques, techniques)
+
+    def test_search_cache_versions(self):
+        """
+        Test that searches pinned to an older state do not disturb cached results of the current one.
+
+        Verifies that:
+        - A snapshot's searches bypass the shared cache once newer results are cached
+        - Cached results for the current version survive those searches
+        """
+        from solve_it_library.search_index import SearchResultCache
+        cache = SearchResultCache(4)
+        cache.put(('a',), 2, {'techniques': [1]})
+        self.assertIsNone(cache.get(('a',), 1))
+        cache.put(('b',), 1, {'techniques': [2]})
+        self.assertEqual(cache.get(('a',), 2), {'techniques': [1]})
+        self.assertIsNone(cache.get(('b',), 2))
+        cache.put(('c',), 3, {'techniques': [3]})
+        self.assertIsNone(cache.get(('a',), 3))
+
+        kb = KnowledgeBase('.', 'solve-it.json')
+        pinned = kb._pinned()
+        kb.rebuild_indices()
+        kb.search('disk imaging')
+        pinned.search('memory')
+        hits = kb.search_cache_info()['hits']
+        kb.search('disk imaging')
+        self.assertEqual(kb.search_cache_info()['hits'], hits + 1)
+
+    def test_legacy_solveit_view(self):
+        """
+        Test that solveitcore.SOLVEIT is a view over the shared KnowledgeBase.
+
+        Verifies that:
+        - SOLVEIT and KnowledgeBase.shared() use the same loaded data
+        - Legacy in_techniques/in_weaknesses fields match the reverse indices
+        - The legacy fields are not added to the KnowledgeBase records
+        - Legacy list and lookup methods match the KnowledgeBase
+        """
+        import solveitcore
+        shared = KnowledgeBase.shared('.', 'solve-it.json')
+        self.assertIs(KnowledgeBase.shared('.'), shared)
+        legacy = solveitcore.SOLVEIT('data', 'solve-it.json')
+        self.assertIs(legacy.kb._state, shared._state)
+
+        self.assertEqual(legacy.list_tactics(), shared.list_tactics())
+        self.assertEqual(legacy.list_techniques(), shared.list_techniques())
+        self.assertEqual(legacy.get_technique('T1002'), shared.get_technique('T1002'))
+        weakness_id = shared.get_technique('T1002')['weaknesses'][0]
+        self.assertIn('T1002', legacy.get_weakness(weakness_id)['in_techniques'])
+        self.assertNotIn('in_techniques', shared.get_weakness(weakness_id))
+        mitigation_id = shared.get_weakness(weakness_id)['mitigations'][0]
+        mitigation = legacy.get_mitigation(mitigation_id)
+        self.assertIn('T1002', mitigation['in_techniques'])
+        self.assertIn(weakness_id, mitigation['in_weaknesses'])
+        self.assertIsNone(legacy.get_mitigation('M9999'))
+        self.assertEqual(legacy.get_mit_list_for_technique('T1002'), shared.get_mit_list_for_technique('T1002'))
+
+    def test_legacy_solveit_records(self):
+        """
+        Test that solveitcore.SOLVEIT gives records in the legacy shape.
+
+        Verifies that:
+        - Weaknesses and mitigations have the keys of their JSON files plus the usage fields
+          (e.g. 'INAC-EX' rather than 'INAC_EX', and no 'description' the file does not have)
+        - The collections can be modified without changing the shared KnowledgeBase
+        """
+        import solveitcore
+        shared = KnowledgeBase.shared('.', 'solve-it.json')
+        legacy = solveitcore.SOLVEIT('data', 'solve-it.json')
+        with open(os.path.join('data', 'weaknesses', 'W1001.json')) as f:
+            weakness_keys = set(json.load(f))
+        with open(os.path.join('data', 'mitigations', 'M1001.json')) as f:
+            mitigation_keys = set(json.load(f))
+        self.assertEqual(set(legacy.get_weakness('W1001')), weakness_keys | {'in_techniques'})
+        self.assertIn('INAC-EX', weakness_keys)
+        self.assertEqual(set(legacy.get_mitigation('M1001')), mitigation_keys | {'in_techniques', 'in_weaknesses'})
+
+        legacy.get_weakness('W1001')['INAC-EX'] = 'x'
+        self.assertEqual(legacy.weaknesses['W1001']['INAC-EX'], 'x')
+        self.assertNotEqual(shared.get_weakness('W1001').get('INAC_EX'), 'x')
+        legacy.techniques['T9999'] = {'id': 'T9999', 'name': 'Added'}
+        del legacy.mitigations['M1001']
+        self.assertIn('T9999', legacy.list_techniques())
+        self.assertNotIn('M1001', legacy.list_mitigations())
+        self.assertIsNone(shared.get_technique('T9999'))
+        self.assertIsNotNone(shared.get_mitigation('M1001'))
+
+        legacy.tactics[0]['name'] = 'Changed'
+        self.assertNotEqual(shared.list_objectives()[0]['name'], 'Changed')
+        self.assertNotEqual(solveitcore.SOLVEIT('data', 'solve-it.json').tactics[0]['name'], 'Changed')
+
+    def test_legacy_solveit_matches_original_loader(self):
+        """
+        Test that solveitcore.SOLVEIT records match those of the original loader.
+
+        Verifies that:
+        - Fields that validation drops (weakness 'details', 'INAC-EX_comment') are kept
+        - Usage fields list techniques in load order and weaknesses in the order listed
+        """
+        import solveitcore
+        legacy = solveitcore.SOLVEIT('data', 'solve-it.json')
+
+        # The original loader: raw files in directory order, usage fields appended without repeats
+        def load(folder):
+            items = {}
+            for filename in os.listdir(os.path.join('data', folder)):
+                if filename.endswith('json'):
+                    with open(os.path.join('data', folder, filename)) as f:
+                        item = json.load(f)
+                    items[item.get('id')] = item
+            return items
+        techniques, weaknesses, mitigations = load('techniques'), load('weaknesses'), load('mitigations')
+        for weakness in weaknesses.values():
+            weakness['in_techniques'] = []
+        for mitigation in mitigations.values():
+            mitigation['in_techniques'] = []
+            mitigation['in_weaknesses'] = []
+        for t_id, technique in techniques.items():
+            for w_id in technique.get('weaknesses'):
+                if t_id not in weaknesses[w_id]['in_techniques']:
+                    weaknesses[w_id]['in_techniques'].append(t_id)
+                for m_id in weaknesses[w_id].get('mitigations'):
+                    if w_id not in mitigations[m_id]['in_weaknesses']:
+                        mitigations[m_id]['in_weaknesses'].append(w_id)
+                    if t_id not in mitigations[m_id]['in_techniques']:
+                        mitigations[m_id]['in_techniques'].append(t_id)
+
+        self.assertIn('details', weaknesses['W1178'])
+        self.assertIn('INAC-EX_comment', weaknesses['W1172'])
+        for w_id in ['W1172', 'W1178']:
+            self.assertEqual(legacy.get_weakness(w_id), weaknesses[w_id])
+            for m_id in weaknesses[w_id]['mitigations']:
+                self.assertEqual(legacy.get_mitigation(m_id), mitigations[m_id])
+        self.assertEqual(dict(legacy.weaknesses), weaknesses)
+        self.assertEqual(dict(legacy.mitigations), mitigations)
+        self.assertEqual(dict(legacy.techniques), techniques)
+
+    def test_legacy_solveit_data_folder_name(self):
+        """
+        Test that solveitcore.SOLVEIT loads the data folder it is given, whatever its name.
+
+        Expected outcome:
+        - A data folder not named 'data' is loaded, not '<parent>/data'
+        """
+        import shutil
+        import solveitcore
+        with tempfile.TemporaryDirectory() as tmp:
+            data_path = os.path.join(tmp, 'altkb', 'mydata')
+            os.makedirs(data_path)
+            for folder in ['techniques', 'weaknesses', 'mitigations']:
+                shutil.copytree(os.path.join('data', folder), os.path.join(data_path, folder))
+            shutil.copy(os.path.join('data', 'solve-it.json'), data_path)
+
+            legacy = solveitcore.SOLVEIT(data_path)
+            self.assertEqual(legacy.kb.data_path, data_path)
+            self.assertEqual(legacy.list_techniques(), KnowledgeBase.shared('.').list_techniques())
+            self.assertEqual(legacy.list_tactics(), KnowledgeBase.shared('.').list_tactics())
+
+    def test_lazy_imports(self):
+        """
+        Test that importing the library does not import its heavy dependencies.
+
+        Verifies that:
+        - Importing KnowledgeBase does not import pydantic or asyncio
+        - Opening a data pack does not import pydantic (records are already validated)
+        - Importing change validation does not import pydantic
+        - A trusted load (as used by the read-only report scripts) does not import pydantic
+        - Loading from the JSON files imports pydantic for validation
+        """
+        import subprocess
+        code = ("import sys; from solve_it_library import KnowledgeBase; {}; "
+                "print(' '.join(m for m in ('pydantic', 'asyncio') if m in sys.modules))")
+        with tempfile.TemporaryDirectory() as tmp:
+            pack_path = os.path.join(tmp, 'solve-it.pack')
+            build_pack(KnowledgeBase('.', 'solve-it.json'), pack_path)
+            for statement, expected in [('pass', ''),
+                                        ('KnowledgeBase(".", data_pack=%r)' % pack_path, ''),
+                                        ('import solve_it_library.change_validation', ''),
+                                        ('KnowledgeBase(".", trusted=True).list_tactics()', ''),
+                                        ('KnowledgeBase(".")', 'pydantic')]:
+                result = subprocess.run([sys.executable, '-c', code.format(statement)], capture_output=True,
+                                        text=True, check=True)
+                self.assertEqual(result.stdout.strip(), expected, statement)
+
+    def test_batched_and_trusted_validation(self):
+        """
+        Test batched record validation and the trusted load mode.
+
+        Verifies that:
+        - Batched validation gives the same records as model_validate().model_dump() per file
+        - Invalid records (and invalid objectives) are skipped, the rest still load
+        - trusted=True skips validation but gives records of the same shape
+        - The field table used by trusted loads matches the models
+        """
+        from solve_it_library.record_validation import get_model, NORMALISED_FIELDS
+        for model_name, fields in NORMALISED_FIELDS.items():
+            model_fields = get_model(model_name).model_fields
+            self.assertEqual([name for name, _, _, _ in fields], list(model_fields), model_name)
+            for name, key, required, default_factory in fields:
+                field = model_fields[name]
+                self.assertEqual((key, required), (field.alias or name, field.is_required()), name)
+                if not required:
+                    self.assertEqual(default_factory(), field.get_default(call_default_factory=True), name)
+        items = {
+            'techniques/T1001.json': {'id': 'T1001', 'name': 'Technique', 'description': '', 'weaknesses': ['W1001']},
+            'techniques/T1002.json': {'id': 'X1002', 'name': 'Invalid ID', 'description': ''},
+            'weaknesses/W1001.json': {'id': 'W1001', 'name': 'Weakness', 'INCOMP': 'x', 'INAC-EX': '',
+                                      'mitigations': ['M1001']},
+            'mitigations/M1001.json': {'id': 'M1001', 'name': 'Mitigation'},
+            'solve-it.json': [{'name': 'Objective', 'description': '', 'techniques': ['T1001']},
+                              {'name': 'Invalid objective', 'description': '', 'techniques': ['X1']}],
+        }
+        with tempfile.TemporaryDirectory() as base_path:
+            for subdir in ['techniques', 'weaknesses', 'mitigations']:
+                os.makedirs(os.path.join(base_path, 'data', subdir))
+            for relative_path, content in items.items():
+                with open(os.path.join(base_path, 'data', relative_path), 'w') as f:
+                    json.dump(content, f)
+
+            kb = KnowledgeBase(base_path, 'solve-it.json')
+            trusted_kb = KnowledgeBase(base_path, 'solve-it.json', trusted=True)
+
+        self.assertEqual(sorted(kb.techniques), ['T1001'])
+        self.assertEqual(kb.get_technique('T1001'),
+                         get_model('Technique').model_validate(items['techniques/T1001.json']).model_dump())
+        self.assertEqual(kb.get_weakness('W1001'),
+                         get_model('Weakness').model_validate(items['weaknesses/W1001.json']).model_dump())
+        self.assertEqual(kb.get_weakness('W1001')['INAC_EX'], '')
+        self.assertEqual(kb.list_tactics(), ['Objective'])
+
+        self.assertTrue(trusted_kb.trusted)
+        self.assertIn('X1002', trusted_kb.techniques)
+        self.assertEqual(trusted_kb.get_technique('T1001'), kb.get_technique('T1001'))
+        self.assertEqual(trusted_kb.get_weakness('W1001'), kb.get_weakness('W1001'))
+        self.assertEqual(trusted_kb.get_mitigation('M1001'), kb.get_mitigation('M1001'))
+        self.assertEqual(len(trusted_kb.list_tactics()), 2)
+
+    def test_citation_index(self):
+        """
+        Test the citation index built over technique, weakness and mitigation references.
+
+        Verifies that:
+        - get_items_for_reference finds every item citing a reference, whatever its spacing/case
+        - get_references_for_technique aggregates technique, weakness and mitigation
+          references with their provenance, without duplicates
+        - list_references and find_references return normalised, deduplicated references
+        """
+        kb = KnowledgeBase('.', 'solve-it.json')
+        technique_id = next(t_id for t_id in kb.list_techniques()
+                            if any(kb.get_weakness(w_id) and kb.get_weakness(w_id).get('references')
+                                   for w_id in kb.get_technique(t_id)['weaknesses']))
+        aggregated = kb.get_references_for_technique(technique_id)
+        for reference in kb.get_technique(technique_id).get('references') or []:
+            self.assertEqual(aggregated[' '.join(reference.split())][0], technique_id)
+        for weakness_id in kb.get_technique(technique_id)['weaknesses']:
+            for reference in kb.get_weakness(weakness_id).get('references') or []:
+                provenance = aggregated[' '.join(reference.split())]
+                self.assertIn(weakness_id, provenance)
+                self.assertEqual(len(provenance), len(set(provenance)))
+                citing = kb.get_items_for_reference('  ' + reference.upper() + ' ')
+                self.assertIn(weakness_id, citing)
+        self.assertEqual(kb.get_references_for_technique('T9999'), {})
+        self.assertEqual(kb.get_items_for_reference('not a cited reference'), [])
+
+        references = kb.list_references()
+        self.assertEqual(len(references), len({r.casefold().rstrip('.') for r in references}))
+        self.assertTrue(all(r == ' '.join(r.split()) for r in references))
+        found = kb.find_references(references[0][:20].lower(), limit=2)
+        self.assertLessEqual(len(found), 2)
+        self.assertIn(references[0][:20].casefold(), found[0]['reference'].casefold())
+
+    def test_excel_format_registry(self):
+        """
+        Test the shared format registry and row templates used by the Excel reports.
+
+        Verifies that:
+        - equal properties (in any order, or via a named style) give the same format object
+        - different properties give different formats, and each is created only once
+        - row templates write their values with one write_row/write_column call
+        """
+        from solve_it_library.excel_formats import FormatRegistry, RowTemplate, SheetTemplate, STYLES
+
+        class FakeWorkbook:
+            def __init__(self):
+                self.created = []
+
+            def add_format(self, properties):
+                self.created.append(properties)
+                return object()
+
+        class FakeWorksheet:
+            def __init__(self):
+                self.calls = []
+
+            def __getattr__(self, name):
+                return lambda *args: self.calls.append((name,) + args)
+
+        workbook = FakeWorkbook()
+        formats = FormatRegistry(workbook)
+        bold = formats.get(bold=True, text_wrap=True)
+        self.assertIs(formats.get(text_wrap=True, bold=True), bold)
+        self.assertIs(formats['bold_wrap'], bold)
+        self.assertIsNot(formats['weakness_type'], bold)
+        for _ in range(100):
+            formats['weakness_type']
+        self.assertEqual(len(formats), 2)
+        self.assertEqual(workbook.created, [{'bold': True, 'text_wrap': True}, STYLES['weakness_type']])
+        with self.assertRaises(KeyError):
+            formats['no_such_style']
+
+        worksheet = FakeWorksheet()
+        RowTemplate.blank(3, bold).write(worksheet, 5, 8)
+        template = SheetTemplate().set_column(0, 0, 20).add(0, 0, RowTemplate(['a', 'b'], bold, vertical=True))
+        self.assertIs(template.apply(worksheet), worksheet)
+        self.assertEqual(worksheet.calls, [('write_row', 5, 8, ['', '', ''], bold),
+                                           ('set_column', 0, 0, 20, None, {}),
+                                           ('write_column', 0, 0, ['a', 'b'], bold)])
+
+    def test_tool_index(self):
+        """
+        Test the reverse index from tools named in technique examples to techniques.
+
+        Verifies that:
+        - the tool name is taken from the start of an example, before any description
+        - lookups ignore case and whitespace, and merge aliases
+        - list_tools counts the techniques listing each tool, most first
+        - examples that are prose, artefacts, datasets or citations are not tools
+        """
+        from solve_it_library.tool_index import tool_name
+        self.assertEqual(tool_name("FTK Imager: This tool can be used to acquire data"), 'FTK Imager')
+        self.assertEqual(tool_name("Checkra1n, https://checkra.in"), 'Checkra1n')
+        self.assertEqual(tool_name("PyDFT (Hargreaves & Patterson 2012)"), 'PyDFT')
+        self.assertEqual(tool_name("Magnet Axiom 'World map view' (Magnet 2020)"), 'Magnet Axiom')
+        self.assertEqual(tool_name("Autopsy Interesting Files module"), 'Autopsy')
+        prose = ["Discussed in 'Puma: Automatically generating digital forensic reference data'",
+                 "Hargreaves, Nelson and Casey (2024) provides a dataset",
+                 "2009 M57-Jean - Data is supplied as a 'multi-volume Expert Witness file'",
+                 "Chip-off can be used when data stored in a non-volatile (NV) memory chip",
+                 "Examination of syslog", "Example word lists https://www.dfir.training/downloads/search-terms",
+                 "prefs.js from Firefox", "USB connected devices", "See Hargreaves & Drury (2025)",
+                 "sqlite-forensic-corpus (2018), https://faui1-files.cs.fau.de/public/sqlite-forensic-corpus/"]
+        for example in prose:
+            self.assertEqual(tool_name(example), '', example)
+
+        kb = KnowledgeBase('.', 'solve-it.json')
+        ftk_ids = [t['id'] for t in kb.get_techniques_for_tool('FTK Imager')]
+        self.assertIn('T1002', ftk_ids)
+        self.assertEqual(ftk_ids, sorted(ftk_ids))
+        self.assertEqual([t['id'] for t in kb.get_techniques_for_tool('  ftk   IMAGER ')], ftk_ids)
+        self.assertIn('FTK Imager', kb.get_tools_for_technique('T1002'))
+        for t_id in ftk_ids:
+            self.assertTrue(any(e.lower().startswith('ftk imager') for e in kb.get_technique(t_id)['examples']))
+
+        # 'Axiom' and 'Magnet Axiom ...' are merged under one tool
+        axiom_ids = [t['id'] for t in kb.get_techniques_for_tool('axiom')]
+        self.assertEqual(axiom_ids, [t['id'] for t in kb.get_techniques_for_tool('Magnet AXIOM')])
+        self.assertGreater(len(axiom_ids), 1)
+        self.assertEqual(kb.get_techniques_for_tool('no such tool'), [])
+        self.assertEqual(kb.get_tools_for_technique('T9999'), [])
+
+        tools = kb.list_tools()
+        counts = [entry['count'] for entry in tools]
+        self.assertEqual(counts, sorted(counts, reverse=True))
+        self.assertEqual(len({entry['tool'].casefold() for entry in tools}), len(tools))
+        self.assertTrue(all(entry['count'] == len(entry['techniques']) for entry in tools))
+        tool_names = {entry['tool'] for entry in tools}
+        for name in ['Discussed in', 'Hargreaves', '2009 M57-Jean', 'Examination of syslog', 'prefs.js from Firefox']:
+            self.assertNotIn(name, tool_names)
+        # Product lines of one vendor are not merged
+        self.assertEqual(kb.get_techniques_for_tool('UFED'), [])
+
+    def test_case_class_index(self):
+        """
+        Test the CASE class index and the streaming JSON-LD export.
+
+        Verifies that:
+        - class <-> technique lookups agree with the CASE_output_classes of each technique
+        - prefix patterns ('observable:*') select a whole namespace
+        - the JSON-LD chunks join into a valid document with one node per technique
+        """
+        import json
+        kb = KnowledgeBase('.', 'solve-it.json')
+        expected = {}
+        for t_id in kb.list_techniques():
+            for name in kb.get_technique(t_id).get('CASE_output_classes') or []:
+                expected.setdefault(name.strip(), set()).add(t_id)
+
+        self.assertEqual(kb.list_case_classes(), sorted(expected))
+        for name, technique_ids in expected.items():
+            self.assertEqual([t['id'] for t in kb.get_techniques_for_case_class(name)], sorted(technique_ids))
+        self.assertEqual(kb.get_case_classes_for_technique('T1002'), ['observable:Image'])
+        self.assertEqual(kb.get_case_classes_for_technique('T9999'), [])
+
+        observables = kb.list_case_classes('observable:*')
+        self.assertEqual(observables, sorted(name for name in expected if name.startswith('observable:')))
+        self.assertEqual({t['id'] for t in kb.get_techniques_for_case_class('observable:*')},
+                         set().union(*(expected[name] for name in observables)))
+        self.assertEqual(kb.get_techniques_for_case_class('observable:'), [])
+        self.assertEqual(kb.list_case_classes('nosuchprefix:*'), [])
+
+        chunks = list(kb.iter_case_jsonld())
+        self.assertGreater(len(chunks), 2)
+        document = json.loads(''.join(chunks))
+        self.assertEqual(document['@context']['observable'], 'https://ontology.unifiedcyberontology.org/uco/observable/')
+        nodes = {node['@id']: node for node in document['@graph']}
+        self.assertEqual(set(nodes), {'solveit:' + t_id for t_id in set().union(*expected.values())})
+        self.assertEqual(nodes['solveit:T1002']['caseOutputClass'], ['observable:Image'])
+        self.assertTrue(all(' ' not in name for node in nodes.values() for name in node['caseOutputClass']))
+
+        filtered = json.loads(''.join(kb.iter_case_jsonld('observable:Image', base_iri='https://example.org/',
+                                                          indent=False)))
+        self.assertEqual(filtered['@context']['solveit'], 'https://example.org/')
+        self.assertEqual([node['@id'] for node in filtered['@graph']],
+                         ['solveit:' + t_id for t_id in sorted(expected['observable:Image'])])
+
+    def test_subtechnique_hierarchy(self):
+        """
+        Test the subtechnique hierarchy index and the inherited queries.
+
+        Verifies that:
+        - parent, depth, path, ancestors and descendants agree with the subtechnique lists
+        - subtechniques belong to the objectives of their parent
+        - inherited weaknesses and mitigations include those of the subtechniques
+        - nested chains and cycles are handled by the index
+        """
+        from solve_it_library.technique_hierarchy import TechniqueHierarchy
+        kb = KnowledgeBase('.', 'solve-it.json')
+        parent_id = next(t_id for t_id in kb.list_techniques() if kb.get_technique(t_id).get('subtechniques'))
+        sub_ids = kb.get_technique(parent_id)['subtechniques']
+
+        self.assertIsNone(kb.get_parent_technique(parent_id))
+        self.assertEqual(kb.get_technique_depth(parent_id), 0)
+        self.assertIsNone(kb.get_technique_depth('T9999'))
+        self.assertEqual(kb.get_technique_descendants(parent_id), sub_ids)
+        for sub_id in sub_ids:
+            self.assertEqual(kb.get_parent_technique(sub_id), parent_id)
+            self.assertEqual(kb.get_technique_depth(sub_id), 1)
+            self.assertEqual(kb.get_technique_ancestors(sub_id), [parent_id])
+            self.assertEqual(kb.get_technique_path(sub_id), [parent_id, sub_id])
+            self.assertEqual(kb.get_objectives_for_technique(sub_id), kb.get_objectives_for_technique(parent_id))
+        self.assertTrue(kb.get_objectives_for_technique(parent_id))
+        self.assertEqual(kb.get_subtechnique_cycles(), [])
+
+        expected = []
+        for t_id in [parent_id] + sub_ids:
+            for w_id in kb.get_technique(t_id)['weaknesses']:
+                if w_id not in expected:
+                    expected.append(w_id)
+        self.assertEqual([w['id'] for w in kb.get_inherited_weaknesses(parent_id)], expected)
+        mitigation_ids = {m['id'] for m in kb.get_inherited_mitigations(parent_id)}
+        for w_id in expected:
+            self.assertTrue(set(kb.get_weakness(w_id)['mitigations']) <= mitigation_ids)
+
+        hierarchy = TechniqueHierarchy({
+            'T1': {'subtechniques': ['T2']},
+            'T2': {'subtechniques': ['T3', 'T9']},
+            'T3': {'subtechniques': ['T2'], 'weaknesses': ['W1']},
+            'T4': {'subtechniques': []},
+        })
+        self.assertEqual(hierarchy.cycles, [['T2', 'T3', 'T2']])
+        self.assertEqual(hierarchy.roots(), ['T1', 'T4'])
+        self.assertEqual(hierarchy.descendants('T1'), ['T2', 'T3'])
+        self.assertEqual(hierarchy.ancestors('T3'), ['T2', 'T1'])
+        self.assertEqual(hierarchy.depth('T3'), 2)
+        self.assertEqual(hierarchy.path('T3'), ['T1', 'T2', 'T3'])
+        self.assertEqual(hierarchy.inherited_weaknesses('T1'), ['W1'])
+
+
+    def test_mitigation_closure(self):
+        """
+        Test the closure over Mitigation.technique links.
+
+        Verifies that:
+        - a closure contains the techniques linked from its mitigations, and their closures
+        - links between techniques in a cycle are left out of the dependency DAG
+        - chains, self links and cycles are found in synthetic data
+        """
+        from solve_it_library.mitigation_closure import MitigationClosure
+        kb = KnowledgeBase('.', 'solve-it.json')
+        closures = kb.get_all_mitigation_closures()
+        self.assertEqual(list(closures), list(kb.techniques))
+        self.assertIsNone(kb.get_mitigation_closure('T9999'))
+        for t_id, closure in closures.items():
+            self.assertEqual(closure['techniques'][0], t_id)
+            for weakness in kb.get_weaknesses_for_technique(t_id):
+                self.assertIn(weakness['id'], closure['weaknesses'])
+                for mitigation in kb.get_mitigations_for_weakness(weakness['id']):
+                    linked_id = mitigation.get('technique')
+                    if linked_id in kb.techniques:
+                        self.assertTrue(set(closures[linked_id]['techniques']) <= set(closure['techniques']))
+        for closure in closures.values():
+            for link in closure['links']:
+                # the linked technique does not lead back, so the link does not close a cycle
+                self.assertNotIn(link['technique'], closures[link['linked_technique']]['techniques'])
+
+        closure = MitigationClosure(
+            {'T1': {'weaknesses': ['W1']}, 'T2': {'weaknesses': ['W2']}, 'T3': {'weaknesses': ['W3']},
+             'T4': {'weaknesses': ['W4']}, 'T5': {}},
+            {'W1': {'mitigations': ['M1', 'M5']}, 'W2': {'mitigations': ['M2']}, 'W3': {'mitigations': ['M3']},
+             'W4': {'mitigations': ['M4']}},
+            {'M1': {'technique': 'T2'}, 'M2': {'technique': 'T3'}, 'M3': {'technique': 'T2'},
+             'M4': {'technique': 'T4'}, 'M5': {'technique': 'T5'}})
+        self.assertEqual(closure.cycles, [['T2', 'T3'], ['T4']])
+        t1 = closure.closure('T1')
+        self.assertEqual(t1['techniques'], ['T1', 'T2', 'T3', 'T5'])
+        self.assertEqual(t1['mitigations'], ['M1', 'M2', 'M3', 'M5'])
+        self.assertEqual([(link['mitigation'], link['linked_technique']) for link in t1['links']],
+                         [('M1', 'T2'), ('M5', 'T5')])
+        self.assertEqual(t1['cycles'], [['T2', 'T3']])
+        self.assertEqual(t1['depth'], 1)
+        self.assertEqual(closure.closure('T3')['techniques'], ['T3', 'T2'])
+        t1['techniques'].append('T9')
+        self.assertEqual(closure.closure('T1')['techniques'], ['T1', 'T2', 'T3', 'T5'])
+
+
+    def test_weakness_class_masks(self):
+        """
+        Test the weakness class masks, class filters and class count rollups.
+
+        Verifies that:
+        - masks agree with the 'x' flags of each weakness
+        - filters by class, technique and objective return the matching weaknesses
+        - per-technique and per-objective counts agree with the flags
+        """
+        from solve_it_library.weakness_classes import class_mask, WEAKNESS_CLASS_FIELDS, WEAKNESS_CLASS_HEADERS
+        kb = KnowledgeBase('.', 'solve-it.json')
+
+        def flagged(w_id, field):
+            return kb.get_weakness(w_id).get(field) in ['x', 'X']
+
+        for w_id in kb.list_weaknesses():
+            expected = [name for name, field in zip(WEAKNESS_CLASS_HEADERS, WEAKNESS_CLASS_FIELDS)
+                        if flagged(w_id, field)]
+            self.assertEqual(kb.get_weakness_classes(w_id), expected)
+            self.assertEqual(kb.get_weakness_class_mask(w_id), class_mask(expected))
+        self.assertIsNone(kb.get_weakness_class_mask('W9999'))
+        self.assertEqual(class_mask(['inac_ex', 'MISINT']), 2 | 32)
+        with self.assertRaises(ValueError):
+            class_mask('INAC')
+
+        misint = [w['id'] for w in kb.get_weaknesses_by_class('MISINT')]
+        self.assertEqual(misint, sorted(w_id for w_id in kb.list_weaknesses() if flagged(w_id, 'MISINT')))
+        both = [w['id'] for w in kb.get_weaknesses_by_class(['INCOMP', 'INAC-EX'], match_all=True)]
+        self.assertEqual(both, sorted(w_id for w_id in kb.list_weaknesses()
+                                      if flagged(w_id, 'INCOMP') and flagged(w_id, 'INAC_EX')))
+
+        technique_weaknesses = set(kb.get_technique('T1002')['weaknesses'])
+        counts = kb.get_weakness_class_counts('T1002')
+        self.assertEqual(counts['total'], len(technique_weaknesses))
+        for name, field in zip(WEAKNESS_CLASS_HEADERS, WEAKNESS_CLASS_FIELDS):
+            self.assertEqual(counts[name], sum(1 for w_id in technique_weaknesses if flagged(w_id, field)))
+        self.assertEqual({w['id'] for w in kb.get_weaknesses_by_class('INCOMP', technique_id='T1002')},
+                         {w_id for w_id in technique_weaknesses if flagged(w_id, 'INCOMP')})
+        self.assertIsNone(kb.get_weakness_class_counts('T9999'))
+
+        rollups = kb.get_objective_weakness_class_counts()
+        self.assertEqual(list(rollups), [o['name'] for o in kb.list_objectives()])
+        objective = kb.list_objectives()[0]
+        objective_weaknesses = set()
+        for t_id in objective['techniques']:
+            for each_id in [t_id] + kb.get_technique_descendants(t_id):
+                objective_weaknesses.update(w_id for w_id in kb.get_technique(each_id)['weaknesses']
+                                            if w_id in kb.weaknesses)
+        self.assertEqual(rollups[objective['name']]['total'], len(objective_weaknesses))
+        self.assertEqual({w['id'] for w in kb.get_weaknesses_by_class('MISINT', objective_name=objective['name'])},
+                         {w_id for w_id in objective_weaknesses if flagged(w_id, 'MISINT')})
+        self.assertEqual(kb.get_weaknesses_by_class('MISINT', objective_name='No such objective'), [])
+
+
+    def test_compare_mappings(self):
+        """
+        Test the cross-mapping comparison.
+
+        Verifies that:
+        - the matrix agrees with the objectives of each mapping, including subtechniques
+        - unmapped techniques are those in no objective of a mapping
+        - Jaccard overlaps are computed from the objective technique sets
+        - comparing does not change the active mapping
+        """
+        from solve_it_library.mapping_comparison import MappingComparison, jaccard
+        kb = KnowledgeBase('.', 'solve-it.json')
+        comparison = kb.compare_mappings()
+        self.assertEqual(kb.current_mapping_name, 'solve-it.json')
+        self.assertEqual(comparison['mappings'], sorted(kb.list_available_mappings()))
+        self.assertEqual(list(comparison['matrix']), sorted(kb.list_techniques()))
+        for mapping_name in comparison['mappings']:
+            for t_id, objectives in comparison['matrix'].items():
+                self.assertEqual(objectives[mapping_name], kb.get_objectives_for_technique(t_id, mapping_name))
+            self.assertEqual(comparison['unmapped'][mapping_name],
+                             [t_id for t_id, objectives in comparison['matrix'].items()
+                              if not objectives[mapping_name]])
+        self.assertEqual(kb.get_unmapped_techniques(), comparison['unmapped']['solve-it.json'])
+        self.assertEqual(len(comparison['overlap']), 3)
+
+        overlap = kb.get_mapping_overlap('carrier.json', 'dfrws.json')
+        self.assertIn(overlap, comparison['overlap'])
+        self.assertTrue(0 < overlap['jaccard'] <= 1)
+        self.assertEqual(overlap['objectives'], sorted(overlap['objectives'],
+                                                       key=lambda pair: (-pair['jaccard'], -pair['shared'])))
+        with self.assertRaises(ValueError):
+            kb.compare_mappings(['no-such-mapping.json'])
+
+        index = MappingComparison({'a': [{'name': 'A1', 'techniques': ['T1', 'T9']},
+                                         {'name': 'A2', 'techniques': ['T3']}],
+                                   'b': [{'name': 'B1', 'techniques': ['T1', 'T3']}]},
+                                  ['T1', 'T2', 'T3'], {'T1': ['T2']})
+        self.assertEqual(index.matrix()['T2'], {'a': ['A1'], 'b': ['B1']})
+        self.assertEqual(index.unmapped('a'), [])
+        self.assertEqual(index.overlap('a', 'b')['objectives'][0],
+                         {'objective_a': 'A1', 'objective_b': 'B1', 'shared': 2, 'jaccard': 0.6667})
+        self.assertEqual(jaccard({'T1'}, {'T1', 'T2'}), 0.5)
+        self.assertEqual(jaccard(set(), set()), 0.0)
+
+
+    def test_mapping_cache(self):
+        """
+        Test that mapping files are discovered and loaded once and re-read only when they change.
+
+        Expected outcome:
+        - Switching between mappings and listing them does not read the files again
+        - A changed file is read and validated again; a touched but unchanged file is
+          read but not validated again
+        - Added mapping files are discovered
+        """
+        def write(path, content):
+            with open(path, 'w') as f:
+                json.dump(content, f)
+
+        with tempfile.TemporaryDirectory() as base_path:
+            data_path = os.path.join(base_path, 'data')
+            for subdir in ['techniques', 'weaknesses', 'mitigations']:
+                os.makedirs(os.path.join(data_path, subdir))
+            write(os.path.join(data_path, 'techniques', 'T1001.json'),
+                  {'id': 'T1001', 'name': 'Technique', 'description': '', 'weaknesses': []})
+            write(os.path.join(data_path, 'solve-it.json'), [{'name': 'A', 'description': '', 'techniques': ['T1001']}])
+            write(os.path.join(data_path, 'other.json'), [{'name': 'B', 'description': '', 'techniques': []}])
+            # files modified just before they are read are checked again, so backdate them
+            for mapping_name in ['solve-it.json', 'other.json']:
+                os.utime(os.path.join(data_path, mapping_name), ns=(10 ** 9, 10 ** 9))
+
+            kb = KnowledgeBase(base_path, 'solve-it.json')
+            cache = kb._mapping_cache
+            self.assertEqual(sorted(kb.list_available_mappings()), ['other.json', 'solve-it.json'])
+            for mapping_name in ['other.json', 'solve-it.json'] * 3:
+                self.assertTrue(kb.load_objective_mapping(mapping_name))
+            self.assertEqual((cache.files_read, cache.files_validated), (2, 2))
+            self.assertIs(KnowledgeBase(base_path, 'solve-it.json')._mapping_cache, cache)
+
+            mapping_path = os.path.join(data_path, 'other.json')
+            write(mapping_path, [{'name': 'Changed', 'description': '', 'techniques': []}])
+            os.utime(mapping_path, ns=(2 * 10 ** 9, 2 * 10 ** 9))
+            self.assertTrue(kb.load_objective_mapping('other.json'))
+            self.assertEqual([o['name'] for o in kb.list_objectives()], ['Changed'])
+            self.assertEqual((cache.files_read, cache.files_validated), (3, 3))
+
+            os.utime(mapping_path, ns=(3 * 10 ** 9, 3 * 10 ** 9))
+            self.assertTrue(kb.load_objective_mapping('other.json'))
+            self.assertEqual((cache.files_read, cache.files_validated), (4, 3))
+
+            write(os.path.join(data_path, 'new.json'), [])
+            self.assertIn('new.json', kb.list_available_mappings())
+            self.assertFalse(kb.load_objective_mapping('missing.json'))
+
+    def test_shared_in_fresh_process(self):
+        """
+        Test that shared() loads the knowledge base in a process with no mapping cache yet.
+
+        Expected outcome:
+        - KnowledgeBase.shared() and the legacy SOLVEIT view return instead of deadlocking
+        """
+        import subprocess
+        code = ("import sys; sys.path.insert(0, '.'); from solve_it_library import KnowledgeBase; "
+                "import solveitcore; kb = KnowledgeBase.shared('.'); solveitcore.SOLVEIT('data'); "
+                "print(kb.current_mapping_name)")
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, timeout=120, check=True)
+        self.assertEqual(result.stdout.strip(), 'solve-it.json')
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+from contextlib import redirect_stdout
+import io
+import sys
+import os
+import tempfile
+import xlsxwriter
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from solve_it_library import KnowledgeBase
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'reporting_scripts'))
+import generate_excel_from_kb
+
+class MyTestCase(unittest.TestCase):
+    def test_plan_shards_covers_every_technique(self):
+        kb = KnowledgeBase('..', 'solve-it.json')
+        shards, shard_files = generate_excel_from_kb.plan_shards(kb, os.path.join('out', 'solve-it.xlsx'))
+
+        self.assertEqual(set(shard_files), set(kb.list_techniques()))
+        self.assertGreaterEqual(len(shards), len(kb.list_objectives()))
+        self.assertEqual(shards[0][0], 'solve-it-01.xlsx')
+        for file_name, tactic, technique_ids in shards:
+            for each_id in tactic.get('techniques'):
+                if kb.get_technique(each_id) is not None:
+                    self.assertIn(each_id, technique_ids)
+                    for sub_id in kb.get_technique(each_id).get('subtechniques'):
+                        self.assertIn(sub_id, technique_ids)
+
+    def test_shard_links(self):
+        link = generate_excel_from_kb.shard_link({'T1001': 'kb-01.xlsx', 'T1002': 'kb-02.xlsx'}, 'kb-01.xlsx')
+        self.assertEqual(link('T1001'), 'internal:T1001!A1')
+        self.assertEqual(link('T1002'), 'external:kb-02.xlsx#T1002!A1')
+
+    def test_sharded_workbooks_are_written(self):
+        kb = KnowledgeBase('..', 'solve-it.json')
+        with tempfile.TemporaryDirectory() as tmp:
+            outpath = os.path.join(tmp, 'solve-it.xlsx')
+            with redirect_stdout(io.StringIO()):
+                written = generate_excel_from_kb.generate_sharded_workbooks(kb, outpath, '..', 'solve-it.json',
+                                                                             jobs=1)
+            self.assertTrue(os.path.exists(outpath))
+            for file_name in written:
+                self.assertTrue(os.path.exists(os.path.join(tmp, file_name)))
+
+    def test_nested_subtechniques_in_main_sheet(self):
+        kb = KnowledgeBase('..', 'solve-it.json')
+        parent_id = next(t_id for t_id in kb.list_techniques() if kb.get_technique(t_id).get('subtechniques'))
+        sub_id = kb.get_technique(parent_id)['subtechniques'][0]
+        techniques = dict(kb.techniques)
+        techniques[sub_id] = dict(techniques[sub_id], subtechniques=['T9999'])
+        techniques['T9999'] = {'id': 'T9999', 'name': 'Nested', 'subtechniques': [], 'weaknesses': []}
+        nested_kb = KnowledgeBase.from_records('..', techniques, kb.weaknesses, kb.mitigations)
+        tactic = {'name': 'Objective', 'techniques': [parent_id]}
+
+        class FakeWorksheet:
+            def __init__(self):
+                self.cells = []
+
+            def set_default_row(self, height):
+                pass
+
+            def write_url(self, row, column, url, string=None, cell_format=None):
+                self.cells.append((row, string))
+
+        worksheet = FakeWorksheet()
+        styles = generate_excel_from_kb.create_formats(xlsxwriter.Workbook(io.BytesIO()))
+        added, _ = generate_excel_from_kb.write_main_sheet(nested_kb, worksheet, [tactic], styles)
+
+        self.assertEqual(added[:3], [parent_id, sub_id, 'T9999'])
+        self.assertEqual(worksheet.cells[2], (3, '>> Nested\nT9999'))
+        self.assertTrue(worksheet.cells[1][1].startswith('> '))
+
+    def test_missing_weakness_raises(self):
+        kb = KnowledgeBase('..', 'solve-it.json')
+        techniques = dict(kb.techniques)
+        technique_id = kb.list_techniques()[0]
+        techniques[technique_id] = dict(techniques[technique_id], weaknesses=['W9999'])
+        broken_kb = KnowledgeBase.from_records('..', techniques, kb.weaknesses, kb.mitigations)
+        workbook = xlsxwriter.Workbook(io.BytesIO())
+        styles = generate_excel_from_kb.create_formats(workbook)
+
+        with redirect_stdout(io.StringIO()):
+            with self.assertRaisesRegex(ValueError, 'W9999'):
+                generate_excel_from_kb.write_summary_sheets(broken_kb, workbook.add_worksheet(),
+                                                            workbook.add_worksheet(), workbook.add_worksheet())
+            with self.assertRaisesRegex(ValueError, 'W9999'):
+                generate_excel_from_kb.write_technique_sheet(broken_kb, workbook.add_worksheet(technique_id),
+                                                             technique_id, styles)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -61,6 +61,15 @@ class MyTestCase(unittest.TestCase):
             generate_tsv_from_kb.print_mitigations(kb, False)
         self.assertIn("M1001", captured_output.getvalue())
 
+    def test_print_tools_runs_without_error(self):
+        kb = KnowledgeBase('..', 'solve-it.json')
+        captured_output = io.StringIO()
+
+        with redirect_stdout(captured_output):
+            generate_tsv_from_kb.print_tools(kb, True)
+        self.assertIn("Tool\tTechniques\tTechnique IDs", captured_output.getvalue())
+        self.assertIn("FTK Imager\t", captured_output.getvalue())
+
 
 
 